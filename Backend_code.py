@@ -4,6 +4,13 @@
 from question_classifier import QuestionClassifier  # 导入问题分类器类
 from question_parser import QuestionParser  # 导入问题解析器类
 from answer_search import AnswerSearcher  # 导入答案搜索器类
+from src.models.city_stats import get_city_statistics  # 导入城市统计，用于管理接口
+from src.models.snapshot import reload_snapshot  # 导入快照重新加载，用于数据重新导入后的管理接口
+from src.models.passage_index import MIN_CONFIDENCE, get_passage_index  # 导入景点介绍段落检索，在调用API之前尝试
+from src.api.pipeline import AnswerCache, AnswerPipeline, Tier, TierAnswer  # 导入分级问答流水线
+from src.api.speculation import SpeculationBudget, SpeculationStore, SpeculativeCall, answer_coverage  # 导入大模型投机预取
+from src.api.dialogue import DialogueState, resolve_followup  # 导入多轮对话的指代消解
+from src.utils.database import get_graph_pool  # 导入共享的Neo4j连接池，用于管理接口
 
 # 导入环境变量处理
 import os
@@ -24,9 +31,10 @@ import base64  # 导入 Base64 编码模块
 import hmac  # 导入 HMAC 算法模块，用于生成签名
 import json  # 导入 JSON 模块，用于处理 JSON 数据格式
 from urllib.parse import urlencode, quote  # 从 urllib.parse 模块导入 urlencode 函数，用于将字典编码为 URL 查询字符串；导入 quote 函数，用于 URL 编码特殊字符
-from typing import List, Dict, Union  # 从 typing 模块导入类型提示，用于代码可读性和静态分析
+from typing import Any, List, Dict, Union  # 从 typing 模块导入类型提示，用于代码可读性和静态分析
 import _thread  # 导入 _thread 模块，用于在单独的线程中运行 WebSocket，避免阻塞主线程
 import threading  # 导入 threading 模块，用于创建线程
+import time  # 导入 time 模块，用于计算分句回答的剩余时间
 import uuid  # 导入 uuid 模块，用于生成唯一标识符
 
 # --- 讯飞星火 Spark X1 WebSocket 服务接口认证信息 ---
@@ -35,6 +43,9 @@ APPID = os.getenv("SPARK_APPID", "your_APPID")  # 设置讯飞星火应用的 AP
 APISECRET = os.getenv("SPARK_APISECRET", "your_APISecret")  # 设置讯飞星火应用的 APISecret
 APIKEY = os.getenv("SPARK_APIKEY", "your_APIKey")  # 设置讯飞星火应用的 APIKey
 
+# 管理接口的访问令牌，设置后访问 /admin/* 需要在请求头 X-Admin-Token 或参数 token 中提供
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
 # 检查API配置是否已设置
 if "your_" in APPID or "your_" in APISECRET or "your_" in APIKEY:
     print("警告: 讯飞星火API配置未完成。如需使用API功能，请在.env文件中设置正确的值。")
@@ -44,12 +55,13 @@ SPARK_X1_WEBSOCKET_HOST = "spark-api.xf-yun.com"  # 定义讯飞星火 WebSocket
 SPARK_X1_WEBSOCKET_PATH = "/v1/x1"  # 定义讯飞星火 WebSocket 服务的路径
 SPARK_X1_WEBSOCKET_URL_BASE = f"wss://{SPARK_X1_WEBSOCKET_HOST}{SPARK_X1_WEBSOCKET_PATH}"  # 构建基础的 WebSocket URL
 
-# 全局变量，用于存储WebSocket响应
-ws_response_handler = {  # 初始化一个字典，用于存储 WebSocket 的响应信息
-    "full_response": "",  # 存储从 API 接收到的完整响应文本
-    "is_finished": False,  # 标记 API 响应是否已完全接收
-    "error_message": None  # 存储 API 调用过程中发生的错误信息
-}
+def new_response_state() -> Dict[str, Any]:  # 定义创建单次API调用响应状态的函数
+    """每次API调用使用自己的响应状态，投机调用和其他用户的调用同时进行时互不干扰"""
+    return {  # 返回一个字典，用于存储本次 WebSocket 调用的响应信息
+        "full_response": "",  # 存储从 API 接收到的完整响应文本
+        "is_finished": False,  # 标记 API 响应是否已完全接收
+        "error_message": None  # 存储 API 调用过程中发生的错误信息
+    }
 
 # 存储用户对话历史
 chat_history = {}  # 初始化一个空字典，用于存储不同用户的对话历史；键为用户ID，值为对话列表
@@ -73,57 +85,264 @@ except Exception as e:  # 捕获所有可能的异常
     searcher = None  # 将搜索器设置为空
 
 
-def get_tourist_answer(question_str: str, user_id: str = "default_user"):  # 定义获取旅游问答答案的函数
+def answer_from_passages(question_str: str, entities=None):  # 定义用景点介绍段落回答问题的函数
     """
-    处理用户问题并从问答系统获取答案。
-    先尝试从本地知识图谱获取答案，如果找不到再使用API。
+    在调用API之前，尝试从已爬取的景点介绍中检索能回答问题的段落。
+    置信度达到 PASSAGE_MIN_CONFIDENCE 时返回答案，否则返回 None。
     """
-    if not all([classifier, parser, searcher]):  # 检查问答系统的所有组件是否都已成功初始化
-        return "抱歉，问答系统未能正确初始化，无法处理您的问题。"  # 如果有组件未初始化，则返回错误信息
-
-    res_classify = classifier.classify(question_str)  # 调用问题分类器对用户输入的问题进行分类
-
-    if not res_classify or not res_classify.get('args'):  # 检查分类结果是否存在，以及是否包含 'args'（通常是识别出的实体）
-        # 没有识别出景点实体，使用API回答
-        print("没有识别出景点实体，转向API寻求回答...")  # 打印提示信息
-        waiting_msg = "正在思考中，由于没有识别到相关景点信息，正在联网查询更多资源，请稍等片刻..."
-        print(waiting_msg)
-        query_id = str(uuid.uuid4())  # 生成一个唯一的查询ID
-        # 在后台线程中处理API请求
-        threading.Thread(target=lambda: process_api_query(question_str, user_id, query_id)).start()
-        return waiting_msg, query_id  # 返回等待提示和查询ID
-
-    if not res_classify.get('question_types'):  # 检查分类结果中是否包含问题类型
+    try:  # 段落检索失败时不影响后续的API调用
+        snapshot = searcher.snapshot  # 当前的知识图谱快照
+        names = [name for name in (entities or []) if name in snapshot.attractions] or None  # 只保留识别出的景点名称，没有时按问题中提到的景点检索
+        hits = get_passage_index(snapshot).search(question_str, names=names, k=1)  # 检索得分最高的段落
+    except Exception as e:  # 捕获所有可能的异常
+        print(f"景点介绍段落检索失败: {e}")  # 打印错误信息
+        return None
+    if not hits or hits[0].confidence < MIN_CONFIDENCE:  # 没有找到段落或置信度不足
+        return None
+    print(f"从景点介绍中找到答案（置信度{hits[0].confidence}），不再调用API")  # 打印提示信息
+    return f"根据{hits[0].name}的介绍：{hits[0].text}"  # 返回段落及其所属景点
+
+
+# 只对与当前时刻无关的答案做缓存，"现在开着吗"之类的问题每次重新计算
+UNCACHEABLE_QUESTION_TYPES = {'是否开放', '开放景点'}
+
+answer_cache = AnswerCache(int(os.getenv("ANSWER_CACHE_SIZE", "1024")))  # 最终答案缓存，键包含快照版本
+
+# 大模型投机预取：只识别出景点、默认按简介回答时，在查询知识图谱的同时提前调用API
+SPECULATIVE_LLM = os.getenv("SPECULATIVE_LLM", "false").lower() == "true"  # 是否开启投机预取
+SPECULATIVE_MIN_COVERAGE = float(os.getenv("SPECULATIVE_MIN_COVERAGE", "0.6"))  # 知识图谱答案覆盖问题内容的比例达到该值时取消投机调用
+speculation_budget = SpeculationBudget(float(os.getenv("SPECULATIVE_MAX_FRACTION", "0.1")))  # 限制投机调用占请求的比例
+speculation_store = SpeculationStore(float(os.getenv("SPECULATIVE_TTL", "300")))  # 未取消的投机调用，等待用户重新提问
+
+# 多轮对话：记住每个用户上一轮识别出的景点，"它的门票呢"之类的追问改写后仍由知识图谱回答
+dialogue_state = DialogueState(float(os.getenv("DIALOGUE_TTL", "600")), int(os.getenv("DIALOGUE_MAX_USERS", "10000")))
+
+
+def start_speculation(question_str: str, user_id: str):  # 定义发起投机API调用的函数
+    """在后台调用API，使用对话历史的副本，结果被采用前不写入用户的对话历史"""
+    query_id = str(uuid.uuid4())  # 生成一个唯一的查询ID
+    history = list(chat_history.get(user_id, []))  # 对话历史的副本
+
+    def finish(call):  # 调用结束后的处理
+        speculation_budget.release()  # 释放同时进行的投机调用名额
+        if call.cancelled or call.result is None:  # 已取消，丢弃结果
+            return
+        api_results[query_id] = {"status": "completed", "result": call.result, "timestamp": datetime.datetime.now().isoformat()}  # 供前端轮询
+        if call.adopted:  # 结束前已被采用，写入对话历史
+            record_adopted_answer(user_id, question_str, call.result)
+
+    print("识别置信度较低，提前调用API（投机预取）...")  # 打印提示信息
+    return SpeculativeCall(query_id, lambda cancel: get_answer_from_api(question_str, user_id, history=history, cancel_event=cancel), finish).start()
+
+
+def record_adopted_answer(user_id: str, question_str: str, answer: str):  # 定义把被采用的投机答案写入对话历史的函数
+    """将问题和投机调用的答案追加到用户的对话历史"""
+    chat_history.setdefault(user_id, []).extend([{"role": "user", "content": question_str}, {"role": "assistant", "content": answer}])
+
+
+def adopt_speculation(call, question_str: str, user_id: str):  # 定义采用投机调用结果的函数
+    """已完成时直接返回答案，仍在进行时返回等待提示和查询ID"""
+    speculation_budget.record('adopted')  # 记录采用次数
+    done, result = call.adopt()  # 采用调用结果
+    if done:  # 已完成
+        record_adopted_answer(user_id, question_str, result)  # 写入对话历史
+        return TierAnswer(result)
+    return TierAnswer(("正在思考中，正在联网查询更多资源，请稍等片刻...", call.query_id))  # 前端轮询该查询ID
+
+
+def tier_prefetched(context):  # 第零级：之前为该问题提前发起的API调用
+    """用户重新提问时采用之前的投机调用"""
+    if context.get('partial'):  # 分句回答时不采用投机调用
+        return None
+    call = speculation_store.pop(context['user_id'], context['question'])  # 同一用户同一问题的投机调用
+    if call is None or call.cancelled:  # 没有投机调用
+        return None
+    return adopt_speculation(call, context['question'], context['user_id'])
+
+
+def tier_cache(context):  # 第一级：答案缓存
+    """返回缓存的最终答案"""
+    answer = answer_cache.get((searcher.snapshot.version, context['question']))  # 按快照版本和问题查找
+    return TierAnswer(answer) if answer is not None else None
+
+
+def tier_snapshot(context):  # 第二级：问题分类 + 内存快照索引
+    """对问题分类并生成查询；全部问题类型都由内存索引回答时直接给出答案"""
+    res_classify = classifier.classify(context['question'])  # 调用问题分类器对用户输入的问题进行分类
+    params = res_classify.get('params', {})  # 分类器提取的参数
+    if params.get('more'):  # "更多"：从对话状态中取出正在查看的城市景点列表和下一页的游标
+        listing = dialogue_state.recall_listing(context['user_id'])
+        if listing and params.get('city', listing[0]) == listing[0]:  # 继续列出同一城市的景点
+            params.update(city=listing[0], cursor=listing[1])
+        elif 'city' in params:  # 提到了另一个城市，从第一页开始列出
+            del params['more']
+        else:  # 没有正在查看的列表，按追问处理
+            res_classify = {}
+    if not res_classify.get('args'):  # 没有识别出景点，可能是追问
+        followup = resolve_followup(context['question'], dialogue_state.recall(context['user_id']), ellipsis=not res_classify)  # 用上一轮的景点改写追问
+        resolved = classifier.classify(followup) if followup else {}  # 对改写后的问题分类
+        if resolved.get('args'):  # 改写后识别出了景点
+            print(f"追问改写: '{context['question']}' -> '{followup}'")
+            res_classify = resolved
+            context['resolved_question'] = followup  # 保存改写后的问题，供段落检索使用
+            context['cacheable'] = False  # 答案取决于对话状态，不缓存
+    if res_classify.get('args'):  # 记住本轮识别出的景点，供下一轮追问使用
+        dialogue_state.remember(context['user_id'], list(res_classify['args']))
+    context['classify'] = res_classify  # 保存分类结果，供后面的级别使用
+    if not res_classify or not (res_classify.get('args') or res_classify.get('question_types')):  # 没有识别出实体，也没有不依赖实体的问题类型
+        context['reason'] = "没有识别到相关景点信息"  # 记录调用API的原因
+        return None
+    if not res_classify.get('question_types'):  # 识别出了景点但没有识别出问题类型
         attraction_name_keys = list(res_classify.get('args', {}).keys())  # 获取识别出的景点名称列表
         example_attraction = attraction_name_keys[0] if attraction_name_keys else "该景点"  # 选择第一个景点名称作为示例，如果列表为空则使用默认值
-        return f"抱歉，我理解您在问关于\"{example_attraction}\"的信息，但我不太明白您具体想了解哪个方面。您可以问我关于景点的地址、开放时间、简介等信息。"  # 返回提示信息，引导用户提问更具体的问题
-
+        return TierAnswer(f"抱歉，我理解您在问关于\"{example_attraction}\"的信息，但我不太明白您具体想了解哪个方面。您可以问我关于景点的地址、开放时间、简介等信息。")  # 返回提示信息，引导用户提问更具体的问题
     cypher_queries = parser.parser_main(res_classify)  # 调用问题解析器将分类结果转换为 Cypher 查询语句
+    context['cypher'] = cypher_queries  # 保存查询，供Neo4j级别使用
+    if not cypher_queries:  # 无法构建有效查询
+        context['reason'] = "无法构建有效的查询"  # 记录调用API的原因
+        return None
+    if SPECULATIVE_LLM and res_classify.get('low_confidence') and not context.get('partial') and speculation_budget.try_acquire():  # 识别置信度低且预算允许
+        context['speculation'] = start_speculation(context['question'], context['user_id'])  # 与知识图谱查询并行调用API
+    question_types = {sql_['question_type'] for sql_ in cypher_queries}  # 本次涉及的问题类型
+    context['cacheable'] = context['cacheable'] and not (question_types & UNCACHEABLE_QUESTION_TYPES) and '城市景点' not in question_types  # 与当前时刻有关的答案和需要记住游标的景点列表不缓存
+    if not question_types <= set(searcher.local_searchers):  # 还有需要查询Neo4j的问题类型
+        return None
+    context['reason'] = "本地知识库中未找到相关信息"  # 记录调用API的原因
+    results = searcher.search_results(cypher_queries, local_only=True)  # 由内存索引回答，不查询Neo4j
+    for sql_ in cypher_queries:  # 记住城市景点列表的下一页游标，供用户回复"更多"时使用
+        if sql_['question_type'] == '城市景点' and 'next_cursor' in sql_['params']:
+            dialogue_state.remember_listing(context['user_id'], sql_['params'].get('city'), sql_['params']['next_cursor'])
+    if not results:  # 内存索引没有给出答案
+        return None
+    return TierAnswer("\n".join(answer for answer, _ in results), any(found for _, found in results))  # 有答案时为最终答案，只有未找到的提示时为候选
+
+
+def tier_neo4j(context):  # 第三级：Neo4j查询
+    """执行需要查询Neo4j的问题类型"""
+    cypher_queries = context.get('cypher')  # 第二级生成的查询
+    if not any(sql_['sql'] for sql_ in cypher_queries or []):  # 没有需要Neo4j执行的查询（全部由内存索引回答）
+        return None
+    context['reason'] = "本地知识库中未找到相关信息"  # 记录调用API的原因（查询超时时同样适用）
+    results = searcher.search_results(cypher_queries)  # 执行 Cypher 查询并获取答案列表
+    if not results:  # 没有任何结果
+        return None
+    return TierAnswer("\n".join(answer for answer, _ in results), any(found for _, found in results))  # 有答案时为最终答案，只有未找到的提示时为候选
+
+
+def tier_passages(context):  # 第四级：景点介绍段落检索
+    """从景点介绍中检索置信度足够的段落"""
+    entities = list((context.get('classify') or {}).get('args', {}).keys())  # 识别出的实体
+    answer = answer_from_passages(context.get('resolved_question', context['question']), entities)  # 检索景点介绍（追问使用改写后的问题）
+    return TierAnswer(answer) if answer else None
+
+
+def tier_llm(context):  # 兜底：讯飞星火API（异步）
+    """在后台线程中调用API，立即返回等待提示和查询ID"""
+    question_str, user_id = context['question'], context['user_id']  # 问题和用户ID
+    if context.get('partial'):  # 分句回答时由 answer_in_parts 把未解决的分句合并后再调用API
+        return None
+    if context.get('speculation'):  # 已经提前发起了API调用，直接采用
+        return adopt_speculation(context.pop('speculation'), question_str, user_id)
+    print(f"{context.get('reason', '没有识别到相关景点信息')}，转向API寻求回答...")  # 打印提示信息
+    waiting_msg = f"正在思考中，由于{context.get('reason', '没有识别到相关景点信息')}，正在联网查询更多资源，请稍等片刻..."
+    print(waiting_msg)
+    query_id = str(uuid.uuid4())  # 生成一个唯一的查询ID
+    # 在后台线程中处理API请求
+    threading.Thread(target=lambda: process_api_query(question_str, user_id, query_id)).start()
+    return TierAnswer((waiting_msg, query_id))  # 返回等待提示和查询ID
+
+
+LOCAL_TIERS = ('cache', 'snapshot', 'neo4j', 'passages')  # 在本地给出答案的级别
+CACHED_TIERS = ('snapshot', 'neo4j')  # 最终答案写入答案缓存的级别
+
+
+def cache_local_answer(context, result):  # 定义缓存本地最终答案的函数
+    """缓存内存快照或Neo4j给出的最终答案（与当前时刻有关的答案除外）；介绍段落的答案可能答非所问，不缓存"""
+    if result.final and result.tier in CACHED_TIERS and context['cacheable']:  # 本地得到的最终答案
+        answer_cache.put((searcher.snapshot.version, context['question']), result.answer)  # 缓存答案
+
+
+# 分级问答流水线：缓存 → 内存快照 → Neo4j → 介绍段落，都没有答案时调用API
+# 每一级有耗时预算，整个请求有截止时间（秒），到达截止时间时返回已有的最佳答案
+answer_pipeline = AnswerPipeline(
+    [
+        Tier("prefetched", tier_prefetched, 0.05, inline=True),
+        Tier("cache", tier_cache, 0.05, inline=True),
+        Tier("snapshot", tier_snapshot, 0.5, inline=True),
+        Tier("neo4j", tier_neo4j, float(os.getenv("NEO4J_TIER_BUDGET", "2.0"))),
+        Tier("passages", tier_passages, float(os.getenv("PASSAGE_TIER_BUDGET", "0.5"))),
+    ],
+    deadline=float(os.getenv("ANSWER_DEADLINE", "3.0")),
+    fallback=Tier("llm", tier_llm, 1.0, inline=True),
+)
+
+
+def answer_in_parts(clauses: List[str], user_id: str):  # 定义分句回答包含多个问题的提问的函数
+    """
+    分别回答各分句（例如 "武侯祠门票多少钱"、"武侯祠附近有什么好吃的"），各分句共用一个截止时间。
+    本地能回答的分句立即返回，只把其余分句合并后交给API。
+    返回: 全部分句都在本地回答时为答案；部分回答时为 (答案和等待提示, 查询ID)；没有分句能在本地回答时为None
+    """
+    started = time.perf_counter()  # 开始时间
+    answered, unresolved = [], []  # 本地给出的答案、需要API回答的分句
+    for clause in clauses:
+        context = {'question': clause, 'user_id': user_id, 'cacheable': True, 'partial': True}  # 分句的请求上下文
+        remaining = max(0.0, answer_pipeline.deadline - (time.perf_counter() - started))  # 剩余时间，用完后其余分句都交给API
+        result = answer_pipeline.run(context, deadline=remaining)
+        print(f"分句 '{clause}': {result.tier} ({result.elapsed * 1000:.1f}ms) {result.trace}")  # 打印各分句的结果
+        low_confidence = (context.get('classify') or {}).get('low_confidence')  # 只识别出景点、默认回答简介的分句
+        if result.final and result.tier in LOCAL_TIERS and not low_confidence:  # 本地给出了可信的答案
+            answered.append(result.answer)
+            cache_local_answer(context, result)
+        else:
+            unresolved.append(clause)
+
+    if not answered:  # 没有分句能在本地回答，按完整问题处理
+        return None
+    if not unresolved:  # 全部分句都在本地回答
+        return "\n".join(answered)
+    remainder = "，".join(unresolved)  # 只把未解决的分句交给API
+    print(f"分句 '{remainder}' 未能在本地回答，转向API寻求回答...")
+    query_id = str(uuid.uuid4())  # 生成一个唯一的查询ID
+    threading.Thread(target=lambda: process_api_query(remainder, user_id, query_id)).start()
+    waiting_msg = f"关于“{remainder}”，正在联网查询更多资源，请稍等片刻..."
+    return "\n".join(answered) + "\n\n" + waiting_msg, query_id  # 先返回本地答案，API结果由前端轮询后追加
 
-    if not cypher_queries:  # 检查是否成功生成了 Cypher 查询语句
-        # 无法构建有效查询，使用API回答
-        print("无法构建有效的数据库查询，转向API寻求回答...")  # 打印提示信息
-        waiting_msg = "正在思考中，由于无法构建有效的查询，正在联网查询更多资源，请稍等片刻..."
-        print(waiting_msg)
-        query_id = str(uuid.uuid4())  # 生成一个唯一的查询ID
-        # 在后台线程中处理API请求
-        threading.Thread(target=lambda: process_api_query(question_str, user_id, query_id)).start()
-        return waiting_msg, query_id  # 返回等待提示和查询ID
-
-    answers_list = searcher.search_main(cypher_queries)  # 调用答案搜索器执行 Cypher 查询并获取答案列表
 
-    if not answers_list:  # 检查是否从知识图谱中找到了答案
-        # 本地知识图谱没有找到答案，使用API回答
-        print("本地知识图谱没有找到答案，转向API寻求回答...")  # 打印提示信息
-        waiting_msg = "正在思考中，由于本地知识库中未找到相关信息，正在联网查询更多资源，请稍等片刻..."
-        print(waiting_msg)
-        query_id = str(uuid.uuid4())  # 生成一个唯一的查询ID
-        # 在后台线程中处理API请求
-        threading.Thread(target=lambda: process_api_query(question_str, user_id, query_id)).start()
-        return waiting_msg, query_id  # 返回等待提示和查询ID
+def get_tourist_answer(question_str: str, user_id: str = "default_user"):  # 定义获取旅游问答答案的函数
+    """
+    处理用户问题并从问答系统获取答案。
+    依次尝试答案缓存、内存快照、Neo4j和景点介绍段落，都没有答案时使用API。
+    包含多个分句的问题先分句回答，只有本地无法回答的分句交给API。
+    """
+    if not all([classifier, parser, searcher]):  # 检查问答系统的所有组件是否都已成功初始化
+        return "抱歉，问答系统未能正确初始化，无法处理您的问题。"  # 如果有组件未初始化，则返回错误信息
 
-    # 找到本地答案，直接返回
-    return "\n".join(answers_list)  # 将答案列表中的所有答案用换行符连接起来并返回
+    if SPECULATIVE_LLM:  # 开启投机预取时记录请求数，用于限制投机比例
+        speculation_budget.note_request()
+    clauses = classifier.split_clauses(question_str)  # 按标点拆分问题
+    if len(clauses) > 1:  # 一次问了多个问题
+        answer = answer_in_parts(clauses, user_id)
+        if answer is not None:  # 至少有一个分句在本地得到了答案
+            return answer
+    context = {'question': question_str, 'user_id': user_id, 'cacheable': True}  # 请求上下文，各级在其中存放分类结果等
+    result = answer_pipeline.run(context)  # 执行分级问答流水线
+    print(f"问答流水线: {result.tier} ({result.elapsed * 1000:.1f}ms) {result.trace}")  # 打印各级的结果和耗时
+
+    speculation = context.get('speculation')  # 本次请求发起且尚未采用的投机调用
+    if speculation is not None:
+        entities = list((context.get('classify') or {}).get('args', {}).keys())  # 识别出的实体
+        coverage = answer_coverage(question_str, result.answer, entities) if isinstance(result.answer, str) else 0.0  # 答案覆盖问题内容的比例
+        if result.final and result.tier != 'llm' and (coverage is None or coverage >= SPECULATIVE_MIN_COVERAGE):  # 本地答案可信
+            speculation.cancel()  # 取消投机调用
+            speculation_budget.record('cancelled')
+        else:  # 本地答案可能不是用户想要的，保留投机调用等待重新提问
+            speculation_store.put(user_id, question_str, speculation)
+
+    if result.answer is None:  # 截止时间内没有任何答案
+        return "抱歉，系统繁忙，暂时无法回答您的问题，请稍后再试。"
+    cache_local_answer(context, result)  # 缓存本地得到的最终答案
+    return result.answer  # 返回答案（API级别为等待提示和查询ID）
 
 
 # API调用相关函数
@@ -166,11 +385,10 @@ def generate_auth_params():  # 定义生成讯飞星火 API 认证参数的函
     # 返回完整的URL和需要作为HTTP Header发送的Date
     return url_with_auth, date_header_value  # 返回构建好的带有认证参数的 WebSocket URL 和 Date 头信息
 
-def on_message(ws, message):  # 定义处理 WebSocket 接收到消息的回调函数
+def on_message(ws, message, ws_response_handler):  # 定义处理 WebSocket 接收到消息的回调函数
     """
-    处理WebSocket接收到的消息
+    处理WebSocket接收到的消息，写入本次调用的响应状态 ws_response_handler
     """
-    global ws_response_handler  # 声明使用全局变量 ws_response_handler
     data = json.loads(message)  # 将接收到的 JSON 格式的消息字符串解析为 Python 字典
     header = data.get('header', {})  # 从消息数据中获取 'header' 部分，如果不存在则返回空字典
     code = header.get('code')  # 从 'header' 中获取状态码 'code'
@@ -189,30 +407,28 @@ def on_message(ws, message):  # 定义处理 WebSocket 接收到消息的回调
     text_array = choices.get('text', [])  # 从 'choices' 中获取文本内容数组 'text'
     for text_item in text_array:  # 遍历文本内容数组
         content = text_item.get('content', '')  # 获取每个文本项的 'content'
-        ws_response_handler["full_response"] += content  # 将获取到的内容追加到全局的完整响应中
+        ws_response_handler["full_response"] += content  # 将获取到的内容追加到本次调用的完整响应中
 
     if status == 2:  # 检查响应状态是否为 2 (表示这是最后一帧数据)
         ws_response_handler["is_finished"] = True  # 标记响应已完成
         ws.close()  # 关闭 WebSocket 连接
 
-def on_error(ws, error):  # 定义处理 WebSocket 发生错误的回调函数
+def on_error(ws, error, ws_response_handler):  # 定义处理 WebSocket 发生错误的回调函数
     """
-    处理WebSocket错误
+    处理WebSocket错误，写入本次调用的响应状态 ws_response_handler
     """
-    global ws_response_handler  # 声明使用全局变量 ws_response_handler
     error_msg = f"WebSocket错误: {error}"  # 构建基础的错误信息
     if isinstance(error, websocket.WebSocketBadStatusException):  # 检查错误是否为 WebSocket 握手失败异常
         error_msg = f"WebSocket握手失败: Status {error.status_code} - {error.resp_body.decode() if error.resp_body else 'No body'}"  # 构建更详细的握手失败错误信息
     
-    ws_response_handler["error_message"] = error_msg  # 将错误信息存储到全局变量中
+    ws_response_handler["error_message"] = error_msg  # 将错误信息存储到本次调用的响应状态中
     print(f"\n{ws_response_handler['error_message']}")  # 打印错误信息
     ws_response_handler["is_finished"] = True  # 标记响应已完成（因为出错了）
 
-def on_close(ws, close_status_code, close_msg):  # 定义处理 WebSocket 连接关闭的回调函数
+def on_close(ws, close_status_code, close_msg, ws_response_handler):  # 定义处理 WebSocket 连接关闭的回调函数
     """
-    处理WebSocket连接关闭
+    处理WebSocket连接关闭，只标记本次调用的响应状态 ws_response_handler
     """
-    global ws_response_handler  # 声明使用全局变量 ws_response_handler
     if not ws_response_handler["is_finished"]:  # 检查响应是否已经被标记为完成
         ws_response_handler["is_finished"] = True  # 如果尚未标记，则标记为完成
     if close_status_code or close_msg:  # 检查是否存在关闭状态码或关闭消息
@@ -224,11 +440,6 @@ def on_open(ws, message_history: List[Dict[str, str]]):  # 定义处理 WebSocke
     """
     处理WebSocket连接打开事件，发送查询请求
     """
-    global ws_response_handler  # 声明使用全局变量 ws_response_handler
-    ws_response_handler["full_response"] = ""  # 重置完整响应内容为空字符串
-    ws_response_handler["is_finished"] = False  # 重置响应完成标记为 False
-    ws_response_handler["error_message"] = None  # 重置错误信息为 None
-    
     request_payload = {  # 构建发送给 API 的请求体
         "header": {  # 请求头部分
             "app_id": APPID,  # 设置应用 ID
@@ -248,21 +459,27 @@ def on_open(ws, message_history: List[Dict[str, str]]):  # 定义处理 WebSocke
     }
     ws.send(json.dumps(request_payload))  # 将请求体序列化为 JSON 字符串并通过 WebSocket 发送
 
-def get_answer_from_api(user_question: str, user_id: str = "default_user") -> str:  # 定义从讯飞星火 API 获取答案的函数
+def get_answer_from_api(user_question: str, user_id: str = "default_user", history=None, cancel_event=None) -> str:  # 定义从讯飞星火 API 获取答案的函数
     """
     调用星火API获取问题的回答
     参数:
         user_question: 用户问题
         user_id: 用户标识，用于保存对话历史
+        history: 使用这份对话历史（副本）而不是用户的对话历史，用于投机调用，结果被采用前不写入用户历史
+        cancel_event: 取消事件，被设置后不再发出请求或尽早关闭连接（返回None）
     返回:
         API返回的回答文本
     """
-    # 获取或初始化用户的对话历史
-    if user_id not in chat_history:  # 检查该用户的对话历史是否已存在
-        chat_history[user_id] = []  # 如果不存在，则初始化为空列表
+    if cancel_event is not None and cancel_event.is_set():  # 调用已被取消
+        return None
+    if history is None:  # 使用用户的对话历史
+        # 获取或初始化用户的对话历史
+        if user_id not in chat_history:  # 检查该用户的对话历史是否已存在
+            chat_history[user_id] = []  # 如果不存在，则初始化为空列表
+        history = chat_history[user_id]  # 获取指定用户的对话历史列表
     
     # 添加用户问题到对话历史
-    user_history = chat_history[user_id]  # 获取指定用户的对话历史列表
+    user_history = history  # 本次调用使用的对话历史
     user_history.append({"role": "user", "content": user_question})  # 将当前用户的问题添加到历史记录中
     
     # 检查对话历史长度，过长则截断 (讯飞星火 API 对话历史有长度限制)
@@ -279,28 +496,26 @@ def get_answer_from_api(user_question: str, user_id: str = "default_user") -> st
         "Host": SPARK_X1_WEBSOCKET_HOST  # 设置 Host 头
     }
     
+    ws_response_handler = new_response_state()  # 本次调用自己的响应状态，由下面的回调函数捕获
     ws = websocket.WebSocketApp(  # 创建 WebSocketApp 实例
         auth_url,  # 设置 WebSocket 连接的 URL
         header=handshake_headers,  # 设置握手请求头
-        on_message=on_message,  # 注册接收消息的回调函数
-        on_error=on_error,  # 注册发生错误的回调函数
-        on_close=on_close,  # 注册连接关闭的回调函数
+        on_message=lambda ws_app, message: ws_app.close() if cancel_event is not None and cancel_event.is_set() else on_message(ws_app, message, ws_response_handler),  # 注册接收消息的回调函数，调用被取消时关闭连接
+        on_error=lambda ws_app, error: on_error(ws_app, error, ws_response_handler),  # 注册发生错误的回调函数
+        on_close=lambda ws_app, code, msg: on_close(ws_app, code, msg, ws_response_handler),  # 注册连接关闭的回调函数
         on_open=lambda ws_app: on_open(ws_app, user_history)  # 注册连接打开的回调函数，使用 lambda 传递用户历史
     )
     
-    global ws_response_handler  # 声明使用全局变量 ws_response_handler
-    ws_response_handler["full_response"] = ""  # 在开始新的 API 调用前，重置完整响应
-    ws_response_handler["is_finished"] = False  # 重置响应完成标记
-    ws_response_handler["error_message"] = None  # 重置错误信息
-    
     try:  # 使用 try-except 块捕获 WebSocket 运行过程中可能发生的异常
         ws.run_forever()  # 启动 WebSocket 客户端并保持运行，直到连接关闭或发生错误
     except Exception as e:  # 捕获所有可能的异常
-        if not ws_response_handler["error_message"]:  # 如果全局错误信息尚未被设置
+        if not ws_response_handler["error_message"]:  # 如果错误信息尚未被设置
              ws_response_handler["error_message"] = f"WebSocket run_forever 异常: {e}"  # 则记录 run_forever 抛出的异常
         ws_response_handler["is_finished"] = True  # 标记响应已完成（因为出错了）
     
     # 获取API回答
+    if cancel_event is not None and cancel_event.is_set():  # 调用在进行中被取消，丢弃结果
+        return None
     if ws_response_handler["error_message"]:  # 检查在 API 调用过程中是否发生了错误
         return f"API调用错误: {ws_response_handler['error_message']}"  # 如果有错误，则返回错误信息
     
@@ -374,6 +589,64 @@ def get_api_result(query_id):
     
     return json.dumps(result)
 
+LOCAL_ADDRESSES = ('127.0.0.1', '::1')  # 没有设置访问令牌时允许访问管理接口的本机地址
+
+
+def admin_forbidden():
+    """校验管理接口的访问令牌，不通过时返回403响应，通过时返回None；没有设置 ADMIN_TOKEN 时只允许本机访问"""
+    if ADMIN_TOKEN:  # 设置了访问令牌时校验令牌
+        token = request.headers.get('X-Admin-Token', request.args.get('token', ''))  # 请求中提供的访问令牌
+        allowed = hmac.compare_digest(token, ADMIN_TOKEN)
+    else:  # 服务默认监听0.0.0.0，没有令牌时拒绝来自其他机器的请求
+        allowed = request.remote_addr in LOCAL_ADDRESSES
+    if not allowed:
+        return app.response_class(json.dumps({"status": "forbidden"}), status=403, mimetype='application/json')
+    return None
+
+@app.route('/admin/stats', methods=['GET'])
+def admin_stats():
+    """
+    管理接口：返回各城市景点数量以及评分、热度的均值和分位数（JSON）
+    统计结果按知识图谱快照版本缓存，数据重新加载前重复请求不会重新计算
+    """
+    forbidden = admin_forbidden()  # 校验访问令牌
+    if forbidden:
+        return forbidden
+    if searcher is None:  # 问答系统组件未初始化
+        return app.response_class(json.dumps({"status": "unavailable"}), status=503, mimetype='application/json')
+    snapshot = searcher.snapshot  # 当前的知识图谱快照
+    payload = dict(get_city_statistics(snapshot).to_dict(), version=snapshot.version)  # 统计结果附带数据版本
+    return app.response_class(json.dumps(payload, ensure_ascii=False), mimetype='application/json')
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """
+    管理接口：数据重新导入后重新加载知识图谱快照（JSON）
+    快照版本随之改变，基于旧快照的内存索引和按快照版本缓存的答案不再命中
+    """
+    forbidden = admin_forbidden()  # 校验访问令牌
+    if forbidden:
+        return forbidden
+    if searcher is None:  # 问答系统组件未初始化
+        return app.response_class(json.dumps({"status": "unavailable"}), status=503, mimetype='application/json')
+    previous = searcher.snapshot.version  # 重新加载前的快照版本
+    snapshot = reload_snapshot(searcher.g)  # 三元组文件不存在时从Neo4j加载
+    payload = {"status": "ok", "version": snapshot.version, "previous_version": previous, "attractions": len(snapshot)}
+    return app.response_class(json.dumps(payload, ensure_ascii=False), mimetype='application/json')
+
+@app.route('/admin/pipeline', methods=['GET'])
+def admin_pipeline():
+    """
+    管理接口：返回分级问答流水线各级的调用次数、命中率、超时次数和耗时，以及Neo4j连接池的使用率（JSON）
+    """
+    forbidden = admin_forbidden()  # 校验访问令牌
+    if forbidden:
+        return forbidden
+    payload = {"deadline": answer_pipeline.deadline, "cache_size": len(answer_cache), "tiers": answer_pipeline.stats(),
+               "speculation": dict(speculation_budget.stats(), enabled=SPECULATIVE_LLM, pending=len(speculation_store)),
+               "neo4j_pool": get_graph_pool().stats()}
+    return app.response_class(json.dumps(payload, ensure_ascii=False), mimetype='application/json')
+
 if __name__ == '__main__':  # 检查当前脚本是否作为主程序直接运行
     print("启动 Flask Web 服务器...")  # 打印启动服务器的提示信息
     app.run(host='0.0.0.0', port=5000, debug=True)  # 运行 Flask 开发服务器，监听所有网络接口的 5000 端口，并开启调试模式
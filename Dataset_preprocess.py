@@ -1,100 +1,312 @@
 import pandas as pd # 导入pandas库，用于数据处理和分析
 import numpy as np # 导入numpy库，用于数值计算
-import re # 导入re库，用于正则表达式操作
 import os # 导入os库，用于与操作系统交互，例如文件路径操作
-
-def clean_rating(rating_str): # 定义一个函数，用于清洗评分字符串
+import argparse # 导入argparse库，用于解析命令行参数
+import hashlib # 导入hashlib库，用于计算缓存键
+import inspect # 导入inspect库，用于定位生成派生字段的解析模块源码
+from src.data.gazetteer import DEFAULT_GAZETTEER_PATH # 导入地名库文件路径，地名库变化时增量缓存失效
+from src.data.gazetteer import get_gazetteer # 导入四川行政区划地名库，用于提取城市和区县
+from src.data.opening_hours import parse_opening_hours, format_rules # 导入开放时间解析函数，用于生成结构化开放时段
+from src.data.ticket_prices import TicketPrices, extract_ticket_prices # 导入门票价格提取函数，用于生成数值化票价
+from src.data.facilities import extract_facility_tags, format_tags # 导入服务设施标签提取函数，用于生成设施倒排索引的标签
+
+# 数值提取使用的正则表达式：提取第一个数字（可能包含小数点）
+NUMBER_PATTERN = r'(\d+\.?\d*)'
+
+def clean_rating(rating_series): # 定义一个函数，用于向量化清洗评分列
     """
-    Cleans the rating string and converts it to a float.
-    Example: "4.5分" -> 4.5
+    Cleans a rating column and converts it to floats (vectorized).
+    Example: "4.5分" -> 4.5; NaN / "N/A" / "" -> NaN
     """
-    if pd.isna(rating_str) or str(rating_str).strip().upper() == "N/A" or str(rating_str).strip() == "": # 检查评分字符串是否为NaN、"N/A"或空字符串
-        return np.nan # 如果是，则返回NaN
-    # Try to extract a number, allowing for a decimal point
-    match = re.search(r'(\d+\.?\d*)', str(rating_str)) # 尝试使用正则表达式提取数字（可能包含小数点）
-    if match: # 如果匹配成功
-        try:
-            return float(match.group(1)) # 尝试将提取到的字符串转换为浮点数并返回
-        except ValueError: # 如果转换失败
-            return np.nan # 返回NaN
-    return np.nan # 如果没有匹配到数字，也返回NaN
+    text = rating_series.astype(object).where(rating_series.notna(), "").astype(str) # 将评分列统一转换为字符串，缺失值视为空字符串
+    return text.str.extract(NUMBER_PATTERN, expand=False).astype(float) # 提取第一个数字并转换为浮点数，未匹配到数字（包括"N/A"和空字符串）的结果为NaN
 
-def clean_popularity(pop_str): # 定义一个函数，用于清洗热度字符串
+def clean_popularity(pop_series): # 定义一个函数，用于向量化清洗热度列
     """
-    Cleans the popularity string, handles units like 'w' or '万', and converts to a float.
+    Cleans a popularity column, handles units like 'w' or '万', and converts to floats (vectorized).
     Example: "12.3w热度" -> 123000.0, "5000热度" -> 5000.0
     """
-    if pd.isna(pop_str) or str(pop_str).strip().upper() == "N/A" or str(pop_str).strip() == "": # 检查热度字符串是否为NaN、"N/A"或空字符串
-        return np.nan # 如果是，则返回NaN
-    
-    text = str(pop_str).lower() # 将热度字符串转换为小写
-    num_val = None # 初始化数值变量
-    
-    # Check for 'w' or '万' (ten thousand)
-    if 'w' in text or '万' in text: # 检查字符串中是否包含'w'或'万'
-        match = re.search(r'(\d+\.?\d*)', text) # 尝试使用正则表达式提取数字
-        if match: # 如果匹配成功
-            try:
-                num_val = float(match.group(1)) * 10000 # 将提取到的数字乘以10000（表示万）
-            except ValueError: # 如果转换失败
-                return np.nan # 返回NaN
-    else: # If no 'w' or '万', try to extract number directly
-        match = re.search(r'(\d+\.?\d*)', text) # 如果不包含'w'或'万'，直接尝试提取数字
-        if match: # 如果匹配成功
-            try:
-                num_val = float(match.group(1)) # 将提取到的字符串转换为浮点数
-            except ValueError: # 如果转换失败
-                return np.nan # 返回NaN
-    return num_val # 返回清洗后的数值
+    text = pop_series.astype(object).where(pop_series.notna(), "").astype(str).str.lower() # 将热度列统一转换为小写字符串，缺失值视为空字符串
+    values = text.str.extract(NUMBER_PATTERN, expand=False).astype(float) # 提取第一个数字并转换为浮点数
+    is_wan = text.str.contains('w|万', regex=True) # 检查字符串中是否包含'w'或'万'（表示万）
+    return values.where(~is_wan, values * 10000) # 包含'万'单位的数值乘以10000
 
-def extract_city(address_str): # 定义一个函数，用于从地址字符串中提取城市信息
+def extract_location(address_str): # 定义一个函数，用于从地址字符串中一次性提取城市和区县
     """
-    Extracts city from address string.
-    This function attempts to identify common Sichuan cities/regions.
+    Extracts (city, district) from an address string in a single prefix-trie scan
+    over the full Sichuan gazetteer (dict/sichuan_gazetteer.csv).
+    Example: "四川省成都市武侯区武侯祠大街231号" -> ("成都", "武侯区")
     """
     if pd.isna(address_str) or address_str.strip() == "": # 检查地址字符串是否为NaN或空字符串
-        return "" # 如果是，则返回空字符串
-
-    address_str_norm = address_str.strip() # 去除地址字符串两端的空白字符
-
-    # List of cities/regions to check for, ordered to avoid premature short matches
-    # (e.g., check for "阿坝藏族羌族自治州" before just "阿坝")
-    sichuan_entities = [ # 定义四川省的城市/地区列表，注意顺序以避免错误匹配
-        "阿坝藏族羌族自治州", "甘孜藏族自治州", "凉山彝族自治州", # 自治州
-        "成都市", "自贡市", "攀枝花市", "泸州市", "德阳市", "绵阳市", # 市
-        "广元市", "遂宁市", "内江市", "乐山市", "南充市", "眉山市", "宜宾市", # 市
-        "广安市", "达州市", "雅安市", "巴中市", "资阳市", # 市
-        "都江堰市", "彭州市", "邛崃市", "崇州市", "广汉市", "什邡市", # 县级市
-        "绵竹市", "江油市", "峨眉山市", "阆中市", "华蓥市", "万源市", # 县级市
-        "简阳市", "西昌市", "康定市", "马尔康市", # 县级市
-        # Add common county or district names if they often appear as the primary location identifier
-        "锦江区", "青羊区", "金牛区", "武侯区", "成华区", "龙泉驿区", "青白江区", # 区
-        "新都区", "温江区", "双流区", "郫都区", "新津区", "大邑县", "蒲江县", "金堂县", # 区/县
-        "雨城区", "名山区", "东坡区", "彭山区", "仁寿县", "洪雅县", # 区/县
-        "旌阳区", "罗江区", "中江县", "游仙区", "涪城区", "安州区", # 区/县
-        "利州区", "昭化区", "朝天区", "船山区", "安居区", "东兴区", "翠屏区", "南溪区", # 区
-        "顺庆区", "高坪区", "嘉陵区", "通川区", "达川区", "雁江区", "雨城区" # 区
-    ]
-
-    # Remove "四川省" or "四川" prefix if present
-    if address_str_norm.startswith("四川省"): # 如果地址以"四川省"开头
-        address_str_norm = address_str_norm[len("四川省"):].strip() # 去除"四川省"前缀并去除空白
-    elif address_str_norm.startswith("四川"): # 如果地址以"四川"开头
-        address_str_norm = address_str_norm[len("四川"):].strip() # 去除"四川"前缀并去除空白
-
-    for entity in sichuan_entities: # 遍历四川省的城市/地区列表
-        if address_str_norm.startswith(entity): # 如果地址以列表中的某个实体开头
-            # Return the base name without suffix for consistency
-            return re.sub(r'(市|县|区|自治州|藏族羌族自治州|彝族自治州)$', '', entity) # 返回去除后缀（如市、县、区等）的实体名称
-
-    # Fallback for Chengdu if not caught by full "成都市"
-    if address_str_norm.startswith("成都"): # 如果地址以"成都"开头（作为备选方案）
-        return "成都" # 返回"成都"
-        
-    return "" # Return empty if no specific city is reliably extracted # 如果没有提取到特定城市，则返回空字符串
+        return "", "" # 如果是，则返回空的城市和区县
+    return get_gazetteer().extract(address_str) # 使用地名库字典树匹配 省 -> 城市 -> 区县
+
+def extract_city(address_str): # 定义一个函数，用于从地址字符串中提取城市信息
+    """
+    Extracts city (prefecture short name, e.g. "成都") from address string.
+    """
+    return extract_location(address_str)[0] # 只返回城市部分
+
+
+# 流式模式下每次读取的行数
+DEFAULT_CHUNKSIZE = 20000
+
+# 增量缓存的格式版本，三元组生成逻辑变化时递增，使旧缓存全部失效
+CACHE_VERSION = "1"
+
+# 需要确保存在的文本列
+TEXT_COLUMNS = ["景点名称", "地址", "开放时间", "官方电话", "介绍", "优待政策", "服务设施", "URL"]
+
+# 参与三元组生成的原始列，增量缓存只对这些列计算行哈希
+HASH_COLUMNS = ["景点名称", "评分", "热度", "地址", "开放时间", "官方电话", "介绍", "优待政策", "服务设施", "URL"]
+
+# 生成派生字段（城市区县、开放时段、票价、设施标签）的模块源码，任一文件变化时增量缓存全部失效
+DERIVED_FIELD_SOURCES = [inspect.getsourcefile(func) for func in (get_gazetteer, parse_opening_hours, extract_ticket_prices, extract_facility_tags)]
+
+# 三元组的谓语及其取值列，顺序即每个景点输出三元组的顺序
+TRIPLET_COLUMNS = [
+    ("位于", "地址"), # 1. 地点相关 (地址)
+    ("属于城市", "城市"), # 1a. 地点相关 (城市)
+    ("属于区县", "区县"), # 1b. 地点相关 (区县)
+    ("的评分是", "评分_数值"), # 2. 评价相关 (评分)
+    ("的热度为", "热度_数值"), # 3. 评价相关 (热度)
+    ("的开放时间为", "开放时间"), # 4. 时间相关 (开放时间)
+    ("的开放时段为", "开放时段"), # 4a. 时间相关 (由开放时间解析出的结构化开放时段)
+    ("的官方电话是", "官方电话"), # 5. 联系方式相关 (官方电话)
+    ("的介绍是", "介绍"), # 6. 介绍相关 (介绍)
+    ("的优待政策是", "优待政策"), # 7. 优待政策相关 (优待政策)
+    ("的成人票价是", "成人票价"), # 7a. 门票相关 (由优待政策、介绍提取的成人票价，单位元)
+    ("的儿童票价是", "儿童票价"), # 7b. 门票相关 (儿童票价，单位元)
+    ("是否免费开放", "免费开放"), # 7c. 门票相关 (是否免费开放，true/false)
+    ("的服务设施包括", "服务设施"), # 8. 服务设施相关 (服务设施)
+    ("的设施标签为", "设施标签"), # 8a. 服务设施相关 (由服务设施提取的规范化设施标签，以;分隔)
+    ("的URL是", "URL"), # 9. 网络资源相关 (URL)
+]
+
+def preprocess_frame(df): # 定义一个函数，对读取的原始数据进行清洗
+    """
+    Cleans the raw crawl DataFrame in place (vectorized) and returns it.
+    Adds 评分_数值 / 热度_数值 columns, ensures text columns exist and normalizes N/A values.
+    """
+    # Apply cleaning and create numerical columns
+    df["评分_数值"] = clean_rating(df["评分"]) if "评分" in df.columns else np.nan # 如果存在"评分"列，则向量化清洗得到"评分_数值"列，否则填充NaN
+    df["热度_数值"] = clean_popularity(df["热度"]) if "热度" in df.columns else np.nan # 如果存在"热度"列，则向量化清洗得到"热度_数值"列，否则填充NaN
+
+    # Ensure essential text columns exist, fill with empty string if not, then process
+    for col in TEXT_COLUMNS: # 遍历需要确保存在的文本列
+        if col not in df.columns: # 如果该列不在DataFrame的列中
+            df[col] = "" # 创建该列并用空字符串填充
+            print(f"警告: 列 '{col}' 未在CSV中找到，已创建为空列。") # 打印警告信息
+
+    # Standardize N/A and strip whitespace for all object columns (or columns we treat as text)
+    for col in df.columns: # 遍历DataFrame的所有列
+        if df[col].dtype == 'object' or col in TEXT_COLUMNS : # 如果列的数据类型是object或者在TEXT_COLUMNS列表中
+            df[col] = _normalize_text(df[col]) # 将列转换为字符串、去除两端空白并把"N/A"等空值标记替换为NaN
+    return df # 返回清洗后的DataFrame
+
+def _normalize_text(series): # 定义一个辅助函数，对原始文本列做字符串化、去空白和空值标准化
+    """Converts a raw column to stripped strings and replaces "N/A", "nan", "" and "None" with NaN."""
+    text = series.astype(str).str.strip() # 将列转换为字符串类型并去除两端空白
+    return text.replace({"N/A": np.nan, "nan": np.nan, "": np.nan, "None": np.nan}) # 将"N/A", "nan", 空字符串, "None"替换为NaN
+
+def _clean_text(series): # 定义一个辅助函数，将文本列规范为去除空白的字符串，空值统一为NaN
+    """Returns the stripped string values of a column, with missing or blank values as NaN."""
+    text = series.astype(object) # 转换为object类型，便于统一处理缺失值
+    text = text.where(text.isna(), text.astype(str).str.strip()) # 非缺失值转换为字符串并去除两端空白
+    return text.where(text != "") # 空字符串视为缺失值
+
+def _extract_tickets(policy, introduction, opening_time): # 定义一个辅助函数，从文本列中提取门票信息
+    """
+    Extracts numeric ticket information row by row from the cleaned 优待政策 / 介绍 / 开放时间 columns.
+    Only rows mentioning a price ("元") or free entry ("免") are parsed; the rest are left unknown.
+    Returns a DataFrame with adult / child (float, NaN if unknown) and free (True/False/NaN) columns.
+    """
+    tickets = pd.DataFrame({field: pd.Series(np.nan, index=policy.index, dtype=object) for field in TicketPrices._fields}) # 默认全部未知
+    texts = policy.fillna("") + "\n" + introduction.fillna("") + "\n" + opening_time.fillna("") # 拼接文本用于快速筛选
+    candidates = texts.str.contains("元|免", regex=True) # 只有提到金额或免费的行才可能提取到门票信息
+    for label in policy.index[candidates.to_numpy()]: # 遍历候选行
+        prices = extract_ticket_prices(policy.at[label], introduction.at[label], opening_time.at[label]) # 提取门票信息
+        for field, value in zip(TicketPrices._fields, prices): # 写入各字段
+            if value is not None: # 只写入已知的值
+                tickets.at[label, field] = value
+    return tickets # 返回门票信息
+
+def generate_triplets(df): # 定义一个函数，以列式方式从清洗后的数据生成三元组
+    """
+    Generates (subject, predicate, object) triplets from a cleaned DataFrame.
+    Each predicate is computed as a whole column, then the columns are stacked row-major
+    so that triplets come out per attraction in TRIPLET_COLUMNS order, skipping missing values.
+    Returns the triplets DataFrame (index = source row label) and the set of attraction names.
+    """
+    subjects = _clean_text(df["景点名称"]) # 清洗景点名称列
+    df = df[subjects.notna()] # 跳过景点名称缺失或为空的行
+    subjects = subjects[subjects.notna()] # 只保留有效的景点名称
+
+    columns = {} # 初始化一个字典，存储每个谓语对应的取值列
+    locations = None # 地址到(城市, 区县)的映射，首次需要时构建
+    tickets = None # 每行提取出的门票信息，首次需要时构建
+    for predicate, col in TRIPLET_COLUMNS: # 遍历谓语及其取值列
+        if col in ("城市", "区县"): # 城市和区县由地址提取得到
+            address = columns["位于"] # 使用清洗后的地址列
+            if locations is None: # 每个不同的地址只扫描一次，同时得到城市和区县
+                unique_addresses = address.dropna().unique() # 对地址去重
+                locations = {addr: extract_location(addr) for addr in unique_addresses} # 构建地址到(城市, 区县)的映射
+            part = 0 if col == "城市" else 1 # 取城市或区县部分
+            location_map = {addr: loc[part] for addr, loc in locations.items()} # 地址到城市或区县的映射
+            columns[predicate] = _clean_text(address.map(location_map)) # 映射得到取值列，空值视为缺失值
+        elif col == "开放时段": # 开放时段由清洗后的开放时间解析得到
+            opening = columns["的开放时间为"] # 使用清洗后的开放时间列
+            interval_map = {text: format_rules(parse_opening_hours(text)) for text in opening.dropna().unique()} # 每个不同的开放时间文本只解析一次
+            columns[predicate] = _clean_text(opening.map(interval_map)) # 映射得到取值列，无法解析的文本视为缺失值
+        elif col == "设施标签": # 设施标签由清洗后的服务设施提取得到
+            facilities = columns["的服务设施包括"] # 使用清洗后的服务设施列
+            tag_map = {text: format_tags(extract_facility_tags(text)) for text in facilities.dropna().unique()} # 每个不同的服务设施文本只提取一次
+            columns[predicate] = _clean_text(facilities.map(tag_map)) # 映射得到取值列，没有可识别设施的文本视为缺失值
+        elif col in ("成人票价", "儿童票价", "免费开放"): # 门票信息由优待政策、介绍和开放时间提取得到
+            if tickets is None: # 三个谓语共用一次提取
+                tickets = _extract_tickets(columns["的优待政策是"], columns["的介绍是"], columns["的开放时间为"]) # 逐行提取门票信息
+            if col == "免费开放": # 布尔值输出为 true/false
+                columns[predicate] = tickets["free"].map({True: "true", False: "false"}) # 未知时为NaN，不生成三元组
+            else: # 票价保持为浮点数
+                columns[predicate] = tickets["adult" if col == "成人票价" else "child"] # 未知时为NaN，不生成三元组
+        elif col in ("评分_数值", "热度_数值"): # 数值列
+            columns[predicate] = df[col].astype(object) # 数值保持为浮点数
+        else: # 文本列
+            columns[predicate] = _clean_text(df[col]) # 清洗文本列
+
+    predicates = [predicate for predicate, _ in TRIPLET_COLUMNS] # 谓语列表
+    wide = pd.DataFrame(columns, index=df.index)[predicates] # 构建宽表：每行一个景点，每列一个谓语
+    values = wide.to_numpy(dtype=object).ravel() # 按行优先展开（stack），得到每个景点依次的各谓语取值
+    keep = pd.notna(values) # 缺失值不生成三元组
+
+    triplets_df = pd.DataFrame({ # 构建三元组DataFrame
+        "subject": np.repeat(subjects.to_numpy(dtype=object), len(predicates))[keep], # 主体：每个景点名称重复谓语个数次
+        "predicate": np.tile(np.array(predicates, dtype=object), len(wide))[keep], # 谓语：按列顺序循环
+        "object": values[keep], # 客体：展开后的取值
+    }, index=np.repeat(wide.index.to_numpy(), len(predicates))[keep]) # 索引为来源行，便于按行分组
+    return triplets_df, set(subjects) # 返回三元组DataFrame和唯一景点名称集合
+
+def stream_triplets(input_csv_path, output_triplets_csv_path, chunksize=DEFAULT_CHUNKSIZE): # 定义一个函数，分块读取爬取数据并逐块写出三元组
+    """
+    Streams the crawl CSV in chunks of `chunksize` rows: each chunk is cleaned and turned
+    into triplets, which are appended to the output CSV right away. Only one chunk and the
+    set of unique attraction names are held in memory, so peak memory does not grow with
+    the number of rows. Produces the same file as the in-memory path.
+    Returns (number of triplets written, set of unique attraction names).
+    """
+    unique_attraction_names = set() # 流式累积的唯一景点名称集合
+    total = 0 # 已写出的三元组数量
+    reader = pd.read_csv(input_csv_path, encoding='utf-8-sig', dtype=str, chunksize=chunksize) # 分块读取，全部按字符串读入，避免各块类型推断不一致
+    with open(output_triplets_csv_path, 'w', encoding='utf-8-sig', newline='') as f: # 以utf-8-sig编码打开输出文件，BOM只在文件开头写入一次
+        header = True # 只有第一块写出表头
+        for chunk_number, chunk in enumerate(reader, 1): # 逐块处理
+            triplets_df, names = generate_triplets(preprocess_frame(chunk)) # 清洗当前块并生成三元组
+            triplets_df.to_csv(f, index=False, header=header, lineterminator='\n') # 追加写出当前块的三元组
+            header = False # 后续块不再写表头
+            unique_attraction_names.update(names) # 更新唯一景点名称集合
+            total += len(triplets_df) # 累计三元组数量
+            print(f"已处理第 {chunk_number} 块（{len(chunk)} 条记录），累计 {total} 条三元组。") # 打印进度
+        if header: # 输入文件没有任何数据行
+            pd.DataFrame(columns=["subject", "predicate", "object"]).to_csv(f, index=False, lineterminator='\n') # 仍然写出表头
+    return total, unique_attraction_names # 返回三元组数量和唯一景点名称集合
+
+def _cache_hash_key(): # 定义一个函数，生成行哈希使用的16字符密钥
+    """
+    Derives the 16-character hash key for row hashing from CACHE_VERSION, HASH_COLUMNS, the gazetteer file
+    and the source of the derived-field parsers (DERIVED_FIELD_SOURCES), so changing the triplet logic,
+    a parser or the gazetteer invalidates every cached row.
+    """
+    digest = hashlib.md5() # 使用md5汇总影响三元组结果的因素
+    digest.update(CACHE_VERSION.encode("utf-8")) # 缓存格式版本
+    digest.update("|".join(HASH_COLUMNS + [p for p, _ in TRIPLET_COLUMNS]).encode("utf-8")) # 参与哈希的列和谓语顺序
+    with open(DEFAULT_GAZETTEER_PATH, "rb") as f: # 地名库内容决定城市和区县的提取结果
+        digest.update(f.read())
+    for path in DERIVED_FIELD_SOURCES: # 解析模块的源码决定开放时段、票价和设施标签等派生字段
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16] # hash_pandas_object 要求16字符的密钥
+
+def row_hashes(raw_df): # 定义一个函数，计算每条原始记录的内容哈希
+    """
+    Returns a uint64 content hash for every raw row (index aligned with raw_df),
+    computed over HASH_COLUMNS only; columns missing from the crawl hash as NaN.
+    """
+    columns = raw_df.reindex(columns=HASH_COLUMNS).astype(object) # 只取参与生成三元组的列，缺失列补NaN
+    return pd.util.hash_pandas_object(columns, index=False, hash_key=_cache_hash_key()) # 向量化计算每行的哈希值
 
+def load_triplet_cache(cache_path): # 定义一个函数，读取增量缓存
+    """
+    Loads the row-hash cache written by save_triplet_cache.
+    Returns a DataFrame with row_hash (uint64), seq, subject, predicate, object; empty if missing or unreadable.
+    """
+    empty = pd.DataFrame({"row_hash": pd.Series(dtype="uint64"), "seq": pd.Series(dtype="int64"),
+                          "subject": pd.Series(dtype=object), "predicate": pd.Series(dtype=object),
+                          "object": pd.Series(dtype=object)}) # 空缓存
+    if not os.path.exists(cache_path): # 缓存文件不存在（首次运行）
+        return empty # 返回空缓存
+    try:
+        cache = pd.read_pickle(cache_path) # 缓存为本工具写出的pickle文件，读取比CSV快得多
+        return cache[["row_hash", "seq", "subject", "predicate", "object"]] # 返回规范列顺序的缓存
+    except Exception as e: # 缓存损坏时全部重新处理
+        print(f"读取增量缓存 {cache_path} 时发生错误，将全部重新处理: {e}") # 打印错误信息
+        return empty # 返回空缓存
+
+def save_triplet_cache(cache, cache_path): # 定义一个函数，写出增量缓存
+    """Writes the cache atomically (temporary file + os.replace)."""
+    tmp_path = cache_path + ".tmp" # 临时文件路径
+    cache.to_pickle(tmp_path) # 先写入临时文件
+    os.replace(tmp_path, cache_path) # 原子替换，避免中断时留下半个缓存文件
+
+def incremental_triplets(raw_df, cache_path): # 定义一个函数，基于行内容哈希增量生成三元组
+    """
+    Generates triplets for a raw crawl (read with dtype=str), reusing cached triplets for rows
+    whose content hash is unchanged; only new or changed rows go through cleaning and
+    city/district extraction. Rows that no longer appear are dropped from the cache.
+    Returns (triplets DataFrame identical to the full run, set of attraction names, stats dict).
+    """
+    hashes = row_hashes(raw_df) # 每条原始记录的内容哈希
+    cache = load_triplet_cache(cache_path) # 读取上次运行的缓存
+    hit = hashes.isin(cache["row_hash"]) # 命中缓存的行
+    miss = ~hit & ~hashes.duplicated() # 未命中的行，内容相同的行只处理一次
+
+    triplets_df, _ = generate_triplets(preprocess_frame(raw_df[miss].copy())) # 只对未命中的行清洗并生成三元组
+    fresh = triplets_df.assign(row_hash=hashes.loc[triplets_df.index].to_numpy(dtype="uint64")) # 为新三元组附上所属行的哈希
+    fresh["seq"] = fresh.groupby("row_hash", sort=False).cumcount() # 行内三元组序号，用于还原输出顺序
+    fresh["object"] = fresh["object"].astype(str) # 与缓存一致，客体按写出的文本保存
+
+    alive = cache["row_hash"].isin(hashes) # 本次仍然存在的缓存行
+    table = pd.concat([cache[alive], fresh[["row_hash", "seq", "subject", "predicate", "object"]]], ignore_index=True) # 合并仍然有效的缓存和新生成的三元组
+    order = pd.DataFrame({"row_hash": hashes.to_numpy(), "pos": np.arange(len(hashes))}) # 原始记录顺序
+    merged = order.merge(table, on="row_hash", how="inner").sort_values(["pos", "seq"], kind="stable") # 按原始记录顺序展开三元组
+
+    names = _clean_text(_normalize_text(raw_df["景点名称"])) if "景点名称" in raw_df.columns else pd.Series(dtype=object) # 景点名称直接由原始列得到，与三元组是否命中缓存无关
+    stats = {"rows": len(raw_df), "hits": int(hit.sum()), "misses": int((~hit).sum()), "processed": int(miss.sum())} # 缓存命中统计
+    if len(fresh) or not alive.all() or not os.path.exists(cache_path): # 缓存内容有变化时才重写
+        save_triplet_cache(table, cache_path) # 写出只包含当前行的新缓存
+    return merged[["subject", "predicate", "object"]].reset_index(drop=True), set(names.dropna()), stats # 返回三元组、唯一景点名称集合和统计信息
+
+def save_attraction_names(unique_attraction_names, script_dir): # 定义一个函数，保存景点名称词典
+    """Saves the sorted unique attraction names to dict/attraction_name.txt."""
+    if unique_attraction_names: # 如果唯一景点名称集合不为空
+        dict_dir = os.path.join(script_dir, 'dict') # 构建存放词典文件的目录路径
+        if not os.path.exists(dict_dir): # 如果目录不存在
+            os.makedirs(dict_dir) # 创建目录
+            print(f"创建文件夹: {dict_dir}") # 打印创建文件夹的提示信息
 
-def main(): # 定义主函数
+        attraction_dict_path = os.path.join(dict_dir, 'attraction_name.txt') # 构建景点名称词典文件的完整路径
+        sorted_attraction_names = sorted(list(unique_attraction_names)) # 将唯一景点名称集合转换为列表并排序
+        
+        try:
+            with open(attraction_dict_path, 'w', encoding='utf-8') as f: # 尝试以写入模式打开词典文件，使用utf-8编码
+                for name in sorted_attraction_names: # 遍历排序后的景点名称列表
+                    f.write(name + '\n') # 将每个景点名称写入文件，并添加换行符
+            print(f"已将 {len(sorted_attraction_names)} 个唯一景点名称保存到 {attraction_dict_path}") # 打印保存成功的提示信息和数量
+        except Exception as e: # 如果保存词典文件时发生错误
+            print(f"保存景点名称词典到 {attraction_dict_path} 时发生错误: {e}") # 打印错误信息
+    else: # 如果唯一景点名称集合为空
+        print("未能提取到任何唯一的景点名称，未生成景点词典文件。") # 打印未能提取到唯一景点名称的提示
+
+def main(stream=False, chunksize=DEFAULT_CHUNKSIZE, incremental=False): # 定义主函数，stream为True时使用分块流式处理，incremental为True时使用增量缓存
     script_dir = os.path.dirname(os.path.abspath(__file__)) # 获取当前脚本所在的绝对路径的目录部分
 
     input_csv_name = "完整数据爬取.csv" # 定义输入CSV文件的名称
@@ -102,19 +314,23 @@ def main(): # 定义主函数
 
     input_csv_path = os.path.join(script_dir, input_csv_name) # 构建输入CSV文件的完整路径
     output_triplets_csv_path = os.path.join(script_dir, output_triplets_csv_name) # 构建输出三元组CSV文件的完整路径
-    
-    # 由于输入和输出文件都与脚本在同一目录，
-    # script_dir 必定存在，通常不需要为其调用 os.makedirs。
-    # 如果输出文件需要存放到 script_dir 内的子目录（例如 "output"），
-    # 则可以像这样创建：
-    # output_dir = os.path.join(script_dir, "output")
-    # os.makedirs(output_dir, exist_ok=True)
-    # print(f"确保输出文件夹存在: {output_dir}")
+    cache_path = os.path.join(script_dir, "景点知识图谱_三元组.cache.pkl") # 增量缓存文件路径
 
     print(f"脚本运行目录: {script_dir}") # 打印脚本运行目录
     print(f"开始读取数据从: {input_csv_path}") # 打印开始读取数据的提示信息
+    if stream: # 流式模式：分块读取、逐块写出，内存占用与数据规模无关
+        print(f"使用流式模式，每块 {chunksize} 条记录。") # 打印流式模式提示
+        try:
+            total, unique_attraction_names = stream_triplets(input_csv_path, output_triplets_csv_path, chunksize) # 分块生成并写出三元组
+        except FileNotFoundError: # 如果文件未找到
+            print(f"错误: 文件未找到 {input_csv_path}") # 打印错误信息
+            return # 结束函数执行
+        print(f"已生成 {total} 条三元组，数据成功保存到 {output_triplets_csv_path}。") # 打印生成的三元组数量
+        save_attraction_names(unique_attraction_names, script_dir) # 保存景点名称到dict/attraction_name.txt
+        return # 结束函数执行
+
     try:
-        df = pd.read_csv(input_csv_path, encoding='utf-8-sig') # 尝试读取CSV文件，使用utf-8-sig编码以处理BOM头
+        df = pd.read_csv(input_csv_path, encoding='utf-8-sig', dtype=str if incremental else None) # 尝试读取CSV文件，使用utf-8-sig编码以处理BOM头；增量模式按字符串读取以便稳定计算行哈希
     except FileNotFoundError: # 如果文件未找到
         print(f"错误: 文件未找到 {input_csv_path}") # 打印错误信息
         return # 结束函数执行
@@ -122,91 +338,16 @@ def main(): # 定义主函数
         print(f"读取CSV文件时发生错误: {e}") # 打印错误信息
         return # 结束函数执行
 
-    print(f"数据读取完毕，共 {len(df)} 条记录。开始预处理...") # 打印数据读取完成的提示信息和记录数
-
-    # Apply cleaning and create numerical columns
-    df["评分_数值"] = df["评分"].apply(clean_rating) if "评分" in df.columns else np.nan # 如果存在"评分"列，则应用clean_rating函数创建"评分_数值"列，否则填充NaN
-    df["热度_数值"] = df["热度"].apply(clean_popularity) if "热度" in df.columns else np.nan # 如果存在"热度"列，则应用clean_popularity函数创建"热度_数值"列，否则填充NaN
-
-    # Ensure essential text columns exist, fill with empty string if not, then process
-    text_cols_to_ensure = ["景点名称", "地址", "开放时间", "官方电话", "介绍", "优待政策", "服务设施", "URL"] # 定义需要确保存在的文本列列表
-    for col in text_cols_to_ensure: # 遍历列表中的每一列
-        if col not in df.columns: # 如果该列不在DataFrame的列中
-            df[col] = "" # 创建该列并用空字符串填充
-            print(f"警告: 列 '{col}' 未在CSV中找到，已创建为空列。") # 打印警告信息
+    if incremental: # 增量模式：只处理新增或内容变化的记录
+        print(f"数据读取完毕，共 {len(df)} 条记录。使用增量缓存: {cache_path}") # 打印增量模式提示
+        triplets_df, unique_attraction_names, stats = incremental_triplets(df, cache_path) # 复用未变化记录的三元组
+        print(f"缓存命中 {stats['hits']}/{stats['rows']} 条记录，重新处理 {stats['processed']} 条。") # 打印缓存命中情况
+    else:
+        print(f"数据读取完毕，共 {len(df)} 条记录。开始预处理...") # 打印数据读取完成的提示信息和记录数
+        df = preprocess_frame(df) # 向量化清洗数据
 
-    # Standardize N/A and strip whitespace for all object columns (or columns we treat as text)
-    for col in df.columns: # 遍历DataFrame的所有列
-        if df[col].dtype == 'object' or col in text_cols_to_ensure : # 如果列的数据类型是object或者在text_cols_to_ensure列表中
-            df[col] = df[col].astype(str).str.strip() # 将列转换为字符串类型并去除两端空白
-            df[col] = df[col].replace({"N/A": np.nan, "nan": np.nan, "": np.nan, "None": np.nan}) # 将"N/A", "nan", 空字符串, "None"替换为NaN
-
-
-    triplets = [] # 初始化一个空列表，用于存储三元组
-    print("开始生成三元组...") # 打印开始生成三元组的提示信息
-    unique_attraction_names = set() # 初始化一个空集合，用于存储唯一的景点名称
-
-    for index, row in df.iterrows(): # 遍历DataFrame的每一行
-        subject_name = row.get("景点名称") # 获取当前行的"景点名称"
-
-        if pd.isna(subject_name) or str(subject_name).strip() == "": # 如果景点名称为NaN或空字符串
-            # print(f"第 {index+2} 行因景点名称缺失已跳过。") # +2 because of header and 0-indexing # 打印跳过信息（注释掉了）
-            continue # 跳过当前循环，处理下一行
-
-        subject_name = str(subject_name).strip() # 将景点名称转换为字符串并去除两端空白
-        unique_attraction_names.add(subject_name) # 将景点名称添加到唯一景点名称集合中
-
-        # 1. 地点相关 (地址)
-        address = row.get("地址") # 获取当前行的"地址"
-        if pd.notna(address) and str(address).strip() != "": # 如果地址不为NaN且不为空字符串
-            address_clean = str(address).strip() # 清洗地址字符串
-            triplets.append({"subject": subject_name, "predicate": "位于", "object": address_clean}) # 添加"景点名称 位于 地址"的三元组
-            # 1a. 地点相关 (城市)
-            city = extract_city(address_clean) # 从清洗后的地址中提取城市信息
-            if city and city.strip() != "": # 如果提取到的城市不为空
-                triplets.append({"subject": subject_name, "predicate": "属于城市", "object": city.strip()}) # 添加"景点名称 属于城市 城市"的三元组
-        
-        # 2. 评价相关 (评分)
-        rating_value = row.get("评分_数值") # 获取当前行的"评分_数值"
-        if pd.notna(rating_value): # 如果评分数值不为NaN
-            triplets.append({"subject": subject_name, "predicate": "的评分是", "object": rating_value}) # 添加"景点名称 的评分是 评分数值"的三元组
-
-        # 3. 评价相关 (热度)
-        popularity_value = row.get("热度_数值") # 获取当前行的"热度_数值"
-        if pd.notna(popularity_value): # 如果热度数值不为NaN
-            triplets.append({"subject": subject_name, "predicate": "的热度为", "object": popularity_value}) # 添加"景点名称 的热度为 热度数值"的三元组
-
-        # 4. 时间相关 (开放时间)
-        opening_hours = row.get("开放时间") # 获取当前行的"开放时间"
-        if pd.notna(opening_hours) and str(opening_hours).strip() != "": # 如果开放时间不为NaN且不为空字符串
-            triplets.append({"subject": subject_name, "predicate": "的开放时间为", "object": str(opening_hours).strip()}) # 添加"景点名称 的开放时间为 开放时间"的三元组
-
-        # 5. 联系方式相关 (官方电话)
-        phone = row.get("官方电话") # 获取当前行的"官方电话"
-        if pd.notna(phone) and str(phone).strip() != "": # 如果官方电话不为NaN且不为空字符串
-            triplets.append({"subject": subject_name, "predicate": "的官方电话是", "object": str(phone).strip()}) # 添加"景点名称 的官方电话是 官方电话"的三元组
-            
-        # 6. 介绍相关 (介绍)
-        introduction = row.get("介绍") # 获取当前行的"介绍"
-        if pd.notna(introduction) and str(introduction).strip() != "": # 如果介绍不为NaN且不为空字符串
-            triplets.append({"subject": subject_name, "predicate": "的介绍是", "object": str(introduction).strip()}) # 添加"景点名称 的介绍是 介绍"的三元组
-
-        # 7. 优待政策相关 (优待政策)
-        discount_policy = row.get("优待政策") # 获取当前行的"优待政策"
-        if pd.notna(discount_policy) and str(discount_policy).strip() != "": # 如果优待政策不为NaN且不为空字符串
-            triplets.append({"subject": subject_name, "predicate": "的优待政策是", "object": str(discount_policy).strip()}) # 添加"景点名称 的优待政策是 优待政策"的三元组
-
-        # 8. 服务设施相关 (服务设施)
-        facilities = row.get("服务设施") # 获取当前行的"服务设施"
-        if pd.notna(facilities) and str(facilities).strip() != "": # 如果服务设施不为NaN且不为空字符串
-            triplets.append({"subject": subject_name, "predicate": "的服务设施包括", "object": str(facilities).strip()}) # 添加"景点名称 的服务设施包括 服务设施"的三元组
-
-        # 9. 网络资源相关 (URL)
-        url_link = row.get("URL") # 获取当前行的"URL"
-        if pd.notna(url_link) and str(url_link).strip() != "": # 如果URL不为NaN且不为空字符串
-            triplets.append({"subject": subject_name, "predicate": "的URL是", "object": str(url_link).strip()}) # 添加"景点名称 的URL是 URL"的三元组
-
-    triplets_df = pd.DataFrame(triplets) # 将三元组列表转换为DataFrame
+        print("开始生成三元组...") # 打印开始生成三元组的提示信息
+        triplets_df, unique_attraction_names = generate_triplets(df) # 以列式方式生成三元组和唯一景点名称集合
     print(f"已生成 {len(triplets_df)} 条三元组。") # 打印生成的三元组数量
 
     if not triplets_df.empty: # 如果三元组DataFrame不为空
@@ -217,31 +358,19 @@ def main(): # 定义主函数
 
     print(f"预处理和三元组生成完成，保存数据到: {output_triplets_csv_path}") # 打印预处理和三元组生成完成的提示信息
     try:
-        triplets_df.to_csv(output_triplets_csv_path, index=False, encoding='utf-8-sig') # 尝试将三元组DataFrame保存到CSV文件，不包含索引，使用utf-8-sig编码
+        triplets_df.to_csv(output_triplets_csv_path, index=False, encoding='utf-8-sig', lineterminator='\n') # 尝试将三元组DataFrame保存到CSV文件，不包含索引，使用utf-8-sig编码，与流式模式一样使用\n换行
         print(f"数据成功保存到 {output_triplets_csv_path}。") # 打印数据成功保存的提示信息
     except Exception as e: # 如果保存CSV文件时发生错误
         print(f"保存CSV文件时发生错误: {e}") # 打印错误信息
 
-    # --- 新增：保存景点名称到dict/attraction_name.txt ---
-    if unique_attraction_names: # 如果唯一景点名称集合不为空
-        dict_dir = os.path.join(script_dir, 'dict') # 构建存放词典文件的目录路径
-        if not os.path.exists(dict_dir): # 如果目录不存在
-            os.makedirs(dict_dir) # 创建目录
-            print(f"创建文件夹: {dict_dir}") # 打印创建文件夹的提示信息
-
-        attraction_dict_path = os.path.join(dict_dir, 'attraction_name.txt') # 构建景点名称词典文件的完整路径
-        sorted_attraction_names = sorted(list(unique_attraction_names)) # 将唯一景点名称集合转换为列表并排序
-        
-        try:
-            with open(attraction_dict_path, 'w', encoding='utf-8') as f: # 尝试以写入模式打开词典文件，使用utf-8编码
-                for name in sorted_attraction_names: # 遍历排序后的景点名称列表
-                    f.write(name + '\n') # 将每个景点名称写入文件，并添加换行符
-            print(f"已将 {len(sorted_attraction_names)} 个唯一景点名称保存到 {attraction_dict_path}") # 打印保存成功的提示信息和数量
-        except Exception as e: # 如果保存词典文件时发生错误
-            print(f"保存景点名称词典到 {attraction_dict_path} 时发生错误: {e}") # 打印错误信息
-    else: # 如果唯一景点名称集合为空
-        print("未能提取到任何唯一的景点名称，未生成景点词典文件。") # 打印未能提取到唯一景点名称的提示
-    # --- 新增代码结束 ---
+    save_attraction_names(unique_attraction_names, script_dir) # 保存景点名称到dict/attraction_name.txt
 
 if __name__ == "__main__": # 如果当前脚本是主程序运行
-    main() # 调用main函数
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="预处理爬取数据并生成景点知识图谱三元组") # 创建命令行参数解析器
+    parser.add_argument("--stream", action="store_true", help="分块流式处理，适用于大规模爬取数据") # 是否使用流式模式
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="流式模式下每块读取的记录数") # 每块记录数
+    parser.add_argument("--incremental", action="store_true", help="使用行内容哈希缓存，只处理新增或变化的记录") # 是否使用增量缓存
+    args = parser.parse_args() # 解析命令行参数
+    if args.stream and args.incremental: # 两种模式不能同时使用
+        parser.error("--stream 与 --incremental 不能同时使用") # 打印错误并退出
+    main(stream=args.stream, chunksize=args.chunksize, incremental=args.incremental) # 调用main函数
@@ -5,9 +5,20 @@
 
 import os # 导入os模块，用于处理环境变量
 import logging # 导入logging模块，用于日志记录
-from py2neo import Graph
+import datetime # 导入datetime模块，用于确定"现在"等查询时刻
 from dotenv import load_dotenv
 
+from src.models.snapshot import get_snapshot # 导入知识图谱内存快照
+from src.models.opening_index import get_opening_index # 导入开放时间区间索引
+from src.models.price_index import MIN_COVERAGE as PRICE_MIN_COVERAGE, get_price_index # 导入门票价格索引和作为最终答案所需的票价覆盖率
+from src.models.ranking_index import METRICS, get_city_rankings # 导入城市景点排行索引
+from src.models.city_stats import MIN_COMPARE_COUNT, get_city_statistics # 导入城市统计
+from src.models.similar_index import get_similar_attractions # 导入相似景点索引
+from src.models.facility_index import get_facility_index # 导入服务设施位图索引
+from src.models.nearby_index import DEFAULT_TOP_K as NEARBY_TOP_K, get_nearby_index # 导入附近景点索引
+from src.models.city_listing import get_city_listing # 导入城市景点列表索引
+from src.utils.database import GraphUnavailable, get_graph_pool # 导入进程内共享的Neo4j连接池及其不可用时的异常
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -23,42 +34,108 @@ dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
 if os.path.exists(dotenv_path):
     load_dotenv(dotenv_path)
 
+# 景点比较的指标：中文名称、单位、取较大值和较小值时的用词
+COMPARE_WORDING = {
+    'rating': ('评分', '分', '高', '低'),
+    'popularity': ('热度', '', '高', '低'),
+    'adultPrice': ('门票价格', '元', '贵', '便宜'),
+}
+
+# Neo4j不可用时从内存快照回答的问题类型：问题类型 -> {查询结果中的列名: 快照中的属性名}，与 QuestionParser.sql_transfer 的查询一致
+SNAPSHOT_COLUMNS = {
+    '地址': {'地址': 'address'},
+    '开放时间': {'开放时间': 'openingTime'},
+    '电话': {'电话': 'phone'},
+    '评分': {'评分': 'rating'},
+    '热度': {'热度': 'popularity'},
+    '官网': {'官网': 'website'},
+    '门票价格': {'门票价格': 'discountPolicy'},
+    '简介': {'introduction': 'introduction'},
+    '景点比较': {'rating': 'rating', 'popularity': 'popularity', 'adultPrice': 'adultPrice'},
+}
+
 class AnswerSearcher: # 定义一个名为AnswerSearcher的类
-    def __init__(self): # 定义类的构造函数
-        # 从环境变量中获取Neo4j连接信息，如果不存在则使用默认值
-        neo4j_uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-        neo4j_user = os.getenv("NEO4J_USER", "neo4j")
-        neo4j_password = os.getenv("NEO4J_PASSWORD", "neo4j")
-        
-        try:
-            self.g = Graph( # 初始化Graph对象，连接到Neo4j数据库
-                uri=neo4j_uri, # Neo4j数据库的URI，从环境变量获取
-                auth=(neo4j_user, neo4j_password)) # Neo4j数据库的认证信息，从环境变量获取
-            logger.info("成功连接到Neo4j数据库")
-        except Exception as e:
-            logger.error(f"连接Neo4j数据库失败: {e}")
-            # 仍然创建Graph对象，但可能会在后续查询时失败
-            self.g = Graph(uri=neo4j_uri, auth=(neo4j_user, neo4j_password))
+    def __init__(self, snapshot=None): # 定义类的构造函数，snapshot为可选的知识图谱快照（默认使用全局快照）
+        # 使用进程内共享的Neo4j连接池（连接信息从环境变量获取），首次查询时才连接，连接失败时在查询处记录错误
+        self.g = get_graph_pool()
         self.num_limit = 20 # 定义一个数字限制，用于在列表答案中显示的最大项目数（例如多个症状）
+        self._snapshot = snapshot # 知识图谱快照，为None时使用全局快照
+        self.clock = datetime.datetime.now # 获取当前时刻的函数，便于测试时替换
+        # 由内存索引回答的问题类型及其处理方法，与 QuestionParser.LOCAL_QUESTION_TYPES 对应；
+        # 景点比较同时带有批量Cypher查询，快照中没有参与比较的景点时改为查询Neo4j
+        self.local_searchers = {
+            '是否开放': self.search_open_status,
+            '开放景点': self.search_open_attractions,
+            '价格区间': self.search_price_range,
+            '免费景点': self.search_free_attractions,
+            '景点排行': self.search_ranking,
+            '城市统计': self.search_city_statistics,
+            '相似景点': self.search_similar,
+            '设施筛选': self.search_facilities,
+            '景点比较': self.search_comparison,
+            '周边景点': self.search_nearby,
+            '城市景点': self.search_city_listing,
+        }
+
+    @property
+    def snapshot(self): # 知识图谱快照属性
+        """获取知识图谱快照，未指定时使用全局快照（三元组文件不存在时从Neo4j加载），全局快照重新加载后随之更新"""
+        if self._snapshot is None: # 如果未指定快照
+            return get_snapshot(self.g) # 每次取当前的全局快照，不在搜索器中保存旧快照
+        return self._snapshot # 返回指定的快照
 
     '''执行cypher查询，并返回相应结果''' # 方法的文档字符串，说明其功能
     def search_main(self, sqls): # 定义search_main方法，接收一个包含Cypher查询语句的列表作为参数
-        final_answers = [] # 初始化一个空列表，用于存储最终的答案
+        final_answers = [answer for answer, _ in self.search_results(sqls)] # 按问题类型的顺序取出答案（包括未找到信息的提示）
+        
+        if not final_answers and sqls: # If no specific answers were generated but there were queries # 如果没有生成具体的答案但是有查询语句
+            final_answers.append("抱歉，未能根据您的问题找到明确的答案。请尝试更具体的问题或检查景点名称是否正确。") # 添加通用的未找到明确答案的提示
+        elif not sqls: # If no SQLs were generated by the parser # 如果问题解析器没有生成任何SQL查询语句
+             final_answers.append("抱歉，我无法理解您的问题。") # 添加无法理解问题的提示
+
+
+        return final_answers # 返回最终的答案列表
+
+    '''执行查询，返回每个答案以及是否真正找到了信息''' # 方法的文档字符串，说明其功能
+    def search_results(self, sqls, local_only=False): # 定义search_results方法，返回 (答案, 是否找到) 列表，未找到信息的提示标记为False；local_only为True时不查询Neo4j
+        final_answers = [] # 初始化一个空列表，用于存储最终的答案及是否找到
         for sql_ in sqls: # 遍历传入的Cypher查询语句列表中的每一个元素
             question_type = sql_['question_type'] # 获取当前查询语句对应的问题类型
+            if question_type in self.local_searchers: # 如果该问题类型由内存索引回答
+                try: # 尝试使用内存索引回答
+                    final_answer = self.local_searchers[question_type](sql_.get('params', {})) # 调用对应的处理方法
+                except Exception as e: # 如果处理过程中发生异常
+                    logger.error(f"内存索引回答出错 '{question_type}': {e}") # 记录错误信息
+                    final_answer = "" # 视为没有答案
+                found = True # 处理方法只返回答案时视为找到
+                if isinstance(final_answer, tuple): # 处理方法同时返回了是否找到（例如票价信息不足时只作为候选）
+                    final_answer, found = final_answer
+                if final_answer: # 如果得到了答案
+                    final_answers.append((final_answer, found)) # 将答案添加到最终答案列表中
+                if final_answer or local_only or not sql_.get('sql'): # 内存索引没有答案时，有Cypher查询的问题类型（例如景点比较）改为查询Neo4j
+                    continue # 处理下一个问题类型
+            elif local_only: # 只使用内存索引时跳过需要查询Neo4j的问题类型
+                continue
             queries = sql_['sql'] # 获取当前问题类型对应的Cypher查询语句列表
             answers = [] # 初始化一个空列表，用于存储从Neo4j查询到的原始结果
             for query in queries: # 遍历当前问题类型下的每一个Cypher查询语句
                 try: # 尝试执行查询
                     ress = self.g.run(query).data() # 执行Cypher查询，并获取返回的数据
                     answers.extend(ress) # 将查询结果追加到answers列表中（使用extend是因为ress本身可能是一个包含多个字典的列表）
+                except GraphUnavailable as e: # Neo4j暂时不可用（熔断器打开、等待连接或查询超时）
+                    logger.warning(f"Neo4j不可用，'{question_type}' 改用内存快照回答: {e}") # 降级为从快照回答，不再逐条等待数据库
+                    answers = self.snapshot_rows(question_type, sql_.get('entities', [])) # 从快照取出与Cypher查询结果格式一致的数据
+                    break
                 except Exception as e: # 如果执行查询时发生异常
                     logger.error(f"执行Cypher查询出错 '{query}': {e}") # 使用logger记录错误信息，包括出错的查询语句和异常详情
             
             if answers: # 如果查询到了结果 (answers列表不为空)
-                final_answer = self.answer_prettify(question_type, answers) # 调用answer_prettify方法美化答案
+                if question_type == '景点比较': # 比较需要全部景点的结果
+                    final_answer = self.compare_answer(answers, sql_.get('params', {})) # 在本地比较各景点的指标
+                else:
+                    final_answer = self.answer_prettify(question_type, answers) # 调用answer_prettify方法美化答案
                 if final_answer: # 如果美化后的答案不为空
-                    final_answers.append(final_answer) # 将美化后的答案添加到最终答案列表中
+                    final_answers.append((final_answer, True)) # 将美化后的答案添加到最终答案列表中
             elif queries: # 如果存在查询语句但是没有查询到答案
                 try: # 尝试从第一条查询语句中提取实体名称
                     first_query = queries[0] # 获取第一条查询语句
@@ -66,17 +143,22 @@ class AnswerSearcher: # 定义一个名为AnswerSearcher的类
                     entity_name_start = first_query.find("a.name = '") + len("a.name = '") # 查找实体名称的起始位置
                     entity_name_end = first_query.find("'", entity_name_start) # 查找实体名称的结束位置
                     entity_name = first_query[entity_name_start:entity_name_end] if entity_name_start > len("a.name = '") -1 and entity_name_end > entity_name_start else "该景点" # 提取实体名称，如果提取失败则默认为"该景点"
-                    final_answers.append(f"抱歉，没有找到关于“{entity_name}”的“{question_type}”信息。") # 添加未找到信息的提示
+                    final_answers.append((f"抱歉，没有找到关于“{entity_name}”的“{question_type}”信息。", False)) # 添加未找到信息的提示
                 except Exception: # Fallback if entity name extraction fails # 如果实体名称提取失败
-                    final_answers.append(f"抱歉，没有找到关于该问题的相关信息 (类型: {question_type})。") # 添加通用的未找到信息提示
+                    final_answers.append((f"抱歉，没有找到关于该问题的相关信息 (类型: {question_type})。", False)) # 添加通用的未找到信息提示
         
-        if not final_answers and sqls: # If no specific answers were generated but there were queries # 如果没有生成具体的答案但是有查询语句
-            final_answers.append("抱歉，未能根据您的问题找到明确的答案。请尝试更具体的问题或检查景点名称是否正确。") # 添加通用的未找到明确答案的提示
-        elif not sqls: # If no SQLs were generated by the parser # 如果问题解析器没有生成任何SQL查询语句
-             final_answers.append("抱歉，我无法理解您的问题。") # 添加无法理解问题的提示
+        return final_answers # 返回答案及是否找到的列表
 
-
-        return final_answers # 返回最终的答案列表
+    def snapshot_rows(self, question_type, entities): # 定义从内存快照取出查询结果的方法
+        """
+        Neo4j不可用时的降级查询：从内存快照中取出与 QuestionParser 生成的Cypher查询结果格式一致的数据，
+        例如 [{'name': '武侯祠', '地址': '...'}]；快照中没有的景点不返回（与Cypher查询没有匹配时一致）
+        """
+        columns = SNAPSHOT_COLUMNS.get(question_type) # 该问题类型的列名和属性名
+        if not columns: # 不支持从快照回答的问题类型
+            return []
+        return [dict({'name': name}, **{column: self.snapshot.get(name, key) for column, key in columns.items()})
+                for name in entities if name in self.snapshot.attractions]
 
     '''根据对应的qustion_type，调用相应的回复模板''' # 方法的文档字符串，说明其功能
     def answer_prettify(self, question_type, answers): # 定义answer_prettify方法，接收问题类型和查询结果作为参数
@@ -154,8 +236,263 @@ class AnswerSearcher: # 定义一个名为AnswerSearcher的类
                 # This case might indicate a mismatch between classifier, parser, and searcher # 这种情况可能表明分类器、解析器和搜索器之间存在不匹配
                 final_answer_parts.append(f"抱歉，我暂时无法回答关于{subject_name}的“{question_type}”问题。请检查问题类型是否支持。") # 构建无法回答的提示
 
-        return "\\n".join(final_answer_parts) if final_answer_parts else "" # 将答案片段列表用换行符连接成一个字符串返回，如果列表为空则返回空字符串
+        return "\n".join(final_answer_parts) if final_answer_parts else "" # 将答案片段列表用换行符连接成一个字符串返回，如果列表为空则返回空字符串
+
+    def _query_time(self, params): # 定义根据参数计算查询时刻的方法
+        """
+        根据分类器提取的时间参数计算查询时刻。
+        返回 (查询时刻, 用于回答的时刻描述)，例如 (datetime, "现在（10:30）") 或 (datetime, "明天21:00")
+        """
+        now = self.clock() # 获取当前时刻
+        day_offset = params.get('day_offset', 0) or 0 # 相对今天的天数
+        minute = params.get('minute') # 当天零点起的分钟数，None表示当前时刻
+        when = now + datetime.timedelta(days=day_offset) # 先移动到目标日期
+        if minute is not None: # 如果问题中给出了具体时间
+            when = when.replace(hour=minute // 60, minute=minute % 60, second=0, microsecond=0) # 使用问题中的时间
+        day_label = {0: "", 1: "明天", 2: "后天"}.get(day_offset, when.strftime("%m月%d日")) # 日期描述
+        if minute is None and day_offset == 0: # 没有给出时间，表示现在
+            return when, f"现在（{when:%H:%M}）"
+        return when, f"{day_label}{when:%H:%M}"
+
+    def search_open_status(self, params): # 定义回答某景点在某一时刻是否开放的方法
+        """使用开放时间区间索引判断 params['entities'] 中的景点在查询时刻是否开放"""
+        index = get_opening_index(self.snapshot) # 获取开放时间索引
+        when, label = self._query_time(params) # 计算查询时刻
+        parts = [] # 初始化答案片段列表
+        for name in params.get('entities', []): # 遍历问题中的景点
+            state = index.is_open(name, when) # O(1)判断是否开放
+            if state is None: # 没有结构化的开放时间
+                raw = self.snapshot.get(name, 'openingTime') # 使用原始开放时间文本
+                if raw: # 如果原始文本存在
+                    parts.append(f"{name}暂无明确的开放时段，开放时间信息为：{raw}。")
+                else: # 如果没有任何开放时间信息
+                    parts.append(f"抱歉，未能查询到{name}的开放时间信息。")
+                continue
+            hours = index.hours_on(name, when.date()) # 当天的开放时段
+            hours_text = f"当天开放时间为{hours}" if hours else "当天不开放" # 开放时段描述，例如 "当天开放时间为08:00-17:30"、"当天开放时间为全天"
+            parts.append(f"{label}{name}{'正在开放' if state else '不在开放时间内'}，{hours_text}。")
+        return "\n".join(parts) # 用换行符连接答案片段
+
+    def search_open_attractions(self, params): # 定义回答某一时刻开放的景点的方法
+        """使用开放时间区间索引列出查询时刻开放的景点，按热度从高到低显示前 num_limit 个"""
+        index = get_opening_index(self.snapshot) # 获取开放时间索引
+        when, label = self._query_time(params) # 计算查询时刻
+        names = index.open_at(when) # O(log n + k)查询开放的景点
+        if not names: # 如果没有开放的景点
+            return f"{label}没有查询到正在开放的景点。"
+        shown = sorted(names, key=lambda name: -(self.snapshot.get(name, 'popularity') or 0))[:self.num_limit] # 按热度排序后取前num_limit个
+        more = "等" if len(names) > len(shown) else "" # 超出显示数量时加"等"
+        return f"{label}仍在开放的景点共有{len(names)}个，热门的有：{'、'.join(shown)}{more}。"
+
+    def search_price_range(self, params): # 定义回答某一价格区间内的景点的方法
+        """
+        使用门票价格索引列出成人票价在 [min_price, max_price] 内的景点，按票价从低到高显示前 num_limit 个。
+        返回 (答案, 是否找到)，票价信息覆盖率低于 PRICE_MIN_COVERAGE 时答案只作为候选。
+        """
+        index = get_price_index(self.snapshot) # 获取门票价格索引
+        min_price, max_price = params.get('min_price'), params.get('max_price') # 价格区间，None表示不限
+        if min_price is not None and max_price is not None: # 两端都有限制
+            label = f"{min_price:g}-{max_price:g}元之间"
+        elif max_price is not None: # 只有上限
+            label = f"{max_price:g}元以下"
+        else: # 只有下限
+            label = f"{(min_price or 0):g}元以上"
+        names = index.in_range(min_price, max_price) # O(log n + k)查询价格区间内的景点
+        city = params.get('city') # 城市简称，None表示全省
+        place = city or "" # 地点描述
+        if city: # 只保留该城市的景点
+            names = [name for name in names if self.snapshot.city_of.get(name) == city]
+        if not names: # 如果没有符合条件的景点
+            return f"抱歉，在有明确票价信息的{len(index)}个景点中，没有查询到{place}门票在{label}的景点。", False
+        shown = [f"{name}（{index.price_of[name]:g}元）" for name in names[:self.num_limit]] # 按票价从低到高取前num_limit个
+        more = "等" if len(names) > len(shown) else "" # 超出显示数量时加"等"
+        answer = f"在有明确票价信息的{len(index)}个景点中，{place}门票在{label}的有{len(names)}个：{'、'.join(shown)}{more}。"
+        return answer, index.coverage >= PRICE_MIN_COVERAGE # 大部分景点没有票价信息时不作为最终答案
+
+    def search_free_attractions(self, params): # 定义回答免费开放的景点的方法
+        """
+        使用门票价格索引列出免费开放的景点，按热度从高到低显示前 num_limit 个。
+        返回 (答案, 是否找到)，票价信息覆盖率低于 PRICE_MIN_COVERAGE 时答案只作为候选。
+        """
+        index = get_price_index(self.snapshot) # 获取门票价格索引
+        names = index.free() # 预先筛出的免费景点
+        city = params.get('city') # 城市简称，None表示全省
+        place = city or "" # 地点描述
+        if city: # 只保留该城市的景点
+            names = [name for name in names if self.snapshot.city_of.get(name) == city]
+        if not names: # 如果没有免费景点
+            return f"抱歉，在有明确票价信息的{index.known}个景点中，没有查询到{place}明确免费开放的景点。", False
+        shown = sorted(names, key=lambda name: -(self.snapshot.get(name, 'popularity') or 0))[:self.num_limit] # 按热度排序后取前num_limit个
+        more = "等" if len(names) > len(shown) else "" # 超出显示数量时加"等"
+        answer = f"在有明确票价信息的{index.known}个景点中，{place}免费开放的有{len(names)}个：{'、'.join(shown)}{more}。"
+        return answer, index.coverage >= PRICE_MIN_COVERAGE # 大部分景点没有票价信息时不作为最终答案
+
+    def search_ranking(self, params): # 定义回答城市景点排行的方法
+        """使用预先排好序的城市排行返回前K个景点，K未指定时使用 RANKING_TOP_K 配置"""
+        rankings = get_city_rankings(self.snapshot) # 获取城市排行索引
+        city, metric = params.get('city'), params.get('metric', 'popularity') # 城市（None表示全省）和排行指标
+        top = rankings.top(metric, city, params.get('k')) # 直接取前K个的切片
+        place = city or "四川" # 地点描述
+        metric_name = METRICS.get(metric, metric) # 指标的中文名称
+        if not top: # 如果没有可排行的景点
+            return f"抱歉，没有查询到{place}有{metric_name}信息的景点。"
+        unit = "分" if metric == 'rating' else "" # 评分带"分"单位
+        items = [f"{rank}. {name}（{metric_name}{value:g}{unit}）" for rank, (name, value) in enumerate(top, 1)] # 带名次和指标值的景点列表
+        return f"{place}{metric_name}最高的{len(top)}个景点：\n" + "\n".join(items)
+
+    def search_city_statistics(self, params): # 定义回答城市统计问题的方法
+        """使用按快照版本缓存的城市统计回答景点数量、平均评分/热度及城市之间的比较"""
+        statistics = get_city_statistics(self.snapshot) # 获取城市统计
+        metric = params.get('metric') # None表示景点数量，否则为 rating 或 popularity
+        metric_name = METRICS.get(metric, "") # 指标的中文名称
+        unit = "分" if metric == 'rating' else "" # 评分带"分"单位
+
+        if params.get('compare'): # 比较各城市
+            ranked = statistics.rank_cities(metric) # 按景点数量或均值从高到低排序
+            if not ranked: # 没有可比较的城市
+                return "抱歉，暂时没有可以比较的城市统计数据。"
+            if metric is None: # 按景点数量比较
+                items = [f"{rank}. {city}（{value:g}个）" for rank, (city, value) in enumerate(ranked, 1)]
+                return f"景点数量最多的城市是{ranked[0][0]}，各城市景点数量：\n" + "\n".join(items)
+            items = [f"{rank}. {city}（{value:.2f}{unit}）" for rank, (city, value) in enumerate(ranked, 1)]
+            return (f"景点平均{metric_name}最高的城市是{ranked[0][0]}（只统计至少有{MIN_COMPARE_COUNT}个有{metric_name}景点的城市）：\n"
+                    + "\n".join(items))
+
+        city = params.get('city') # 城市简称，None表示全省
+        stats = statistics.city(city) if city else statistics.total # 单个城市或全省的统计
+        place = city or "四川" # 地点描述
+        if not stats or not stats['count']: # 城市没有景点
+            return f"抱歉，知识库中暂时没有{place}的景点。"
+        if metric is None: # 景点数量
+            rating = stats['rating'] # 评分统计
+            answer = f"{place}共收录{stats['count']}个景点"
+            if rating['count']: # 有评分的景点
+                answer += f"，其中{rating['count']}个有评分，平均评分{rating['mean']:.2f}分"
+            return answer + "。"
+        field = stats[metric] # 指标统计
+        if not field['count']: # 没有该指标的景点
+            return f"抱歉，没有查询到{place}景点的{metric_name}信息。"
+        return (f"{place}有{metric_name}的景点共{field['count']}个，平均{metric_name}{field['mean']:.2f}{unit}，"
+                f"中位数{field['p50']:g}{unit}，90%分位数{field['p90']:g}{unit}。")
+
+    def search_similar(self, params): # 定义回答相似景点问题的方法
+        """查预先计算的相似景点表，返回与 params['entities'] 中的景点文本最相似的景点（最多 num_limit 个）"""
+        similar = get_similar_attractions(self.snapshot) # 获取相似景点索引
+        parts = [] # 初始化答案片段列表
+        for name in params.get('entities', []): # 遍历问题中的景点
+            neighbors = similar.similar(name, self.num_limit) # 一次查表得到相似景点
+            if not neighbors: # 景点没有介绍和服务设施文本，或没有相似的景点
+                parts.append(f"抱歉，暂时没有找到与{name}相似的景点。")
+                continue
+            items = [f"{rank}. {other}（相似度{score:.2f}）" for rank, (other, score) in enumerate(neighbors, 1)] # 带名次和相似度的景点列表
+            parts.append(f"与{name}相似的景点：\n" + "\n".join(items))
+        return "\n".join(parts) # 用换行符连接答案片段
+
+    def search_facilities(self, params): # 定义回答服务设施筛选问题的方法
+        """使用服务设施位图索引列出满足设施、城市和评分条件的景点，按热度从高到低显示前 num_limit 个"""
+        index = get_facility_index(self.snapshot) # 获取服务设施索引
+        facilities = params.get('facilities', []) # 设施标签
+        mode = params.get('mode', 'all') # 'all' 表示同时具备，'any' 表示具备其一
+        city, min_rating = params.get('city'), params.get('min_rating') # 城市和最低评分条件
+        if mode == 'any': # 具备其一
+            names = index.query(any_of=facilities, city=city, min_rating=min_rating)
+        else: # 同时具备
+            names = index.query(all_of=facilities, city=city, min_rating=min_rating)
+
+        conditions = [] # 条件描述
+        if min_rating is not None: # 有评分条件
+            conditions.append(f"评分{min_rating:g}分以上")
+        joiner = "或" if mode == 'any' else "和" # 设施之间的连接词
+        conditions.append(f"有{joiner.join(facilities)}") # 设施条件
+        description = f"{city or ''}{'、'.join(conditions)}的景点" # 例如 "成都评分4.5分以上、有停车场和母婴室的景点"
+        if not names: # 没有满足条件的景点
+            return f"抱歉，没有查询到{description}（目前有{len(index)}个景点收录了服务设施信息）。"
+        shown = sorted(names, key=lambda name: -(self.snapshot.get(name, 'popularity') or 0))[:self.num_limit] # 按热度排序后取前num_limit个
+        more = "等" if len(names) > len(shown) else "" # 超出显示数量时加"等"
+        return f"{description}共有{len(names)}个：{'、'.join(shown)}{more}。"
+
+    def search_nearby(self, params): # 定义回答附近景点问题的方法
+        """按区县索引返回同一区县、相邻区县（或同一城市其他区县）的景点，按热度排序"""
+        index = get_nearby_index(self.snapshot) # 获取附近景点索引
+        parts = [] # 初始化答案片段列表
+        for name in params.get('entities', []): # 遍历问题中的景点
+            groups = index.nearby(name, NEARBY_TOP_K) # 按热度排序的附近景点
+            if not groups: # 景点没有区县信息
+                parts.append(f"抱歉，暂时没有{name}所在区县的信息，无法查询附近的景点。")
+                continue
+            lines = [f"{name}附近的景点（按热度排序）："]
+            for group in groups: # 同一区县、相邻区县或同一城市其他区县
+                districts = "、".join(group.districts)
+                if group.scope == "same":
+                    label = f"同在{districts}"
+                elif group.scope == "adjacent":
+                    label = f"相邻的{districts}"
+                else:
+                    label = f"{index.district_city.get(index.district_of[name], '')}的{districts}"
+                lines.append(f"{label}：{'、'.join(group.names)}")
+            parts.append("\n".join(lines))
+        return "\n".join(parts) # 用换行符连接答案片段
+
+    def search_city_listing(self, params): # 定义回答城市景点列表问题的方法
+        """
+        使用预先按热度排序的城市景点列表返回游标 params['cursor'] 之后的一页，每页最多 num_limit 个。
+        下一页的游标写回 params['next_cursor']（已是最后一页时为None），由调用方保存，用户回复"更多"时传入。
+        """
+        listing = get_city_listing(self.snapshot) # 获取城市景点列表索引
+        city = params.get('city') # 城市简称，None表示全省
+        place = city or "四川" # 地点描述
+        cursor = params.get('cursor') # 上一页的游标
+        if params.get('more') and cursor is None: # 上一页已经是最后一页
+            params['next_cursor'] = None
+            return f"{place}的{listing.count(city)}个景点已经全部列出了。"
+        limit = min(params.get('limit') or self.num_limit, self.num_limit) # 每页的个数不超过 num_limit
+        page = listing.page(city, cursor, limit) # 从游标之后切出一页
+        params['next_cursor'] = page.next_cursor # 下一页的游标
+        if not page.names: # 城市没有景点
+            return f"抱歉，没有查询到{place}的景点。"
+        answer = f"{place}共收录{page.total}个景点，按热度排序第{page.start + 1}-{page.start + len(page.names)}个：{'、'.join(page.names)}。"
+        if page.next_cursor is None: # 最后一页
+            return answer + ("以上是全部景点。" if page.start else "")
+        return answer + "回复“更多”查看后面的景点。"
+
+    def search_comparison(self, params): # 定义回答景点比较问题的方法
+        """从快照中取出参与比较的景点的指标并比较，有景点不在快照中时返回空字符串（改为查询Neo4j）"""
+        names = params.get('entities', []) # 参与比较的景点
+        if not names or any(name not in self.snapshot.attractions for name in names): # 有景点不在快照中
+            return ""
+        metric = params.get('metric', 'rating') # 比较的指标
+        rows = [{'name': name, metric: self.snapshot.get(name, metric)} for name in names] # 与Cypher查询结果格式一致
+        return self.compare_answer(rows, params)
+
+    def compare_answer(self, rows, params): # 定义根据各景点的指标给出比较结论的方法
+        """
+        比较各景点的指标，rows 为 [{'name': 景点, 指标: 值}]（快照或Neo4j批量查询的结果）。
+        例如 "武侯祠的评分更高（武侯祠4.6分，杜甫草堂4.5分）。"
+        """
+        metric = params.get('metric', 'rating') # 比较的指标
+        lower = params.get('order') == 'min' # 是否取较小值
+        metric_name, unit, higher_word, lower_word = COMPARE_WORDING.get(metric, (metric, "", "高", "低")) # 指标的中文名称、单位和比较用词
+        values, missing = [], [] # 有指标值的景点、没有指标值的景点
+        for row in rows:
+            value = row.get(metric) # 指标值
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values.append((row.get('name'), float(value)))
+            else:
+                missing.append(row.get('name'))
+        missing += [name for name in params.get('entities', []) if name not in {row.get('name') for row in rows}] # Neo4j中没有的景点
+        if len(values) < 2: # 少于两个景点有指标值，无法比较
+            return f"抱歉，没有查询到{'、'.join(missing) or '这些景点'}的{metric_name}信息，无法比较。"
 
+        ranked = sorted(values, key=lambda item: item[1], reverse=not lower) # 按比较方向排序
+        details = "，".join(f"{name}{value:g}{unit}" for name, value in values) # 各景点的指标值
+        best = [name for name, value in ranked if value == ranked[0][1]] # 并列最优的景点
+        if len(best) == len(values): # 全部相同
+            answer = f"{'和'.join(best)}的{metric_name}相同（{details}）。"
+        else:
+            answer = f"{'和'.join(best)}的{metric_name}更{lower_word if lower else higher_word}（{details}）。"
+        if missing: # 部分景点没有指标值
+            answer += f"未查询到{'、'.join(missing)}的{metric_name}信息。"
+        return answer
 
 if __name__ == '__main__': # 如果当前脚本是作为主程序运行
     searcher = AnswerSearcher() # 创建AnswerSearcher类的实例
\ No newline at end of file
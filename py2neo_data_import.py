@@ -1,11 +1,12 @@
 import csv # 导入csv模块，用于处理CSV文件
+import json # 导入json模块，用于读写检查点文件
 import os # 导入os模块，用于与操作系统交互，例如文件路径操作
-from py2neo import Graph, Node, Relationship # 从py2neo库导入Graph、Node和Relationship类，用于操作Neo4j数据库
+import time # 导入time模块，用于计算吞吐量和预计剩余时间
+from py2neo import Node, Relationship # 从py2neo库导入Node和Relationship类，用于操作Neo4j数据库
 
-# Neo4j 连接信息 (请根据你的设置修改) # Neo4j数据库的连接配置信息
-NEO4J_URI = "bolt://localhost:7687" # Neo4j数据库的URI地址
-NEO4J_USER = "neo4j" # Neo4j数据库的用户名
-NEO4J_PASSWORD = "neo4j"  # 修改为你的Neo4j密码 # Neo4j数据库的密码，需要根据实际情况修改
+from src.utils.database import get_graph_pool # 导入进程内共享的Neo4j连接池
+
+# Neo4j 连接信息从 .env 中的 NEO4J_URI、NEO4J_USER、NEO4J_PASSWORD 读取 (请根据你的设置修改)，与问答系统共用同一个连接池
 
 # 确定CSV文件的绝对路径 # 获取CSV文件的绝对路径
 script_dir = os.path.dirname(os.path.abspath(__file__)) # 获取当前脚本文件所在的目录的绝对路径
@@ -20,145 +21,298 @@ def get_property_details(predicate): # 定义一个函数，根据谓语获取
         "的评分是": {"key": "rating", "type": float}, # "的评分是" 对应属性键 "rating"，类型为浮点数
         "的热度为": {"key": "popularity", "type": float}, # "的热度为" 对应属性键 "popularity"，类型为浮点数
         "的开放时间为": {"key": "openingTime", "type": str}, # "的开放时间为" 对应属性键 "openingTime"，类型为字符串
+        "的开放时段为": {"key": "openingIntervals", "type": str}, # "的开放时段为" 对应属性键 "openingIntervals"，类型为字符串（结构化的开放时段规则）
         "的官方电话是": {"key": "phone", "type": str}, # "的官方电话是" 对应属性键 "phone"，类型为字符串
         "的介绍是": {"key": "introduction", "type": str}, # "的介绍是" 对应属性键 "introduction"，类型为字符串
         "的优待政策是": {"key": "discountPolicy", "type": str}, # "的优待政策是" 对应属性键 "discountPolicy"，类型为字符串
+        "的成人票价是": {"key": "adultPrice", "type": float}, # "的成人票价是" 对应属性键 "adultPrice"，类型为浮点数（元）
+        "的儿童票价是": {"key": "childPrice", "type": float}, # "的儿童票价是" 对应属性键 "childPrice"，类型为浮点数（元）
+        "是否免费开放": {"key": "freeEntry", "type": bool}, # "是否免费开放" 对应属性键 "freeEntry"，类型为布尔值
         "的服务设施包括": {"key": "facilities", "type": str}, # "的服务设施包括" 对应属性键 "facilities"，类型为字符串
+        "的设施标签为": {"key": "facilityTags", "type": str}, # "的设施标签为" 对应属性键 "facilityTags"，类型为字符串（以;分隔的规范化设施标签）
         "的URL是": {"key": "website", "type": str} # "的URL是" 对应属性键 "website"，类型为字符串
     }
     return mapping.get(predicate) # 返回与给定谓语匹配的属性详细信息，如果未找到则返回None
 
-def import_triplets_to_neo4j(): # 定义一个函数，用于将三元组数据导入到Neo4j数据库
-    """
-    从三元组CSV文件导入数据到Neo4j数据库。
-    创建节点和关系。
-    """ # 函数的文档字符串，说明其功能和目的
+def convert_property_value(value_str, prop_type): # 定义一个函数，将客体字符串转换为属性的期望类型
+    """将客体字符串转换为属性类型（str/float/int/bool），无法转换时抛出ValueError""" # 函数的文档字符串，说明其功能
+    if prop_type == float: # 如果期望类型是浮点数
+        return float(value_str) # 将客体字符串转换为浮点数
+    if prop_type == int: # 如果期望类型是整数
+        return int(float(value_str)) # 先转换为浮点数再转换为整数，以处理可能的小数点
+    if prop_type == bool: # 如果期望类型是布尔值
+        lowered = value_str.lower() # 统一为小写
+        if lowered not in ("true", "false"): # 只接受 "true" 和 "false"
+            raise ValueError(f"无效的布尔值: {value_str}") # 其他取值视为转换失败
+        return lowered == "true" # 返回布尔值
+    return value_str # str # 字符串直接使用原始的客体字符串
+
+def get_relationship_details(predicate): # 定义一个函数，根据谓语获取关系的详细信息（关系类型和目标节点标签）
+    """将谓语映射到Neo4j关系类型和目标节点标签""" # 函数的文档字符串，说明其功能
+    mapping = { # 定义一个字典，存储谓语到关系类型和目标节点标签的映射关系
+        "属于城市": {"type": "属于城市", "label": "城市"}, # "属于城市" 对应关系类型 "属于城市"，目标节点标签为 "城市"
+        "属于区县": {"type": "属于区县", "label": "区县"}, # "属于区县" 对应关系类型 "属于区县"，目标节点标签为 "区县"
+    }
+    return mapping.get(predicate) # 返回与给定谓语匹配的关系详细信息，如果未找到则返回None
+
+def connect_graph(): # 定义一个函数，用于创建并测试Neo4j数据库连接
+    """创建Neo4j连接并执行一次测试查询，连接失败时返回None""" # 函数的文档字符串，说明其功能
     try: # 尝试执行以下代码块
-        graph = Graph(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD)) # 创建一个Graph对象，连接到Neo4j数据库，使用指定的URI和认证信息
+        pool = get_graph_pool() # 获取共享的连接池
+        graph = pool.graph # 连接池中的Graph对象，事务使用的连接同样来自该连接池
         graph.run("RETURN 1") # Test connection # 执行一个简单的Cypher查询来测试数据库连接
-        print(f"成功连接到 Neo4j 数据库: {NEO4J_URI}") # 如果连接成功，打印成功连接的提示信息
+        print(f"成功连接到 Neo4j 数据库: {pool.uri}") # 如果连接成功，打印成功连接的提示信息
+        return graph # 返回可用的Graph对象
     except Exception as e: # 如果在尝试连接数据库时发生任何异常
         print(f"无法连接到 Neo4j 数据库: {e}") # 打印无法连接数据库的错误信息，并显示异常详情
         print("请确保 Neo4j 服务正在运行，并且连接信息正确。") # 提示用户检查Neo4j服务状态和连接配置
-        return # 结束函数的执行
+        return None # 返回None表示连接失败
 
-    # 创建约束以提高性能和确保数据唯一性 # 在数据库中创建约束，以优化查询性能并保证节点名称的唯一性
+def ensure_constraints(graph): # 定义一个函数，用于创建唯一性约束
+    """创建约束以提高性能和确保数据唯一性""" # 函数的文档字符串，说明其功能
     try: # 尝试执行以下代码块
         graph.run("CREATE CONSTRAINT IF NOT EXISTS FOR (j:景点) REQUIRE j.name IS UNIQUE") # 创建或确保存在一个约束：对于所有标签为"景点"的节点j，其name属性必须是唯一的
         graph.run("CREATE CONSTRAINT IF NOT EXISTS FOR (c:城市) REQUIRE c.name IS UNIQUE") # 创建或确保存在一个约束：对于所有标签为"城市"的节点c，其name属性必须是唯一的
-        print("已确保景点和城市名称的唯一性约束存在或已创建。") # 打印约束已成功创建或已存在的提示信息
+        graph.run("CREATE CONSTRAINT IF NOT EXISTS FOR (d:区县) REQUIRE d.name IS UNIQUE") # 创建或确保存在一个约束：对于所有标签为"区县"的节点d，其name属性必须是唯一的
+        print("已确保景点、城市和区县名称的唯一性约束存在或已创建。") # 打印约束已成功创建或已存在的提示信息
     except Exception as e: # 如果在创建约束时发生任何异常
         print(f"创建约束时出错 (可能是权限问题或约束已存在且有冲突，可忽略): {e}") # 打印创建约束时发生的错误信息，并提示可能的原因
 
-    count_triplets_processed = 0 # 初始化已处理的三元组计数器为0
-    count_nodes_created = 0 # A rough counter, MERGE handles actual creation # 初始化已创建的节点计数器为0（这是一个粗略的计数，因为MERGE操作会处理实际的创建逻辑）
-    count_rels_created = 0 # 初始化已创建的关系计数器为0
+def apply_triplet(tx, subject_name, predicate, object_value_str): # 定义一个函数，在事务中写入单条三元组
+    """
+    在给定事务中写入一条三元组：确保主体节点存在，再设置属性或创建关系。
+    返回True表示该三元组被处理（包括未知谓语），False表示三元组不完整被跳过。
+    """ # 函数的文档字符串，说明其功能和返回值
+    if not subject_name or not predicate or object_value_str is None or str(object_value_str).strip() == "": # 检查主体、谓语或客体是否为空或仅包含空白字符
+        return False # 三元组不完整，跳过
+
+    subject_name = subject_name.strip() # 去除主体名称两端的空白字符
+    predicate = predicate.strip() # 去除谓语两端的空白字符
+    object_value_str = str(object_value_str).strip() # 将客体值转换为字符串并去除两端的空白字符
+
+    # 1. 处理主体节点 (景点) - 确保节点存在 # 第一步：处理主体节点（景点），确保该节点在数据库中存在
+    tx.run("MERGE (s:景点 {name: $name})", name=subject_name) # MERGE语句：存在则匹配，不存在则创建
+
+    # 2. 根据谓语处理属性或关系 # 第二步：根据谓语的类型，处理节点的属性或节点间的关系
+    prop_details = get_property_details(predicate) # 调用get_property_details函数获取当前谓语对应的属性详细信息
+    rel_details = get_relationship_details(predicate) # 调用get_relationship_details函数获取当前谓语对应的关系详细信息
+
+    if prop_details: # 此谓语定义主体的属性 # 如果prop_details不为None，表示这个谓语定义的是主体的属性
+        prop_key = prop_details["key"] # 获取属性的键名（例如 "address", "rating"）
+        prop_type = prop_details["type"] # 获取属性的期望数据类型（例如 str, float）
+        try: # 尝试执行以下代码块
+            value_to_set = convert_property_value(object_value_str, prop_type) # 将客体字符串转换为期望类型（例如浮点数、布尔值）
+            tx.run( # 在当前事务中执行Cypher查询
+                f"MATCH (s:景点 {{name: $name}}) SET s.{prop_key} = $value", # 设置该节点的指定属性（由prop_key动态指定，来自固定映射）为$value
+                name=subject_name, value=value_to_set # 将subject_name和转换后的value_to_set作为参数传递
+            )
+        except ValueError as ve: # 如果在类型转换过程中发生ValueError（例如，无法将字符串转换为浮点数）
+            print(f"警告: 无法转换属性 '{prop_key}' 的值 '{object_value_str}' (景点: {subject_name}) 为 {prop_type}. 错误: {ve}. 将尝试作为字符串存储。") # 打印警告信息
+            tx.run( # 在当前事务中执行Cypher查询
+                f"MATCH (s:景点 {{name: $name}}) SET s.{prop_key} = $value_str", # 设置属性为原始的字符串值
+                name=subject_name, value_str=object_value_str # 将subject_name和原始的object_value_str作为参数传递
+            )
+
+    elif rel_details: # 如果谓语定义的是一个关系（例如"属于城市"）
+        tx.run( # 在当前事务中执行Cypher查询
+            f"""
+            MATCH (s:景点 {{name: $s_name}}) // 匹配名为$s_name的景点节点s
+            MERGE (c:{rel_details['label']} {{name: $c_name}}) // MERGE目标节点c，如果不存在则创建
+            MERGE (s)-[r:{rel_details['type']}]->(c) // MERGE从景点s到目标节点c的关系r，如果不存在则创建
+            """, # 多行Cypher查询字符串（标签和关系类型来自固定映射，可安全拼接）
+            s_name=subject_name, c_name=object_value_str # 将subject_name和目标节点名称作为参数传递
+        )
+    # 其他未知谓语不做任何操作 # 未知或不直接处理的谓语被忽略
+    return True # 返回True表示该三元组已处理
+
+class OffsetLineReader: # 定义一个按行读取二进制文件并记录字节偏移量的迭代器类
+    """
+    以二进制方式逐行读取文件，解码后交给csv.reader，并记录已消费的字节偏移量。
+    csv.reader每次只拉取组成一条记录所需的行，因此每读完一条记录后，offset即为下一条记录的起始位置，
+    可以作为断点续传的检查点（文本模式下迭代时无法使用tell()）。
+    """ # 类的文档字符串，说明其功能
+    def __init__(self, binary_file, offset=0): # 类的初始化方法
+        self.f = binary_file # 保存二进制文件对象
+        self.f.seek(offset) # 定位到起始偏移量
+        self.offset = offset # 记录当前已消费的字节偏移量
+
+    def __iter__(self): # 迭代器协议
+        return self # 返回自身
+
+    def __next__(self): # 读取下一行
+        line = self.f.readline() # 读取一行原始字节
+        if not line: # 如果读到文件末尾
+            raise StopIteration # 结束迭代
+        if self.offset == 0 and line.startswith(b'\xef\xbb\xbf'): # 如果是文件开头且带有UTF-8 BOM
+            text = line[3:].decode('utf-8') # 去除BOM后解码
+        else: # 其他情况
+            text = line.decode('utf-8') # 直接按UTF-8解码
+        self.offset += len(line) # 更新已消费的字节偏移量
+        return text # 返回解码后的文本行
+
+def load_checkpoint(checkpoint_path, file_path): # 定义一个函数，读取并校验检查点
+    """读取检查点，只有当其记录的文件路径、大小和修改时间与当前文件一致时才有效""" # 函数的文档字符串，说明其功能
+    if not os.path.exists(checkpoint_path): # 如果检查点文件不存在
+        return None # 返回None，表示从头开始
+    try: # 尝试读取检查点
+        with open(checkpoint_path, 'r', encoding='utf-8') as f: # 打开检查点文件
+            checkpoint = json.load(f) # 解析JSON内容
+    except (OSError, ValueError) as e: # 如果读取或解析失败
+        print(f"警告: 检查点文件 {checkpoint_path} 无法读取，将从头开始导入: {e}") # 打印警告信息
+        return None # 返回None
+    stat = os.stat(file_path) # 获取当前数据文件的状态
+    if (checkpoint.get('file') != os.path.abspath(file_path) or checkpoint.get('size') != stat.st_size
+            or checkpoint.get('mtime') != stat.st_mtime): # 如果检查点对应的不是同一个（未修改的）文件
+        print("警告: 数据文件自上次导入后已变化，忽略旧检查点并从头开始导入。") # 打印警告信息
+        return None # 返回None
+    return checkpoint # 返回有效的检查点
+
+def save_checkpoint(checkpoint_path, checkpoint): # 定义一个函数，持久化保存检查点
+    """先写临时文件并fsync，再原子替换，保证崩溃时检查点文件不会损坏""" # 函数的文档字符串，说明其功能
+    tmp_path = checkpoint_path + '.tmp' # 临时文件路径
+    with open(tmp_path, 'w', encoding='utf-8') as f: # 以写入模式打开临时文件
+        json.dump(checkpoint, f, ensure_ascii=False) # 写入检查点内容
+        f.flush() # 刷新Python缓冲区
+        os.fsync(f.fileno()) # 强制写入磁盘
+    os.replace(tmp_path, checkpoint_path) # 原子替换旧的检查点文件
+
+def format_eta(seconds): # 定义一个函数，格式化剩余时间
+    """将秒数格式化为 时:分:秒""" # 函数的文档字符串，说明其功能
+    seconds = int(max(seconds, 0)) # 取非负整数秒
+    return f"{seconds // 3600:d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}" # 返回格式化后的字符串
 
+def main(file_path=None, clear=False, batch_size=500, checkpoint_path=None): # 定义流式导入的主入口函数
+    """
+    流式、可断点续传地将三元组CSV导入Neo4j。
+    每提交一批事务后，将（字节偏移量, 批次号）持久化到检查点文件；
+    程序崩溃后重新运行会从检查点继续，而不是从第0行重新开始。
+    导入过程中实时打印吞吐量和预计剩余时间。
+
+    参数:
+        file_path: 三元组CSV文件路径，默认为脚本目录下的 景点知识图谱_三元组.csv
+        clear: 导入前是否清空数据库（同时丢弃旧检查点）
+        batch_size: 每个事务提交的三元组数量
+        checkpoint_path: 检查点文件路径，默认为 <file_path>.checkpoint.json
+    返回:
+        统计信息字典；连接失败时返回None
+    """ # 函数的文档字符串，说明其功能、参数和返回值
+    file_path = file_path or input_csv_path # 未指定文件时使用默认的三元组文件
+    checkpoint_path = checkpoint_path or file_path + '.checkpoint.json' # 未指定检查点路径时使用默认路径
+
+    if not os.path.exists(file_path): # 如果数据文件不存在
+        print(f"错误: CSV文件未找到 '{file_path}'") # 打印文件未找到的错误信息
+        return None # 结束函数的执行
+
+    graph = connect_graph() # 连接数据库
+    if graph is None: # 如果连接失败
+        return None # 结束函数的执行
+
+    if clear: # 如果需要在导入前清空数据库
+        graph.run("MATCH (n) DETACH DELETE n") # 删除所有节点及其关系
+        get_graph_pool().bump_data_version() # 数据已修改，使缓存的查询结果失效
+        if os.path.exists(checkpoint_path): # 如果存在旧检查点
+            os.remove(checkpoint_path) # 清空数据库后旧检查点不再有效
+        print("已清空数据库。") # 打印提示信息
+
+    ensure_constraints(graph) # 创建唯一性约束
+
+    checkpoint = load_checkpoint(checkpoint_path, file_path) # 读取检查点
+    stat = os.stat(file_path) # 获取数据文件状态，用于检查点校验和ETA计算
+    total_bytes = stat.st_size # 文件总字节数
+
+    with open(file_path, 'rb') as binary_file: # 以二进制模式打开文件，以便精确记录字节偏移量
+        header_lines = OffsetLineReader(binary_file) # 从文件开头逐行读取
+        fieldnames = next(csv.reader(header_lines), None) # 读取表头行
+        if not fieldnames or not all(f in fieldnames for f in ['subject', 'predicate', 'object']): # 检查表头是否包含必需的列
+            print(f"错误: CSV文件 {file_path} 缺少必要的列: 'subject', 'predicate', 'object'") # 如果缺少必要的列，打印错误信息
+            return None # 结束函数的执行
+        data_start = header_lines.offset # 表头之后的第一条记录的字节偏移量
+
+        start_offset = checkpoint['offset'] if checkpoint else data_start # 有检查点则从检查点继续，否则从第一条记录开始
+        batch_no = checkpoint['batch'] if checkpoint else 0 # 已提交的批次号
+        rows_done = checkpoint['rows'] if checkpoint else 0 # 已处理的三元组行数
+        if checkpoint: # 如果从检查点继续
+            print(f"从检查点继续导入: 第 {batch_no} 批之后，已处理 {rows_done} 行，字节偏移量 {start_offset}") # 打印继续导入的提示信息
+
+        line_reader = OffsetLineReader(binary_file, start_offset) # 从起始偏移量开始逐行读取
+        reader = csv.reader(line_reader) # 创建csv.reader对象
+        col = {name: fieldnames.index(name) for name in ['subject', 'predicate', 'object']} # 记录各列的位置
+
+        started_at = time.time() # 本次运行的开始时间，用于计算吞吐量
+        start_bytes = start_offset # 本次运行的起始字节，用于计算吞吐量
+        rows_this_run = 0 # 本次运行处理的行数
+        tx = None # 当前事务
+
+        print(f"开始从 {file_path} 读取三元组并导入 Neo4j...") # 打印开始读取和导入数据的提示信息
+        try: # 尝试执行以下代码块
+            while True: # 按批次循环
+                tx = graph.begin() # 开始一个新的事务
+                rows_in_batch = 0 # 当前批次的行数
+                for row in reader: # 逐条读取三元组
+                    if len(row) < len(fieldnames): # 如果该行列数不足
+                        row = row + [''] * (len(fieldnames) - len(row)) # 用空字符串补齐
+                    apply_triplet(tx, row[col['subject']], row[col['predicate']], row[col['object']]) # 在事务中写入三元组
+                    rows_in_batch += 1 # 当前批次行数加1
+                    if rows_in_batch >= batch_size: # 如果达到批次大小
+                        break # 结束本批次
+                if rows_in_batch == 0: # 如果没有读到任何数据，说明已到文件末尾
+                    tx.rollback() # 回滚空事务
+                    tx = None # 清空事务引用
+                    break # 结束循环
+
+                graph.commit(tx) # 提交当前批次
+                tx = None # 清空事务引用
+                get_graph_pool().bump_data_version() # 数据已修改，使缓存的查询结果失效
+                batch_no += 1 # 批次号加1
+                rows_done += rows_in_batch # 累计已处理行数
+                rows_this_run += rows_in_batch # 累计本次运行处理行数
+                save_checkpoint(checkpoint_path, { # 持久化保存检查点
+                    'file': os.path.abspath(file_path), 'size': stat.st_size, 'mtime': stat.st_mtime, # 数据文件标识
+                    'offset': line_reader.offset, 'batch': batch_no, 'rows': rows_done # 下一条记录的字节偏移量、批次号和行数
+                })
+
+                elapsed = max(time.time() - started_at, 1e-6) # 本次运行已用时间
+                rows_per_sec = rows_this_run / elapsed # 行吞吐量
+                bytes_per_sec = (line_reader.offset - start_bytes) / elapsed # 字节吞吐量
+                eta = (total_bytes - line_reader.offset) / bytes_per_sec if bytes_per_sec > 0 else 0 # 根据剩余字节估算剩余时间
+                print(f"已提交第 {batch_no} 批，共 {rows_done} 行 ({line_reader.offset / total_bytes:.1%})，" # 打印进度
+                      f"吞吐量 {rows_per_sec:.0f} 行/秒，预计剩余 {format_eta(eta)}") # 打印吞吐量和ETA
+        except Exception as e: # 如果导入过程中发生异常
+            if tx is not None: # 如果存在未提交的事务
+                tx.rollback() # 回滚事务，撤销未提交的更改
+                print("事务已回滚。") # 打印事务已回滚的提示信息
+            print(f"导入过程中发生错误: {e}") # 打印错误信息
+            print(f"已提交的 {batch_no} 批已记录在检查点 {checkpoint_path}，重新运行将从断点继续。") # 提示可以断点续传
+            raise # 重新抛出异常，让调用者处理
+
+    if os.path.exists(checkpoint_path): # 导入全部完成后
+        os.remove(checkpoint_path) # 删除检查点，下次运行从头开始
+    print(f"\n成功处理 {rows_done} 条三元组，共 {batch_no} 批。") # 打印成功处理的总三元组数量
+    print("请在 Neo4j Browser 中检查导入的数据。例如，运行 'MATCH (n:景点) RETURN n LIMIT 25'") # 提示用户如何在Neo4j Browser中检查数据
+    print("或 'MATCH (c:城市) RETURN c LIMIT 25'") # 提示检查城市节点的示例查询
+    print("或 'MATCH p=()-[r:属于城市]->() RETURN p LIMIT 10'") # 提示检查关系的示例查询
+    print("问答服务正在运行时，请求管理接口 POST /admin/reload 重新加载知识图谱快照。") # 提示问答服务重新加载快照
+    return {'rows': rows_done, 'batches': batch_no} # 返回统计信息
+
+def import_triplets_to_neo4j(): # 定义一个函数，用于将三元组数据导入到Neo4j数据库
+    """
+    从三元组CSV文件导入数据到Neo4j数据库。
+    创建节点和关系。保留此函数以兼容旧的调用方式，内部调用可断点续传的 main()。
+    """ # 函数的文档字符串，说明其功能和目的
     try: # 尝试执行以下代码块
-        with open(input_csv_path, 'r', encoding='utf-8-sig') as csvfile: # 以只读模式打开指定的CSV文件，使用'utf-8-sig'编码以正确处理可能存在的BOM头
-            reader = csv.DictReader(csvfile) # 创建一个csv.DictReader对象，它将CSV文件的每一行读取为一个字典
-            if not reader.fieldnames or not all(f in reader.fieldnames for f in ['subject', 'predicate', 'object']): # 检查CSV文件的表头是否存在，并且是否包含必需的列名（'subject', 'predicate', 'object'）
-                print(f"错误: CSV文件 {input_csv_path} 缺少必要的列: 'subject', 'predicate', 'object'") # 如果缺少必要的列，打印错误信息
-                return # 结束函数的执行
-
-            print(f"开始从 {input_csv_path} 读取三元组并导入 Neo4j...") # 打印开始读取和导入数据的提示信息
-            
-            tx = graph.begin() # Start a transaction for batching # 开始一个新的数据库事务，用于批量处理操作以提高效率
-
-            for i, row in enumerate(reader): # 遍历CSV文件中的每一行数据（每一行都是一个字典）
-                subject_name = row.get('subject') # 从当前行字典中获取'subject'（主体）的值
-                predicate = row.get('predicate') # 从当前行字典中获取'predicate'（谓语）的值
-                object_value_str = row.get('object') # 从当前行字典中获取'object'（客体）的值
-
-                if not subject_name or not predicate or object_value_str is None or str(object_value_str).strip() == "": # 检查主体、谓语或客体是否为空或仅包含空白字符
-                    # print(f"跳过不完整或空的客体三元组: 主体='{subject_name}', 谓语='{predicate}', 客体='{object_value_str}'") # （注释掉的代码）如果三元组不完整，打印跳过信息
-                    continue # 跳过当前循环，处理下一个三元组
-
-                subject_name = subject_name.strip() # 去除主体名称两端的空白字符
-                predicate = predicate.strip() # 去除谓语两端的空白字符
-                object_value_str = str(object_value_str).strip() # 将客体值转换为字符串并去除两端的空白字符
-
-                # 1. 处理主体节点 (景点) - 确保节点存在 # 第一步：处理主体节点（景点），确保该节点在数据库中存在
-                tx.run( # 在当前事务中执行Cypher查询
-                    "MERGE (s:景点 {name: $name})", # MERGE语句：如果数据库中已存在标签为"景点"且name属性为指定值的节点s，则匹配该节点；否则，创建一个新的这样的节点
-                    name=subject_name # 将subject_name作为参数传递给Cypher查询中的$name
-                )
-                # count_nodes_created += 1 # MERGE handles this, so this count is indicative # （注释掉的代码）节点创建计数器的更新（MERGE操作会处理实际创建，所以这是一个指示性计数）
-
-                # 2. 根据谓语处理属性或关系 # 第二步：根据谓语的类型，处理节点的属性或节点间的关系
-                prop_details = get_property_details(predicate) # 调用get_property_details函数获取当前谓语对应的属性详细信息
-
-                if prop_details:  # 此谓语定义主体的属性 # 如果prop_details不为None，表示这个谓语定义的是主体的属性
-                    prop_key = prop_details["key"] # 获取属性的键名（例如 "address", "rating"）
-                    prop_type = prop_details["type"] # 获取属性的期望数据类型（例如 str, float）
-                    
-                    try: # 尝试执行以下代码块
-                        value_to_set = None # 初始化要设置的属性值为None
-                        if prop_type == float: # 如果期望类型是浮点数
-                            value_to_set = float(object_value_str) # 将客体字符串转换为浮点数
-                        elif prop_type == int: # Example if you had int types # 如果期望类型是整数（示例，当前映射中没有整数类型）
-                             value_to_set = int(float(object_value_str)) # 先转换为浮点数再转换为整数，以处理可能的小数点
-                        else: # str # 如果期望类型是字符串（或其他未明确处理的类型）
-                            value_to_set = object_value_str # 直接使用原始的客体字符串
-                        
-                        if value_to_set is not None: # 如果成功转换或获取了值
-                             tx.run( # 在当前事务中执行Cypher查询
-                                f"MATCH (s:景点 {{name: $name}}) SET s.{{prop_key}} = $value", # MATCH语句：匹配标签为"景点"且name属性为指定值的节点s，然后SET语句：设置该节点的指定属性（由prop_key动态指定）为$value
-                                name=subject_name, value=value_to_set # 将subject_name和转换后的value_to_set作为参数传递
-                            )
-                    except ValueError as ve: # 如果在类型转换过程中发生ValueError（例如，无法将字符串转换为浮点数）
-                        print(f"警告: 无法转换属性 '{prop_key}' 的值 '{object_value_str}' (景点: {subject_name}) 为 {prop_type}. 错误: {ve}. 将尝试作为字符串存储。") # 打印警告信息，说明转换失败的原因，并提示将尝试以字符串形式存储
-                        tx.run( # 在当前事务中执行Cypher查询
-                           f"MATCH (s:景点 {{name: $name}}) SET s.{prop_key} = $value_str", # 设置属性为原始的字符串值
-                           name=subject_name, value_str=object_value_str # 将subject_name和原始的object_value_str作为参数传递
-                       )
-                    except Exception as ex: # 如果在设置属性时发生其他任何未预料的异常
-                        print(f"错误: 设置属性 '{prop_key}' 时发生意外错误 (景点: {subject_name}, 值: {object_value_str}). 错误: {ex}") # 打印错误信息，包括属性键、景点名称、值和异常详情
-
-                elif predicate == "属于城市": # 如果谓语是"属于城市"，表示这是一个关系
-                    city_name = object_value_str # 客体值即为城市名称
-                    if city_name: # 如果城市名称不为空
-                        tx.run( # 在当前事务中执行Cypher查询
-                            """
-                            MATCH (s:景点 {name: $s_name}) # 匹配名为$s_name的景点节点s
-                            MERGE (c:城市 {name: $c_name}) # MERGE城市节点c，如果不存在则创建
-                            MERGE (s)-[r:属于城市]->(c) # MERGE从景点s到城市c的"属于城市"关系r，如果不存在则创建
-                            """, # 多行Cypher查询字符串
-                            s_name=subject_name, c_name=city_name # 将subject_name和city_name作为参数传递
-                        )
-                        # count_nodes_created +=1 # For city # （注释掉的代码）城市节点创建计数器更新
-                        # count_rels_created +=1 # （注释掉的代码）关系创建计数器更新
-                else: # 如果谓语既不是已定义的属性也不是"属于城市"关系
-                    # print(f"提示: 未知或不直接处理的谓语: '{predicate}' (主体: '{subject_name}', 客体: '{object_value_str}')。") # （注释掉的代码）打印未知谓语的提示信息
-                    pass # 不做任何操作
-
-                count_triplets_processed += 1 # 已处理的三元组计数器加1
-                if (i + 1) % 500 == 0: # Commit every 500 triplets # 每处理500条三元组
-                    print(f"已处理 {count_triplets_processed} 条三元组，正在提交事务...") # 打印提交事务的提示信息
-                    graph.commit(tx) # 提交当前事务中的所有操作到数据库
-                    tx = graph.begin() # Start a new transaction # 开始一个新的事务，用于下一批操作
-            
-            graph.commit(tx) # Commit any remaining operations # 提交循环结束后剩余在事务中的操作
-            print(f"\n成功处理 {count_triplets_processed} 条三元组。") # 打印成功处理的总三元组数量
-            print("请在 Neo4j Browser 中检查导入的数据。例如，运行 'MATCH (n:景点) RETURN n LIMIT 25'") # 提示用户如何在Neo4j Browser中检查数据
-            print("或 'MATCH (c:城市) RETURN c LIMIT 25'") # 提示检查城市节点的示例查询
-            print("或 'MATCH p=()-[r:属于城市]->() RETURN p LIMIT 10'") # 提示检查关系的示例查询
-
-
-    except FileNotFoundError: # 如果在打开CSV文件时发生FileNotFoundError
-        print(f"错误: CSV文件未找到 '{input_csv_path}'") # 打印文件未找到的错误信息
-    except csv.Error as csve: # 如果在读取CSV文件时发生csv.Error（例如格式错误）
-        print(f"CSV文件读取错误 '{input_csv_path}': {csve}") # 打印CSV读取错误的错误信息
-    except Exception as e: # 如果在导入过程中发生其他任何未被捕获的严重异常
-        print(f"导入过程中发生严重错误: {e}") # 打印严重错误的错误信息
+        main(input_csv_path) # 使用默认文件执行流式导入
+    except Exception: # 如果导入失败
         import traceback # 导入traceback模块，用于获取详细的异常堆栈信息
         traceback.print_exc() # 打印完整的异常堆栈信息
-        if 'tx' in locals() and tx.active: # 检查事务对象tx是否存在且仍处于活动状态
-            tx.rollback() # 如果事务活动，则回滚事务，撤销未提交的更改
-            print("事务已回滚。") # 打印事务已回滚的提示信息
 
 
 if __name__ == "__main__": # 如果当前脚本是作为主程序直接运行（而不是被其他模块导入）
+    import argparse # 导入argparse模块，用于解析命令行参数
+    arg_parser = argparse.ArgumentParser(description="将三元组数据导入 Neo4j（支持断点续传）") # 创建命令行参数解析器
+    arg_parser.add_argument("--file", type=str, help="三元组数据文件路径") # 数据文件路径参数
+    arg_parser.add_argument("--clear", action="store_true", help="导入前清空数据库") # 清空数据库参数
+    arg_parser.add_argument("--batch-size", type=int, default=500, help="每个事务提交的三元组数量") # 批次大小参数
+    cli_args = arg_parser.parse_args() # 解析命令行参数
     print("开始将三元组数据导入 Neo4j...") # 打印开始导入数据的提示信息
-    import_triplets_to_neo4j() # 调用import_triplets_to_neo4j函数执行导入操作
-    print("导入脚本执行完成。") # 打印导入脚本执行完成的提示信息
\ No newline at end of file
+    main(cli_args.file, cli_args.clear, cli_args.batch_size) # 调用main函数执行导入操作
+    print("导入脚本执行完成。") # 打印导入脚本执行完成的提示信息
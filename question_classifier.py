@@ -7,6 +7,74 @@
 import os # 导入os模块，用于处理文件和目录路径
 import ahocorasick # 导入ahocorasick模块，用于高效的字符串多模式匹配
 import csv # 导入csv模块，用于处理CSV文件（当前代码中并未使用，但可能为未来扩展或原始版本残留）
+import re # 导入re模块，用于从问题中提取时间等参数
+from src.data.gazetteer import PROVINCE_NAMES, get_gazetteer # 导入四川行政区划地名库，用于识别问题中的城市
+from src.data.facilities import match_facilities # 导入设施标签匹配函数，用于识别问题中的服务设施
+
+# 中文数字到整数的映射，用于解析"晚上九点"之类的时间
+CN_DIGITS = {'零': 0, '一': 1, '二': 2, '两': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9}
+
+# 时间表达式："21:30"、"晚上9点半"、"下午三点十五分"
+TIME_COLON_PATTERN = re.compile(r'(凌晨|早上|早晨|上午|中午|下午|傍晚|晚上|夜里|夜间)?\s*(\d{1,2})[:：](\d{2})')
+TIME_POINT_PATTERN = re.compile(r'(凌晨|早上|早晨|上午|中午|下午|傍晚|晚上|夜里|夜间)?\s*(\d{1,2}|[零一二两三四五六七八九十]{1,3})\s*点(?:\s*(半|一刻|三刻|(\d{1,2}|[零一二两三四五六七八九十]{1,3})\s*分?))?')
+
+# 需要转换为24小时制的时段词
+PM_PERIODS = ('下午', '傍晚', '晚上', '夜里', '夜间')
+
+# 排行数量表达式："前5"、"top 10"、"十大景点"、"5个好玩的景点"；
+# 不带"前/top"的数量后面必须是景点或景区，避免"我们3个人去哪里玩"被当作排行数量
+RANK_K_PATTERNS = [
+    re.compile(r'(?:前|top|TOP|Top)\s*(\d{1,3}|[一二两三四五六七八九十]{1,3})'),
+    re.compile(r'(\d{1,3}|[一二两三四五六七八九十]{1,3})\s*(?:个|家|处|大)(?!人)[^，。？！,.?!\d人]{0,3}?(?:景点|景区)'),
+]
+
+# 价格区间表达式："50到100元"、"100元以下"、"不超过100块"、"200元以上"
+PRICE_BETWEEN_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(?:元|块)?\s*(?:到|至|-|~|—)\s*(\d+(?:\.\d+)?)\s*(?:元|块)')
+PRICE_MAX_PATTERNS = [
+    re.compile(r'(\d+(?:\.\d+)?)\s*(?:元|块)钱?\s*(?:以下|以内|之内|内|及以下)'),
+    re.compile(r'(?:低于|少于|不到|不超过|小于|便宜于)\s*(\d+(?:\.\d+)?)\s*(?:元|块)'),
+]
+PRICE_MIN_PATTERNS = [
+    re.compile(r'(\d+(?:\.\d+)?)\s*(?:元|块)钱?\s*(?:以上|及以上)'),
+    re.compile(r'(?:高于|超过|多于|大于)\s*(\d+(?:\.\d+)?)\s*(?:元|块)'),
+]
+
+# 最低评分表达式："评分4.5以上"、"评分不低于4.5"、"4.5分以上"
+RATING_MIN_PATTERNS = [
+    re.compile(r'(?:评分|评价|口碑)\s*(?:在|不低于|高于|超过|大于|达到)\s*(\d(?:\.\d+)?)\s*分?'),
+    re.compile(r'(?:评分|评价|口碑)?\s*(\d(?:\.\d+)?)\s*分?\s*(?:以上|及以上)'),
+]
+
+# 表示"或"的连接词，多个设施之间出现这些词时只要求具备其一
+FACILITY_OR_WORDS = ['或', '还是', '任一', '其中一', '之一']
+
+# 景点比较的指标及其特征词，按顺序匹配（"门票哪个好"按门票价格比较）
+COMPARE_METRICS = [
+    ('adultPrice', ('门票', '票价', '价格', '贵', '便宜', '花钱', '省钱')),
+    ('popularity', ('人多', '人少', '人气', '热度', '热门', '火', '受欢迎', '冷清')),
+    ('rating', ('评分', '评价', '口碑', '好玩', '值得', '好', '差')),
+]
+
+# 比较指标对应的问题类型，问题中还有其他问题类型时（"…哪个评分高，武侯祠电话"）不按比较处理
+COMPARE_METRIC_TYPES = {'adultPrice': '门票价格', 'popularity': '热度', 'rating': '评分'}
+
+# 表示取较小值的词（"哪个人少"、"哪个便宜"），没有时取较大值
+COMPARE_LOWER_WORDS = ['低', '少', '便宜', '差', '冷清', '省钱']
+
+# 分句标点："武侯祠门票多少钱，附近有什么好吃的"
+CLAUSE_SEPARATOR_PATTERN = re.compile(r'[，,。；;？?！!\n]+')
+
+# 分句开头的连接词："另外成都有哪些免费景点"
+CLAUSE_CONNECTOR_PATTERN = re.compile(r'^(?:另外|还有|顺便问一?下|顺便|再问一?下|那么|那)')
+
+# 并列的景点之间的连接词："武侯祠和锦里的门票" 中两个景点共用 "门票"
+COORDINATION_WORDS = {'和', '与', '跟', '及', '以及', '、', '还有', '或', '或者', '还是', '同'}
+
+# 去掉景点名称后少于这么多字的分句（例如"地址呢"）视为上一分句的补充，不单独成句
+MIN_CLAUSE_CHARS = 4
+
+# 翻页问题（"更多"、"下一页"）的最大字数，更长的问题通常不是翻页
+MAX_MORE_CHARS = 10
 
 class QuestionClassifier: # 定义问题分类器类
     def __init__(self): # 类的初始化方法，创建类的实例时自动调用
@@ -50,6 +118,13 @@ class QuestionClassifier: # 定义问题分类器类
         # 构建Aho-Corasick自动机，用于高效地从问题中识别这些景点名称
         self.region_tree = self.build_actree(all_recognizable_names)
 
+        # 城市的各种写法（"成都"、"成都市"、"阿坝州"等）到城市简称的映射，省名表示全省
+        self.city_aliases = dict(get_gazetteer().prefecture_aliases)
+        for province_name in PROVINCE_NAMES:
+            self.city_aliases[province_name] = None
+        # 构建识别城市名称的Aho-Corasick自动机
+        self.city_tree = self.build_actree(list(self.city_aliases))
+
         # 定义各类问题类型的特征词列表
         self.address_qwds = ['地址', '位置', '在哪', '坐落', '方位', '哪里', '在哪儿'] # 地址相关的关键词
         self.opening_hours_qwds = ['开放时间', '几点开门', '几点关门', '营业时间', '开放到几点', '什么时候开', '什么时候关', '几点开', '几点关'] # 开放时间相关的关键词
@@ -59,6 +134,30 @@ class QuestionClassifier: # 定义问题分类器类
         self.url_qwds = ['官网', '网站', '网址', '官方网站', '链接'] # 官网相关的关键词
         self.description_qwds = ['介绍', '简介', '信息', '详情', '描述一下', '讲讲关于', '是什么', '有哪些特色', '概况', '具体情况', '说一下'] # 描述相关的关键词
         self.ticket_qwds = ['门票', '票价', '多少钱', '价格', '入场费', '费用'] # 新增门票相关的关键词
+        self.open_now_qwds = ['现在开', '开着吗', '开着没', '还开', '开门吗', '开门了吗', '开门没', '营业吗', '开放吗', '关门了吗', '关门没', '在营业', '正在开放', '开放的景点', '开门的景点', '营业的景点'] # 某时刻是否开放相关的关键词
+        self.similar_qwds = ['类似', '相似', '差不多的', '相近的', '同类', '一样的景点', '这样的景点'] # 相似景点相关的关键词
+        self.free_qwds = ['免费的景点', '免费景点', '免费开放', '免费参观', '免费游览', '免门票', '不要门票', '不用门票', '无需门票', '不收门票', '不要钱'] # 免费景点相关的关键词
+        self.ranking_qwds = ['最高', '最热门', '最火', '最受欢迎', '最好', '最值得', '最多人', '排行', '排名', '榜', '必去'] # 景点排行相关的关键词
+        self.rating_rank_qwds = ['评分', '评价', '口碑', '好评', '分数'] # 按评分排行的关键词，其余排行问题按热度排行
+        self.count_qwds = ['多少个景点', '多少景点', '几个景点', '多少处景点', '景点数量', '景点数', '景点有多少', '景点总数'] # 景点数量统计相关的关键词
+        self.average_qwds = ['平均', '均分', '中位数'] # 均值统计相关的关键词
+        self.compare_city_qwds = ['哪个城市', '哪座城市', '哪个市', '哪个地区', '哪些城市', '各城市', '各个城市'] # 城市之间比较的关键词
+        self.nearby_qwds = ['附近', '周边', '周围', '旁边', '邻近', '不远'] # 附近景点相关的关键词
+        self.nearby_target_qwds = ['景点', '景区', '好玩', '玩的', '去处', '逛', '地方', '看的'] # 附近景点问题中表示询问景点的词（区别于"附近有什么好吃的"）
+        self.compare_qwds = ['哪个', '哪一个', '哪家', '谁更', '比较', '相比', '对比', '比一比', '还是'] # 景点之间比较的关键词
+        self.list_qwds = ['哪些', '哪里', '哪儿', '什么景点', '景点', '推荐'] # 不针对具体景点、查询景点列表的关键词
+        self.listing_qwds = ['哪些', '什么', '有啥', '推荐', '列出', '列举', '所有', '全部'] # 列出某城市景点的关键词
+        self.listing_target_qwds = ['景点', '景区', '好玩', '玩的', '去处', '逛', '看的'] # 列出城市景点问题中表示询问景点的词（区别于"成都有什么好吃的"）
+        self.more_qwds = ['更多', '下一页', '换一批', '再来一些', '再来点', '还有哪些', '还有吗', '还有呢', '继续'] # 查看景点列表下一页的关键词
+
+        # 针对具体景点的问题类型及其特征词，用于把问题类型与问题中距离最近的景点配对
+        self.intent_qwds = {
+            '地址': self.address_qwds, '开放时间': self.opening_hours_qwds, '电话': self.phone_qwds,
+            '评分': self.rating_qwds, '热度': self.popularity_qwds, '官网': self.url_qwds,
+            '门票价格': self.ticket_qwds, '是否开放': self.open_now_qwds, '相似景点': self.similar_qwds,
+            '周边景点': self.nearby_qwds,
+            '简介': self.description_qwds,
+        }
 
         # 否定词 (用于区分某些意图，例如“不推荐的食物”等，此处暂时保留，可能用于更复杂场景)
         self.deny_words = ['不是', '没有', '除了', '不要', '而非'] # 否定词列表
@@ -104,9 +203,25 @@ class QuestionClassifier: # 定义问题分类器类
         data = {} # 初始化一个空字典，用于存储分类结果
         # 从问题中提取已知的实体 (这里主要是景点名称)，调用 extract_entities 方法
         entities_dict = self.extract_entities(question)
+
+        statistics = self.classify_statistics(question, entities_dict) # 先识别"成都有多少个景点"之类的城市统计问题
+        if statistics: # 如果是统计问题
+            return statistics # 直接返回统计问题的分类结果
+
+        ranking = self.classify_ranking(question, entities_dict) # 再识别"成都评分最高的景点"之类的城市排行问题
+        if ranking: # 如果是排行问题
+            return ranking # 直接返回排行问题的分类结果
+
+        facilities = self.classify_facilities(question, entities_dict) # 再识别"哪些景点有停车场和无障碍设施"之类的设施筛选问题
+        if facilities: # 如果是设施筛选问题
+            return facilities # 直接返回设施筛选问题的分类结果
+
+        comparison = self.classify_comparison(question, entities_dict) # 再识别"武侯祠和杜甫草堂哪个评分高"之类的景点比较问题
+        if comparison: # 如果是景点比较问题
+            return comparison # 直接返回景点比较问题的分类结果
         
         if not entities_dict: # 如果没有检测到任何已知实体（如景点名称）
-            return {} # 返回空字典，表示无法处理或问题与已知景点无关
+            return self.classify_without_entity(question) # 尝试识别不针对具体景点的问题（例如"晚上9点还开放的景点"），否则返回空字典
         
         data['args'] = entities_dict # 将提取出的实体及其类型存入结果字典的 'args' 键中
         
@@ -151,6 +266,19 @@ class QuestionClassifier: # 定义问题分类器类
         if self.check_words(self.ticket_qwds, question): # 判断门票关键词是否存在
             question_types.append('门票价格') # 如果存在，添加'门票价格' (对应CSV中的“门票价格”)
 
+        # 检查问题是否询问景点在某一时刻是否开放（例如"熊猫基地现在开着吗"）
+        if self.check_words(self.open_now_qwds, question): # 判断是否开放关键词是否存在
+            question_types.append('是否开放') # 如果存在，添加'是否开放'
+            data['params'] = self.extract_time(question) # 提取问题中的时间，没有时间则表示现在
+
+        # 检查问题是否询问与景点相似的其他景点（例如"和武侯祠类似的景点"）
+        if self.check_words(self.similar_qwds, question): # 判断相似景点关键词是否存在
+            question_types.append('相似景点') # 如果存在，添加'相似景点'
+
+        # 检查问题是否询问景点附近的其他景点（例如"武侯祠附近有什么景点"）
+        if self.check_words(self.nearby_qwds, question) and self.check_words(self.nearby_target_qwds, question): # 判断附近景点关键词是否存在
+            question_types.append('周边景点') # 如果存在，添加'周边景点'
+
         # 如果没有匹配到以上具体问题类型，但提到了景点，且包含描述性疑问词，则归类为查询描述
         if not question_types and self.check_words(self.description_qwds, question): # 如果之前未匹配到类型，且包含描述性词汇
             question_types.append('简介') # 添加'简介' (对应CSV中的“简介”)
@@ -158,10 +286,252 @@ class QuestionClassifier: # 定义问题分类器类
         # 如果仍然没有匹配，但问题中包含景点名称，则默认为查询景点描述
         if not question_types and 'attraction' in types: # 如果之前未匹配到类型，但识别出景点
             question_types.append('简介') # 默认查询描述，添加'简介' (对应CSV中的“简介”)
+            data['low_confidence'] = True # 只是猜测用户想看简介，问答时可以提前调用大模型（投机预取）
 
         data['question_types'] = list(set(question_types)) # 对问题类型列表去重，并存入结果字典的 'question_types' 键
+        if len(entities_dict) > 1 and len(data['question_types']) > 1: # 多个景点、多个问题类型时按位置配对，避免两两组合
+            data['pairs'] = self.pair_intents(question, entities_dict, data['question_types'])
         return data # 返回包含实体和问题类型的分类结果字典
 
+    def pair_intents(self, question, entities_dict, question_types): # 定义把问题类型与景点配对的方法
+        """
+        按特征词和景点名称在问题中的位置，把每个问题类型与距离最近的景点配对。
+        例如 "武侯祠的地址和锦里的门票" -> {'地址': ['武侯祠'], '门票价格': ['锦里古街']}。
+        特征词优先与前面最近的景点配对（"武侯祠的地址"），前面没有景点时与后面最近的景点配对；
+        与配对景点并列的景点（"武侯祠和锦里的门票"）一起配对；没有与任何问题类型配对的景点保留全部问题类型。
+        返回 {问题类型: [景点全称, ...]}
+        """
+        mentions = [] # 问题中的景点：(开始位置, 结束位置, 全称)
+        for end_index, (_, word) in self.region_tree.iter(question): # 遍历匹配结果
+            full_name = self.attraction_aliases.get(word, word) # 简称转换为全称
+            if full_name in entities_dict: # 只保留最终识别出的实体
+                mentions.append((end_index - len(word) + 1, end_index + 1, full_name))
+        mentions = [m for m in mentions if not any(o != m and o[0] <= m[0] and m[1] <= o[1] for o in mentions)] # 去掉被更长名称覆盖的匹配
+        mentions.sort() # 按出现位置排序
+
+        pairs = {} # 问题类型 -> 配对的景点
+        for question_type in question_types: # 遍历问题类型
+            positions = [match.start() for word in self.intent_qwds.get(question_type, []) for match in re.finditer(re.escape(word), question)] # 特征词出现的位置
+            paired = [] # 与该问题类型配对的景点
+            for position in positions:
+                before = [i for i, m in enumerate(mentions) if m[1] <= position] # 特征词前面的景点
+                after = [i for i, m in enumerate(mentions) if m[0] > position] # 特征词后面的景点
+                if not before and not after: # 特征词位于景点名称之中
+                    continue
+                nearest = before[-1] if before else after[0] # 前面最近的景点，没有时取后面最近的景点
+                group = [nearest] # 与最近的景点并列的景点
+                while group[0] > 0 and question[mentions[group[0] - 1][1]:mentions[group[0]][0]].strip() in COORDINATION_WORDS:
+                    group.insert(0, group[0] - 1)
+                while group[-1] + 1 < len(mentions) and question[mentions[group[-1]][1]:mentions[group[-1] + 1][0]].strip() in COORDINATION_WORDS:
+                    group.append(group[-1] + 1)
+                paired.extend(mentions[i][2] for i in group)
+            pairs[question_type] = list(dict.fromkeys(paired)) # 去重并保持顺序
+
+        unpaired = [name for name in entities_dict if not any(name in names for names in pairs.values())] # 没有配对的景点
+        for question_type in question_types:
+            if not pairs[question_type]: # 没有特征词的问题类型（例如默认的简介）适用于全部景点
+                pairs[question_type] = list(entities_dict)
+            else:
+                pairs[question_type] += [name for name in unpaired if name not in pairs[question_type]]
+        return pairs # 返回配对结果
+
+    def classify_without_entity(self, question): # 定义对不含景点实体的问题进行分类的方法
+        """
+        识别不针对具体景点的问题类型，例如"晚上9点还开放的景点有哪些"。
+        返回与 classify 相同结构的字典，'args' 为空；无法识别时返回空字典。
+        """
+        if self.check_words(self.open_now_qwds, question) and self.check_words(self.list_qwds, question): # 询问某一时刻开放的景点列表
+            return {'args': {}, 'question_types': ['开放景点'], 'params': self.extract_time(question)} # 返回开放景点问题类型和时间参数
+        if self.check_words(self.free_qwds, question): # 询问免费开放的景点，例如"免费景点有哪些"
+            return {'args': {}, 'question_types': ['免费景点'], 'params': {'city': self.extract_city(question)}} # 返回免费景点问题类型和城市（None表示全省）
+        price_range = self.extract_price_range(question) # 提取问题中的价格区间
+        if price_range and self.check_words(self.list_qwds, question): # 询问某一价格区间的景点列表，例如"成都100元以下的景点"
+            price_range['city'] = self.extract_city(question) # 问题中提到的城市（None表示全省）
+            return {'args': {}, 'question_types': ['价格区间'], 'params': price_range} # 返回价格区间问题类型、价格和城市参数
+        return self.classify_listing(question) # 最后识别"成都有哪些景点"和"更多"之类的城市景点列表问题
+
+    def classify_listing(self, question): # 定义识别城市景点列表问题的方法
+        """
+        识别列出某城市景点的问题（例如"成都有哪些景点"、"阿坝有什么好玩的"）及查看下一页的问题（例如"更多"、"下一页"）。
+        返回 {'args': {}, 'question_types': ['城市景点'], 'params': {'city': 城市简称或None(全省)}}；
+        翻页问题的 params 为 {'more': True}，问题中提到城市时同时带有 'city'，由调用方根据对话状态补上游标。无法识别时返回空字典。
+        """
+        mentions_city = any(True for _ in self.city_tree.iter(question)) # 是否提到了城市或省名
+        if len(question) <= MAX_MORE_CHARS and self.check_words(self.more_qwds, question): # 查看下一页
+            params = {'more': True}
+            if mentions_city: # 例如"成都还有哪些景点"
+                params['city'] = self.extract_city(question)
+            return {'args': {}, 'question_types': ['城市景点'], 'params': params}
+        if mentions_city and self.check_words(self.listing_qwds, question) and self.check_words(self.listing_target_qwds, question): # 列出某城市的景点
+            return {'args': {}, 'question_types': ['城市景点'], 'params': {'city': self.extract_city(question)}}
+        return {} # 无法识别，返回空字典
+
+    def classify_ranking(self, question, entities_dict): # 定义识别城市景点排行问题的方法
+        """
+        识别城市景点排行问题，例如"成都评分最高的景点"、"乐山最热门的5个景点"。
+        问题中识别出的景点实体只有城市名（例如景点"成都"）时仍视为排行问题；含有其他景点时返回空字典。
+        返回 {'args': {}, 'question_types': ['景点排行'], 'params': {'city': 城市简称或None(全省), 'metric': 'rating'/'popularity', 'k': 数量或None}}
+        """
+        k = self.extract_rank_k(question) # 提取问题中的排行数量
+        if not (self.check_words(self.ranking_qwds, question) or k) or not self.check_words(self.list_qwds, question): # 没有排行关键词或不是询问景点列表
+            return {}
+        if not self._only_city_entities(entities_dict): # 问题针对具体景点（例如"武侯祠评分最高吗"）
+            return {}
+        metric = 'rating' if self.check_words(self.rating_rank_qwds, question) else 'popularity' # 排行指标
+        return {'args': {}, 'question_types': ['景点排行'], 'params': {'city': self.extract_city(question), 'metric': metric, 'k': k}}
+
+    def classify_statistics(self, question, entities_dict): # 定义识别城市统计问题的方法
+        """
+        识别城市级统计问题，例如"成都有多少个景点"、"乐山景点的平均评分"、"哪个城市景点平均评分最高"。
+        返回 {'args': {}, 'question_types': ['城市统计'], 'params': {'city': 城市简称或None(全省), 'metric': None(景点数量)/'rating'/'popularity', 'compare': 是否比较各城市}}
+        """
+        if self.check_words(self.count_qwds, question): # 询问景点数量
+            metric = None
+        elif self.check_words(self.average_qwds, question): # 询问平均评分或平均热度
+            metric = 'popularity' if self.check_words(self.popularity_qwds, question) else 'rating'
+        else: # 不是统计问题
+            return {}
+        if not self._only_city_entities(entities_dict): # 问题针对具体景点
+            return {}
+        compare = self.check_words(self.compare_city_qwds, question) # 是否比较各城市
+        city = None if compare else self.extract_city(question) # 比较各城市时不限定城市
+        return {'args': {}, 'question_types': ['城市统计'], 'params': {'city': city, 'metric': metric, 'compare': compare}}
+
+    def classify_facilities(self, question, entities_dict): # 定义识别服务设施筛选问题的方法
+        """
+        识别按服务设施筛选景点的问题，例如"哪些景点有停车场和无障碍设施"、"成都评分4.5以上有母婴室或淋浴的景点"。
+        多个设施默认要求同时具备，出现"或"、"还是"等词时只要求具备其一。
+        返回 {'args': {}, 'question_types': ['设施筛选'], 'params': {'facilities': 设施标签列表, 'mode': 'all'/'any', 'city': 城市简称或None, 'min_rating': 最低评分或None}}
+        """
+        facilities = match_facilities(question) # 识别问题中的设施
+        if not facilities or not self.check_words(self.list_qwds, question): # 没有设施或不是询问景点列表
+            return {}
+        if not self._only_city_entities(entities_dict): # 问题针对具体景点（例如"武侯祠有停车场吗"）
+            return {}
+        mode = 'any' if len(facilities) > 1 and self.check_words(FACILITY_OR_WORDS, question) else 'all' # 多个设施之间的关系
+        params = {'facilities': facilities, 'mode': mode, 'city': self.extract_city(question), 'min_rating': self.extract_min_rating(question)}
+        return {'args': {}, 'question_types': ['设施筛选'], 'params': params}
+
+    def classify_comparison(self, question, entities_dict): # 定义识别景点比较问题的方法
+        """
+        识别比较多个景点的问题，例如"武侯祠和杜甫草堂哪个评分高"、"锦里和宽窄巷子哪个人多"。
+        返回 {'args': 实体, 'question_types': ['景点比较'], 'params': {'metric': 'rating'/'popularity'/'adultPrice', 'order': 'max'/'min'}}
+        """
+        if len(entities_dict) < 2 or not self.check_words(self.compare_qwds, question): # 至少两个景点且有比较的关键词
+            return {}
+        metric = next((metric for metric, words in COMPARE_METRICS if self.check_words(words, question)), None) # 比较的指标
+        if metric is None: # 没有可比较的指标
+            return {}
+        if any(self.check_words(words, question) for question_type, words in self.intent_qwds.items()
+               if question_type not in ('简介', COMPARE_METRIC_TYPES[metric])): # 还询问了其他信息
+            return {}
+        order = 'min' if self.check_words(COMPARE_LOWER_WORDS, question.replace('多少', '')) else 'max' # "多少钱"中的"少"不表示取较小值
+        return {'args': entities_dict, 'question_types': ['景点比较'], 'params': {'metric': metric, 'order': order}}
+
+    def _only_city_entities(self, entities_dict): # 定义判断识别出的实体是否都只是城市名的辅助方法
+        """城市统计、排行问题中，与城市同名的景点（例如景点"成都"）视为城市而不是具体景点"""
+        return all(name in self.city_aliases for name in entities_dict)
+
+    def extract_city(self, question): # 定义从问题中识别城市的方法
+        """返回问题中最长匹配的城市简称，例如 "成都市" -> "成都"；没有城市或只提到省名时返回None"""
+        best = None # 最长匹配的城市写法
+        for end_index, (original_index, word) in self.city_tree.iter(question): # 遍历匹配结果
+            if best is None or len(word) > len(best): # 取最长匹配
+                best = word
+        return self.city_aliases.get(best) if best else None # 转换为城市简称
+
+    def extract_rank_k(self, question): # 定义从问题中提取排行数量的方法
+        """提取 "前5"、"top 10"、"十个" 等排行数量，没有时返回None"""
+        for pattern in RANK_K_PATTERNS: # 依次尝试各个数量表达式
+            match = pattern.search(question)
+            if match:
+                k = self._parse_number(match.group(1)) # 解析阿拉伯数字或中文数字
+                if k: # 数量必须为正数
+                    return k
+        return None
+
+    def extract_min_rating(self, question): # 定义从问题中提取最低评分的方法
+        """提取 "评分4.5以上"、"评分不低于4" 等最低评分，没有或数值不在0-5之间时返回None"""
+        for pattern in RATING_MIN_PATTERNS: # 依次尝试各个评分表达式
+            match = pattern.search(question)
+            if match:
+                rating = float(match.group(1))
+                if 0 <= rating <= 5: # 评分满分为5分
+                    return rating
+        return None
+
+    def extract_price_range(self, question): # 定义从问题中提取价格区间的方法
+        """
+        从问题中提取门票价格区间。
+        返回 {'min_price': 最低价或None, 'max_price': 最高价或None}，没有价格表达式时返回None
+        例如 "100元以下" -> {'min_price': None, 'max_price': 100.0}
+        """
+        match = PRICE_BETWEEN_PATTERN.search(question) # 先匹配 "50到100元" 形式
+        if match: # 如果匹配成功
+            low, high = sorted((float(match.group(1)), float(match.group(2)))) # 两端按大小排序
+            return {'min_price': low, 'max_price': high}
+        for pattern in PRICE_MAX_PATTERNS: # 再匹配上限形式
+            match = pattern.search(question)
+            if match:
+                return {'min_price': None, 'max_price': float(match.group(1))}
+        for pattern in PRICE_MIN_PATTERNS: # 最后匹配下限形式
+            match = pattern.search(question)
+            if match:
+                return {'min_price': float(match.group(1)), 'max_price': None}
+        return None # 没有价格表达式
+
+    def extract_time(self, question): # 定义从问题中提取时间的方法
+        """
+        从问题中提取查询时刻。
+        返回 {'minute': 当天零点起的分钟数或None(表示现在), 'day_offset': 相对今天的天数}
+        例如 "明天晚上9点半" -> {'minute': 1290, 'day_offset': 1}
+        """
+        day_offset = 0 # 默认查询今天
+        if '明天' in question or '明日' in question: # 如果问题中提到明天
+            day_offset = 1 # 查询明天
+        elif '后天' in question: # 如果问题中提到后天
+            day_offset = 2 # 查询后天
+
+        hour, minute, period = None, 0, None # 初始化小时、分钟和时段词
+        match = TIME_COLON_PATTERN.search(question) # 先匹配 "21:30" 形式
+        if match: # 如果匹配成功
+            period, hour, minute = match.group(1), int(match.group(2)), int(match.group(3)) # 提取时段词、小时和分钟
+        else:
+            match = TIME_POINT_PATTERN.search(question) # 再匹配 "晚上9点半" 形式
+            if match: # 如果匹配成功
+                period, hour = match.group(1), self._parse_number(match.group(2)) # 提取时段词和小时
+                fraction = match.group(3) # 提取分钟部分
+                if fraction == '半': # 半点
+                    minute = 30
+                elif fraction == '一刻': # 一刻钟
+                    minute = 15
+                elif fraction == '三刻': # 三刻钟
+                    minute = 45
+                elif match.group(4): # 具体分钟数
+                    minute = self._parse_number(match.group(4))
+
+        if hour is None or minute is None or hour > 24 or minute >= 60: # 没有识别到时间或时间不合法
+            return {'minute': None, 'day_offset': day_offset} # 表示查询当前时刻
+        if period in PM_PERIODS and hour < 12: # 下午、晚上等时段的小时转换为24小时制
+            hour += 12
+        elif period == '中午' and hour < 6: # 中午1点表示13点
+            hour += 12
+        return {'minute': (hour % 24) * 60 + minute, 'day_offset': day_offset} # 返回分钟数和日期偏移
+
+    def _parse_number(self, text): # 定义解析阿拉伯数字或中文数字的辅助方法
+        """将 "9"、"九"、"十一"、"二十" 等转换为整数，无法解析时返回None"""
+        if text.isdigit(): # 阿拉伯数字
+            return int(text)
+        if '十' in text: # 含"十"的中文数字
+            tens, _, ones = text.partition('十') # 拆分十位和个位
+            return (CN_DIGITS.get(tens, 1) if tens else 1) * 10 + (CN_DIGITS.get(ones, 0) if ones else 0)
+        value = 0 # 逐位解析
+        for char in text: # 遍历每个中文数字
+            if char not in CN_DIGITS: # 无法识别的字符
+                return None
+            value = value * 10 + CN_DIGITS[char]
+        return value
+
     def build_wdtype_dict(self): # 定义构建词汇及其对应类型字典的方法
         """
         构建词汇及其对应类型的字典。
@@ -243,6 +613,41 @@ class QuestionClassifier: # 定义问题分类器类
 
         return final_entities # 返回处理简称后的最终实体字典
 
+    def split_clauses(self, question): # 定义把一个问题拆分为可以分别回答的分句的方法
+        """
+        按标点拆分问题，例如 "武侯祠门票多少钱，附近有什么好吃的" -> ["武侯祠门票多少钱", "武侯祠附近有什么好吃的"]。
+        去掉分句开头的连接词；没有提到景点（也没有提到城市）的分句补上前面最近提到的景点；只有景点名称的分句与下一分句合并；
+        去掉景点名称后过短的分句（"地址呢"）并入上一分句。
+        """
+        clauses = [] # 拆分得到的分句
+        carried = None # 前面最近提到的景点（问题中的写法）
+        pending = '' # 只有景点名称、等待与下一分句合并的分句
+        for part in CLAUSE_SEPARATOR_PATTERN.split(question): # 按标点拆分
+            part = CLAUSE_CONNECTOR_PATTERN.sub('', part.strip()) # 去掉首尾空白和开头的连接词
+            if not part: # 跳过空的分句
+                continue
+            mentions = [word for _, (_, word) in self.region_tree.iter(part)] if getattr(self, 'region_tree', None) else [] # 分句中提到的景点
+            remainder = part # 去掉景点名称后的内容
+            for word in sorted(mentions, key=len, reverse=True): # 先去掉较长的名称
+                remainder = remainder.replace(word, '')
+            content_chars = len(re.sub(r'[的了吗呢啊呀吧\s]', '', remainder)) # 除景点名称和语气词外的字数
+            if mentions: # 记录最近提到的景点
+                carried = max(mentions, key=len)
+            if content_chars == 0: # 只有景点名称
+                pending += part # 与下一分句合并
+                continue
+            if pending: # 前面有只含景点名称的分句
+                part, pending = pending + part, ''
+            elif content_chars < MIN_CLAUSE_CHARS and clauses: # 过短的补充说明
+                clauses[-1] += '，' + part # 并入上一分句
+                continue
+            elif not mentions and carried and not any(True for _ in self.city_tree.iter(part)): # 没有提到景点和城市时补上前面的景点
+                part = carried + part
+            clauses.append(part) # 添加分句
+        if pending: # 问题只有景点名称
+            clauses.append(pending)
+        return clauses # 返回分句列表
+
     def check_words(self, words_to_check, sentence): # 定义检查词汇是否在句子中存在的方法
         """
         检查 `words_to_check` 列表中的任一词汇是否存在于 `sentence` 中。
@@ -270,7 +675,15 @@ if __name__ == '__main__': # Python的入口点，当脚本直接执行时，以
         "我想知道关于杜甫草堂的信息",
         "春熙路好不好玩",
         "天府广场", # 仅实体，应归类为描述
-        "熊猫基地的门票多少钱？" # 新增测试门票问题
+        "熊猫基地的门票多少钱？", # 新增测试门票问题
+        "熊猫基地现在开着吗？", # 是否开放
+        "晚上9点还开放的景点有哪些？", # 不含景点实体的开放景点问题
+        "门票100元以下的景点有哪些？", # 价格区间问题
+        "免费景点有哪些？", # 免费景点问题
+        "成都评分最高的景点有哪些？", # 城市景点排行问题
+        "乐山最热门的5个景点", # 指定数量的城市景点排行问题
+        "成都有多少个景点？", # 城市景点数量统计问题
+        "哪个城市景点平均评分最高？" # 城市之间的统计比较问题
     ]
 
     for question_text in test_questions: # 遍历测试问题列表
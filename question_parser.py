@@ -5,6 +5,20 @@
 
 class QuestionParser: # Renamed class to follow Python conventions (PascalCase) # 定义一个名为QuestionParser的类，遵循Python的命名规范（帕斯卡命名法）
 
+    # 由内存索引回答、不生成Cypher的问题类型 -> 是否需要景点实体
+    LOCAL_QUESTION_TYPES = {
+        '是否开放': True, # 某景点在某一时刻是否开放（开放时间区间索引）
+        '开放景点': False, # 某一时刻开放的全部景点（开放时间区间索引）
+        '价格区间': False, # 门票价格在某一区间内的景点（门票价格索引）
+        '免费景点': False, # 免费开放的景点（门票价格索引）
+        '景点排行': False, # 某城市按评分或热度排名前K的景点（城市排行索引）
+        '城市统计': False, # 城市的景点数量、平均评分等统计（城市统计）
+        '相似景点': True, # 与某景点介绍和服务设施相似的景点（相似景点表）
+        '设施筛选': False, # 具备指定服务设施、可按城市和评分过滤的景点（服务设施位图索引）
+        '周边景点': True, # 与某景点同一区县及相邻区县的景点（附近景点索引）
+        '城市景点': False, # 某城市的景点列表，按游标翻页（城市景点列表索引）
+    }
+
     def build_entitydict(self, args): # 定义一个方法，用于构建实体字典
         """
         构建实体字典。
@@ -24,8 +38,10 @@ class QuestionParser: # Renamed class to follow Python conventions (PascalCase)
         """
         解析主函数。
         输入: res_classify - QuestionClassifier的输出结果，
-                           包含 'args' (提取的实体) 和 'question_types' (问题类型列表)
-        输出: sqls - 一个列表，每个元素是一个包含 'question_type' 和 'sql' (Cypher查询语句列表) 的字典
+                           包含 'args' (提取的实体) 和 'question_types' (问题类型列表)，
+                           多个景点时可能带有 'pairs' ({问题类型: [景点, ...]})，只查询配对的景点
+        输出: sqls - 一个列表，每个元素是一个包含 'question_type'、'sql' (Cypher查询语句列表) 和 'entities' (查询的景点) 的字典；
+              由内存索引回答的问题类型 'sql' 为空列表，并带有 'params' (分类器提取的参数及景点实体列表 'entities')
         """ # 方法的文档字符串，说明其功能、输入和输出
         args = res_classify.get('args', {}) # 从分类结果中获取'args'（提取的实体），如果不存在则默认为空字典
         entity_dict = self.build_entitydict(args) # 调用build_entitydict方法构建实体字典
@@ -35,19 +51,32 @@ class QuestionParser: # Renamed class to follow Python conventions (PascalCase)
         # 获取景点实体，后续查询都基于此 # 获取类型为'attraction'的实体列表，这些是后续查询的基础
         attraction_entities = entity_dict.get('attraction', []) # 从实体字典中获取'attraction'类型的实体列表，如果不存在则默认为空列表
 
-        if not attraction_entities: # 如果没有识别到景点实体，则无法生成查询 # 如果没有景点实体
-            return sqls # 直接返回空的sqls列表
+        params = res_classify.get('params', {}) # 从分类结果中获取参数（例如查询时刻），如果不存在则默认为空字典
+        pairs = res_classify.get('pairs', {}) # 问题类型与景点的配对（"武侯祠的地址和锦里的门票"），没有时每个问题类型适用于全部景点
 
         for question_type in question_types: # 遍历问题类型列表中的每一个问题类型
+            type_entities = pairs.get(question_type, attraction_entities) # 该问题类型对应的景点
+            if question_type in self.LOCAL_QUESTION_TYPES: # 如果是由内存索引回答的问题类型
+                if self.LOCAL_QUESTION_TYPES[question_type] and not type_entities: # 需要景点实体但没有识别到
+                    continue # 跳过该问题类型
+                sqls.append({'question_type': question_type, 'sql': [], 'params': dict(params, entities=type_entities)}) # 不生成Cypher，把参数和实体交给搜索器
+                continue # 处理下一个问题类型
+
+            if not type_entities: # 如果没有识别到景点实体，则无法生成查询 # 如果没有景点实体
+                continue # 跳过该问题类型
+
             sql_entry = {'question_type': question_type} # 为当前问题类型创建一个字典条目，包含问题类型本身
             generated_sql_queries = [] # To store Cypher queries for this question_type # 初始化一个空列表，用于存储针对当前问题类型生成的Cypher查询语句
 
             # 根据问题类型调用sql_transfer生成Cypher查询 # 调用sql_transfer方法生成Cypher查询
             # 注意：sql_transfer现在将处理单个问题类型和所有相关实体 # 注意sql_transfer方法会处理单个问题类型和所有相关的实体
-            generated_sql_queries = self.sql_transfer(question_type, attraction_entities) # 调用sql_transfer方法，传入当前问题类型和景点实体列表
+            generated_sql_queries = self.sql_transfer(question_type, type_entities) # 调用sql_transfer方法，传入当前问题类型和配对的景点实体列表
             
             if generated_sql_queries: # 如果成功生成了Cypher查询语句
                 sql_entry['sql'] = generated_sql_queries # 将生成的查询语句列表存入当前sql_entry字典的'sql'键下
+                sql_entry['entities'] = type_entities # 查询的景点，Neo4j不可用时用于从内存快照回答
+                if params: # 带参数的问题类型（例如景点比较的指标）同时附上参数和景点实体
+                    sql_entry['params'] = dict(params, entities=type_entities)
                 sqls.append(sql_entry) # 将当前sql_entry字典追加到sqls列表中
         
         return sqls # 返回包含所有生成查询信息的sqls列表
@@ -93,6 +122,10 @@ class QuestionParser: # Renamed class to follow Python conventions (PascalCase)
         elif question_type == '简介': # This is also the default type from classifier # 如果问题类型是'简介'（这也是分类器的默认类型）
             sql = [f"MATCH (a:景点) WHERE a.name = '{entity}' RETURN a.name AS name, a.introduction AS introduction" for entity in entities] # 为每个实体生成查询其简介的Cypher语句
         
+        elif question_type == '景点比较': # 如果问题类型是'景点比较'
+            names = ", ".join(f"'{entity}'" for entity in entities) # 参与比较的全部景点
+            sql = [f"MATCH (a:景点) WHERE a.name IN [{names}] RETURN a.name AS name, a.rating AS rating, a.popularity AS popularity, a.adultPrice AS adultPrice"] # 一次查询取出全部景点的比较指标
+
         # 可以根据需要添加更多问题类型的处理逻辑 # 可以根据需要添加更多问题类型的处理逻辑
         # 例如，如果以后有查询景点所属城市的需求： # 例如，如果以后有查询景点所属城市的需求：
         # elif question_type == '所属城市': # 如果问题类型是'所属城市'
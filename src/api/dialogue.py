@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+多轮对话中的指代消解。
+
+追问（"它的门票呢？"、"那开放时间呢"）中没有景点名称，分类器无法识别，只能调用大模型。
+`DialogueState` 按用户记住上一轮识别出的景点，`resolve_followup` 把追问中的代词替换为
+这些景点（省略了景点的追问则在开头补上景点），改写后的问题再交给分类器，仍由知识图谱回答。
+
+对话状态同时记住用户上一次查看的城市景点列表及下一页的游标，用户回复"更多"时从游标处继续列出。
+
+对话状态有用户数上限（超出时淘汰最久未提问的用户）和有效期，过期后追问不再被改写。
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 指代景点的代词，较长的写法在前（"其它"不是代词）
+PRONOUN_PATTERN = re.compile(r"(?<!其)(?:它们|它)|这个景点|那个景点|这个地方|那个地方|该景点|这些景点|那些景点|这里|那里|这儿|那儿")
+
+# 省略了景点的追问："那开放时间呢"、"电话呢"、"还有门票"
+ELLIPSIS_PATTERN = re.compile(r"^(?:那么?|还有|再问一?下)|呢[？?。！!]*$")
+
+# 省略了景点的追问的最大字数，更长的问题通常不是追问
+MAX_ELLIPSIS_CHARS = 12
+
+
+def resolve_followup(question: str, entities: Sequence[str], ellipsis: bool = True) -> Optional[str]:
+    """
+    用上一轮的景点改写追问
+
+    Args:
+        question: 没有识别出景点的问题
+        entities: 上一轮识别出的景点
+        ellipsis: 是否改写省略了景点的追问；问题本身已被识别为不针对景点的类型（"成都有多少个景点呢"）时应为False
+
+    Returns:
+        改写后的问题，例如 "它的门票呢" -> "武侯祠的门票呢"；不是追问或没有上一轮的景点时返回None
+    """
+    if not entities:
+        return None
+    names = "和".join(entities)
+    if PRONOUN_PATTERN.search(question):
+        return PRONOUN_PATTERN.sub(names, question, count=1)
+    if ellipsis and len(question) <= MAX_ELLIPSIS_CHARS and ELLIPSIS_PATTERN.search(question):
+        return names + re.sub(r"^(?:那么?|还有|再问一?下)", "", question)
+    return None
+
+
+class DialogueState:
+    """按用户保存上一轮识别出的景点和正在查看的城市景点列表，有用户数上限和有效期"""
+
+    def __init__(self, ttl: float = 600.0, max_users: int = 10000):
+        """
+        Args:
+            ttl: 有效期（秒），超过有效期没有提问的用户的状态被丢弃
+            max_users: 最多保存的用户数，超出时淘汰最久未提问的用户
+        """
+        self.ttl = ttl
+        self.max_users = max_users
+        self._users: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def remember(self, user_id: str, entities: Sequence[str]) -> None:
+        """记住用户本轮识别出的景点"""
+        if entities:
+            self._update(user_id, "entities", list(entities))
+
+    def recall(self, user_id: str) -> List[str]:
+        """返回用户上一轮识别出的景点，没有或已过期时返回空列表"""
+        return list(self._get(user_id, "entities") or [])
+
+    def remember_listing(self, user_id: str, city: Optional[str], cursor: Optional[str]) -> None:
+        """记住用户正在查看的城市景点列表及下一页的游标（已是最后一页时为None）"""
+        self._update(user_id, "listing", (city, cursor))
+
+    def recall_listing(self, user_id: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """返回用户正在查看的 (城市简称, 下一页的游标)，没有或已过期时返回None"""
+        return self._get(user_id, "listing")
+
+    def _update(self, user_id: str, key: str, value: Any) -> None:
+        if self.max_users <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            item = self._users.get(user_id)
+            fields = dict(item[1]) if item is not None and now - item[0] <= self.ttl else {}
+            fields[key] = value
+            self._users[user_id] = (now, fields)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def _get(self, user_id: str, key: str) -> Any:
+        with self._lock:
+            item = self._users.get(user_id)
+            if item is None:
+                return None
+            if time.monotonic() - item[0] > self.ttl:
+                del self._users[user_id]
+                return None
+            return item[1].get(key)
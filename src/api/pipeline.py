@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+分级问答流水线，按顺序尝试各级答案来源（缓存 → 内存快照 → Neo4j → 介绍段落 → 大模型）。
+
+每一级有自己的耗时预算，整个请求另有总截止时间：
+- 一级返回最终答案时立即结束；
+- 一级只返回候选答案（例如"抱歉，没有找到……"）时记下候选，继续尝试后面的级别；
+- 一级超出预算时放弃等待（后台线程自行结束，结果丢弃），继续下一级；
+- 到达截止时间后不再启动新的级别，返回已有的最佳候选。
+
+没有任何答案时调用兜底级别（大模型，异步返回等待提示），兜底级别不受截止时间限制。
+每一级的调用次数、命中、候选、超时、出错次数和耗时都记录在 `TierStats` 中。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# 从日志模块导入
+from src.utils.logger import get_logger
+
+# 创建日志记录器
+logger = get_logger(__name__)
+
+
+class TierAnswer(NamedTuple):
+    """一级返回的答案"""
+    answer: Any          # 答案，通常为字符串
+    final: bool = True   # True表示最终答案，False表示候选答案（继续尝试后面的级别）
+
+
+class Tier(NamedTuple):
+    """流水线中的一级"""
+    name: str                                              # 名称，用于统计
+    handler: Callable[[Dict[str, Any]], Optional[TierAnswer]]  # 处理函数，参数为请求上下文，没有答案时返回None
+    budget: float                                          # 耗时预算（秒）
+    inline: bool = False                                   # 是否在调用线程中直接执行（只用于纯内存、不会阻塞的级别）
+
+
+class PipelineResult(NamedTuple):
+    """一次请求的结果"""
+    answer: Any                # 答案，没有任何答案时为None
+    tier: Optional[str]        # 给出答案的级别
+    final: bool                # 是否为最终答案
+    elapsed: float             # 总耗时（秒）
+    trace: List[tuple]         # [(级别, 结果, 耗时)]，结果为 hit/candidate/miss/timeout/error/skipped
+
+
+class TierStats:
+    """一级的累计统计"""
+
+    def __init__(self):
+        self.calls = 0
+        self.hits = 0
+        self.candidates = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.skipped = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典，包含命中率和平均耗时"""
+        return {
+            "calls": self.calls,
+            "hits": self.hits,
+            "candidates": self.candidates,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "hit_rate": round(self.hits / self.calls, 4) if self.calls else 0.0,
+            "avg_ms": round(self.total_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class AnswerCache:
+    """按问题缓存最终答案的LRU缓存，键中应包含数据版本，数据重新加载后旧的答案自然失效"""
+
+    def __init__(self, max_size: int = 1024):
+        """
+        Args:
+            max_size: 最多缓存的答案个数
+        """
+        self.max_size = max_size
+        self._items: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Any) -> Optional[Any]:
+        """返回缓存的答案，没有时返回None"""
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: Any, answer: Any) -> None:
+        """缓存答案，超出容量时淘汰最久未使用的答案"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = answer
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+class AnswerPipeline:
+    """带耗时预算和截止时间的分级问答流水线"""
+
+    def __init__(self, tiers: List[Tier], deadline: float, fallback: Optional[Tier] = None, max_workers: int = 8):
+        """
+        Args:
+            tiers: 按顺序尝试的级别
+            deadline: 整个请求的截止时间（秒）
+            fallback: 没有任何答案时调用的兜底级别
+            max_workers: 执行非内联级别的线程数
+        """
+        self.tiers = tiers
+        self.deadline = deadline
+        self.fallback = fallback
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="answer-tier")
+        self._stats: Dict[str, TierStats] = {tier.name: TierStats() for tier in tiers + ([fallback] if fallback else [])}
+        self._lock = threading.Lock()
+
+    def _record(self, name: str, outcome: str, seconds: float) -> None:
+        """记录一级的一次调用结果"""
+        with self._lock:
+            stats = self._stats[name]
+            if outcome == "skipped":
+                stats.skipped += 1
+                return
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if outcome == "hit":
+                stats.hits += 1
+            elif outcome == "candidate":
+                stats.candidates += 1
+            elif outcome == "timeout":
+                stats.timeouts += 1
+            elif outcome == "error":
+                stats.errors += 1
+
+    def _call(self, tier: Tier, context: Dict[str, Any], timeout: float) -> tuple:
+        """
+        在预算内执行一级
+
+        Returns:
+            (结果, TierAnswer或None, 耗时)
+        """
+        started = time.perf_counter()
+        try:
+            if tier.inline:
+                answer = tier.handler(context)
+            else:
+                answer = self._executor.submit(tier.handler, context).result(timeout=timeout)
+        except FutureTimeoutError:
+            logger.warning(f"问答级别 {tier.name} 超出预算 {timeout:.3f}s，跳过")
+            return "timeout", None, time.perf_counter() - started
+        except Exception as e:
+            logger.error(f"问答级别 {tier.name} 出错: {e}")
+            return "error", None, time.perf_counter() - started
+        if answer is None:
+            return "miss", None, time.perf_counter() - started
+        return ("hit" if answer.final else "candidate"), answer, time.perf_counter() - started
+
+    def run(self, context: Dict[str, Any], deadline: Optional[float] = None) -> PipelineResult:
+        """
+        按顺序执行各级，返回最终答案或截止时间到达时的最佳候选
+
+        Args:
+            context: 请求上下文（问题、用户ID等），各级可以在其中存放供后面级别使用的中间结果
+            deadline: 本次请求的截止时间（秒），默认为 self.deadline；一个问题拆成多个分句时各分句共用剩余时间
+
+        Returns:
+            PipelineResult
+        """
+        started = time.perf_counter()
+        trace: List[tuple] = []
+        best: Optional[tuple] = None  # (级别, TierAnswer)
+        deadline = self.deadline if deadline is None else deadline
+
+        for position, tier in enumerate(self.tiers):
+            remaining = deadline - (time.perf_counter() - started)
+            if remaining <= 0:
+                for skipped in self.tiers[position:]:
+                    self._record(skipped.name, "skipped", 0.0)
+                    trace.append((skipped.name, "skipped", 0.0))
+                break
+            outcome, answer, seconds = self._call(tier, context, min(tier.budget, remaining))
+            self._record(tier.name, outcome, seconds)
+            trace.append((tier.name, outcome, round(seconds, 6)))
+            if outcome == "hit":
+                return PipelineResult(answer.answer, tier.name, True, time.perf_counter() - started, trace)
+            if outcome == "candidate" and best is None:
+                best = (tier.name, answer)
+
+        if best is not None:
+            return PipelineResult(best[1].answer, best[0], False, time.perf_counter() - started, trace)
+
+        if self.fallback is not None:
+            outcome, answer, seconds = self._call(self.fallback, context, self.fallback.budget)
+            self._record(self.fallback.name, outcome, seconds)
+            trace.append((self.fallback.name, outcome, round(seconds, 6)))
+            if answer is not None:
+                return PipelineResult(answer.answer, self.fallback.name, answer.final,
+                                      time.perf_counter() - started, trace)
+        return PipelineResult(None, None, False, time.perf_counter() - started, trace)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """返回各级的累计统计"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+大模型投机预取。
+
+分类器只识别出景点、问题类型是默认的 `简介` 时，知识图谱返回的介绍往往不是用户想问的内容
+（例如"武侯祠供奉的是谁"），用户重新提问后才会调用大模型。投机模式在查询知识图谱的同时
+提前发起大模型调用：
+- 知识图谱的答案覆盖了问题的内容时取消投机调用；
+- 否则把投机调用按 (用户, 问题) 保存一段时间，用户重新提问时直接返回（或等待）它的结果。
+
+`SpeculationBudget` 限制投机调用占请求的比例：每个请求积累 max_fraction 个令牌，
+投机一次消耗一个令牌，同时限制同时进行的投机调用个数。
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from src.models.passage_index import question_terms
+
+
+def answer_coverage(question: str, answer: str, entities: Iterable[str] = ()) -> Optional[float]:
+    """
+    计算答案覆盖了问题中多少内容（字符二元组比例）
+
+    Args:
+        question: 用户问题
+        answer: 知识图谱给出的答案
+        entities: 问题中识别出的实体，不计入问题的内容
+
+    Returns:
+        0-1 的覆盖比例，问题中除实体和疑问词外没有其他内容时返回None
+    """
+    for entity in sorted(entities, key=len, reverse=True):
+        question = question.replace(entity, " ")
+    terms = set(question_terms(question))
+    if not terms:
+        return None
+    return sum(term in answer for term in terms) / len(terms)
+
+
+class SpeculationBudget:
+    """投机调用的令牌桶"""
+
+    def __init__(self, max_fraction: float, burst: float = 2.0, max_in_flight: int = 4):
+        """
+        Args:
+            max_fraction: 允许投机的请求比例上限
+            burst: 令牌数上限，允许短时间内连续投机的次数
+            max_in_flight: 同时进行的投机调用个数上限
+        """
+        self.max_fraction = max_fraction
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self._tokens = 0.0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "started": 0, "denied": 0, "cancelled": 0, "adopted": 0}
+
+    def note_request(self) -> None:
+        """记录一个请求，积累 max_fraction 个令牌"""
+        with self._lock:
+            self.counts["requests"] += 1
+            self._tokens = min(self.burst, self._tokens + self.max_fraction)
+
+    def try_acquire(self) -> bool:
+        """尝试开始一次投机调用，令牌不足或同时进行的调用过多时返回False"""
+        with self._lock:
+            if self._tokens < 1.0 or self._in_flight >= self.max_in_flight:
+                self.counts["denied"] += 1
+                return False
+            self._tokens -= 1.0
+            self._in_flight += 1
+            self.counts["started"] += 1
+            return True
+
+    def release(self) -> None:
+        """投机调用结束（完成、出错或取消）"""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def record(self, event: str) -> None:
+        """记录投机调用被取消（cancelled）或被采用（adopted）"""
+        with self._lock:
+            self.counts[event] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """返回计数和实际投机比例"""
+        with self._lock:
+            counts = dict(self.counts, in_flight=self._in_flight)
+        counts["fraction"] = round(counts["started"] / counts["requests"], 4) if counts["requests"] else 0.0
+        return counts
+
+
+class SpeculativeCall:
+    """在后台线程中执行的一次投机调用，可取消、可被后续请求采用"""
+
+    def __init__(self, query_id: str, worker: Callable[[threading.Event], Any],
+                 on_finish: Optional[Callable[["SpeculativeCall"], None]] = None):
+        """
+        Args:
+            query_id: 查询ID，结果同时写入API查询结果，前端可以轮询
+            worker: 执行调用的函数，参数为取消事件，应在事件被设置后尽早返回
+            on_finish: 调用结束后在后台线程中执行的回调
+        """
+        self.query_id = query_id
+        self.started = time.monotonic()
+        self.result: Any = None
+        self.adopted = False
+        self._worker = worker
+        self._on_finish = on_finish
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> "SpeculativeCall":
+        """启动后台线程"""
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            result = self._worker(self._cancel)
+        except Exception as e:
+            result = f"API查询处理异常: {e}"
+        with self._lock:
+            self.result = result
+            self._done.set()
+        if self._on_finish:
+            self._on_finish(self)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """取消调用，尚未开始的请求不再发出，进行中的请求尽早结束，结果被丢弃"""
+        self._cancel.set()
+
+    def adopt(self) -> Tuple[bool, Any]:
+        """
+        采用调用结果
+
+        Returns:
+            (是否已完成, 结果)；已完成时由调用方处理结果，未完成时标记为已采用，结束后由 on_finish 处理
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self.adopted = True
+            return self._done.is_set(), self.result
+
+
+class SpeculationStore:
+    """按 (用户, 问题) 保存未被取消的投机调用，超过有效期的调用被丢弃"""
+
+    def __init__(self, ttl: float = 300.0):
+        """
+        Args:
+            ttl: 有效期（秒）
+        """
+        self.ttl = ttl
+        self._calls: Dict[Tuple[str, str], SpeculativeCall] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def put(self, user_id: str, question: str, call: SpeculativeCall) -> None:
+        """保存投机调用，同时清理过期的调用"""
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, item in self._calls.items() if now - item.started > self.ttl]:
+                del self._calls[key]
+            self._calls[(user_id, question.strip())] = call
+
+    def pop(self, user_id: str, question: str) -> Optional[SpeculativeCall]:
+        """取出同一用户同一问题的投机调用，没有或已过期时返回None"""
+        with self._lock:
+            call = self._calls.pop((user_id, question.strip()), None)
+        if call is None or time.monotonic() - call.started > self.ttl:
+            return None
+        return call
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+离线批量导出工具，将三元组CSV转换为 `neo4j-admin database import` 可直接使用的节点/关系CSV。
+
+全量重建时，逐条执行Cypher事务是最慢的导入方式。本模块以流式方式读取
+`景点知识图谱_三元组.csv`，按主体分组输出带类型表头的文件：
+- nodes_景点.csv: 景点节点，评分/热度等数值属性使用 `rating:float` 形式的类型表头
+- nodes_<标签>.csv: 关系目标节点（城市、区县）
+- rels_<关系类型>.csv: 景点到目标节点的关系（属于城市、属于区县）
+
+内存占用只与节点ID集合相关，与三元组行数和介绍文本长度无关。
+"""
+
+import csv
+import os
+from typing import Any, Dict, List, Optional
+
+from py2neo_data_import import convert_property_value, get_property_details, get_relationship_details
+
+# 从日志模块导入
+from src.utils.logger import get_logger
+
+# 创建日志记录器
+logger = get_logger(__name__)
+
+# 景点节点标签
+ATTRACTION_LABEL = "景点"
+
+# 景点节点的属性谓语，顺序决定输出列顺序
+ATTRACTION_PREDICATES = [
+    "位于", "的评分是", "的热度为", "的开放时间为", "的开放时段为", "的官方电话是",
+    "的介绍是", "的优待政策是", "的成人票价是", "的儿童票价是", "是否免费开放",
+    "的服务设施包括", "的设施标签为", "的URL是",
+]
+
+# 关系谓语，顺序决定输出文件顺序
+RELATIONSHIP_PREDICATES = ["属于城市", "属于区县"]
+
+# Python类型到neo4j-admin表头类型的映射
+ADMIN_TYPES = {float: "float", int: "long", bool: "boolean", str: "string"}
+
+
+def _header_for(key: str, value_type: type) -> str:
+    """生成带类型的列名，字符串属性不需要类型后缀"""
+    admin_type = ADMIN_TYPES.get(value_type, "string")
+    return key if admin_type == "string" else f"{key}:{admin_type}"
+
+
+def _format(value: Any) -> str:
+    """将属性值格式化为neo4j-admin可解析的字符串"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _iter_blocks(triplets_path: str):
+    """
+    按主体连续分组读取三元组。
+
+    Yields:
+        (主体名称, [(谓语, 客体), ...])，主体名称为空的行会以空名称单独返回
+    """
+    with open(triplets_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or not all(k in reader.fieldnames for k in ("subject", "predicate", "object")):
+            raise ValueError(f"三元组文件缺少必要的列: 'subject', 'predicate', 'object' ({triplets_path})")
+
+        current = None
+        rows: List[tuple] = []
+        for row in reader:
+            subject = (row.get("subject") or "").strip()
+            predicate = (row.get("predicate") or "").strip()
+            obj = (row.get("object") or "").strip()
+            if subject != current:
+                if current is not None:
+                    yield current, rows
+                current, rows = subject, []
+            rows.append((predicate, obj))
+        if current is not None:
+            yield current, rows
+
+
+def export_for_neo4j_admin(triplets_path: str, output_dir: str) -> Dict[str, int]:
+    """
+    将三元组CSV导出为neo4j-admin批量导入格式。
+
+    第一遍只统计每个景点出现的分组数；第二遍流式写出节点和关系。
+    同一景点在文件中分散出现时，按事务导入的 MERGE + SET 语义合并属性（后出现的值覆盖先出现的值），
+    只有这类重复景点会在内存中暂存到其最后一个分组。
+
+    Args:
+        triplets_path: 三元组CSV文件路径
+        output_dir: 输出目录，不存在时自动创建
+
+    Returns:
+        统计信息字典，包括各类节点/关系数量以及被跳过的无效ID、无效属性值数量
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 第一遍：统计每个主体的分组数，用于识别分散出现的重复景点
+    remaining: Dict[str, int] = {}
+    for subject, _ in _iter_blocks(triplets_path):
+        if subject:
+            remaining[subject] = remaining.get(subject, 0) + 1
+
+    prop_details = [get_property_details(p) for p in ATTRACTION_PREDICATES]
+    rel_details = [get_relationship_details(p) for p in RELATIONSHIP_PREDICATES]
+
+    stats = {"attractions": 0, "invalid_ids": 0, "invalid_values": 0, "merged_duplicates": 0}
+    for details in rel_details:
+        stats[details["label"]] = 0
+        stats[details["type"]] = 0
+
+    node_path = os.path.join(output_dir, f"nodes_{ATTRACTION_LABEL}.csv")
+    target_paths = {d["label"]: os.path.join(output_dir, f"nodes_{d['label']}.csv") for d in rel_details}
+    rel_paths = {d["type"]: os.path.join(output_dir, f"rels_{d['type']}.csv") for d in rel_details}
+
+    files = []
+    try:
+        node_file = open(node_path, "w", encoding="utf-8", newline="")
+        files.append(node_file)
+        node_writer = csv.writer(node_file, lineterminator="\n")
+        node_writer.writerow(
+            [f"name:ID({ATTRACTION_LABEL})"]
+            + [_header_for(d["key"], d["type"]) for d in prop_details]
+            + [":LABEL"]
+        )
+
+        target_writers = {}
+        for label, path in target_paths.items():
+            target_file = open(path, "w", encoding="utf-8", newline="")
+            files.append(target_file)
+            target_writers[label] = csv.writer(target_file, lineterminator="\n")
+            target_writers[label].writerow([f"name:ID({label})", ":LABEL"])
+
+        rel_writers = {}
+        for details in rel_details:
+            rel_file = open(rel_paths[details["type"]], "w", encoding="utf-8", newline="")
+            files.append(rel_file)
+            rel_writers[details["type"]] = csv.writer(rel_file, lineterminator="\n")
+            rel_writers[details["type"]].writerow(
+                [f":START_ID({ATTRACTION_LABEL})", f":END_ID({details['label']})", ":TYPE"]
+            )
+
+        seen_targets = {label: set() for label in target_paths}
+        pending: Dict[str, Dict[str, Any]] = {}
+
+        # 第二遍：流式输出
+        for subject, rows in _iter_blocks(triplets_path):
+            if not subject:
+                stats["invalid_ids"] += len(rows)
+                continue
+
+            entry = pending.pop(subject, None) or {"props": {}, "rels": []}
+            for predicate, obj in rows:
+                if not predicate or not obj:
+                    continue
+                details = get_property_details(predicate)
+                if details:
+                    try:
+                        entry["props"][details["key"]] = convert_property_value(obj, details["type"])
+                    except ValueError:
+                        stats["invalid_values"] += 1
+                        logger.warning(f"跳过无法转换的属性值: {subject} {predicate} {obj}")
+                    continue
+                rel = get_relationship_details(predicate)
+                if rel and rel["type"] in rel_writers and (rel["type"], obj) not in entry["rels"]:
+                    entry["rels"].append((rel["type"], obj))
+
+            remaining[subject] -= 1
+            if remaining[subject] > 0:
+                # 该景点后面还会再次出现，暂存到最后一个分组再输出
+                pending[subject] = entry
+                stats["merged_duplicates"] += 1
+                continue
+
+            node_writer.writerow(
+                [subject]
+                + [_format(entry["props"].get(d["key"])) for d in prop_details]
+                + [ATTRACTION_LABEL]
+            )
+            stats["attractions"] += 1
+
+            for rel_type, target in entry["rels"]:
+                label = next(d["label"] for d in rel_details if d["type"] == rel_type)
+                if target not in seen_targets[label]:
+                    seen_targets[label].add(target)
+                    target_writers[label].writerow([target, label])
+                    stats[label] += 1
+                rel_writers[rel_type].writerow([subject, target, rel_type])
+                stats[rel_type] += 1
+    finally:
+        for f in files:
+            f.close()
+
+    logger.info(f"批量导出完成: {stats}")
+    return stats
+
+
+def build_admin_command(output_dir: str, database: str = "neo4j") -> str:
+    """
+    生成对应导出目录的 neo4j-admin 导入命令
+
+    Args:
+        output_dir: export_for_neo4j_admin 的输出目录
+        database: 目标数据库名称
+
+    Returns:
+        可直接执行的命令行字符串
+    """
+    parts = ["neo4j-admin database import full", database, "--overwrite-destination",
+             "--multiline-fields=true"]
+    for name in sorted(os.listdir(output_dir)):
+        path = os.path.join(output_dir, name)
+        if name.startswith("nodes_") and name.endswith(".csv"):
+            parts.append(f"--nodes={path}")
+        elif name.startswith("rels_") and name.endswith(".csv"):
+            parts.append(f"--relationships={path}")
+    return " ".join(parts)
+
+
+def main(triplets_path: Optional[str] = None, output_dir: Optional[str] = None) -> Dict[str, int]:
+    """
+    命令行入口，导出并打印neo4j-admin导入命令
+
+    Args:
+        triplets_path: 三元组CSV文件路径，默认为项目根目录下的 景点知识图谱_三元组.csv
+        output_dir: 输出目录，默认为项目根目录下的 neo4j_import
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    triplets_path = triplets_path or os.path.join(project_root, "景点知识图谱_三元组.csv")
+    output_dir = output_dir or os.path.join(project_root, "neo4j_import")
+
+    stats = export_for_neo4j_admin(triplets_path, output_dir)
+    print(f"已导出到 {output_dir}: {stats}")
+    print("使用以下命令进行离线导入（需先停止数据库）:")
+    print(build_admin_command(output_dir))
+    return stats
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+服务设施标签提取模块，将爬取的 `服务设施` 文本转换为规范化的设施标签。
+
+原始文本每项设施一段，以 "设施名称 ： 说明" 开头，例如：
+    停车场 ： 【金沙遗址博物馆停车场】参考价格：¥5元/次；……
+
+    WIFI ： 账号：Jinsha-site-Museum；……
+
+    童车租赁 ： 参考价格：免费；地址：游客中心
+
+只根据每行开头的设施名称判断，说明文字中顺带提到的设施不计入。
+不同写法归并为同一标签（例如 "WiFi"、"WIFI" -> "WIFI"，"残障通道"、"轮椅租赁" -> "无障碍设施"），
+多个标签按 FACILITY_ALIASES 的顺序以 `;` 连接，例如 "停车场;卫生间;WIFI"。
+"""
+
+import re
+from typing import List, Optional
+
+# 设施标签 -> 写法（小写匹配），顺序即标签的输出顺序；问题中的设施也按这些写法识别
+FACILITY_ALIASES = {
+    "停车场": ["停车场", "停车位", "停车"],
+    "卫生间": ["卫生间", "厕所", "洗手间"],
+    "无障碍设施": ["无障碍", "残障", "轮椅"],
+    "母婴室": ["母婴"],
+    "WIFI": ["wifi", "无线网"],
+    "餐饮": ["餐饮", "餐厅", "吃饭"],
+    "便利店": ["便利店", "小卖部", "超市"],
+    "行李寄存": ["行李寄存", "寄存"],
+    "手机充电": ["充电"],
+    "园内交通": ["园内交通", "观光车", "小火车", "摆渡车", "缆车"],
+    "讲解服务": ["讲解", "导游"],
+    "童车租赁": ["童车", "婴儿车"],
+    "纪念品商店": ["纪念品"],
+    "自动售卖机": ["售卖机", "售货机"],
+    "ATM": ["atm", "取款"],
+    "吸烟区": ["吸烟区"],
+    "雨具租赁": ["雨具", "雨伞"],
+    "淋浴设施": ["淋浴"],
+}
+
+# 标签分隔符
+TAG_SEPARATOR = ";"
+
+# 行首的设施名称："停车场 ： ……"
+_HEADER_PATTERN = re.compile(r"^\s*([^：:\n]{1,20}?)\s*[：:]", re.MULTILINE)
+
+
+def match_facilities(text: str) -> List[str]:
+    """
+    返回文本中提到的设施标签，按 FACILITY_ALIASES 的顺序
+
+    Args:
+        text: 设施名称或问题文本，例如 "轮椅租赁"、"哪些景点有停车场和无障碍设施"
+
+    Returns:
+        设施标签列表，没有时为空列表
+    """
+    lowered = text.lower()
+    return [tag for tag, aliases in FACILITY_ALIASES.items() if any(alias in lowered for alias in aliases)]
+
+
+def extract_facility_tags(facilities: Optional[str]) -> List[str]:
+    """
+    从服务设施文本中提取设施标签
+
+    Args:
+        facilities: 服务设施文本
+
+    Returns:
+        设施标签列表，按 FACILITY_ALIASES 的顺序，没有可识别的设施时为空列表
+    """
+    if not isinstance(facilities, str):
+        return []
+    headers = " ".join(_HEADER_PATTERN.findall(facilities))
+    return match_facilities(headers)
+
+
+def format_tags(tags: List[str]) -> str:
+    """将设施标签列表序列化为字符串，空列表返回空字符串"""
+    return TAG_SEPARATOR.join(tags)
+
+
+def parse_tags(serialized: Optional[str]) -> List[str]:
+    """解析 format_tags 输出的字符串，忽略未知的标签"""
+    if not isinstance(serialized, str):
+        return []
+    return [tag for tag in (part.strip() for part in serialized.split(TAG_SEPARATOR)) if tag in FACILITY_ALIASES]
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+四川省行政区划地名库，用于从景点地址中提取城市（地级行政区）和区县。
+
+地名库文件 `dict/sichuan_gazetteer.csv` 列出全部地级行政区及其下辖的区、县、县级市。
+加载时编译成前缀字典树，`extract` 从地址开头依次匹配 省 → 地级行政区 → 区县，
+每一级都取最长匹配，一次扫描同时得到城市和区县。
+
+`dict/sichuan_district_adjacency.csv` 列出相邻的区县（使用与 `extract` 相同的区县ID），
+用于回答"附近的景点"，不依赖地理编码服务。
+"""
+
+import csv
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 默认地名库文件路径
+DEFAULT_GAZETTEER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "dict", "sichuan_gazetteer.csv"
+)
+
+# 地级行政区名称后缀，去除后得到简称（例如 "阿坝藏族羌族自治州" -> "阿坝"）
+PREFECTURE_SUFFIXES = ("藏族羌族自治州", "藏族自治州", "彝族自治州", "市")
+
+# 默认区县相邻关系文件路径
+DEFAULT_ADJACENCY_PATH = os.path.join(os.path.dirname(DEFAULT_GAZETTEER_PATH), "sichuan_district_adjacency.csv")
+
+# 省级前缀
+PROVINCE_NAMES = ("四川省", "四川")
+
+# 字典树中标记词条结尾的键
+_END = ""
+
+
+def prefecture_short_name(prefecture: str) -> str:
+    """返回地级行政区的简称"""
+    for suffix in PREFECTURE_SUFFIXES:
+        if prefecture.endswith(suffix) and len(prefecture) > len(suffix):
+            return prefecture[:-len(suffix)]
+    return prefecture
+
+
+class Gazetteer:
+    """基于前缀字典树的地名库"""
+
+    def __init__(self, rows: Iterable[Tuple[str, str]]):
+        """
+        根据 (地级行政区全称, 区县全称) 列表构建字典树
+
+        Args:
+            rows: 地名库记录
+        """
+        self._trie: Dict[str, dict] = {}
+        # 区县名称 -> {城市简称: 区县ID}
+        self._districts: Dict[str, Dict[str, str]] = {}
+        self.prefectures: List[str] = []
+        # 地级行政区的各种写法（全称、简称、"X州"）-> 简称
+        self.prefecture_aliases: Dict[str, str] = {}
+
+        rows = list(rows)
+        name_count: Dict[str, int] = {}
+        for _, district in rows:
+            name_count[district] = name_count.get(district, 0) + 1
+
+        for name in PROVINCE_NAMES:
+            self._insert(name, ("province", None))
+
+        for prefecture, district in rows:
+            city = prefecture_short_name(prefecture)
+            if city not in self.prefectures:
+                self.prefectures.append(city)
+                aliases = [prefecture, city] + ([city + "州"] if prefecture.endswith("自治州") else [])
+                for alias in aliases:
+                    self._insert(alias, ("prefecture", city))
+                    self.prefecture_aliases[alias] = city
+            # 同名区县（例如内江市和乐山市都有"市中区"）使用 地级行政区全称+区县名 作为ID
+            district_id = district if name_count[district] == 1 else prefecture + district
+            self._districts.setdefault(district, {})[city] = district_id
+            self._insert(district, ("district", district))
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_GAZETTEER_PATH) -> "Gazetteer":
+        """
+        从CSV地名库文件加载
+
+        Args:
+            path: 地名库文件路径，表头为 prefecture,district
+
+        Returns:
+            Gazetteer实例
+        """
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            rows = [(row["prefecture"].strip(), row["district"].strip()) for row in reader
+                    if row.get("prefecture") and row.get("district")]
+        return cls(rows)
+
+    def _insert(self, word: str, entry: tuple) -> None:
+        """向字典树中插入一个词条"""
+        node = self._trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_END] = entry
+
+    def _longest_match(self, text: str, pos: int) -> Tuple[Optional[tuple], int]:
+        """从pos开始查找最长匹配的词条，返回 (词条, 结束位置)"""
+        node = self._trie
+        best, best_end = None, pos
+        i = pos
+        while i < len(text):
+            node = node.get(text[i])
+            if node is None:
+                break
+            i += 1
+            if _END in node:
+                best, best_end = node[_END], i
+        return best, best_end
+
+    def extract(self, address: str) -> Tuple[str, str]:
+        """
+        从地址中提取城市简称和区县ID
+
+        Args:
+            address: 地址字符串，例如 "四川省成都市武侯区武侯祠大街231号"
+
+        Returns:
+            (城市简称, 区县ID)，无法识别的部分为空字符串，例如 ("成都", "武侯区")
+        """
+        if not address:
+            return "", ""
+        text = address.strip()
+        city, district = "", ""
+
+        entry, pos = self._longest_match(text, 0)
+        if entry and entry[0] == "province":
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            entry, pos = self._longest_match(text, pos)
+
+        if entry and entry[0] == "prefecture":
+            city = entry[1]
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            entry, pos = self._longest_match(text, pos)
+
+        if entry and entry[0] == "district":
+            owners = self._districts[entry[1]]
+            if city:
+                district = owners.get(city, "")
+            elif len(owners) == 1:
+                # 地址直接以区县开头时，由区县反推城市；同名区县无法确定归属，不做推断
+                city, district = next(iter(owners.items()))
+
+        return city, district
+
+
+def load_district_adjacency(path: str = DEFAULT_ADJACENCY_PATH) -> Dict[str, List[str]]:
+    """
+    读取区县相邻关系，每对区县只需列出一次
+
+    Args:
+        path: 相邻关系文件路径，表头为 district,neighbor
+
+    Returns:
+        区县ID -> 相邻区县ID列表，文件不存在时返回空字典
+    """
+    adjacency: Dict[str, List[str]] = {}
+    if not os.path.exists(path):
+        return adjacency
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            a, b = (row.get("district") or "").strip(), (row.get("neighbor") or "").strip()
+            if not a or not b or a == b:
+                continue
+            for district, neighbor in ((a, b), (b, a)):
+                neighbors = adjacency.setdefault(district, [])
+                if neighbor not in neighbors:
+                    neighbors.append(neighbor)
+    return adjacency
+
+
+_gazetteer: Optional[Gazetteer] = None
+
+
+def get_gazetteer() -> Gazetteer:
+    """
+    获取默认地名库实例（首次调用时加载）
+
+    Returns:
+        Gazetteer实例
+    """
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer.from_file()
+    return _gazetteer
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+开放时间解析模块，将爬取的 `开放时间` 文本解析为结构化的季节/星期/时段规则。
+
+原始文本示例：
+- "全年 08:30-17:30开放"
+- "03/01-10/31 07:30-18:00开放;11/01-02/28 08:00-17:30开放"
+- "全年 周一-周五 13:30-21:00开放;全年 周六-周日 10:00-21:00开放"
+- "全年 全天开放，具体营业状态以当天开放情况为准"
+
+只解析以"开放"结尾、限定条件为 全年/日期/星期 的子句；"全天不开放"等闭馆子句
+和依赖节假日的子句不生成规则。每条规则序列化为 `MMDD-MMDD|星期|HHMM-HHMM`，多条规则以 `;` 连接，
+例如 "0301-1031|1234567|0730-1800;1101-1231|1234567|0800-1730"。
+跨越零点的时段结束时间小于开始时间（例如 "2000-0200"）。
+原始文本用 02/28 表示二月底，以 02/28 结束的日期范围包含闰年的2月29日。
+"""
+
+import datetime
+import re
+from typing import List, NamedTuple, Optional
+
+# 用于计算日期序号的闰年，保证2月29日也有对应的序号
+_LEAP_YEAR = 2000
+
+# 一天的分钟数
+MINUTES_PER_DAY = 24 * 60
+
+# 星期的中文写法到 0(周一)-6(周日) 的映射
+WEEKDAY_CHARS = {"一": 0, "二": 1, "三": 2, "四": 3, "五": 4, "六": 5, "日": 6, "天": 6}
+
+# 全部星期的位掩码
+ALL_WEEKDAYS = 0b1111111
+
+_DATE_RANGE_PATTERN = re.compile(r"(\d{1,2})/(\d{1,2})\s*-\s*(\d{1,2})/(\d{1,2})")
+_SINGLE_DATE_PATTERN = re.compile(r"(\d{1,2})/(\d{1,2})")
+_WEEKDAY_PATTERN = re.compile(r"周([一二三四五六日天])(?:\s*[-至到~]\s*周([一二三四五六日天]))?")
+_TIME_RANGE_PATTERN = re.compile(r"(\d{1,2}):(\d{2})\s*[-至到~]\s*(?:次日)?(\d{1,2}):(\d{2})")
+_RULE_PATTERN = re.compile(r"^(\d{4})-(\d{4})\|([1-7]{1,7})\|(\d{4})-(\d{4})$")
+
+
+class OpeningRule(NamedTuple):
+    """一条开放规则：在 [start_day, end_day] 日期范围内、weekdays 中的星期，开放 [open_minute, close_minute) 分钟"""
+    start_day: int      # 起始日期序号（闰年中的第几天，1-366）
+    end_day: int        # 结束日期序号（含），不小于 start_day
+    weekdays: int       # 星期位掩码，第0位为周一
+    open_minute: int    # 开放时间，当天零点起的分钟数
+    close_minute: int   # 关闭时间，跨越零点时大于 MINUTES_PER_DAY
+
+    def covers_day(self, day: int, weekday: int) -> bool:
+        """判断规则是否适用于指定日期序号和星期"""
+        return self.start_day <= day <= self.end_day and bool(self.weekdays >> weekday & 1)
+
+
+def day_of_year(month: int, day: int) -> int:
+    """
+    返回月/日在闰年中的日期序号，日期非法时抛出ValueError
+
+    Args:
+        month: 月份
+        day: 日
+
+    Returns:
+        1-366 的日期序号
+    """
+    return datetime.date(_LEAP_YEAR, month, day).timetuple().tm_yday
+
+
+def range_end_day(month: int, day: int) -> int:
+    """
+    返回日期范围结束日的序号；结束于 02/28 的范围视为到二月底，包含闰年的2月29日
+
+    Args:
+        month: 月份
+        day: 日
+
+    Returns:
+        1-366 的日期序号
+    """
+    end = day_of_year(month, day)
+    return end + 1 if (month, day) == (2, 28) else end
+
+
+def date_of_day(day: int) -> str:
+    """将日期序号格式化为 MMDD"""
+    date = datetime.date(_LEAP_YEAR, 1, 1) + datetime.timedelta(days=day - 1)
+    return f"{date.month:02d}{date.day:02d}"
+
+
+def _weekday_mask(segment: str) -> int:
+    """从文本片段中解析星期位掩码，没有星期限定时返回全部星期"""
+    mask = 0
+    for start, end in _WEEKDAY_PATTERN.findall(segment):
+        first = WEEKDAY_CHARS[start]
+        last = WEEKDAY_CHARS[end] if end else first
+        day = first
+        while True:
+            mask |= 1 << day
+            if day == last:
+                break
+            day = (day + 1) % 7
+    return mask or ALL_WEEKDAYS
+
+
+def _day_ranges(segment: str) -> Optional[List[tuple]]:
+    """从文本片段中解析日期范围，跨年的范围拆成两段；无法识别的日期返回None"""
+    try:
+        match = _DATE_RANGE_PATTERN.search(segment)
+        if match:
+            start = day_of_year(int(match.group(1)), int(match.group(2)))
+            end = range_end_day(int(match.group(3)), int(match.group(4)))
+        else:
+            match = _SINGLE_DATE_PATTERN.search(segment)
+            if not match:
+                # "全年" 或未写日期时视为全年
+                return [(1, 366)]
+            start = end = day_of_year(int(match.group(1)), int(match.group(2)))
+    except ValueError:
+        return None
+    if start <= end:
+        return [(start, end)]
+    # 例如 11/01-02/28，拆分为 11/01-12/31 和 01/01-02/29
+    return [(start, 366), (1, end)]
+
+
+def _time_ranges(segment: str) -> List[tuple]:
+    """从文本片段中解析开放时段（分钟），跨越零点的时段结束时间加一天"""
+    if "全天" in segment:
+        return [(0, MINUTES_PER_DAY)]
+    ranges = []
+    for h1, m1, h2, m2 in _TIME_RANGE_PATTERN.findall(segment):
+        open_minute = int(h1) * 60 + int(m1)
+        close_minute = int(h2) * 60 + int(m2)
+        if open_minute >= MINUTES_PER_DAY or close_minute > MINUTES_PER_DAY:
+            continue
+        if close_minute <= open_minute:
+            close_minute += MINUTES_PER_DAY
+        ranges.append((open_minute, close_minute))
+    return ranges
+
+
+def _is_plain_qualifier(head: str) -> bool:
+    """判断开放时段前的限定只由 全年/日期/星期 组成"""
+    rest = _TIME_RANGE_PATTERN.sub("", head)
+    rest = _DATE_RANGE_PATTERN.sub("", rest)
+    rest = _SINGLE_DATE_PATTERN.sub("", rest)
+    rest = _WEEKDAY_PATTERN.sub("", rest)
+    rest = re.sub(r"全年|全天|[\s,，、]", "", rest)
+    return not rest
+
+
+def parse_opening_hours(text: str) -> List[OpeningRule]:
+    """
+    将开放时间文本解析为开放规则列表
+
+    Args:
+        text: 爬取的开放时间文本，例如 "全年 周一-周五 13:30-21:00开放;全年 周六-周日 10:00-21:00开放"
+
+    Returns:
+        开放规则列表；"待定"、"以当天开放情况为准" 等无法确定时段的文本返回空列表
+    """
+    if not isinstance(text, str) or not text.strip():
+        return []
+    rules = []
+    for segment in re.split(r"[;；]", text):
+        # 只解析"……开放"子句，之后是补充说明（例如"，演出开始时间 19:30"）
+        head, found, _ = segment.partition("开放")
+        head = head.strip()
+        if not found or not head or head.startswith("待定") or head.endswith("不"):
+            # 没有开放时段，或为"全天不开放"等闭馆规则（开放规则取并集，闭馆日自然不在其中）
+            continue
+        if not _is_plain_qualifier(head):
+            # "劳动节 09:00-18:30开放" 之类依赖节假日的规则无法换算为日期，跳过
+            continue
+        segment = head
+        times = _time_ranges(segment)
+        days = _day_ranges(segment)
+        if not times or not days:
+            continue
+        weekdays = _weekday_mask(segment)
+        for start_day, end_day in days:
+            for open_minute, close_minute in times:
+                rules.append(OpeningRule(start_day, end_day, weekdays, open_minute, close_minute))
+    return rules
+
+
+def _format_minute(minute: int) -> str:
+    """将分钟数格式化为 HHMM，跨越零点的时间取模"""
+    if minute > MINUTES_PER_DAY:
+        minute -= MINUTES_PER_DAY
+    return f"{minute // 60:02d}{minute % 60:02d}"
+
+
+def format_rules(rules: List[OpeningRule]) -> str:
+    """
+    将开放规则列表序列化为字符串，空列表返回空字符串
+
+    Args:
+        rules: 开放规则列表
+
+    Returns:
+        例如 "0101-1231|1234567|0830-1730"
+    """
+    parts = []
+    for rule in rules:
+        weekdays = "".join(str(day + 1) for day in range(7) if rule.weekdays >> day & 1)
+        parts.append(
+            f"{date_of_day(rule.start_day)}-{date_of_day(rule.end_day)}|{weekdays}|"
+            f"{_format_minute(rule.open_minute)}-{_format_minute(rule.close_minute)}"
+        )
+    return ";".join(parts)
+
+
+def parse_rules(serialized: str) -> List[OpeningRule]:
+    """
+    解析 format_rules 输出的字符串，格式错误的规则会被跳过
+
+    Args:
+        serialized: 序列化的开放规则
+
+    Returns:
+        开放规则列表
+    """
+    rules = []
+    if not isinstance(serialized, str):
+        return rules
+    for part in serialized.split(";"):
+        match = _RULE_PATTERN.match(part.strip())
+        if not match:
+            continue
+        start, end, weekdays, open_hhmm, close_hhmm = match.groups()
+        try:
+            start_day = day_of_year(int(start[:2]), int(start[2:]))
+            # 单日规则不扩展；之前预处理保存的 "0101-0228" 同样包含2月29日
+            end_day = range_end_day(int(end[:2]), int(end[2:])) if end != start else start_day
+        except ValueError:
+            continue
+        open_minute = int(open_hhmm[:2]) * 60 + int(open_hhmm[2:])
+        close_minute = int(close_hhmm[:2]) * 60 + int(close_hhmm[2:])
+        if close_minute <= open_minute:
+            close_minute += MINUTES_PER_DAY
+        mask = 0
+        for char in weekdays:
+            mask |= 1 << (int(char) - 1)
+        rules.append(OpeningRule(start_day, end_day, mask, open_minute, close_minute))
+    return rules
+
+
+def format_time_ranges(rules: List[OpeningRule], day: int, weekday: int) -> str:
+    """
+    返回某一天适用的开放时段文本，例如 "08:00-17:30"、"全天"，当天不开放时返回空字符串
+
+    Args:
+        rules: 开放规则列表
+        day: 日期序号
+        weekday: 星期（0为周一）
+    """
+    ranges = []
+    for rule in rules:
+        if not rule.covers_day(day, weekday):
+            continue
+        if rule.open_minute == 0 and rule.close_minute == MINUTES_PER_DAY:
+            text = "全天"
+        else:
+            start, end = _format_minute(rule.open_minute), _format_minute(rule.close_minute)
+            text = f"{start[:2]}:{start[2:]}-{end[:2]}:{end[2:]}"
+        if text not in ranges:
+            ranges.append(text)
+    return "、".join(ranges)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+离线BM25段落索引构建工具，把景点 `介绍` 切分为句子级段落并建立倒排索引。
+
+很多问题（"都江堰是谁修的"、"碧峰峡有多少只大熊猫"）的答案就在已爬取的介绍文本中。
+段落按句号、问号、换行等切分，过短的句子与后一句合并；分词使用字符二元组，景点名称不参与索引，
+问题提到的景点由检索时的名称匹配处理（见 `src.models.passage_index`）。
+
+每个词的倒排表按 CSR 形式存放（term_ptr/passage_ids/weights），weights 是预先算好的
+BM25 词项得分 idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))，
+查询时只需取出问题中各词的倒排表，用 `np.bincount` 累加即得到全部段落的得分。
+"""
+
+import os
+import re
+import time
+from collections import Counter
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from src.data.text_neighbors import char_ngrams, snapshot_signature
+# 从日志模块导入
+from src.utils.logger import get_logger
+
+# 创建日志记录器
+logger = get_logger(__name__)
+
+# 参与检索的景点文本属性
+PASSAGE_FIELDS = ("introduction",)
+
+# 分词使用的字符n-gram长度
+TOKEN_NGRAM = (2, 2)
+
+# BM25参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 段落的最少字数，更短的句子与后一句合并
+MIN_PASSAGE_CHARS = 20
+
+# 句子边界：句末标点（保留在句中）或换行
+_SENTENCE_PATTERN = re.compile(r"[^。！？!?；;\n]+[。！？!?；;]*")
+
+
+class BM25Index(NamedTuple):
+    """BM25段落倒排索引"""
+    names: List[str]             # 景点名称
+    passages: List[str]          # 段落文本
+    owners: np.ndarray           # int32，每个段落所属景点在 names 中的下标
+    terms: List[str]             # 词表
+    idf: np.ndarray              # float32，每个词的idf
+    term_ptr: np.ndarray         # int64，第 t 个词的倒排表为 [term_ptr[t], term_ptr[t+1])
+    passage_ids: np.ndarray      # int32，倒排表中的段落下标
+    weights: np.ndarray          # float32，倒排表中每项的BM25词项得分
+    signature: str               # 数据签名，用于判断文件是否与当前数据一致
+
+
+def split_passages(text: Optional[str], min_chars: int = MIN_PASSAGE_CHARS) -> List[str]:
+    """
+    将介绍文本切分为句子级段落
+
+    Args:
+        text: 介绍文本
+        min_chars: 段落的最少字数，更短的句子与后一句合并
+
+    Returns:
+        段落列表
+    """
+    if not isinstance(text, str):
+        return []
+    passages = []
+    pending = ""
+    for sentence in _SENTENCE_PATTERN.findall(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        pending += sentence
+        if len(pending) >= min_chars:
+            passages.append(pending)
+            pending = ""
+    if pending:
+        if passages and len(pending) < min_chars:
+            passages[-1] += pending
+        else:
+            passages.append(pending)
+    return passages
+
+
+def tokenize(text: str) -> List[str]:
+    """将文本切分为字符二元组"""
+    return char_ngrams(text, TOKEN_NGRAM)
+
+
+def passage_signature(snapshot) -> str:
+    """计算快照中景点名称和介绍文本的签名"""
+    return snapshot_signature(snapshot, PASSAGE_FIELDS, f"bm25|{TOKEN_NGRAM}|{BM25_K1}|{BM25_B}|{MIN_PASSAGE_CHARS}")
+
+
+def build_bm25_index(snapshot) -> BM25Index:
+    """
+    为快照中全部景点的介绍构建BM25段落索引
+
+    Args:
+        snapshot: KGSnapshot实例
+
+    Returns:
+        BM25Index
+    """
+    started = time.perf_counter()
+    passages: List[str] = []
+    owners: List[int] = []
+    counts: List[Counter] = []
+    for owner, name in enumerate(snapshot.names):
+        props = snapshot.attractions[name]
+        for field in PASSAGE_FIELDS:
+            for passage in split_passages(props.get(field)):
+                passages.append(passage)
+                owners.append(owner)
+                counts.append(Counter(tokenize(passage)))
+
+    df = Counter()
+    for doc in counts:
+        df.update(doc.keys())
+    terms = sorted(df)
+    term_ids = {term: i for i, term in enumerate(terms)}
+    n_passages = len(passages)
+    df_array = np.array([df[term] for term in terms], dtype=np.float64)
+    idf = np.log(1 + (n_passages - df_array + 0.5) / (df_array + 0.5))
+
+    lengths = np.array([sum(doc.values()) for doc in counts], dtype=np.float64)
+    avg_length = lengths.mean() if n_passages else 1.0
+
+    # 按词排序得到倒排表
+    rows = np.repeat(np.arange(n_passages, dtype=np.int32), [len(doc) for doc in counts])
+    cols = np.fromiter((term_ids[term] for doc in counts for term in doc), dtype=np.int64, count=len(rows))
+    tfs = np.fromiter((tf for doc in counts for tf in doc.values()), dtype=np.float64, count=len(rows))
+    order = np.argsort(cols, kind="stable")
+    rows, cols, tfs = rows[order], cols[order], tfs[order]
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[rows] / avg_length)
+    weights = idf[cols] * tfs * (BM25_K1 + 1) / (tfs + norm)
+    term_ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+    term_ptr[1:] = np.cumsum(np.bincount(cols, minlength=len(terms)))
+
+    logger.info(f"BM25段落索引构建完成: {n_passages} 个段落, 词表 {len(terms)}, 用时 {time.perf_counter() - started:.2f}s")
+    return BM25Index(list(snapshot.names), passages, np.array(owners, dtype=np.int32), terms,
+                     idf.astype(np.float32), term_ptr, rows, weights.astype(np.float32), passage_signature(snapshot))
+
+
+def save_bm25_index(index: BM25Index, path: str) -> None:
+    """将BM25段落索引保存为 .npz 文件"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        np.savez(f, names=np.array(index.names, dtype=str), passages=np.array(index.passages, dtype=str),
+                 owners=index.owners, terms=np.array(index.terms, dtype=str), idf=index.idf,
+                 term_ptr=index.term_ptr, passage_ids=index.passage_ids, weights=index.weights,
+                 signature=np.array(index.signature))
+
+
+def load_bm25_index(path: str) -> Optional[BM25Index]:
+    """
+    读取 save_bm25_index 保存的文件
+
+    Args:
+        path: .npz 文件路径
+
+    Returns:
+        BM25Index，文件不存在或格式错误时返回None
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return BM25Index(data["names"].tolist(), data["passages"].tolist(), data["owners"],
+                             data["terms"].tolist(), data["idf"], data["term_ptr"], data["passage_ids"],
+                             data["weights"], str(data["signature"]))
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f"读取BM25段落索引失败: {path} ({e})")
+        return None
+
+
+def main(output_path: Optional[str] = None) -> BM25Index:
+    """
+    命令行入口，为当前快照构建BM25段落索引并保存
+
+    Args:
+        output_path: 输出文件路径，默认为配置项 PASSAGE_INDEX_PATH
+    """
+    from src.models.passage_index import default_index_path
+    from src.models.snapshot import load_snapshot
+
+    output_path = output_path or default_index_path()
+    index = build_bm25_index(load_snapshot())
+    save_bm25_index(index, output_path)
+    print(f"已保存BM25段落索引到 {output_path}: {len(index.passages)} 个段落")
+    return index
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+离线相似景点计算工具，基于 `介绍` 和 `服务设施` 文本为每个景点预先计算最相似的景点。
+
+不依赖外部模型：文本切分为汉字/字母数字连续片段，取2-3字的字符n-gram，
+按文档频率筛选词表后计算TF-IDF（对数词频，L2归一化），余弦相似度即向量内积。
+TF-IDF矩阵以CSR形式（indptr/indices/data 三个NumPy数组）保存，计算近邻时
+按行分块，每次只把两个行块展开为稠密矩阵做矩阵乘法，并与已有的top-k合并，
+内存占用只与块大小和词表大小相关，与景点总数无关。
+
+结果保存为 `.npz` 文件（景点名称、近邻下标、相似度和数据签名），问答时只需一次查表。
+"""
+
+import hashlib
+import math
+import os
+import re
+import time
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+# 从日志模块导入
+from src.utils.logger import get_logger
+
+# 创建日志记录器
+logger = get_logger(__name__)
+
+# 参与计算的景点文本属性
+TEXT_FIELDS = ("introduction", "facilities")
+
+# 字符n-gram的长度
+NGRAM_RANGE = (2, 3)
+
+# 词表筛选：至少出现在2个景点中（只出现一次的n-gram对任何两个景点的相似度都没有贡献），
+# 出现在一半以上景点中的n-gram（"参考价格"、"停车场"等模板文字）视为停用词
+MIN_DF = 2
+MAX_DF_RATIO = 0.5
+
+# 词表大小上限，按文档频率保留最常见的n-gram
+MAX_FEATURES = 16384
+
+# 每个景点保存的近邻个数
+TOP_K = 10
+
+# 分块计算时每块的景点数
+BLOCK_SIZE = 1024
+
+# 非文字字符，用于切分连续片段
+_SEPARATOR_PATTERN = re.compile(r"[\W_]+")
+
+
+class TfidfMatrix(NamedTuple):
+    """CSR格式的TF-IDF矩阵，每行已L2归一化"""
+    indptr: np.ndarray   # 行起始位置，长度为行数+1
+    indices: np.ndarray  # 列下标（词表序号）
+    data: np.ndarray     # TF-IDF权重
+    n_features: int      # 词表大小
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def dense_rows(self, start: int, stop: int) -> np.ndarray:
+        """将第 [start, stop) 行展开为稠密的float32矩阵"""
+        block = np.zeros((stop - start, self.n_features), dtype=np.float32)
+        lo, hi = self.indptr[start], self.indptr[stop]
+        rows = np.repeat(np.arange(stop - start), np.diff(self.indptr[start:stop + 1]))
+        block[rows, self.indices[lo:hi]] = self.data[lo:hi]
+        return block
+
+
+class NeighborTable(NamedTuple):
+    """相似景点表，第 i 行是 names[i] 的近邻，按相似度从高到低排列"""
+    names: List[str]
+    neighbors: np.ndarray  # int32 (n, k)，不足k个时以-1补齐
+    scores: np.ndarray     # float32 (n, k)
+    signature: str         # 数据签名，用于判断文件是否与当前数据一致
+
+
+def char_ngrams(text: str, ngram_range: Sequence[int] = NGRAM_RANGE) -> List[str]:
+    """
+    提取文本的字符n-gram，n-gram不跨越标点和空白
+
+    Args:
+        text: 文本
+        ngram_range: (最小长度, 最大长度)
+
+    Returns:
+        n-gram列表（可重复）
+    """
+    grams = []
+    low, high = ngram_range
+    for run in _SEPARATOR_PATTERN.split(text.lower()):
+        for n in range(low, high + 1):
+            grams.extend(run[i:i + n] for i in range(len(run) - n + 1))
+    return grams
+
+
+def build_tfidf(texts: Sequence[str], min_df: int = MIN_DF, max_df_ratio: float = MAX_DF_RATIO,
+                max_features: int = MAX_FEATURES) -> TfidfMatrix:
+    """
+    计算文本的TF-IDF矩阵
+
+    Args:
+        texts: 文本列表，每个景点一条
+        min_df: n-gram至少出现的文本数
+        max_df_ratio: n-gram最多出现的文本比例
+        max_features: 词表大小上限
+
+    Returns:
+        TfidfMatrix，空文本对应的行为全零
+    """
+    counts = [Counter(char_ngrams(text)) for text in texts]
+    df = Counter()
+    for doc in counts:
+        df.update(doc.keys())
+
+    n_docs = len(texts)
+    max_df = max_df_ratio * n_docs
+    candidates = [(gram, freq) for gram, freq in df.items() if min_df <= freq <= max_df]
+    # 文档频率高的优先，相同时按n-gram排序，保证结果可复现
+    candidates.sort(key=lambda item: (-item[1], item[0]))
+    vocabulary = {gram: col for col, (gram, _) in enumerate(candidates[:max_features])}
+    idf = np.array([math.log((1 + n_docs) / (1 + df[gram])) + 1 for gram in vocabulary], dtype=np.float64)
+
+    indptr = np.zeros(n_docs + 1, dtype=np.int64)
+    indices: List[int] = []
+    weights: List[float] = []
+    for row, doc in enumerate(counts):
+        for gram, tf in doc.items():
+            col = vocabulary.get(gram)
+            if col is not None:
+                indices.append(col)
+                weights.append(1 + math.log(tf))
+        indptr[row + 1] = len(indices)
+
+    indices_array = np.array(indices, dtype=np.int32)
+    data = np.array(weights, dtype=np.float64) * idf[indices_array]
+    # 按行L2归一化
+    row_ids = np.repeat(np.arange(n_docs), np.diff(indptr))
+    norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=n_docs))
+    data /= np.where(norms > 0, norms, 1.0)[row_ids]
+    return TfidfMatrix(indptr, indices_array, data.astype(np.float32), len(vocabulary))
+
+
+def top_k_neighbors(matrix: TfidfMatrix, k: int = TOP_K, block_size: int = BLOCK_SIZE):
+    """
+    分块计算每行余弦相似度最高的k行（不含自身）
+
+    Args:
+        matrix: 已归一化的TF-IDF矩阵
+        k: 近邻个数
+        block_size: 每块的行数
+
+    Returns:
+        (neighbors, scores)：int32 和 float32 的 (n, k) 数组，相似度为0的位置下标为-1
+    """
+    n = matrix.n_rows
+    neighbors = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if n == 0 or k <= 0:
+        return neighbors, scores
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        query = matrix.dense_rows(start, stop)
+        best_scores = np.full((stop - start, k), -np.inf, dtype=np.float32)
+        best_ids = np.full((stop - start, k), -1, dtype=np.int64)
+        for other_start in range(0, n, block_size):
+            other_stop = min(other_start + block_size, n)
+            other = query if other_start == start else matrix.dense_rows(other_start, other_stop)
+            block_scores = query @ other.T
+            if other_start == start:
+                # 排除自身
+                np.fill_diagonal(block_scores, -np.inf)
+            # 与已有的top-k合并后重新取top-k
+            merged_scores = np.concatenate([best_scores, block_scores], axis=1)
+            merged_ids = np.concatenate(
+                [best_ids, np.broadcast_to(np.arange(other_start, other_stop), block_scores.shape)], axis=1
+            )
+            keep = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(merged_scores, keep, axis=1)
+            best_ids = np.take_along_axis(merged_ids, keep, axis=1)
+
+        # 按相似度从高到低、下标从小到大排序
+        order = np.lexsort((best_ids, -best_scores))
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+        valid = best_scores > 0
+        neighbors[start:stop] = np.where(valid, best_ids, -1)
+        scores[start:stop] = np.where(valid, best_scores, 0)
+    return neighbors, scores
+
+
+def attraction_text(props: Dict, fields: Sequence[str] = TEXT_FIELDS) -> str:
+    """拼接景点参与计算的文本属性"""
+    return "\n".join(props.get(field) for field in fields if isinstance(props.get(field), str))
+
+
+def snapshot_signature(snapshot, fields: Sequence[str] = TEXT_FIELDS, params: Optional[str] = None) -> str:
+    """
+    计算快照景点名称和文本的签名，数据或参数变化时签名随之变化
+
+    Args:
+        snapshot: KGSnapshot实例
+        fields: 参与签名的文本属性
+        params: 影响计算结果的参数描述，默认为相似景点表的参数
+    """
+    if params is None:
+        params = f"{NGRAM_RANGE}|{MIN_DF}|{MAX_DF_RATIO}|{MAX_FEATURES}"
+    digest = hashlib.sha1(params.encode("utf-8"))
+    for name in snapshot.names:
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\x1f")
+        digest.update(attraction_text(snapshot.attractions[name], fields).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def build_neighbor_table(snapshot, k: int = TOP_K, block_size: int = BLOCK_SIZE) -> NeighborTable:
+    """
+    为快照中的全部景点计算相似景点表
+
+    Args:
+        snapshot: KGSnapshot实例
+        k: 每个景点保存的近邻个数
+        block_size: 分块计算时每块的景点数
+
+    Returns:
+        NeighborTable
+    """
+    started = time.perf_counter()
+    texts = [attraction_text(snapshot.attractions[name]) for name in snapshot.names]
+    matrix = build_tfidf(texts)
+    vectorized = time.perf_counter()
+    neighbors, scores = top_k_neighbors(matrix, k, block_size)
+    logger.info(
+        f"相似景点表计算完成: {matrix.n_rows} 个景点, 词表 {matrix.n_features}, "
+        f"TF-IDF {vectorized - started:.2f}s, 近邻 {time.perf_counter() - vectorized:.2f}s"
+    )
+    return NeighborTable(list(snapshot.names), neighbors, scores, snapshot_signature(snapshot))
+
+
+def save_neighbor_table(table: NeighborTable, path: str) -> None:
+    """将相似景点表保存为 .npz 文件"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        np.savez(f, names=np.array(table.names, dtype=str), neighbors=table.neighbors,
+                 scores=table.scores, signature=np.array(table.signature))
+
+
+def load_neighbor_table(path: str) -> Optional[NeighborTable]:
+    """
+    读取 save_neighbor_table 保存的文件
+
+    Args:
+        path: .npz 文件路径
+
+    Returns:
+        NeighborTable，文件不存在或格式错误时返回None
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return NeighborTable(data["names"].tolist(), data["neighbors"].astype(np.int32),
+                                 data["scores"].astype(np.float32), str(data["signature"]))
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f"读取相似景点表失败: {path} ({e})")
+        return None
+
+
+def main(output_path: Optional[str] = None) -> NeighborTable:
+    """
+    命令行入口，为当前快照计算相似景点表并保存
+
+    Args:
+        output_path: 输出文件路径，默认为配置项 SIMILAR_TABLE_PATH
+    """
+    from src.models.similar_index import default_table_path
+    from src.models.snapshot import load_snapshot
+
+    output_path = output_path or default_table_path()
+    table = build_neighbor_table(load_snapshot())
+    save_neighbor_table(table, output_path)
+    print(f"已保存相似景点表到 {output_path}: {len(table.names)} 个景点")
+    return table
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+门票价格提取模块，从 `优待政策`、`介绍`、`开放时间` 等自由文本中提取数值化的票价。
+
+爬取的数据没有单独的票价字段，票价信息散落在文本中，例如：
+- 介绍: "……光影动漫嘉年华门票（成人票128元/张，学生票80元/张）……"
+- 优待政策: "儿童 ： 1.2米（含）-1.49米（含）儿童，30元\\n老人 ： ……，免费"
+- 开放时间: "全天免费开放"
+
+提取结果为成人票价、儿童票价（元）和是否免费开放三项，无法确定的项为None。
+优待政策中各人群的"免费"只代表该人群免票，不作为景点免费开放的依据。
+"""
+
+import re
+from typing import NamedTuple, Optional
+
+# 金额："128元"、"¥5元"、"12.5 元"
+_AMOUNT = r"[¥￥]?\s*(\d+(?:\.\d+)?)\s*元"
+
+# 成人票价：成人票/成人门票/全价票/门票/票价 后紧跟金额
+_ADULT_PATTERN = re.compile(r"(?:成人(?:门)?票|全价票|门票(?:价格)?|票价)\s*[:：为是]?\s*" + _AMOUNT)
+
+# 儿童票价：儿童票/儿童套票/儿童门票 后不远处的金额
+_CHILD_PATTERN = re.compile(r"儿童(?:套|门)?票[^\d。；;\n]{0,12}?" + _AMOUNT)
+
+# 优待政策中 "人群 ： 说明，结果" 形式的行
+_POLICY_LINE_PATTERN = re.compile(r"^\s*([^：:\n]{1,20}?)\s*[：:]\s*(.*)$", re.MULTILINE)
+
+# 景点整体免费开放的说法
+_FREE_PATTERN = re.compile(r"免费开放|免门票|免收门票|无需门票|无需购票|不收门票|不收取门票|不需要门票")
+
+# 金额
+_AMOUNT_PATTERN = re.compile(_AMOUNT)
+
+
+class TicketPrices(NamedTuple):
+    """数值化的门票信息，无法确定的项为None"""
+    adult: Optional[float]  # 成人票价（元），免费开放时为0
+    child: Optional[float]  # 儿童票价（元），免费开放时为0
+    free: Optional[bool]    # 是否免费开放，只在明确时为True/False
+
+
+def _child_price_from_policy(policy: str) -> Optional[float]:
+    """从优待政策的"儿童"行中提取最低的非零票价"""
+    amounts = []
+    for group, rule in _POLICY_LINE_PATTERN.findall(policy):
+        if "儿童" not in group:
+            continue
+        amounts.extend(float(value) for value in _AMOUNT_PATTERN.findall(rule))
+    amounts = [value for value in amounts if value > 0]
+    return min(amounts) if amounts else None
+
+
+def extract_ticket_prices(policy: Optional[str] = None, introduction: Optional[str] = None,
+                          opening_time: Optional[str] = None) -> TicketPrices:
+    """
+    从景点的文本字段中提取数值化的门票信息
+
+    Args:
+        policy: 优待政策文本
+        introduction: 介绍文本
+        opening_time: 开放时间文本
+
+    Returns:
+        TicketPrices，例如 TicketPrices(adult=128.0, child=None, free=False)
+    """
+    policy = policy if isinstance(policy, str) else ""
+    introduction = introduction if isinstance(introduction, str) else ""
+    opening_time = opening_time if isinstance(opening_time, str) else ""
+
+    adult = None
+    for text in (policy, introduction):
+        match = _ADULT_PATTERN.search(text)
+        if match:
+            adult = float(match.group(1))
+            break
+
+    child = _child_price_from_policy(policy)
+    if child is None:
+        for text in (policy, introduction):
+            match = _CHILD_PATTERN.search(text)
+            if match:
+                child = float(match.group(1))
+                break
+
+    # 只根据开放时间和介绍判断景点整体是否免费，优待政策中的"免费"针对特定人群
+    free = None
+    if _FREE_PATTERN.search(opening_time) or (adult is None and _FREE_PATTERN.search(introduction)):
+        free = True
+        adult = 0.0
+        child = 0.0 if child is None else child
+    elif adult is not None:
+        free = adult == 0
+    return TicketPrices(adult, child, free)
+
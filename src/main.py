@@ -48,6 +48,19 @@ def setup_parser() -> argparse.ArgumentParser:
     import_parser.add_argument("--file", type=str, help="三元组数据文件路径")
     import_parser.add_argument("--clear", action="store_true", help="导入前清空数据库")
     
+    # export 命令 - 导出neo4j-admin批量导入文件
+    export_parser = subparsers.add_parser("export", help="导出neo4j-admin批量导入文件")
+    export_parser.add_argument("--file", type=str, help="三元组数据文件路径")
+    export_parser.add_argument("--output", type=str, help="输出目录")
+    
+    # similar 命令 - 计算相似景点表
+    similar_parser = subparsers.add_parser("similar", help="计算相似景点表")
+    similar_parser.add_argument("--output", type=str, help="输出文件路径")
+    
+    # passages 命令 - 构建景点介绍段落索引
+    passages_parser = subparsers.add_parser("passages", help="构建景点介绍段落索引")
+    passages_parser.add_argument("--output", type=str, help="输出文件路径")
+    
     # crawl 命令 - 爬取旅游数据
     crawl_parser = subparsers.add_parser("crawl", help="爬取旅游数据")
     crawl_parser.add_argument("--output", type=str, help="输出文件路径")
@@ -137,16 +150,78 @@ def import_data(file_path: str = None, clear: bool = False) -> None:
         # 导入数据导入模块
         import py2neo_data_import
         
-        # 设置参数并执行导入
-        py2neo_data_import.main(file_path, clear)
+        # 设置参数并执行导入（支持断点续传，失败后重新运行会从检查点继续）
+        result = py2neo_data_import.main(file_path, clear)
         
-        logger.info("数据导入完成")
+        if result is None:
+            logger.error("数据导入未完成，请检查数据文件和数据库连接")
+            return
+        
+        logger.info(f"数据导入完成 - 共 {result['rows']} 条三元组, {result['batches']} 批")
         
     except ImportError as e:
         logger.error(f"导入数据处理模块失败: {e}")
     except Exception as e:
         logger.error(f"导入数据失败: {e}")
 
+def export_data(file_path: str = None, output_dir: str = None) -> None:
+    """
+    导出neo4j-admin批量导入文件
+    
+    Args:
+        file_path: 三元组数据文件路径
+        output_dir: 输出目录
+    """
+    try:
+        from src.data.bulk_export import main as export_main
+        
+        logger.info(f"开始导出批量导入文件 - 文件: {file_path or '(默认)'}, 输出: {output_dir or '(默认)'}")
+        export_main(file_path, output_dir)
+        logger.info("批量导入文件导出完成")
+        
+    except ImportError as e:
+        logger.error(f"导入批量导出模块失败: {e}")
+    except Exception as e:
+        logger.error(f"导出批量导入文件失败: {e}")
+
+def build_similar_table(output_path: str = None) -> None:
+    """
+    离线计算相似景点表并保存
+    
+    Args:
+        output_path: 输出文件路径
+    """
+    try:
+        from src.data.text_neighbors import main as similar_main
+        
+        logger.info(f"开始计算相似景点表 - 输出: {output_path or '(默认)'}")
+        similar_main(output_path)
+        logger.info("相似景点表计算完成")
+        
+    except ImportError as e:
+        logger.error(f"导入相似景点模块失败: {e}")
+    except Exception as e:
+        logger.error(f"计算相似景点表失败: {e}")
+
+def build_passage_index(output_path: str = None) -> None:
+    """
+    离线构建景点介绍段落的BM25索引并保存
+    
+    Args:
+        output_path: 输出文件路径
+    """
+    try:
+        from src.data.passages import main as passages_main
+        
+        logger.info(f"开始构建段落索引 - 输出: {output_path or '(默认)'}")
+        passages_main(output_path)
+        logger.info("段落索引构建完成")
+        
+    except ImportError as e:
+        logger.error(f"导入段落索引模块失败: {e}")
+    except Exception as e:
+        logger.error(f"构建段落索引失败: {e}")
+
 def run_crawler(output_path: str = None, limit: int = None) -> None:
     """
     运行爬虫爬取旅游数据
@@ -220,6 +295,12 @@ def main(args: List[str] = None) -> None:
         start_chat()
     elif args.command == "import":
         import_data(args.file, args.clear)
+    elif args.command == "export":
+        export_data(args.file, args.output)
+    elif args.command == "similar":
+        build_similar_table(args.output)
+    elif args.command == "passages":
+        build_passage_index(args.output)
     elif args.command == "crawl":
         run_crawler(args.output, args.limit)
     elif args.command == "test":
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+城市景点列表索引，回答"成都有哪些景点"并支持"更多"翻页。
+
+构建快照索引时，按 `属于城市` 关系把景点分组，每个城市（以及全省）的景点按热度从高到低
+预先排好序，并记录每个景点在列表中的位置。翻页使用游标（上一页最后一个景点的名称），
+查询时从游标之后切出一页，不需要每次读取该城市的全部景点；每页的个数由调用方限制。
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+
+# 城市景点列表索引在快照中的名称
+INDEX_KEY = "city_listing"
+
+
+class ListingPage(NamedTuple):
+    """城市景点列表的一页"""
+    names: List[str]            # 本页的景点，按热度从高到低排序
+    start: int                  # 本页第一个景点在列表中的序号（从0开始）
+    total: int                  # 该城市的景点总数
+    next_cursor: Optional[str]  # 下一页的游标，已经是最后一页时为None
+
+
+class CityListing:
+    """按城市预先排序的景点列表"""
+
+    def __init__(self, members: Dict[Optional[str], List[str]]):
+        """
+        Args:
+            members: 城市简称 -> 按热度从高到低排序的景点名称列表，城市为None表示全省
+        """
+        self.members = members
+        self.positions: Dict[Optional[str], Dict[str, int]] = {
+            city: {name: i for i, name in enumerate(names)} for city, names in members.items()
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "CityListing":
+        """
+        从知识图谱快照构建列表，没有热度的景点排在最后，热度相同时按名称排序
+
+        Args:
+            snapshot: KGSnapshot实例
+        """
+        def popularity_key(name):
+            value = snapshot.get(name, "popularity")
+            return (-value if isinstance(value, (int, float)) else 1.0), name
+
+        members: Dict[Optional[str], List[str]] = {}
+        for name in sorted(snapshot.attractions, key=popularity_key):
+            members.setdefault(None, []).append(name)
+            city = snapshot.city_of.get(name)
+            if city:
+                members.setdefault(city, []).append(name)
+        return cls(members)
+
+    def count(self, city: Optional[str] = None) -> int:
+        """返回某城市的景点个数，城市为None表示全省"""
+        return len(self.members.get(city, []))
+
+    def page(self, city: Optional[str], cursor: Optional[str] = None, limit: int = 20) -> ListingPage:
+        """
+        返回某城市游标之后的一页景点
+
+        Args:
+            city: 城市简称，None表示全省
+            cursor: 上一页返回的 next_cursor，None表示第一页；游标中的景点已不在列表中（快照重新加载）时从第一页开始
+            limit: 每页的景点个数
+
+        Returns:
+            ListingPage，城市没有景点时 names 为空列表
+        """
+        names = self.members.get(city, [])
+        start = self.positions.get(city, {}).get(cursor, -1) + 1 if cursor is not None else 0
+        shown = names[start:start + max(limit, 0)]
+        end = start + len(shown)
+        next_cursor = shown[-1] if shown and end < len(names) else None
+        return ListingPage(shown, start, len(names), next_cursor)
+
+
+def get_city_listing(snapshot) -> CityListing:
+    """获取快照对应的城市景点列表"""
+    return snapshot.get_index(INDEX_KEY, CityListing.from_snapshot)
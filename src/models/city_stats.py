@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+城市级统计模块，回答"成都有多少个景点"、"哪个城市景点平均评分最高"等问题，并为管理接口提供统计数据。
+
+从快照构建列式存储：评分、热度为float64数组（缺失为NaN），所属城市为int32编码数组（未知为-1）。
+各城市的数量、均值用 `np.bincount` 一次算出；分位数先按 (城市, 数值) 排序，
+再由每组的起止位置直接插值得到，全程没有按城市的Python循环。
+统计结果作为快照索引缓存，快照重新加载（数据版本变化）后重新计算。
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# 城市统计在快照中的名称
+INDEX_KEY = "city_statistics"
+
+# 参与统计的数值字段：属性名 -> 中文名称
+NUMERIC_FIELDS = {"rating": "评分", "popularity": "热度"}
+
+# 统计的分位数
+PERCENTILES = (50, 90)
+
+# 比较城市均值时，城市至少需要的有效景点个数，避免只有一两个景点的城市排在前面
+MIN_COMPARE_COUNT = 3
+
+
+class ColumnStore:
+    """景点数值字段的列式存储"""
+
+    def __init__(self, names: List[str], columns: Dict[str, np.ndarray], city_codes: np.ndarray, cities: List[str]):
+        """
+        Args:
+            names: 景点名称，与各列按位置对应
+            columns: 字段名 -> float64数组，缺失值为NaN
+            city_codes: 每个景点所属城市在 cities 中的下标，未知为-1
+            cities: 城市简称列表
+        """
+        self.names = names
+        self.columns = columns
+        self.city_codes = city_codes
+        self.cities = cities
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "ColumnStore":
+        """
+        从知识图谱快照构建列式存储
+
+        Args:
+            snapshot: KGSnapshot实例
+        """
+        names = snapshot.names
+        columns = {}
+        for field in NUMERIC_FIELDS:
+            values = [snapshot.attractions[name].get(field) for name in names]
+            columns[field] = np.array(
+                [value if isinstance(value, (int, float)) else np.nan for value in values], dtype=np.float64
+            )
+        cities = sorted(set(snapshot.city_of.values()))
+        code_of = {city: code for code, city in enumerate(cities)}
+        city_codes = np.array([code_of.get(snapshot.city_of.get(name), -1) for name in names], dtype=np.int32)
+        return cls(names, columns, city_codes, cities)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def grouped_percentiles(codes: np.ndarray, values: np.ndarray, n_groups: int, q: float) -> np.ndarray:
+    """
+    计算每组的分位数（线性插值，与 np.percentile 默认方法一致）
+
+    Args:
+        codes: 每个值所属的组编号，0 到 n_groups-1
+        values: 数值，不能含NaN
+        n_groups: 组数
+        q: 分位数（0-100）
+
+    Returns:
+        长度为 n_groups 的数组，没有数值的组为NaN
+    """
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    result = np.full(n_groups, np.nan)
+    has_values = counts > 0
+    rank = (counts[has_values] - 1) * (q / 100.0)
+    lower = np.floor(rank).astype(np.int64)
+    upper = np.ceil(rank).astype(np.int64)
+    base = starts[has_values]
+    low_values = sorted_values[base + lower]
+    high_values = sorted_values[base + upper]
+    result[has_values] = low_values + (high_values - low_values) * (rank - lower)
+    return result
+
+
+class CityStatistics:
+    """按城市分组的景点统计"""
+
+    def __init__(self, store: ColumnStore):
+        """
+        Args:
+            store: 景点数值字段的列式存储
+        """
+        self.store = store
+        self.cities = store.cities
+        n_groups = len(self.cities)
+        known = store.city_codes >= 0
+        codes = store.city_codes[known]
+
+        self.count = np.bincount(codes, minlength=n_groups)
+        self.field_stats: Dict[str, Dict[str, np.ndarray]] = {}
+        self.total: Dict[str, Any] = {"count": len(store)}
+        for field, column in store.columns.items():
+            values = column[known]
+            valid = ~np.isnan(values)
+            valid_codes, valid_values = codes[valid], values[valid]
+            valid_count = np.bincount(valid_codes, minlength=n_groups)
+            sums = np.bincount(valid_codes, weights=valid_values, minlength=n_groups)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.where(valid_count > 0, sums / np.maximum(valid_count, 1), np.nan)
+            stats = {"count": valid_count, "mean": mean}
+            for q in PERCENTILES:
+                stats[f"p{q}"] = grouped_percentiles(valid_codes, valid_values, n_groups, q)
+            self.field_stats[field] = stats
+
+            all_values = column[~np.isnan(column)]
+            self.total[field] = {"count": int(all_values.size), "mean": _to_float(all_values.mean()) if all_values.size else None}
+            for q in PERCENTILES:
+                self.total[field][f"p{q}"] = _to_float(np.percentile(all_values, q)) if all_values.size else None
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "CityStatistics":
+        """从知识图谱快照构建城市统计"""
+        return cls(ColumnStore.from_snapshot(snapshot))
+
+    def city(self, city: str) -> Optional[Dict[str, Any]]:
+        """
+        返回单个城市的统计
+
+        Args:
+            city: 城市简称
+
+        Returns:
+            {"count": 景点数, "rating": {"count", "mean", "p50", "p90"}, "popularity": {...}}；城市没有景点时返回None
+        """
+        if city not in self.cities:
+            return None
+        code = self.cities.index(city)
+        result: Dict[str, Any] = {"count": int(self.count[code])}
+        for field, stats in self.field_stats.items():
+            result[field] = {name: _to_float(values[code]) if name != "count" else int(values[code])
+                             for name, values in stats.items()}
+        return result
+
+    def rank_cities(self, field: Optional[str] = None, min_count: int = MIN_COMPARE_COUNT) -> List[tuple]:
+        """
+        按景点数量或某字段的均值对城市排序
+
+        Args:
+            field: None 表示按景点数量，否则为 NUMERIC_FIELDS 中的字段名，按均值排序
+            min_count: 按均值排序时城市至少需要的有效景点个数
+
+        Returns:
+            [(城市简称, 数值)]，从高到低
+        """
+        if field is None:
+            values, eligible = self.count.astype(np.float64), self.count > 0
+        else:
+            stats = self.field_stats[field]
+            values, eligible = stats["mean"], stats["count"] >= min_count
+        codes = np.flatnonzero(eligible)
+        order = codes[np.argsort(-values[codes], kind="stable")]
+        return [(self.cities[code], _to_float(values[code])) for code in order]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """返回全部统计，供管理接口输出JSON"""
+        return {
+            "total": self.total,
+            "cities": {city: self.city(city) for city in self.cities},
+        }
+
+
+def _to_float(value) -> Optional[float]:
+    """将numpy数值转换为保留4位小数的float，NaN转换为None"""
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
+
+
+def get_city_statistics(snapshot) -> CityStatistics:
+    """获取快照对应的城市统计"""
+    return snapshot.get_index(INDEX_KEY, CityStatistics.from_snapshot)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+服务设施倒排索引，回答"哪些景点有停车场和无障碍设施"、"成都评分4.5以上有母婴室的景点"等问题。
+
+每个设施标签、每个城市各对应一个位图（Python整数，第 i 位表示快照中第 i 个景点），
+评分条件预先按评分从高到低累积为"评分不低于x"的位图。
+多个设施的"且"/"或"以及城市、评分条件都通过位运算组合，不需要扫描景点或使用 CONTAINS 查询。
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Optional
+
+from src.data.facilities import FACILITY_ALIASES, parse_tags
+
+# 服务设施索引在快照中的名称
+INDEX_KEY = "facility_bitmaps"
+
+
+def iter_bits(bits: int) -> Iterable[int]:
+    """按从小到大的顺序返回位图中为1的位置"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class FacilityIndex:
+    """服务设施、城市、评分的位图索引"""
+
+    def __init__(self, names: List[str], facility_bits: Dict[str, int], city_bits: Dict[str, int],
+                 ratings: Dict[str, float]):
+        """
+        Args:
+            names: 景点名称，位图的第 i 位对应 names[i]
+            facility_bits: 设施标签 -> 位图
+            city_bits: 城市简称 -> 位图
+            ratings: 景点名称 -> 评分，没有评分的景点不在其中
+        """
+        self.names = names
+        self.facility_bits = facility_bits
+        self.city_bits = city_bits
+        self.with_facilities = 0
+        for bits in facility_bits.values():
+            self.with_facilities |= bits
+
+        # 评分从低到高排列，_rating_bits[i] 为评分不低于 _rating_values[i] 的景点位图
+        ids = {name: i for i, name in enumerate(names)}
+        self._rating_values: List[float] = sorted(set(ratings.values()))
+        self._rating_bits: List[int] = [0] * len(self._rating_values)
+        for name, rating in ratings.items():
+            if name in ids:
+                position = bisect.bisect_left(self._rating_values, rating)
+                self._rating_bits[position] |= 1 << ids[name]
+        for position in range(len(self._rating_bits) - 2, -1, -1):
+            self._rating_bits[position] |= self._rating_bits[position + 1]
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "FacilityIndex":
+        """
+        从知识图谱快照构建索引，使用景点的 facilityTags、rating 属性和 属于城市 关系
+
+        Args:
+            snapshot: KGSnapshot实例
+        """
+        facility_bits = {tag: 0 for tag in FACILITY_ALIASES}
+        city_bits: Dict[str, int] = {}
+        ratings = {}
+        for i, name in enumerate(snapshot.names):
+            props = snapshot.attractions[name]
+            for tag in parse_tags(props.get("facilityTags")):
+                facility_bits[tag] |= 1 << i
+            city = snapshot.city_of.get(name)
+            if city:
+                city_bits[city] = city_bits.get(city, 0) | 1 << i
+            rating = props.get("rating")
+            if isinstance(rating, (int, float)):
+                ratings[name] = float(rating)
+        return cls(snapshot.names, facility_bits, city_bits, ratings)
+
+    def __len__(self) -> int:
+        """有设施标签的景点个数"""
+        return bin(self.with_facilities).count("1")
+
+    def rating_at_least(self, min_rating: float) -> int:
+        """返回评分不低于 min_rating 的景点位图"""
+        position = bisect.bisect_left(self._rating_values, min_rating)
+        return self._rating_bits[position] if position < len(self._rating_bits) else 0
+
+    def query(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (), city: Optional[str] = None,
+              min_rating: Optional[float] = None) -> List[str]:
+        """
+        查询满足条件的景点
+
+        Args:
+            all_of: 必须全部具备的设施标签
+            any_of: 至少具备其一的设施标签
+            city: 城市简称，None表示不限
+            min_rating: 最低评分（含），None表示不限
+
+        Returns:
+            景点名称列表，按快照中的顺序
+        """
+        bits = self.with_facilities
+        for tag in all_of:
+            bits &= self.facility_bits.get(tag, 0)
+        any_of = list(any_of)
+        if any_of:
+            union = 0
+            for tag in any_of:
+                union |= self.facility_bits.get(tag, 0)
+            bits &= union
+        if city is not None:
+            bits &= self.city_bits.get(city, 0)
+        if min_rating is not None:
+            bits &= self.rating_at_least(min_rating)
+        return [self.names[i] for i in iter_bits(bits)]
+
+
+def get_facility_index(snapshot) -> FacilityIndex:
+    """获取快照对应的服务设施索引"""
+    return snapshot.get_index(INDEX_KEY, FacilityIndex.from_snapshot)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+区县级"附近景点"索引，回答"武侯祠附近有什么景点"等问题。
+
+景点所属区县来自知识图谱的 `属于区县` 关系，缺失时用地名库从地址中提取。
+每个区县的景点按热度从高到低预先排好序；附近的景点依次取同一区县、相邻区县
+（`dict/sichuan_district_adjacency.csv`）的景点，相邻关系中没有的区县退回到同一城市的其他区县。
+全部在本地完成，不需要地理编码服务。
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+from src.data.gazetteer import get_gazetteer, load_district_adjacency
+# 从配置模块导入
+from src.utils.config import get_config
+
+# 附近景点索引在快照中的名称
+INDEX_KEY = "nearby_districts"
+
+# 默认返回的附近景点个数
+DEFAULT_TOP_K = int(get_config("NEARBY_TOP_K", "10"))
+
+
+class NearbyGroup(NamedTuple):
+    """附近景点的一组"""
+    scope: str            # same（同一区县）、adjacent（相邻区县）或 city（同一城市的其他区县）
+    districts: List[str]  # 这组景点所在的区县
+    names: List[str]      # 按热度从高到低排序的景点
+
+
+class NearbyIndex:
+    """区县 → 景点索引及区县相邻关系"""
+
+    def __init__(self, district_of: Dict[str, str], city_of: Dict[str, str],
+                 popularity: Dict[str, float], adjacency: Dict[str, List[str]]):
+        """
+        Args:
+            district_of: 景点名称 -> 区县ID
+            city_of: 景点名称 -> 城市简称
+            popularity: 景点名称 -> 热度，没有热度的景点排在最后
+            adjacency: 区县ID -> 相邻区县ID列表
+        """
+        self.district_of = district_of
+        self.popularity = popularity
+        self.adjacency = adjacency
+        self.members: Dict[str, List[str]] = {}
+        self.city_districts: Dict[str, List[str]] = {}
+        self.district_city: Dict[str, str] = {}
+        for name in sorted(district_of, key=self._popularity_key):
+            district = district_of[name]
+            self.members.setdefault(district, []).append(name)
+            city = city_of.get(name)
+            if city and district not in self.district_city:
+                self.district_city[district] = city
+                self.city_districts.setdefault(city, []).append(district)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, adjacency: Optional[Dict[str, List[str]]] = None) -> "NearbyIndex":
+        """
+        从知识图谱快照构建索引
+
+        Args:
+            snapshot: KGSnapshot实例
+            adjacency: 区县相邻关系，默认读取 dict/sichuan_district_adjacency.csv
+        """
+        gazetteer = get_gazetteer()
+        district_of, city_of, popularity = {}, {}, {}
+        for name, props in snapshot.attractions.items():
+            city, district = snapshot.city_of.get(name, ""), snapshot.district_of.get(name, "")
+            if not district:
+                city, district = gazetteer.extract(props.get("address") or "")
+                city = snapshot.city_of.get(name) or city
+            if not district:
+                continue
+            district_of[name] = district
+            if city:
+                city_of[name] = city
+            if isinstance(props.get("popularity"), (int, float)):
+                popularity[name] = float(props["popularity"])
+        return cls(district_of, city_of, popularity, load_district_adjacency() if adjacency is None else adjacency)
+
+    def __len__(self) -> int:
+        return len(self.district_of)
+
+    def nearby(self, name: str, k: int) -> List[NearbyGroup]:
+        """
+        返回景点附近的景点，最多 k 个
+
+        Args:
+            name: 景点名称
+            k: 最多返回的景点个数
+
+        Returns:
+            依次为同一区县、相邻区县（或同一城市其他区县）的分组；景点没有区县信息时返回空列表
+        """
+        district = self.district_of.get(name)
+        if district is None:
+            return []
+        groups = []
+        remaining = k
+        same = [other for other in self.members.get(district, []) if other != name][:remaining]
+        if same:
+            groups.append(NearbyGroup("same", [district], same))
+            remaining -= len(same)
+        if remaining <= 0:
+            return groups
+
+        neighbors = [d for d in self.adjacency.get(district, []) if d in self.members]
+        scope = "adjacent"
+        if not neighbors:
+            city = self.district_city.get(district)
+            neighbors = [d for d in self.city_districts.get(city, []) if d != district]
+            scope = "city"
+        merged = sorted((other for d in neighbors for other in self.members[d]), key=self._popularity_key)[:remaining]
+        if merged:
+            used = [d for d in neighbors if any(self.district_of[other] == d for other in merged)]
+            groups.append(NearbyGroup(scope, used, merged))
+        return groups
+
+    def _popularity_key(self, name: str) -> tuple:
+        """按热度从高到低排序的键，没有热度的景点排在最后"""
+        return -self.popularity.get(name, -1.0), name
+
+
+def get_nearby_index(snapshot) -> NearbyIndex:
+    """获取快照对应的附近景点索引"""
+    return snapshot.get_index(INDEX_KEY, NearbyIndex.from_snapshot)
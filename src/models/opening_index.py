@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+开放时间区间索引，回答"某景点现在是否开放"和"某时刻仍在开放的景点"。
+
+单个景点的判断直接检查其少量开放规则，为O(1)。
+全体景点的查询按日期划分基本区段：同一区段、同一星期内生效的规则集合不变，
+对这样的一天把所有开放时段的端点排序成基本时间槽，并预先算出每个槽内开放的景点，
+查询时二分定位时间槽，复杂度为 O(log n + k)。每天的时间槽表按需构建并缓存。
+"""
+
+import bisect
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.data.opening_hours import (MINUTES_PER_DAY, OpeningRule, day_of_year,
+                                    format_time_ranges, parse_rules)
+
+# 开放时间索引在快照中的名称
+INDEX_KEY = "opening_hours"
+
+# 缓存的时间槽表数量上限（每种 日期区段+星期 组合一张表）
+MAX_CACHED_DAYS = 32
+
+
+def _day_and_weekday(date: datetime.date) -> Tuple[int, int]:
+    """返回日期的日期序号和星期"""
+    return day_of_year(date.month, date.day), date.weekday()
+
+
+class OpeningHoursIndex:
+    """开放时间区间索引"""
+
+    def __init__(self, rules_by_name: Dict[str, List[OpeningRule]]):
+        """
+        Args:
+            rules_by_name: 景点名称 -> 开放规则列表，没有结构化开放时间的景点不在其中
+        """
+        self.rules_by_name = {name: rules for name, rules in rules_by_name.items() if rules}
+        self.names = sorted(self.rules_by_name)
+        # 日期区段边界：所有规则的起始日和结束日的下一天
+        bounds = set()
+        for rules in self.rules_by_name.values():
+            for rule in rules:
+                bounds.add(rule.start_day)
+                bounds.add(rule.end_day + 1)
+        self._day_bounds = sorted(bounds)
+        self._tables: "OrderedDict[tuple, Tuple[List[int], List[List[str]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "OpeningHoursIndex":
+        """
+        从知识图谱快照构建索引，使用景点的 openingIntervals 属性
+
+        Args:
+            snapshot: KGSnapshot实例
+        """
+        rules_by_name = {}
+        for name, props in snapshot.attractions.items():
+            rules = parse_rules(props.get("openingIntervals"))
+            if rules:
+                rules_by_name[name] = rules
+        return cls(rules_by_name)
+
+    def has_hours(self, name: str) -> bool:
+        """判断景点是否有结构化的开放时间"""
+        return name in self.rules_by_name
+
+    def is_open(self, name: str, when: datetime.datetime) -> Optional[bool]:
+        """
+        判断景点在指定时刻是否开放
+
+        Args:
+            name: 景点名称
+            when: 查询时刻
+
+        Returns:
+            True/False；景点没有结构化开放时间时返回None
+        """
+        rules = self.rules_by_name.get(name)
+        if not rules:
+            return None
+        minute = when.hour * 60 + when.minute
+        day, weekday = _day_and_weekday(when.date())
+        prev_day, prev_weekday = _day_and_weekday(when.date() - datetime.timedelta(days=1))
+        for rule in rules:
+            if rule.covers_day(day, weekday) and rule.open_minute <= minute < rule.close_minute:
+                return True
+            # 前一天跨越零点的时段
+            if (rule.close_minute > MINUTES_PER_DAY and rule.covers_day(prev_day, prev_weekday)
+                    and minute + MINUTES_PER_DAY < rule.close_minute):
+                return True
+        return False
+
+    def hours_on(self, name: str, date: datetime.date) -> str:
+        """
+        返回景点在指定日期的开放时段文本，例如 "08:00-17:30"；当天不开放或没有结构化开放时间时返回空字符串
+        """
+        day, weekday = _day_and_weekday(date)
+        return format_time_ranges(self.rules_by_name.get(name, []), day, weekday)
+
+    def open_at(self, when: datetime.datetime) -> List[str]:
+        """
+        返回在指定时刻开放的全部景点
+
+        Args:
+            when: 查询时刻
+
+        Returns:
+            按名称排序的景点名称列表
+        """
+        bounds, slots = self._table_for(when.date())
+        minute = when.hour * 60 + when.minute
+        slot = bisect.bisect_right(bounds, minute) - 1
+        if slot < 0 or slot >= len(slots):
+            return []
+        return slots[slot]
+
+    def _table_for(self, date: datetime.date) -> Tuple[List[int], List[List[str]]]:
+        """获取指定日期的时间槽表（按 日期区段+星期 缓存）"""
+        day, weekday = _day_and_weekday(date)
+        prev_day, prev_weekday = _day_and_weekday(date - datetime.timedelta(days=1))
+        key = (bisect.bisect_right(self._day_bounds, day), weekday,
+               bisect.bisect_right(self._day_bounds, prev_day), prev_weekday)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                return table
+        table = self._build_table(day, weekday, prev_day, prev_weekday)
+        with self._lock:
+            self._tables[key] = table
+            while len(self._tables) > MAX_CACHED_DAYS:
+                self._tables.popitem(last=False)
+        return table
+
+    def _build_table(self, day: int, weekday: int, prev_day: int, prev_weekday: int) -> Tuple[List[int], List[List[str]]]:
+        """扫描线构建一天的基本时间槽：bounds[i] 到 bounds[i+1] 之间开放的景点为 slots[i]"""
+        events: Dict[int, List[Tuple[int, str]]] = {}
+        for name, rules in self.rules_by_name.items():
+            for rule in rules:
+                intervals = []
+                if rule.covers_day(day, weekday):
+                    intervals.append((rule.open_minute, min(rule.close_minute, MINUTES_PER_DAY)))
+                if rule.close_minute > MINUTES_PER_DAY and rule.covers_day(prev_day, prev_weekday):
+                    intervals.append((0, rule.close_minute - MINUTES_PER_DAY))
+                for start, end in intervals:
+                    events.setdefault(start, []).append((1, name))
+                    events.setdefault(end, []).append((-1, name))
+
+        bounds: List[int] = []
+        slots: List[List[str]] = []
+        active: Dict[str, int] = {}
+        for minute in sorted(events):
+            for delta, name in events[minute]:
+                count = active.get(name, 0) + delta
+                if count:
+                    active[name] = count
+                else:
+                    active.pop(name, None)
+            bounds.append(minute)
+            slots.append(sorted(active))
+        return bounds, slots
+
+
+def get_opening_index(snapshot) -> OpeningHoursIndex:
+    """获取快照对应的开放时间索引"""
+    return snapshot.get_index(INDEX_KEY, OpeningHoursIndex.from_snapshot)
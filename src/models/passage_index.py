@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+景点介绍段落检索，在调用大模型之前用已爬取的介绍文本回答"都江堰是谁修的"之类的问题。
+
+BM25段落索引由 `src.data.passages` 离线构建并保存为 `.npz` 文件（`python src/main.py passages`），
+文件签名与当前快照的介绍文本不一致（或文件不存在）时在内存中重新构建并记录警告。
+查询时先找出问题中提到的景点（景点名称去掉 "景区"、括号注释等后缀后在问题中出现），
+找到时只在名称包含这些简称的景点的段落中检索，并从问题中去掉景点名称；其余部分切分为字符二元组，
+取出各词的倒排表后用 `np.bincount` 一次累加出全部段落的得分。
+
+段落按BM25得分排序；置信度为段落包含的问题词的idf之和除以问题中全部词的idf之和（0-1），
+表示问题中除景点名称以外的信息有多少被该段落覆盖。问数量的问题（"有多少只""多高"）的疑问词在检索前被去掉，
+段落中没有相应的数字（及单位）时置信度减半，避免只提到"熊猫""海拔"的段落被当作答案。
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from src.data.passages import BM25Index, build_bm25_index, load_bm25_index, passage_signature, tokenize
+from src.utils.config import get_config
+from src.utils.logger import get_logger
+
+# 创建日志记录器
+logger = get_logger(__name__)
+
+# 段落索引在快照中的名称
+INDEX_KEY = "passage_bm25"
+
+# 默认的段落索引文件路径
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "景点介绍段落索引.npz"
+)
+
+# 直接用段落回答所需的最低置信度
+MIN_CONFIDENCE = float(get_config("PASSAGE_MIN_CONFIDENCE", "0.75"))
+
+# 疑问词、语气词和虚词，检索前从问题中去掉，避免"是谁"、"奉的"之类的二元组匹配到无关段落
+_QUESTION_WORD_PATTERN = re.compile(
+    r"有?(?:多少|几)[个只座年天点种位次米]?|哪[里儿位个些一座]?|为什么|什么|谁|怎么样|怎么|如何|有多|是否|请问"
+    r"|[吗呢呀啊吧的了是有在]"
+)
+
+
+# 问数量的问题：多少/几后面的量词，或者问高度、长度时默认的长度单位
+_QUANTITY_PATTERN = re.compile(r"(?:多少|几)([个只座年天点种位次米层尊])?|多[高长深远]|海拔")
+_LENGTH_UNITS = "(?:米|公里|千米)"
+_NUMERAL = r"(?:\d|[一二两三四五六七八九十百千万余])"
+
+# 数量问题的段落中没有数字时置信度的折扣
+NUMBER_MISSING_FACTOR = 0.5
+
+
+# 景点名称中可以省略的后缀，例如 "都江堰景区"、"青城山(前山)"
+_NAME_SUFFIX_PATTERN = re.compile(r"[（(].*?[)）]|风景名胜区|风景区|旅游区|景区|博物馆$")
+
+# 参与匹配的景点简称的最少字数
+MIN_TOPIC_CHARS = 2
+
+
+def short_name(name: str) -> str:
+    """去掉景点名称中的括号注释和 "景区" 等后缀"""
+    return _NAME_SUFFIX_PATTERN.sub("", name).strip() or name
+
+
+def question_terms(question: str) -> List[str]:
+    """去掉疑问词后把问题切分为字符二元组"""
+    return tokenize(_QUESTION_WORD_PATTERN.sub(" ", question))
+
+
+def number_pattern(question: str) -> Optional[re.Pattern]:
+    """
+    问数量的问题返回答案段落中应当出现的数字（及单位）的模式，其他问题返回None
+
+    Args:
+        question: 用户问题
+    """
+    match = _QUANTITY_PATTERN.search(question)
+    if match is None:
+        return None
+    if match.group(1):
+        unit = "[点:：]" if match.group(1) == "点" else re.escape(match.group(1))
+    elif match.group(0) in ("多高", "多长", "多深", "多远", "海拔"):
+        unit = _LENGTH_UNITS
+    else:
+        unit = ""
+    return re.compile(_NUMERAL + "+" + unit if unit else r"\d")
+
+
+def default_index_path() -> str:
+    """返回段落索引文件路径，可通过 PASSAGE_INDEX_PATH 配置"""
+    return get_config("PASSAGE_INDEX_PATH", DEFAULT_INDEX_PATH)
+
+
+class PassageHit(NamedTuple):
+    """一条检索结果"""
+    name: str          # 段落所属景点
+    text: str          # 段落文本
+    score: float       # BM25得分
+    confidence: float  # 置信度（0-1）
+
+
+class PassageIndex:
+    """基于BM25的介绍段落检索"""
+
+    def __init__(self, index: BM25Index):
+        """
+        Args:
+            index: BM25段落倒排索引
+        """
+        self.index = index
+        self.term_ids = {term: i for i, term in enumerate(index.terms)}
+        self.name_ids = {name: i for i, name in enumerate(index.names)}
+        # 简称 -> 景点下标，同一简称可能对应多个景点
+        self.short_names: Dict[str, List[int]] = {}
+        for i, name in enumerate(index.names):
+            for alias in {name, short_name(name)}:
+                if len(alias) >= MIN_TOPIC_CHARS:
+                    self.short_names.setdefault(alias, []).append(i)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, path: Optional[str] = None) -> "PassageIndex":
+        """
+        读取与快照一致的段落索引，不一致时重新构建
+
+        Args:
+            snapshot: KGSnapshot实例
+            path: 段落索引文件路径，默认为 default_index_path()
+        """
+        path = path or default_index_path()
+        index = load_bm25_index(path)
+        if index is not None and index.signature == passage_signature(snapshot):
+            return cls(index)
+        if index is not None:
+            logger.warning(f"段落索引与当前数据不一致，重新构建（可运行 python src/main.py passages 更新文件）: {path}")
+        return cls(build_bm25_index(snapshot))
+
+    def __len__(self) -> int:
+        return len(self.index.passages)
+
+    def find_topics(self, question: str) -> List[str]:
+        """
+        返回问题中提到的景点简称，被更长的简称包含的不计入
+
+        Args:
+            question: 用户问题
+
+        Returns:
+            景点简称列表，按长度从长到短
+        """
+        found = sorted((alias for alias in self.short_names if alias in question), key=len, reverse=True)
+        topics: List[str] = []
+        for alias in found:
+            if not any(alias in longer for longer in topics):
+                topics.append(alias)
+        return topics
+
+    def search(self, question: str, names: Optional[Iterable[str]] = None, k: int = 3) -> List[PassageHit]:
+        """
+        检索与问题最相关的段落
+
+        Args:
+            question: 用户问题
+            names: 只在这些景点的段落中检索，None表示按问题中提到的景点确定（没有提到时为全部景点）
+            k: 返回的段落个数
+
+        Returns:
+            按得分从高到低排列的 PassageHit 列表，没有任何词匹配时为空列表
+        """
+        index = self.index
+        owners: Optional[List[int]] = None
+        if names is not None:
+            names = list(names)
+            owners = [self.name_ids[name] for name in names if name in self.name_ids]
+            topics = names + [short_name(name) for name in names]
+        else:
+            topics = self.find_topics(question)
+            if topics:
+                # 名称中包含该简称的景点也参与检索，例如 "碧峰峡" -> "雅安碧峰峡熊猫基地"
+                owners = [i for i, name in enumerate(index.names) if any(alias in name for alias in topics)]
+        expected_number = number_pattern(question)
+        for topic in sorted(topics, key=len, reverse=True):
+            question = question.replace(topic, " ")
+
+        terms = set(question_terms(question))
+        query_terms = [self.term_ids[term] for term in terms if term in self.term_ids]
+        if not query_terms or not len(index.passages):
+            return []
+        starts = [index.term_ptr[term] for term in query_terms]
+        stops = [index.term_ptr[term + 1] for term in query_terms]
+        passage_ids = np.concatenate([index.passage_ids[a:b] for a, b in zip(starts, stops)])
+        weights = np.concatenate([index.weights[a:b] for a, b in zip(starts, stops)])
+        term_idf = np.repeat(index.idf[query_terms], np.subtract(stops, starts))
+        scores = np.bincount(passage_ids, weights=weights, minlength=len(index.passages))
+        coverage = np.bincount(passage_ids, weights=term_idf, minlength=len(index.passages))
+
+        if owners is not None:
+            scores = np.where(np.isin(index.owners, owners), scores, 0.0)
+
+        # 语料中没有出现过的词按最大idf计入，问题的关键信息不在任何介绍中时置信度随之降低
+        max_idf = np.log(1 + (len(index.passages) + 0.5) / 0.5)
+        ideal = float(index.idf[query_terms].sum()) + max_idf * (len(terms) - len(query_terms))
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        hits = []
+        for i in top:
+            if scores[i] <= 0:
+                continue
+            confidence = float(coverage[i]) / ideal
+            if expected_number is not None and not expected_number.search(index.passages[i]):
+                confidence *= NUMBER_MISSING_FACTOR
+            hits.append(PassageHit(index.names[index.owners[i]], index.passages[i], round(float(scores[i]), 4),
+                                   round(confidence, 4)))
+        return hits
+
+def get_passage_index(snapshot) -> PassageIndex:
+    """获取快照对应的段落检索索引"""
+    return snapshot.get_index(INDEX_KEY, PassageIndex.from_snapshot)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+门票价格索引，回答"100元以下的景点"、"免费景点有哪些"等问题。
+
+有成人票价的景点按票价排序存放在有序数组中，价格区间查询二分定位区间两端，
+复杂度为 O(log n + k)；免费开放的景点在构建时预先筛出。
+抓取的数据中只有少数景点能解析出票价，覆盖率低于 PRICE_MIN_COVERAGE 时
+答案只作为候选，不作为最终答案。
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.config import get_config
+
+# 门票价格索引在快照中的名称
+INDEX_KEY = "ticket_prices"
+
+# 价格答案作为最终答案所需的票价信息覆盖率（有票价或明确免费的景点占全部景点的比例）
+MIN_COVERAGE = float(get_config("PRICE_MIN_COVERAGE", "0.2"))
+
+
+class PriceIndex:
+    """门票价格有序索引"""
+
+    def __init__(self, prices: Dict[str, float], free_names: Iterable[str] = (), total: Optional[int] = None):
+        """
+        Args:
+            prices: 景点名称 -> 成人票价（元），票价未知的景点不在其中
+            free_names: 明确免费开放的景点名称
+            total: 全部景点数，用于计算票价信息覆盖率，None时视为全部景点都有票价信息
+        """
+        pairs = sorted((price, name) for name, price in prices.items())
+        self.prices: List[float] = [price for price, _ in pairs]
+        self.names: List[str] = [name for _, name in pairs]
+        self.price_of: Dict[str, float] = dict(prices)
+        self.free_names: List[str] = sorted(set(free_names) | {name for name, price in prices.items() if price == 0})
+        self.known: int = len(set(prices) | set(self.free_names))
+        self.total: int = self.known if total is None else total
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "PriceIndex":
+        """
+        从知识图谱快照构建索引，使用景点的 adultPrice 和 freeEntry 属性
+
+        Args:
+            snapshot: KGSnapshot实例
+        """
+        prices = {}
+        free_names = []
+        for name, props in snapshot.attractions.items():
+            price = props.get("adultPrice")
+            if isinstance(price, (int, float)) and price >= 0:
+                prices[name] = float(price)
+            if props.get("freeEntry") is True:
+                free_names.append(name)
+        return cls(prices, free_names, len(snapshot.attractions))
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def coverage(self) -> float:
+        """有票价或明确免费的景点占全部景点的比例"""
+        return self.known / self.total if self.total else 0.0
+
+    def in_range(self, min_price: Optional[float] = None, max_price: Optional[float] = None) -> List[str]:
+        """
+        返回成人票价在 [min_price, max_price] 内的景点
+
+        Args:
+            min_price: 最低票价（含），None表示不限
+            max_price: 最高票价（含），None表示不限
+
+        Returns:
+            按票价从低到高排序的景点名称列表
+        """
+        lo = 0 if min_price is None else bisect.bisect_left(self.prices, min_price)
+        hi = len(self.prices) if max_price is None else bisect.bisect_right(self.prices, max_price)
+        return self.names[lo:hi] if lo < hi else []
+
+    def free(self) -> List[str]:
+        """返回免费开放的景点，按名称排序"""
+        return self.free_names
+
+
+def get_price_index(snapshot) -> PriceIndex:
+    """获取快照对应的门票价格索引"""
+    return snapshot.get_index(INDEX_KEY, PriceIndex.from_snapshot)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+城市景点排行索引，回答"成都评分最高的景点"、"乐山最热门的景点"等问题。
+
+构建快照索引时，按 `属于城市` 关系把景点分组，对每个城市（以及全省）分别按评分和热度
+预先排好序；查询时直接返回前K个的切片，不需要扫描或排序。
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.config import get_config
+
+# 城市排行索引在快照中的名称
+INDEX_KEY = "city_rankings"
+
+# 支持的排行指标：属性名 -> 中文名称
+METRICS = {"rating": "评分", "popularity": "热度"}
+
+# 问题中没有指定数量时返回的景点个数
+DEFAULT_TOP_K = int(get_config("RANKING_TOP_K", "10"))
+
+
+class CityRankings:
+    """按城市预先排序的景点排行"""
+
+    def __init__(self, rankings: Dict[Tuple[Optional[str], str], List[Tuple[str, float]]]):
+        """
+        Args:
+            rankings: (城市简称, 指标) -> 按指标从高到低排序的 [(景点名称, 指标值)]，城市为None表示全省
+        """
+        self.rankings = rankings
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "CityRankings":
+        """
+        从知识图谱快照构建排行，使用 属于城市 关系和 rating/popularity 属性。
+        指标值缺失的景点不参与该指标的排行；指标相同时按另一指标、再按名称排序。
+
+        Args:
+            snapshot: KGSnapshot实例
+        """
+        rankings: Dict[Tuple[Optional[str], str], List[Tuple[str, float]]] = {}
+        for metric in METRICS:
+            other = "popularity" if metric == "rating" else "rating"
+            entries = []
+            for name, props in snapshot.attractions.items():
+                value = props.get(metric)
+                if isinstance(value, (int, float)):
+                    entries.append((-value, -(props.get(other) or 0), name))
+            entries.sort()
+            for neg_value, _, name in entries:
+                item = (name, -neg_value)
+                rankings.setdefault((None, metric), []).append(item)
+                city = snapshot.city_of.get(name)
+                if city:
+                    rankings.setdefault((city, metric), []).append(item)
+        return cls(rankings)
+
+    def top(self, metric: str, city: Optional[str] = None, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        返回某城市按指标排名前K的景点
+
+        Args:
+            metric: 排行指标，rating 或 popularity
+            city: 城市简称，None表示全省
+            k: 返回的景点个数，None时使用 RANKING_TOP_K 配置
+
+        Returns:
+            [(景点名称, 指标值)]，按指标从高到低排序
+        """
+        if k is None:
+            k = DEFAULT_TOP_K
+        return self.rankings.get((city, metric), [])[:max(k, 0)]
+
+    def count(self, metric: str, city: Optional[str] = None) -> int:
+        """返回某城市有该指标的景点个数"""
+        return len(self.rankings.get((city, metric), []))
+
+
+def get_city_rankings(snapshot) -> CityRankings:
+    """获取快照对应的城市景点排行"""
+    return snapshot.get_index(INDEX_KEY, CityRankings.from_snapshot)
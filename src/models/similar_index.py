@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+相似景点索引，回答"和武侯祠类似的景点"等问题。
+
+相似景点表由 `src.data.text_neighbors` 离线计算并保存为 `.npz` 文件（`python src/main.py similar`），
+问答时按景点名称查到行号后直接读取该行的近邻，只需一次查表。
+文件签名与当前快照的景点文本不一致（或文件不存在）时，在内存中重新计算并记录警告。
+"""
+
+import os
+from typing import List, Optional, Tuple
+
+from src.data.text_neighbors import NeighborTable, build_neighbor_table, load_neighbor_table, snapshot_signature
+from src.utils.config import get_config
+from src.utils.logger import get_logger
+
+# 创建日志记录器
+logger = get_logger(__name__)
+
+# 相似景点索引在快照中的名称
+INDEX_KEY = "similar_attractions"
+
+# 默认的相似景点表文件路径
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "景点相似推荐.npz"
+)
+
+
+def default_table_path() -> str:
+    """返回相似景点表文件路径，可通过 SIMILAR_TABLE_PATH 配置"""
+    return get_config("SIMILAR_TABLE_PATH", DEFAULT_TABLE_PATH)
+
+
+class SimilarAttractions:
+    """按景点名称查询预先计算的相似景点"""
+
+    def __init__(self, table: NeighborTable):
+        """
+        Args:
+            table: 相似景点表
+        """
+        self.table = table
+        self.row_of = {name: row for row, name in enumerate(table.names)}
+
+    @classmethod
+    def from_snapshot(cls, snapshot, path: Optional[str] = None) -> "SimilarAttractions":
+        """
+        读取与快照一致的相似景点表，不一致时重新计算
+
+        Args:
+            snapshot: KGSnapshot实例
+            path: 相似景点表文件路径，默认为 default_table_path()
+        """
+        path = path or default_table_path()
+        table = load_neighbor_table(path)
+        if table is not None and table.signature == snapshot_signature(snapshot):
+            return cls(table)
+        if table is not None:
+            logger.warning(f"相似景点表与当前数据不一致，重新计算（可运行 python src/main.py similar 更新文件）: {path}")
+        return cls(build_neighbor_table(snapshot))
+
+    def __len__(self) -> int:
+        return len(self.table.names)
+
+    def similar(self, name: str, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        返回与指定景点最相似的景点
+
+        Args:
+            name: 景点名称
+            k: 返回个数，None表示返回表中保存的全部近邻
+
+        Returns:
+            [(景点名称, 相似度)]，按相似度从高到低；景点不存在或没有文本时返回空列表
+        """
+        row = self.row_of.get(name)
+        if row is None:
+            return []
+        names = self.table.names
+        return [(names[neighbor], round(float(score), 4))
+                for neighbor, score in zip(self.table.neighbors[row][:k], self.table.scores[row][:k])
+                if neighbor >= 0]
+
+
+def get_similar_attractions(snapshot) -> SimilarAttractions:
+    """获取快照对应的相似景点索引"""
+    return snapshot.get_index(INDEX_KEY, SimilarAttractions.from_snapshot)
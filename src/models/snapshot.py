@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+"""
+知识图谱内存快照模块。
+
+问答中的排行、筛选、统计等问题需要扫描全部景点，逐次查询Neo4j代价很高。
+快照一次性载入全部景点属性及其所属城市/区县，供各类内存索引使用；
+索引通过 `get_index` 按快照版本缓存，快照重新加载后自动重建。
+"""
+
+import csv
+import itertools
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from py2neo_data_import import convert_property_value, get_property_details, get_relationship_details
+
+# 从配置和日志模块导入
+from src.utils.config import get_config
+from src.utils.logger import get_logger
+
+# 创建日志记录器
+logger = get_logger(__name__)
+
+# 默认三元组文件路径
+DEFAULT_TRIPLETS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "景点知识图谱_三元组.csv"
+)
+
+# 快照版本号生成器，每次加载快照递增
+_versions = itertools.count(1)
+
+
+class KGSnapshot:
+    """知识图谱的只读内存快照"""
+
+    def __init__(self, attractions: Dict[str, Dict[str, Any]],
+                 relations: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        初始化快照
+
+        Args:
+            attractions: 景点名称 -> 属性字典（键与Neo4j属性名一致，例如 rating、openingTime）
+            relations: 关系类型 -> {景点名称: 目标节点名称}，例如 {"属于城市": {"武侯祠": "成都"}}
+        """
+        self.attractions = attractions
+        self.relations = relations or {}
+        self.names: List[str] = list(attractions)
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.city_of: Dict[str, str] = self.relations.get("属于城市", {})
+        self.district_of: Dict[str, str] = self.relations.get("属于区县", {})
+        self.version = next(_versions)
+        self._indexes: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, name: str, key: str, default: Any = None) -> Any:
+        """
+        获取景点的属性值
+
+        Args:
+            name: 景点名称
+            key: 属性名，例如 rating
+            default: 景点或属性不存在时的默认值
+        """
+        return self.attractions.get(name, {}).get(key, default)
+
+    def get_index(self, key: str, builder: Callable[["KGSnapshot"], Any]) -> Any:
+        """
+        获取基于本快照构建的索引，首次调用时构建并缓存
+
+        Args:
+            key: 索引名称
+            builder: 以快照为参数构建索引的函数
+
+        Returns:
+            索引对象
+        """
+        index = self._indexes.get(key)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    index = builder(self)
+                    self._indexes[key] = index
+                    logger.info(f"已构建索引 {key}（快照版本 {self.version}，{len(self)} 个景点）")
+        return index
+
+    @classmethod
+    def from_triplets(cls, triplets_path: str) -> "KGSnapshot":
+        """
+        从三元组CSV构建快照，属性与关系的映射与导入脚本一致
+
+        Args:
+            triplets_path: 三元组CSV文件路径
+
+        Returns:
+            KGSnapshot实例
+        """
+        attractions: Dict[str, Dict[str, Any]] = {}
+        relations: Dict[str, Dict[str, str]] = {}
+        with open(triplets_path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                subject = (row.get("subject") or "").strip()
+                predicate = (row.get("predicate") or "").strip()
+                obj = (row.get("object") or "").strip()
+                if not subject or not predicate or not obj:
+                    continue
+                props = attractions.setdefault(subject, {"name": subject})
+                details = get_property_details(predicate)
+                if details:
+                    try:
+                        props[details["key"]] = convert_property_value(obj, details["type"])
+                    except ValueError:
+                        logger.warning(f"跳过无法转换的属性值: {subject} {predicate} {obj}")
+                    continue
+                rel = get_relationship_details(predicate)
+                if rel:
+                    relations.setdefault(rel["type"], {})[subject] = obj
+        logger.info(f"从 {triplets_path} 加载快照: {len(attractions)} 个景点")
+        return cls(attractions, relations)
+
+    @classmethod
+    def from_graph(cls, graph) -> "KGSnapshot":
+        """
+        从Neo4j数据库构建快照
+
+        Args:
+            graph: py2neo Graph对象
+
+        Returns:
+            KGSnapshot实例
+        """
+        attractions: Dict[str, Dict[str, Any]] = {}
+        relations: Dict[str, Dict[str, str]] = {}
+        for record in graph.run("MATCH (a:景点) RETURN properties(a) AS props").data():
+            props = record["props"]
+            if props.get("name"):
+                attractions[props["name"]] = props
+        rows = graph.run("MATCH (a:景点)-[r]->(t) RETURN a.name AS name, type(r) AS type, t.name AS target").data()
+        for record in rows:
+            relations.setdefault(record["type"], {})[record["name"]] = record["target"]
+        logger.info(f"从Neo4j加载快照: {len(attractions)} 个景点")
+        return cls(attractions, relations)
+
+
+_snapshot: Optional[KGSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def load_snapshot(graph=None) -> KGSnapshot:
+    """
+    加载新的快照：优先读取三元组文件（KG_TRIPLETS_PATH），文件不存在时从Neo4j读取
+
+    Args:
+        graph: 可选的py2neo Graph对象
+
+    Returns:
+        KGSnapshot实例
+    """
+    triplets_path = get_config("KG_TRIPLETS_PATH", DEFAULT_TRIPLETS_PATH)
+    if os.path.exists(triplets_path):
+        return KGSnapshot.from_triplets(triplets_path)
+    if graph is not None:
+        return KGSnapshot.from_graph(graph)
+    logger.warning(f"三元组文件不存在且未提供数据库连接，使用空快照: {triplets_path}")
+    return KGSnapshot({})
+
+
+def get_snapshot(graph=None) -> KGSnapshot:
+    """
+    获取全局快照（首次调用时加载）
+
+    Args:
+        graph: 可选的py2neo Graph对象，三元组文件不存在时使用
+
+    Returns:
+        KGSnapshot实例
+    """
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = load_snapshot(graph)
+    return _snapshot
+
+
+def reload_snapshot(graph=None) -> KGSnapshot:
+    """
+    重新加载全局快照，数据导入完成后调用；基于旧快照的索引随之失效
+
+    Args:
+        graph: 可选的py2neo Graph对象
+
+    Returns:
+        新的KGSnapshot实例
+    """
+    global _snapshot
+    snapshot = load_snapshot(graph)
+    with _snapshot_lock:
+        _snapshot = snapshot
+    return snapshot
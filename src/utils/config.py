@@ -21,6 +21,15 @@ DEFAULT_CONFIG = {
     "NEO4J_URI": "bolt://localhost:7687",
     "NEO4J_USER": "neo4j",
     "NEO4J_PASSWORD": "neo4j",
+    "NEO4J_POOL_SIZE": "10",
+    "NEO4J_POOL_MAX_AGE": "3600",
+    "NEO4J_POOL_ACQUIRE_TIMEOUT": "5",
+    "NEO4J_QUERY_TIMEOUT": "2",
+    "NEO4J_BREAKER_FAILURES": "5",
+    "NEO4J_BREAKER_RESET": "30",
+    "NEO4J_QUERY_CACHE_SIZE": "0",
+    "NEO4J_QUERY_CACHE_MAX_BYTES": "16777216",
+    "NEO4J_BATCH_SIZE": "1000",
     
     # 讯飞星火API配置
     "SPARK_APPID": "",
@@ -33,7 +42,13 @@ DEFAULT_CONFIG = {
     "FLASK_DEBUG": "False",
     
     # 日志配置
-    "LOG_LEVEL": "INFO"
+    "LOG_LEVEL": "INFO",
+    
+    # 问答配置
+    "RANKING_TOP_K": "10",
+    "NEARBY_TOP_K": "10",
+    "PASSAGE_MIN_CONFIDENCE": "0.75",
+    "PRICE_MIN_COVERAGE": "0.2"
 }
 
 # 加载环境变量
@@ -3,12 +3,38 @@
 
 """
 数据库管理模块，用于处理Neo4j数据库的连接和操作。
+
+问答、数据导入和管理工具通过 `get_graph_pool` 共用进程内唯一的Neo4j连接池：
+py2neo 的连接池按 NEO4J_POOL_SIZE 限制连接数、按 NEO4J_POOL_MAX_AGE 定期更换连接；
+`GraphPool.run` 在执行查询前占用一个名额，名额用完时最多等待 NEO4J_POOL_ACQUIRE_TIMEOUT 秒，
+超时抛出 `PoolTimeout`，而不是无限期阻塞或另外建立连接。
+
+Neo4j变慢或宕机时，每个查询最多等待 NEO4J_QUERY_TIMEOUT 秒；连续失败后熔断器打开，
+查询直接抛出 `CircuitOpen`，调用方捕获 `GraphUnavailable` 后改用本地快照或缓存回答。
+连接被拒绝、连接中断等连接错误包装为 `GraphConnectionError`，第一次失败就改用本地快照。
+
+`Neo4jManager.execute_query` 可以缓存只读查询的结果（NEO4J_QUERY_CACHE_SIZE 大于0时启用），
+缓存按连接池的数据版本失效：数据导入每提交一个事务、管理器每执行一次写操作都会调用
+`GraphPool.bump_data_version`。版本号只在进程内有效，其他进程写入的数据不会使缓存失效。
+
+批量写入使用 `create_attraction_nodes`、`create_relationships`：按 NEO4J_BATCH_SIZE 分批，
+每批用一条 UNWIND 语句在一个事务中写入，只在结束时记录一条汇总日志。
 """
 
 import os
+import re
+import json
+import hashlib
+import itertools
 import logging
-from typing import Optional, Dict, Any, List, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Sequence, Tuple
 from py2neo import Graph, Node, Relationship, NodeMatcher
+from py2neo.errors import ClientError, ConnectionBroken, ConnectionLimit, ConnectionUnavailable, ServiceUnavailable
 
 # 从配置和日志模块导入
 from src.utils.config import get_config
@@ -17,10 +43,429 @@ from src.utils.logger import get_logger
 # 创建日志记录器
 logger = get_logger(__name__)
 
+class GraphUnavailable(Exception):
+    """Neo4j暂时不可用：熔断器打开、等待连接超时或查询超时，调用方应改用本地快照或缓存"""
+
+
+class PoolTimeout(GraphUnavailable):
+    """等待空闲连接超时"""
+
+
+class QueryTimeout(GraphUnavailable):
+    """查询超时"""
+
+
+class CircuitOpen(GraphUnavailable):
+    """熔断器打开，查询未发往数据库"""
+
+
+class GraphConnectionError(GraphUnavailable):
+    """无法连接数据库或连接中断（连接被拒绝、服务不可用等）"""
+
+
+# 说明数据库不可达的异常，包装为 GraphConnectionError；OSError 包括连接被拒绝和py2neo的底层连接错误
+CONNECTION_ERRORS = (ConnectionUnavailable, ConnectionBroken, ConnectionLimit, ServiceUnavailable, OSError)
+
+
+class CircuitBreaker:
+    """
+    Neo4j访问的熔断器。
+
+    连续失败 failure_threshold 次后打开（open），此后的查询直接失败、不再等待数据库；
+    打开 reset_timeout 秒后进入半开（half_open），放行一次试探查询：成功则关闭（closed），失败则重新打开。
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: 打开熔断器的连续失败次数
+            reset_timeout: 打开后经过多少秒放行试探查询
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.counts = {"rejected": 0}
+        self.transitions: Dict[str, int] = {}
+        self.last_transition: Optional[Tuple[str, float]] = None
+    
+    @property
+    def available(self) -> bool:
+        """熔断器关闭，或已到放行试探查询的时间"""
+        with self._lock:
+            return self.state == "closed" or (self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout)
+    
+    def allow(self) -> bool:
+        """判断是否放行一次查询，不放行时计入 rejected"""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._transition("half_open")
+            if self.state == "closed" or (self.state == "half_open" and not self._trial_in_flight):
+                self._trial_in_flight = self.state == "half_open"
+                return True
+            self.counts["rejected"] += 1
+            return False
+    
+    def record_success(self) -> None:
+        """记录一次成功的查询"""
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self.state != "closed":
+                self._transition("closed")
+    
+    def record_failure(self) -> None:
+        """记录一次失败（连接失败或超时）的查询"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or (self.state == "closed" and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self._transition("open")
+    
+    def _transition(self, state: str) -> None:
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.last_transition = (key, time.time())
+        (logger.warning if state == "open" else logger.info)(f"Neo4j熔断器状态变化: {key}")
+        self.state = state
+    
+    def stats(self) -> Dict[str, Any]:
+        """返回熔断器的状态、连续失败次数、拒绝次数和各状态变化的次数"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self._failures,
+                "rejected": self.counts["rejected"],
+                "transitions": dict(self.transitions),
+                "last_transition": list(self.last_transition) if self.last_transition else None,
+            }
+
+
+class GraphPool:
+    """进程内共享的Neo4j连接池，带有查询超时和熔断器，记录使用率等指标"""
+    
+    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None,
+                 max_size: Optional[int] = None, max_age: Optional[float] = None,
+                 acquire_timeout: Optional[float] = None, query_timeout: Optional[float] = None,
+                 breaker: Optional[CircuitBreaker] = None, graph_factory=None):
+        """
+        初始化连接池，首次使用时才连接数据库
+        
+        Args:
+            uri: Neo4j数据库URI，默认从配置获取
+            user: 用户名，默认从配置获取
+            password: 密码，默认从配置获取
+            max_size: 最大连接数，默认为 NEO4J_POOL_SIZE
+            max_age: 连接的最长使用时间（秒），超过后关闭并重新建立，默认为 NEO4J_POOL_MAX_AGE
+            acquire_timeout: 等待空闲连接的超时时间（秒），默认为 NEO4J_POOL_ACQUIRE_TIMEOUT
+            query_timeout: 单次查询的超时时间（秒），0表示不限制，默认为 NEO4J_QUERY_TIMEOUT
+            breaker: 熔断器，默认按 NEO4J_BREAKER_FAILURES、NEO4J_BREAKER_RESET 创建
+            graph_factory: 创建Graph对象的函数，默认按上述配置创建py2neo Graph（便于测试替换）
+        """
+        self.uri = uri or get_config("NEO4J_URI", "bolt://localhost:7687")
+        self.user = user or get_config("NEO4J_USER", "neo4j")
+        self.password = password or get_config("NEO4J_PASSWORD", "neo4j")
+        self.max_size = max_size or int(get_config("NEO4J_POOL_SIZE", "10"))
+        self.max_age = max_age or float(get_config("NEO4J_POOL_MAX_AGE", "3600"))
+        self.acquire_timeout = float(get_config("NEO4J_POOL_ACQUIRE_TIMEOUT", "5")) if acquire_timeout is None else acquire_timeout
+        self.query_timeout = float(get_config("NEO4J_QUERY_TIMEOUT", "2")) if query_timeout is None else query_timeout
+        self.breaker = breaker or CircuitBreaker(int(get_config("NEO4J_BREAKER_FAILURES", "5")),
+                                                 float(get_config("NEO4J_BREAKER_RESET", "30")))
+        self._graph_factory = graph_factory or self._connect
+        self._graph = None
+        self._graph_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self.counts = {"acquired": 0, "timeouts": 0, "query_timeouts": 0, "connection_errors": 0}
+        self.data_version = 0
+    
+    def _connect(self) -> Graph:
+        return Graph(self.uri, auth=(self.user, self.password), max_size=self.max_size, max_age=self.max_age)
+    
+    @property
+    def graph(self) -> Graph:
+        """
+        获取共享的Graph对象，未连接时创建；连接失败时抛出异常，下次调用时重试
+        
+        Returns:
+            Graph对象，事务等操作可直接使用，连接来自同一个连接池
+        """
+        if self._graph is None:
+            with self._graph_lock:
+                if self._graph is None:
+                    try:
+                        self._graph = self._graph_factory()
+                        logger.info(f"成功连接到Neo4j数据库（连接池大小 {self.max_size}）")
+                    except CONNECTION_ERRORS as e:
+                        logger.error(f"连接Neo4j数据库失败: {e}")
+                        raise GraphConnectionError(f"连接Neo4j数据库失败: {e}") from e
+                    except Exception as e:
+                        logger.error(f"连接Neo4j数据库失败: {e}")
+                        raise
+        return self._graph
+    
+    @property
+    def available(self) -> bool:
+        """Neo4j是否可以查询（熔断器未打开）"""
+        return self.breaker.available
+    
+    def bump_data_version(self) -> int:
+        """数据已修改（写入事务提交后调用），使按数据版本缓存的查询结果失效，返回新的版本号"""
+        with self._lock:
+            self.data_version += 1
+            return self.data_version
+    
+    def _take_slot(self) -> None:
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self.counts["timeouts"] += 1
+            raise PoolTimeout(f"等待Neo4j连接超时（{self.acquire_timeout}秒，连接池大小 {self.max_size}）")
+        waited = time.monotonic() - started
+        with self._lock:
+            self.counts["acquired"] += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+    
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
+    
+    @contextmanager
+    def acquire(self) -> Iterator[Graph]:
+        """
+        占用连接池的一个名额，名额用完时最多等待 acquire_timeout 秒
+        
+        Raises:
+            PoolTimeout: 等待超时
+        """
+        self._take_slot()
+        try:
+            yield self.graph
+        finally:
+            self._release_slot()
+    
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwparameters):
+        """
+        经过熔断器、占用一个名额执行Cypher查询，用法与 Graph.run 相同。
+        连接失败、等待连接超时和查询超时计为失败；查询语句本身的错误（ClientError）说明数据库正常，计为成功。
+        
+        Returns:
+            py2neo Cursor，自动提交的查询返回时结果已全部读取，连接已归还
+        
+        Raises:
+            CircuitOpen: 熔断器打开，查询未发往数据库
+            PoolTimeout: 等待空闲连接超时
+            QueryTimeout: 查询超过 query_timeout 秒未返回（查询在后台结束后才归还名额）
+            GraphConnectionError: 无法连接数据库或连接中断
+        """
+        if not self.breaker.allow():
+            raise CircuitOpen("Neo4j熔断器已打开，暂不查询数据库")
+        try:
+            result = self._execute(query, parameters, kwparameters)
+        except ClientError:
+            self.breaker.record_success()
+            raise
+        except (GraphConnectionError,) + CONNECTION_ERRORS as e:
+            self.breaker.record_failure()
+            with self._lock:
+                self.counts["connection_errors"] += 1
+            if isinstance(e, GraphConnectionError):  # 创建Graph时连接失败，已经包装过
+                raise
+            raise GraphConnectionError(f"Neo4j连接失败: {e}") from e
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+    
+    def _execute(self, query: str, parameters: Optional[Dict[str, Any]], kwparameters: Dict[str, Any]):
+        if self.query_timeout <= 0:
+            with self.acquire() as graph:
+                return graph.run(query, parameters, **kwparameters)
+        self._take_slot()
+        
+        def work():
+            try:
+                return self.graph.run(query, parameters, **kwparameters)
+            finally:
+                self._release_slot()
+        
+        try:
+            future = self._get_executor().submit(work)
+        except Exception:
+            self._release_slot()
+            raise
+        try:
+            return future.result(timeout=self.query_timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.counts["query_timeouts"] += 1
+            raise QueryTimeout(f"Neo4j查询超时（{self.query_timeout}秒）: {query}")
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # 执行查询的线程数与名额数相同，占用名额后总有空闲线程
+        if self._executor is None:
+            with self._graph_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_size, thread_name_prefix="neo4j-query")
+        return self._executor
+    
+    def stats(self) -> Dict[str, Any]:
+        """返回连接池的配置、使用率和熔断器指标"""
+        with self._lock:
+            acquired = self.counts["acquired"]
+            stats = {
+                "max_size": self.max_size,
+                "max_age": self.max_age,
+                "acquire_timeout": self.acquire_timeout,
+                "query_timeout": self.query_timeout,
+                "connected": self._graph is not None,
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "utilization": round(self._in_use / self.max_size, 4),
+                "acquired": acquired,
+                "timeouts": self.counts["timeouts"],
+                "query_timeouts": self.counts["query_timeouts"],
+                "connection_errors": self.counts["connection_errors"],
+                "wait_ms_avg": round(self._wait_total / acquired * 1000, 3) if acquired else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+                "data_version": self.data_version,
+            }
+        stats["breaker"] = self.breaker.stats()
+        return stats
+
+
+# 会修改数据的Cypher子句，包含这些子句的查询不使用缓存
+WRITE_CLAUSES = re.compile(r"\b(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV|CALL)\b", re.IGNORECASE)
+
+
+def is_read_only(query: str) -> bool:
+    """
+    判断Cypher查询是否只读（不含写入子句，也不调用可能写入的过程）
+    
+    Args:
+        query: Cypher查询语句，字符串字面量中的关键字不影响判断
+    """
+    return not WRITE_CLAUSES.search(re.sub(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"", "''", query))
+
+
+class QueryCache:
+    """
+    只读查询结果的LRU缓存，键为查询语句和参数的哈希，同时限制条目数和结果占用的字节数。
+    每个条目记录写入时的数据版本，版本变化后的条目在读取时丢弃。
+    """
+    
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024):
+        """
+        Args:
+            max_entries: 最多缓存的查询个数，0表示不缓存
+            max_bytes: 缓存结果（按JSON编码估算）最多占用的字节数，超过单条上限的结果不缓存
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Tuple[str, str], Tuple[int, List[Dict[str, Any]], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counts = {"hits": 0, "misses": 0, "bypassed": 0, "evicted": 0, "invalidated": 0}
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+    
+    @staticmethod
+    def make_key(query: str, parameters: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        """查询语句和参数哈希组成的缓存键，参数的顺序不影响哈希"""
+        encoded = json.dumps(parameters or {}, sort_keys=True, ensure_ascii=False, default=str)
+        return query, hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+    
+    def get(self, key: Tuple[str, str], version: int) -> Optional[List[Dict[str, Any]]]:
+        """返回版本一致的缓存结果（副本），没有或已失效时返回None"""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and entry[0] != version:
+                self._discard(key)
+                self.counts["invalidated"] += 1
+                entry = None
+            if entry is None:
+                self.counts["misses"] += 1
+                return None
+            self._items.move_to_end(key)
+            self.counts["hits"] += 1
+            return [dict(row) for row in entry[1]]
+    
+    def put(self, key: Tuple[str, str], version: int, rows: List[Dict[str, Any]]) -> None:
+        """缓存查询结果，超出条目数或字节数时淘汰最久未使用的结果"""
+        if not self.enabled:
+            return
+        size = len(json.dumps(rows, ensure_ascii=False, default=str).encode("utf-8")) + len(key[0].encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._items[key] = (version, [dict(row) for row in rows], size)
+            self._bytes += size
+            while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._items)))
+                self.counts["evicted"] += 1
+    
+    def bypass(self) -> None:
+        """记录一次未使用缓存的查询（写入查询或调用方要求）"""
+        with self._lock:
+            self.counts["bypassed"] += 1
+    
+    def _discard(self, key: Tuple[str, str]) -> None:
+        entry = self._items.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+    
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存的容量、占用和命中率"""
+        with self._lock:
+            lookups = self.counts["hits"] + self.counts["misses"]
+            return dict(self.counts, entries=len(self._items), bytes=self._bytes, max_entries=self.max_entries,
+                        max_bytes=self.max_bytes, hit_rate=round(self.counts["hits"] / lookups, 4) if lookups else 0.0)
+
+
+_graph_pool: Optional[GraphPool] = None
+_graph_pool_lock = threading.Lock()
+
+
+def get_graph_pool() -> GraphPool:
+    """
+    获取进程内共享的Neo4j连接池（首次调用时创建）
+    
+    Returns:
+        GraphPool实例
+    """
+    global _graph_pool
+    if _graph_pool is None:
+        with _graph_pool_lock:
+            if _graph_pool is None:
+                _graph_pool = GraphPool()
+    return _graph_pool
+
+
 class Neo4jManager:
     """Neo4j数据库管理类，提供连接和基本操作功能"""
     
-    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None):
+    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None,
+                 pool: Optional[GraphPool] = None, query_cache: Optional[QueryCache] = None):
         """
         初始化Neo4j数据库管理器
         
@@ -28,34 +473,44 @@ class Neo4jManager:
             uri: Neo4j数据库URI，默认从配置获取
             user: 用户名，默认从配置获取
             password: 密码，默认从配置获取
+            pool: 使用的连接池；未指定时使用共享连接池，指定了连接信息时单独创建连接池
+            query_cache: 只读查询的结果缓存，默认按 NEO4J_QUERY_CACHE_SIZE、NEO4J_QUERY_CACHE_MAX_BYTES 创建
         """
         # 优先使用传入的参数，否则从配置获取
         self.uri = uri or get_config("NEO4J_URI", "bolt://localhost:7687")
         self.user = user or get_config("NEO4J_USER", "neo4j")
         self.password = password or get_config("NEO4J_PASSWORD", "neo4j")
+        self._custom = bool(uri or user or password)
         
-        # 初始化连接为None，后续lazy加载
-        self._graph = None
+        # 初始化连接池和节点匹配器为None，后续lazy加载
+        self._pool = pool
         self._node_matcher = None
+        if query_cache is None:
+            query_cache = QueryCache(int(get_config("NEO4J_QUERY_CACHE_SIZE", "0")),
+                                     int(get_config("NEO4J_QUERY_CACHE_MAX_BYTES", "16777216")))
+        self.query_cache = query_cache
+    
+    @property
+    def pool(self) -> GraphPool:
+        """
+        获取使用的连接池，未指定连接信息时为进程内共享的连接池
+        
+        Returns:
+            GraphPool实例
+        """
+        if self._pool is None:
+            self._pool = GraphPool(self.uri, self.user, self.password) if self._custom else get_graph_pool()
+        return self._pool
     
     @property
     def graph(self) -> Graph:
         """
-        获取Neo4j数据库连接，如果未连接则创建新连接
+        获取连接池中共享的Graph对象，如果未连接则创建连接
         
         Returns:
             Graph对象，用于执行Cypher查询
         """
-        if self._graph is None:
-            try:
-                self._graph = Graph(uri=self.uri, auth=(self.user, self.password))
-                logger.info("成功连接到Neo4j数据库")
-            except Exception as e:
-                logger.error(f"连接Neo4j数据库失败: {e}")
-                # 重新抛出异常，让调用者处理
-                raise
-        
-        return self._graph
+        return self.pool.graph
     
     @property
     def matcher(self) -> NodeMatcher:
@@ -70,25 +525,42 @@ class Neo4jManager:
         
         return self._node_matcher
     
-    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                      use_cache: bool = True) -> List[Dict[str, Any]]:
         """
-        执行Cypher查询并返回结果
+        执行Cypher查询并返回结果。只读查询的结果在启用缓存时按数据版本缓存，写入查询不使用缓存并使已缓存的结果失效
         
         Args:
             query: Cypher查询语句
             parameters: 查询参数字典
+            use_cache: 是否使用结果缓存，需要读取最新数据时传入False
             
         Returns:
             查询结果列表，每个元素是一个包含属性的字典
         """
+        read_only = is_read_only(query)
+        cacheable = use_cache and read_only and self.query_cache.enabled
+        if cacheable:
+            key = self.query_cache.make_key(query, parameters)
+            version = self.pool.data_version  # 查询前的版本，查询期间数据被修改时结果随之失效
+            rows = self.query_cache.get(key, version)
+            if rows is not None:
+                return rows
+        elif self.query_cache.enabled:
+            self.query_cache.bypass()
         try:
             # 使用parameters执行参数化查询，防止注入攻击
-            result = self.graph.run(query, parameters=parameters)
-            return result.data()  # 转换为字典列表
+            result = self.pool.run(query, parameters)
+            rows = result.data()  # 转换为字典列表
         except Exception as e:
             logger.error(f"执行查询失败: {query}, 错误: {e}")
             # 重新抛出异常，让调用者处理
             raise
+        if not read_only:
+            self.pool.bump_data_version()
+        elif cacheable:
+            self.query_cache.put(key, version, rows)
+        return rows
     
     def create_attraction_node(self, name: str, properties: Dict[str, Any]) -> Node:
         """
@@ -109,12 +581,94 @@ class Neo4jManager:
             node = Node("景点", **full_props)
             # 保存到数据库
             self.graph.create(node)
+            self.pool.bump_data_version()
             logger.info(f"创建景点节点: {name}")
             return node
         except Exception as e:
             logger.error(f"创建景点节点失败: {name}, 错误: {e}")
             raise
     
+    def create_attraction_nodes(self, records: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """
+        批量创建景点节点，每批在一个事务中用一条 UNWIND 语句创建
+        
+        Args:
+            records: 景点属性字典，每个字典必须包含 name，其余键与 create_attraction_node 的 properties 相同
+            chunk_size: 每批（每个事务）创建的节点数，默认为 NEO4J_BATCH_SIZE
+            
+        Returns:
+            创建的节点数
+        """
+        query = "UNWIND $rows AS row CREATE (a:景点) SET a = row RETURN count(a)"
+        created, total, chunks, elapsed = self._write_in_chunks(query, (dict(record) for record in records), chunk_size)
+        logger.info(f"批量创建景点节点: {created} 个，{chunks} 批，用时 {elapsed:.2f} 秒")
+        return created
+    
+    def create_relationships(self, triples: Iterable[Sequence[Any]], start_label: str = "景点", end_label: str = "景点",
+                             chunk_size: Optional[int] = None) -> int:
+        """
+        批量在已有节点之间创建关系，节点按标签和名称匹配，每批每种关系类型用一条 UNWIND 语句在一个事务中创建
+        
+        Args:
+            triples: (起始节点名称, 关系类型, 目标节点名称) 或带关系属性字典的四元组
+            start_label: 起始节点的标签
+            end_label: 目标节点的标签
+            chunk_size: 每批（每个事务）处理的关系数，默认为 NEO4J_BATCH_SIZE
+            
+        Returns:
+            创建的关系数；起始或目标节点不存在的关系不创建，只在汇总日志中记录个数
+        """
+        created, total, chunks, elapsed = 0, 0, 0, 0.0
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for triple in triples:
+            properties = triple[3] if len(triple) > 3 else None
+            by_type.setdefault(triple[1], []).append({"start": triple[0], "end": triple[2], "properties": properties or {}})
+        for rel_type, rows in by_type.items():
+            # 标签和关系类型不能作为参数传入，用反引号转义后拼接
+            query = (f"UNWIND $rows AS row "
+                     f"MATCH (s:{self._quote(start_label)} {{name: row.start}}), (e:{self._quote(end_label)} {{name: row.end}}) "
+                     f"CREATE (s)-[r:{self._quote(rel_type)}]->(e) SET r = row.properties RETURN count(r)")
+            result = self._write_in_chunks(query, rows, chunk_size)
+            created, total, chunks, elapsed = created + result[0], total + result[1], chunks + result[2], elapsed + result[3]
+        logger.info(f"批量创建关系: {created} 个，{len(by_type)} 种关系类型，{chunks} 批，用时 {elapsed:.2f} 秒"
+                    + (f"，{total - created} 个关系因节点不存在未创建" if total > created else ""))
+        return created
+    
+    @staticmethod
+    def _quote(name: str) -> str:
+        return "`" + name.replace("`", "``") + "`"
+    
+    def _write_in_chunks(self, query: str, rows: Iterable[Dict[str, Any]],
+                         chunk_size: Optional[int]) -> Tuple[int, int, int, float]:
+        """
+        按批执行 UNWIND 写入语句，每批一个事务，语句应返回写入的个数
+        
+        Returns:
+            (写入的个数, 传入的行数, 批数, 用时秒数)
+        """
+        chunk_size = chunk_size or int(get_config("NEO4J_BATCH_SIZE", "1000"))
+        started = time.monotonic()
+        created, total, chunks = 0, 0, 0
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            with self.pool.acquire() as graph:
+                tx = graph.begin()
+                try:
+                    count = tx.run(query, rows=chunk).evaluate()
+                    graph.commit(tx)
+                except Exception as e:
+                    tx.rollback()
+                    logger.error(f"批量写入失败（第 {chunks + 1} 批，已提交 {chunks} 批）: {e}")
+                    raise
+            self.pool.bump_data_version()
+            created += count or 0
+            total += len(chunk)
+            chunks += 1
+        return created, total, chunks, time.monotonic() - started
+    
     def create_relationship(self, start_node: Node, rel_type: str, end_node: Node, properties: Optional[Dict[str, Any]] = None) -> Relationship:
         """
         在两个节点之间创建关系
@@ -135,6 +689,7 @@ class Neo4jManager:
             rel = Relationship(start_node, rel_type, end_node, **properties)
             # 保存到数据库
             self.graph.create(rel)
+            self.pool.bump_data_version()
             logger.info(f"创建关系: ({start_node['name']}) -[{rel_type}]-> ({end_node['name']})")
             return rel
         except Exception as e:
@@ -163,6 +718,7 @@ class Neo4jManager:
         """
         try:
             self.graph.delete_all()  # 删除所有节点和关系
+            self.pool.bump_data_version()
             logger.warning("已清空数据库")
         except Exception as e:
             logger.error(f"清空数据库失败: {e}")
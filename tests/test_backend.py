@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_backend.py
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import Backend_code
+from src.models import snapshot as snapshot_module
+
+class TestAdminReload(unittest.TestCase):
+    """测试数据重新导入后通过管理接口重新加载快照"""
+
+    def setUp(self):
+        self.client = Backend_code.app.test_client()
+        self.previous = snapshot_module._snapshot
+        self.directory = tempfile.TemporaryDirectory()
+        self.triplets = os.path.join(self.directory.name, "triplets.csv")
+        with open(self.triplets, "w", encoding="utf-8") as f:
+            f.write("subject,predicate,object\n新景点,位于,成都市新区1号\n新景点,属于城市,成都\n")
+
+    def tearDown(self):
+        snapshot_module._snapshot = self.previous
+        self.directory.cleanup()
+
+    def test_reload_changes_version_and_misses_cache(self):
+        """测试重新加载后快照版本改变，搜索器使用新快照，旧版本缓存的答案不再命中"""
+        old_version = Backend_code.searcher.snapshot.version
+        context = {'question': '新景点在哪里', 'user_id': 'u1', 'cacheable': True}
+        Backend_code.answer_cache.put((old_version, context['question']), "旧答案")
+        self.assertEqual("旧答案", Backend_code.tier_cache(context).answer)
+
+        with patch.dict(os.environ, {"KG_TRIPLETS_PATH": self.triplets}):
+            response = self.client.post('/admin/reload')
+        payload = response.get_json()
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(old_version, payload["previous_version"])
+        self.assertNotEqual(old_version, payload["version"])
+        self.assertEqual(1, payload["attractions"])
+        self.assertEqual(payload["version"], Backend_code.searcher.snapshot.version)
+        self.assertEqual("成都市新区1号", Backend_code.searcher.snapshot.get("新景点", "address"))
+        self.assertIsNone(Backend_code.tier_cache(context))
+
+    def test_reload_requires_token(self):
+        """测试设置了访问令牌时，没有令牌的请求被拒绝且不重新加载"""
+        version = Backend_code.searcher.snapshot.version
+        with patch.object(Backend_code, 'ADMIN_TOKEN', 'secret'):
+            self.assertEqual(403, self.client.post('/admin/reload').status_code)
+            self.assertEqual(version, Backend_code.searcher.snapshot.version)
+            with patch.dict(os.environ, {"KG_TRIPLETS_PATH": self.triplets}):
+                response = self.client.post('/admin/reload', headers={'X-Admin-Token': 'secret'})
+        self.assertEqual(200, response.status_code)
+
+    def test_reload_without_token_only_from_localhost(self):
+        """测试没有设置访问令牌时，来自其他机器的请求被拒绝，本机请求允许"""
+        version = Backend_code.searcher.snapshot.version
+        with patch.object(Backend_code, 'ADMIN_TOKEN', ''):
+            for path in ['/admin/stats', '/admin/pipeline']:
+                self.assertEqual(403, self.client.get(path, environ_base={'REMOTE_ADDR': '10.0.0.5'}).status_code)
+            response = self.client.post('/admin/reload', environ_base={'REMOTE_ADDR': '10.0.0.5'})
+            self.assertEqual(403, response.status_code)
+            self.assertEqual(version, Backend_code.searcher.snapshot.version)
+            with patch.dict(os.environ, {"KG_TRIPLETS_PATH": self.triplets}):
+                response = self.client.post('/admin/reload', environ_base={'REMOTE_ADDR': '::1'})
+        self.assertEqual(200, response.status_code)
+
+if __name__ == '__main__':
+    unittest.main()
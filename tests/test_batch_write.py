@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_batch_write.py
+
+import unittest
+import sys
+import os
+import time
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from py2neo import Node
+from src.utils.database import GraphPool, Neo4jManager
+
+class StubGraph:
+    """模拟每次与数据库往返都有固定延迟的Graph，记录往返次数和写入的节点、关系"""
+
+    def __init__(self, latency=0.002):
+        self.latency = latency
+        self.round_trips = 0
+        self.nodes = set()
+        self.relationships = []
+        self.fail_on_chunk = None
+
+    def _round_trip(self):
+        self.round_trips += 1
+        time.sleep(self.latency)
+
+    def create(self, subgraph):
+        self._round_trip()
+        if isinstance(subgraph, Node):
+            self.nodes.add(subgraph['name'])
+        else:
+            self.relationships.append((subgraph.start_node['name'], type(subgraph).__name__, subgraph.end_node['name']))
+
+    def begin(self):
+        return StubTransaction(self)
+
+    def commit(self, tx):
+        self._round_trip()
+        self.nodes |= tx.nodes
+        self.relationships.extend(tx.relationships)
+
+class StubTransaction:
+    """模拟事务：执行批量写入语句，提交后才写入Graph"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.nodes = set()
+        self.relationships = []
+
+    def run(self, query, rows):
+        self.graph._round_trip()
+        if self.graph.fail_on_chunk is not None and rows[0]['name'] == self.graph.fail_on_chunk:
+            raise RuntimeError("写入失败")
+        if "CREATE (a:景点)" in query:
+            self.nodes |= {row['name'] for row in rows}
+            return StubCursor(len(rows))
+        rel_type = query.split("[r:`")[1].split("`]")[0]
+        matched = [(row['start'], rel_type, row['end']) for row in rows
+                   if row['start'] in self.graph.nodes and row['end'] in self.graph.nodes]
+        self.relationships.extend(matched)
+        return StubCursor(len(matched))
+
+    def rollback(self):
+        self.nodes, self.relationships = set(), []
+
+class StubCursor:
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self):
+        return self.value
+
+class TestBatchWrite(unittest.TestCase):
+    """测试 Neo4jManager 的批量创建节点和关系"""
+
+    def setUp(self):
+        self.graph = StubGraph()
+        self.pool = GraphPool(max_size=2, graph_factory=lambda: self.graph)
+        self.manager = Neo4jManager(pool=self.pool)
+
+    def test_nodes_and_relationships_in_chunks(self):
+        """测试按批次大小分事务写入，节点不存在的关系不创建，每批提交后增加数据版本"""
+        records = ({'name': f'景点{i}', 'rating': 4.5} for i in range(25))
+        self.assertEqual(25, self.manager.create_attraction_nodes(records, chunk_size=10))
+        self.assertEqual(6, self.graph.round_trips)  # 3批，每批一次写入和一次提交
+        self.assertEqual(3, self.pool.data_version)
+
+        triples = [('景点0', '相邻', '景点1'), ('景点1', '相邻', '景点2', {'distance': 1.2}),
+                   ('景点2', '同线路', '景点3'), ('景点2', '相邻', '不存在的景点')]
+        self.assertEqual(3, self.manager.create_relationships(triples, chunk_size=2))
+        self.assertEqual([('景点0', '相邻', '景点1'), ('景点1', '相邻', '景点2'), ('景点2', '同线路', '景点3')],
+                         self.graph.relationships)
+        self.assertEqual(0, self.pool.stats()['in_use'])
+
+    def test_failed_chunk_rolls_back(self):
+        """测试某一批失败时回滚该批并抛出异常，之前提交的批次保留"""
+        self.graph.fail_on_chunk = '景点4'
+        with self.assertRaises(RuntimeError):
+            self.manager.create_attraction_nodes(({'name': f'景点{i}'} for i in range(6)), chunk_size=2)
+        self.assertEqual({'景点0', '景点1', '景点2', '景点3'}, self.graph.nodes)
+        self.assertEqual(0, self.pool.stats()['in_use'])
+
+    def test_benchmark_against_single_writes(self):
+        """基准测试：每次往返2毫秒时，批量写入200个节点和关系的往返次数和用时都远少于逐个写入"""
+        count = 200
+        started = time.perf_counter()
+        nodes = [self.manager.create_attraction_node(f'景点{i}', {'rating': 4.5}) for i in range(count)]
+        for i in range(count - 1):
+            self.manager.create_relationship(nodes[i], '相邻', nodes[i + 1])
+        single_seconds = time.perf_counter() - started
+        single_round_trips = self.graph.round_trips
+
+        self.graph = StubGraph()
+        self.manager = Neo4jManager(pool=GraphPool(max_size=2, graph_factory=lambda: self.graph))
+        started = time.perf_counter()
+        self.manager.create_attraction_nodes(({'name': f'景点{i}', 'rating': 4.5} for i in range(count)), chunk_size=100)
+        self.manager.create_relationships(((f'景点{i}', '相邻', f'景点{i + 1}') for i in range(count - 1)), chunk_size=100)
+        batch_seconds = time.perf_counter() - started
+
+        self.assertEqual(2 * count - 1, single_round_trips)
+        self.assertEqual(8, self.graph.round_trips)
+        self.assertEqual(count - 1, len(self.graph.relationships))
+        self.assertLess(batch_seconds * 10, single_seconds)
+
+if __name__ == '__main__':
+    unittest.main()
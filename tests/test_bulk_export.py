@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_bulk_export.py
+
+import unittest
+import sys
+import os
+import tempfile
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.data.bulk_export import export_for_neo4j_admin, build_admin_command
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+class TestBulkExport(unittest.TestCase):
+    """测试neo4j-admin批量导出"""
+    
+    def setUp(self):
+        """每个测试用例开始前执行，导出样例三元组到临时目录"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.tmp_dir.name
+        self.stats = export_for_neo4j_admin(os.path.join(FIXTURES_DIR, 'triplets_sample.csv'), self.output_dir)
+    
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+    
+    def test_matches_golden_files(self):
+        """测试导出结果与golden文件逐字节一致"""
+        golden_dir = os.path.join(FIXTURES_DIR, 'bulk_export_golden')
+        self.assertEqual(sorted(os.listdir(golden_dir)), sorted(os.listdir(self.output_dir)))
+        
+        for name in os.listdir(golden_dir):
+            with open(os.path.join(golden_dir, name), 'rb') as f:
+                expected = f.read()
+            with open(os.path.join(self.output_dir, name), 'rb') as f:
+                actual = f.read()
+            self.assertEqual(expected, actual, f"导出文件 {name} 与golden文件不一致")
+    
+    def test_validation_stats(self):
+        """测试无效ID、无效数值和分散重复景点的统计"""
+        self.assertEqual(3, self.stats['attractions'])
+        self.assertEqual(1, self.stats['invalid_ids'])
+        self.assertEqual(1, self.stats['invalid_values'])
+        self.assertEqual(1, self.stats['merged_duplicates'])
+        self.assertEqual(2, self.stats['城市'])
+        self.assertEqual(2, self.stats['区县'])
+        self.assertEqual(3, self.stats['属于区县'])
+    
+    def test_admin_command(self):
+        """测试生成的neo4j-admin命令包含所有节点和关系文件"""
+        command = build_admin_command(self.output_dir)
+        
+        self.assertIn("--multiline-fields=true", command)
+        self.assertEqual(3, command.count("--nodes="))
+        self.assertEqual(2, command.count("--relationships="))
+
+if __name__ == '__main__':
+    unittest.main()
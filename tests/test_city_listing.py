@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_city_listing.py
+
+import unittest
+import sys
+import os
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.models.city_listing import CityListing
+from src.models.snapshot import KGSnapshot
+
+class TestCityListing(unittest.TestCase):
+    """测试城市景点列表索引"""
+
+    def setUp(self):
+        snapshot = KGSnapshot(
+            {
+                "武侯祠": {"name": "武侯祠", "popularity": 8.9},
+                "杜甫草堂": {"name": "杜甫草堂", "popularity": 9.0},
+                "熊猫基地": {"name": "熊猫基地", "popularity": 9.5},
+                "锦里": {"name": "锦里"},
+                "文殊院": {"name": "文殊院", "popularity": 7.2},
+                "乐山大佛": {"name": "乐山大佛", "popularity": 8.7},
+            },
+            {"属于城市": {"武侯祠": "成都", "杜甫草堂": "成都", "熊猫基地": "成都", "锦里": "成都", "文殊院": "成都",
+                      "乐山大佛": "乐山"}}
+        )
+        self.listing = CityListing.from_snapshot(snapshot)
+
+    def test_cursor_pages(self):
+        """测试按热度排序后用游标逐页列出，没有热度的景点排在最后"""
+        first = self.listing.page("成都", None, 2)
+        self.assertEqual((["熊猫基地", "杜甫草堂"], 0, 5, "杜甫草堂"), first)
+        second = self.listing.page("成都", first.next_cursor, 2)
+        self.assertEqual((["武侯祠", "文殊院"], 2, 5, "文殊院"), second)
+        self.assertEqual((["锦里"], 4, 5, None), self.listing.page("成都", second.next_cursor, 2))
+
+    def test_province_and_missing(self):
+        """测试全省列表、没有景点的城市，以及游标中的景点已不在列表中时从第一页开始"""
+        self.assertEqual(6, self.listing.count())
+        self.assertEqual(["熊猫基地", "杜甫草堂", "武侯祠"], self.listing.page(None, None, 3).names)
+        self.assertEqual(([], 0, 0, None), self.listing.page("绵阳", None, 3))
+        self.assertEqual((["乐山大佛"], 0, 1, None), self.listing.page("乐山", "已删除的景点", 3))
+
+if __name__ == '__main__':
+    unittest.main()
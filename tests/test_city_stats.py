@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_city_stats.py
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.models.city_stats import CityStatistics, grouped_percentiles, get_city_statistics
+from src.models.snapshot import KGSnapshot
+
+class TestCityStatistics(unittest.TestCase):
+    """测试城市级统计"""
+    
+    def setUp(self):
+        self.snapshot = KGSnapshot(
+            {
+                "武侯祠": {"name": "武侯祠", "rating": 4.7, "popularity": 8.9},
+                "杜甫草堂": {"name": "杜甫草堂", "rating": 4.5, "popularity": 9.0},
+                "熊猫基地": {"name": "熊猫基地", "rating": 4.6, "popularity": 9.5},
+                "锦里": {"name": "锦里", "popularity": 7.9},
+                "乐山大佛": {"name": "乐山大佛", "rating": 4.8, "popularity": 8.7},
+                "无名景点": {"name": "无名景点", "rating": 3.0},
+            },
+            {"属于城市": {"武侯祠": "成都", "杜甫草堂": "成都", "熊猫基地": "成都", "锦里": "成都", "乐山大佛": "乐山"}}
+        )
+        self.statistics = CityStatistics.from_snapshot(self.snapshot)
+    
+    def test_grouped_percentiles_match_numpy(self):
+        """测试分组分位数与逐组调用 np.percentile 的结果一致"""
+        rng = np.random.default_rng(0)
+        codes = rng.integers(0, 5, 500)
+        values = rng.random(500)
+        for q in (0, 50, 90, 100):
+            expected = [np.percentile(values[codes == g], q) if (codes == g).any() else np.nan for g in range(6)]
+            np.testing.assert_allclose(expected, grouped_percentiles(codes, values, 6, q))
+    
+    def test_city(self):
+        """测试单个城市的数量、均值和分位数，缺失值不参与统计"""
+        chengdu = self.statistics.city("成都")
+        self.assertEqual(4, chengdu["count"])
+        self.assertEqual({"count": 3, "mean": 4.6, "p50": 4.6, "p90": 4.68}, chengdu["rating"])
+        self.assertEqual(4, chengdu["popularity"]["count"])
+        self.assertIsNone(self.statistics.city("绵阳"))
+        self.assertEqual(6, self.statistics.total["count"])
+    
+    def test_rank_cities(self):
+        """测试按数量和均值比较城市，均值比较只包括有足够景点的城市"""
+        self.assertEqual([("成都", 4.0), ("乐山", 1.0)], self.statistics.rank_cities())
+        self.assertEqual([("成都", 4.6)], self.statistics.rank_cities("rating"))
+        self.assertEqual(["乐山", "成都"], [city for city, _ in self.statistics.rank_cities("rating", min_count=1)])
+    
+    def test_cached_per_snapshot(self):
+        """测试统计结果按快照缓存"""
+        self.assertIs(get_city_statistics(self.snapshot), get_city_statistics(self.snapshot))
+
+if __name__ == '__main__':
+    unittest.main()
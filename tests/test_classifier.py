@@ -5,6 +5,7 @@
 import unittest
 import sys
 import os
+import json
 
 # 添加上级目录到路径中，使测试可以导入项目模块
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -48,6 +49,64 @@ class TestQuestionClassifier(unittest.TestCase):
         # 验证问题类型
         self.assertIn('开放时间', result['question_types'])
     
+    def test_default_description_low_confidence(self):
+        """测试只识别出景点、默认按简介回答时标记为低置信度"""
+        result = self.classifier.classify("武侯祠供奉的是谁")
+        self.assertEqual(['简介'], result['question_types'])
+        self.assertTrue(result.get('low_confidence'))
+        
+        result = self.classifier.classify("介绍一下武侯祠")
+        self.assertEqual(['简介'], result['question_types'])
+        self.assertNotIn('low_confidence', result)
+    
+    def test_split_clauses(self):
+        """测试按标点拆分多个问题，没有提到景点的分句补上前面的景点"""
+        self.assertEqual(["武侯祠门票多少钱", "武侯祠附近有什么好吃的"],
+                         self.classifier.split_clauses("武侯祠门票多少钱，附近有什么好吃的"))
+        self.assertEqual(["杜甫草堂几点开门", "成都有哪些免费景点"],
+                         self.classifier.split_clauses("杜甫草堂几点开门？另外成都有哪些免费景点"))
+        # 只有景点名称的分句与下一分句合并，过短的补充并入上一分句
+        self.assertEqual(["武侯祠地址在哪"], self.classifier.split_clauses("武侯祠，地址在哪"))
+        self.assertEqual(["武侯祠门票多少钱，地址呢"], self.classifier.split_clauses("武侯祠门票多少钱，地址呢"))
+        self.assertEqual(["武侯祠的地址是什么"], self.classifier.split_clauses("武侯祠的地址是什么？"))
+    
+    def test_nearby(self):
+        """测试附近景点问题的识别，"附近有什么好吃的"不按附近景点处理"""
+        self.assertEqual(['周边景点'], self.classifier.classify("武侯祠附近有什么景点")['question_types'])
+        self.assertEqual(['周边景点'], self.classifier.classify("乐山大佛周边有什么好玩的")['question_types'])
+        self.assertNotIn('周边景点', self.classifier.classify("武侯祠附近有什么好吃的")['question_types'])
+
+    def test_comparison(self):
+        """测试景点比较问题的识别：指标和比较方向"""
+        result = self.classifier.classify("武侯祠和杜甫草堂哪个评分高")
+        self.assertEqual(['景点比较'], result['question_types'])
+        self.assertEqual({'metric': 'rating', 'order': 'max'}, result['params'])
+        self.assertEqual(['武侯祠', '杜甫草堂'], list(result['args']))
+        self.assertEqual({'metric': 'popularity', 'order': 'max'}, self.classifier.classify("锦里和宽窄巷子哪个人多")['params'])
+        self.assertEqual({'metric': 'adultPrice', 'order': 'min'}, self.classifier.classify("峨眉山和青城山哪个门票便宜")['params'])
+        self.assertEqual({'metric': 'adultPrice', 'order': 'max'}, self.classifier.classify("峨眉山和青城山门票多少钱，哪个贵")['params'])
+        # 只有一个景点时不是比较问题
+        self.assertNotIn('景点比较', self.classifier.classify("武侯祠哪个门票便宜")['question_types'])
+
+    def test_pair_intents(self):
+        """测试多个景点、多个问题类型时按位置把问题类型与景点配对"""
+        result = self.classifier.classify("武侯祠的地址和锦里的门票")
+        self.assertEqual({'地址': ['武侯祠'], '门票价格': ['锦里古街']}, result['pairs'])
+        # 只有一个问题类型时不需要配对
+        self.assertNotIn('pairs', self.classifier.classify("武侯祠和锦里的门票分别是多少"))
+
+    def test_pair_intents_accuracy(self):
+        """测试多景点问题集上的配对准确率"""
+        path = os.path.join(os.path.dirname(__file__), 'fixtures', 'multi_entity_questions.json')
+        with open(path, encoding='utf-8') as f:
+            cases = json.load(f)
+        wrong = []
+        for case in cases:
+            pairs = self.classifier.classify(case['question']).get('pairs', {})
+            if {question_type: sorted(names) for question_type, names in pairs.items()} != case['pairs']:
+                wrong.append((case['question'], pairs))
+        self.assertEqual([], wrong, f"配对准确率 {1 - len(wrong) / len(cases):.0%}")
+    
     def test_no_entity(self):
         """测试没有有效实体的情况"""
         test_question = "四川有哪些好吃的？"
@@ -56,6 +115,96 @@ class TestQuestionClassifier(unittest.TestCase):
         # 期望结果中没有识别出景点实体，且问题类型为空列表
         self.assertEqual({}, result.get('args', {}))
         self.assertEqual([], result.get('question_types', []))
+    
+    def test_open_now(self):
+        """测试景点当前是否开放的问题，提取时间参数"""
+        result = self.classifier.classify("都江堰景区晚上9点半还开着吗？")
+        
+        self.assertIn('都江堰景区', result['args'])
+        self.assertIn('是否开放', result['question_types'])
+        self.assertEqual({'minute': 21 * 60 + 30, 'day_offset': 0}, result['params'])
+    
+    def test_open_attractions_without_entity(self):
+        """测试没有景点实体时列出开放景点的问题"""
+        result = self.classifier.classify("明天早上7:15开门的景点有哪些？")
+        
+        self.assertEqual({}, result['args'])
+        self.assertEqual(['开放景点'], result['question_types'])
+        self.assertEqual({'minute': 7 * 60 + 15, 'day_offset': 1}, result['params'])
+        self.assertEqual({'minute': None, 'day_offset': 0}, self.classifier.extract_time("现在还开着的景点"))
+    
+    def test_price_questions(self):
+        """测试价格区间和免费景点问题"""
+        result = self.classifier.classify("门票100元以下的景点有哪些？")
+        self.assertEqual(['价格区间'], result['question_types'])
+        self.assertEqual({'min_price': None, 'max_price': 100.0, 'city': None}, result['params'])
+        result = self.classifier.classify("成都100元以内的景点")
+        self.assertEqual(['价格区间'], result['question_types'])
+        self.assertEqual({'min_price': None, 'max_price': 100.0, 'city': '成都'}, result['params'])
+        
+        self.assertEqual({'min_price': 50.0, 'max_price': 150.0}, self.classifier.extract_price_range("150到50块的景点"))
+        self.assertEqual({'min_price': 200.0, 'max_price': None}, self.classifier.extract_price_range("超过200元的景点"))
+        self.assertEqual(['免费景点'], self.classifier.classify("免费景点有哪些？")['question_types'])
+        self.assertEqual({'args': {}, 'question_types': ['免费景点'], 'params': {'city': '成都'}}, self.classifier.classify("成都免费景点"))
+    
+    def test_city_ranking(self):
+        """测试城市景点排行问题，城市名与景点同名时仍识别为排行问题"""
+        result = self.classifier.classify("成都评分最高的景点有哪些？")
+        self.assertEqual(['景点排行'], result['question_types'])
+        self.assertEqual({'city': '成都', 'metric': 'rating', 'k': None}, result['params'])
+        
+        result = self.classifier.classify("阿坝州最热门的前5个景点")
+        self.assertEqual({'city': '阿坝', 'metric': 'popularity', 'k': 5}, result['params'])
+        
+        self.assertEqual(10, self.classifier.classify("成都十大景点有哪些")['params']['k'])
+        self.assertEqual(3, self.classifier.classify("推荐3个好玩的景点")['params']['k'])
+        
+        # 针对具体景点的问题不是排行问题
+        self.assertNotIn('景点排行', self.classifier.classify("武侯祠评分最高吗？")['question_types'])
+        # 人数不是排行数量，没有排行关键词时不是排行问题
+        self.assertNotIn('景点排行', self.classifier.classify("我们3个人去哪里玩").get('question_types', []))
+        self.assertIsNone(self.classifier.extract_rank_k("我们3个人去哪个景点"))
+    
+    def test_similar_attractions(self):
+        """测试相似景点问题"""
+        result = self.classifier.classify("和武侯祠类似的景点有哪些？")
+        self.assertIn('武侯祠', result['args'])
+        self.assertEqual(['相似景点'], result['question_types'])
+        self.assertEqual(['相似景点'], self.classifier.classify("有没有跟杜甫草堂差不多的景点")['question_types'])
+    
+    def test_facility_filter(self):
+        """测试服务设施筛选问题，提取设施、且/或关系、城市和最低评分"""
+        result = self.classifier.classify("哪些景点有停车场和无障碍设施？")
+        self.assertEqual(['设施筛选'], result['question_types'])
+        self.assertEqual({'facilities': ['停车场', '无障碍设施'], 'mode': 'all', 'city': None, 'min_rating': None}, result['params'])
+        
+        result = self.classifier.classify("成都评分4.5以上有母婴室或者淋浴的景点")
+        self.assertEqual({'facilities': ['母婴室', '淋浴设施'], 'mode': 'any', 'city': '成都', 'min_rating': 4.5}, result['params'])
+        
+        # 针对具体景点的问题不是设施筛选问题
+        self.assertNotIn('设施筛选', self.classifier.classify("武侯祠有停车场吗？")['question_types'])
+    
+    def test_city_statistics(self):
+        """测试城市统计问题"""
+        result = self.classifier.classify("成都有多少个景点？")
+        self.assertEqual(['城市统计'], result['question_types'])
+        self.assertEqual({'city': '成都', 'metric': None, 'compare': False}, result['params'])
+        
+        result = self.classifier.classify("哪个城市景点平均评分最高？")
+        self.assertEqual(['城市统计'], result['question_types'])
+        self.assertEqual({'city': None, 'metric': 'rating', 'compare': True}, result['params'])
+
+    def test_city_listing(self):
+        """测试列出城市景点和翻页问题"""
+        self.assertEqual({'args': {}, 'question_types': ['城市景点'], 'params': {'city': '成都'}},
+                         self.classifier.classify("成都有哪些景点？"))
+        self.assertEqual({'city': '阿坝'}, self.classifier.classify("阿坝州有什么好玩的")['params'])
+        self.assertEqual({'more': True}, self.classifier.classify("更多")['params'])
+        self.assertEqual({'more': True, 'city': '成都'}, self.classifier.classify("成都还有哪些景点")['params'])
+        
+        # 不是询问景点的城市问题不列出景点
+        self.assertEqual({}, self.classifier.classify("成都有什么好吃的"))
+        self.assertEqual({}, self.classifier.classify("成都在哪里"))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_data_import.py
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import py2neo_data_import
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+class FakeTransaction:
+    """记录写入主体的模拟事务，可在指定主体处模拟崩溃"""
+    
+    def __init__(self, graph):
+        self.graph = graph
+        self.subjects = []
+    
+    def run(self, query, **params):
+        name = params.get('name') or params.get('s_name')
+        if name == self.graph.fail_on:
+            raise RuntimeError("模拟数据库崩溃")
+        if query.startswith("MERGE (s:景点"):
+            self.subjects.append(name)
+    
+    def rollback(self):
+        self.subjects = []
+
+class FakeGraph:
+    """只保存已提交事务内容的模拟Graph"""
+    
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.committed = []
+    
+    def run(self, query, **params):
+        return None
+    
+    def begin(self):
+        return FakeTransaction(self)
+    
+    def commit(self, tx):
+        self.committed.extend(tx.subjects)
+
+class TestResumableImport(unittest.TestCase):
+    """测试可断点续传的流式导入"""
+    
+    def setUp(self):
+        """复制样例三元组到临时目录，检查点文件写在同一目录"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'triplets.csv')
+        shutil.copy(os.path.join(FIXTURES_DIR, 'triplets_sample.csv'), self.file_path)
+        self.checkpoint_path = self.file_path + '.checkpoint.json'
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def run_import(self, graph):
+        with patch('py2neo_data_import.get_graph_pool', return_value=MagicMock(graph=graph)):
+            return py2neo_data_import.main(self.file_path, batch_size=4)
+    
+    def test_full_import_removes_checkpoint(self):
+        """测试完整导入后所有有效行都已提交且检查点被删除"""
+        graph = FakeGraph()
+        result = self.run_import(graph)
+        
+        self.assertEqual({'rows': 18, 'batches': 5}, result)
+        self.assertEqual(17, len(graph.committed))  # 主体为空的行被跳过
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+    
+    def test_resume_after_crash(self):
+        """测试崩溃后检查点记录已提交批次，重新运行只处理剩余的行"""
+        crashed = FakeGraph(fail_on='乐山大佛')
+        with self.assertRaises(RuntimeError):
+            self.run_import(crashed)
+        
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        self.assertEqual(3, checkpoint['batch'])
+        self.assertEqual(12, checkpoint['rows'])
+        self.assertEqual(11, len(crashed.committed))
+        
+        resumed = FakeGraph()
+        result = self.run_import(resumed)
+        
+        self.assertEqual({'rows': 18, 'batches': 5}, result)
+        self.assertEqual('乐山大佛', resumed.committed[0])
+        self.assertEqual(17, len(crashed.committed) + len(resumed.committed))
+    
+    def test_stale_checkpoint_is_ignored(self):
+        """测试数据文件变化后旧检查点被忽略"""
+        py2neo_data_import.save_checkpoint(self.checkpoint_path, {
+            'file': os.path.abspath(self.file_path), 'size': 1, 'mtime': 0, 'offset': 10, 'batch': 1, 'rows': 4
+        })
+        
+        self.assertIsNone(py2neo_data_import.load_checkpoint(self.checkpoint_path, self.file_path))
+
+if __name__ == '__main__':
+    unittest.main()
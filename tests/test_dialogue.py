@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_dialogue.py
+
+import unittest
+import sys
+import os
+import json
+import time
+import uuid
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.api.dialogue import DialogueState, resolve_followup
+
+class TestResolveFollowup(unittest.TestCase):
+    """测试追问改写"""
+
+    def test_pronoun_and_ellipsis(self):
+        """测试代词替换为上一轮的景点，省略景点的追问在开头补上景点"""
+        self.assertEqual("武侯祠的门票呢？", resolve_followup("它的门票呢？", ["武侯祠"]))
+        self.assertEqual("武侯祠和锦里古街的地址", resolve_followup("它们的地址", ["武侯祠", "锦里古街"]))
+        self.assertEqual("武侯祠开放时间呢", resolve_followup("那开放时间呢", ["武侯祠"]))
+        self.assertIsNone(resolve_followup("开放时间呢", ["武侯祠"], ellipsis=False))
+        self.assertIsNone(resolve_followup("其它景点有哪些", ["武侯祠"]))
+        self.assertIsNone(resolve_followup("它的门票呢", []))
+
+class TestDialogueState(unittest.TestCase):
+    """测试对话状态"""
+
+    def test_ttl_and_capacity(self):
+        """测试过期的状态被丢弃，超出用户数时淘汰最久未提问的用户"""
+        state = DialogueState(ttl=0.05, max_users=2)
+        state.remember("a", ["武侯祠"])
+        state.remember("b", ["锦里古街"])
+        state.remember("a", ["杜甫草堂"])
+        state.remember("c", ["文殊院"])
+        self.assertEqual([], state.recall("b"))
+        self.assertEqual(["杜甫草堂"], state.recall("a"))
+        time.sleep(0.06)
+        self.assertEqual([], state.recall("c"))
+
+    def test_listing_cursor(self):
+        """测试记住正在查看的城市景点列表，不影响上一轮的景点"""
+        state = DialogueState()
+        self.assertIsNone(state.recall_listing("a"))
+        state.remember("a", ["武侯祠"])
+        state.remember_listing("a", "成都", "杜甫草堂")
+        self.assertEqual(("成都", "杜甫草堂"), state.recall_listing("a"))
+        self.assertEqual(["武侯祠"], state.recall("a"))
+        state.remember_listing("a", "成都", None)
+        self.assertEqual(("成都", None), state.recall_listing("a"))
+
+    def test_followup_fallback_rate(self):
+        """
+        测试脚本对话经过 Backend_code.tier_snapshot 的真实追问流程后，追问不再因无法识别而转向大模型；
+        改写前的转向次数用没有对话状态的新用户逐轮提问得到
+        """
+        import Backend_code
+        path = os.path.join(os.path.dirname(__file__), 'fixtures', 'dialogues.json')
+        with open(path, encoding='utf-8') as f:
+            dialogues = json.load(f)
+
+        def ask(question, user_id):
+            context = {'question': question, 'user_id': user_id, 'cacheable': True}
+            Backend_code.tier_snapshot(context)
+            fallback = context.get('reason') in ("没有识别到相关景点信息", "无法构建有效的查询")
+            return list(context['classify'].get('args', {})), fallback
+
+        turns, fallback_before, fallback_after = 0, 0, 0
+        for dialogue in dialogues:
+            user_id = str(uuid.uuid4())
+            for turn in dialogue:
+                turns += 1
+                fallback_before += ask(turn['question'], str(uuid.uuid4()))[1]  # 没有上一轮的景点
+                entities, fallback = ask(turn['question'], user_id)
+                fallback_after += fallback
+                self.assertEqual(turn['entities'], entities, turn['question'])
+        self.assertEqual(26, turns)
+        self.assertEqual(16, fallback_before)
+        self.assertEqual(0, fallback_after)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_facilities.py
+
+import unittest
+import sys
+import os
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.data.facilities import extract_facility_tags, format_tags, match_facilities, parse_tags
+from src.models.facility_index import FacilityIndex
+from src.models.snapshot import KGSnapshot
+
+class TestFacilityTags(unittest.TestCase):
+    """测试从服务设施文本中提取设施标签"""
+
+    def test_extract_from_headers(self):
+        """测试只根据行首的设施名称提取标签，并归并不同写法"""
+        text = ("停车场 ： 参考价格：¥5元/次；地址：景区南门\n\n"
+                "WiFi ： 密码：无需密码\n\n"
+                "轮椅租赁 ： 游客中心可借用，卫生间旁")
+        self.assertEqual(["停车场", "无障碍设施", "WIFI"], extract_facility_tags(text))
+        self.assertEqual([], extract_facility_tags(None))
+
+    def test_serialize(self):
+        """测试标签序列化与解析，未知标签被忽略"""
+        self.assertEqual("停车场;卫生间", format_tags(["停车场", "卫生间"]))
+        self.assertEqual(["停车场", "卫生间"], parse_tags("停车场; 卫生间;未知设施"))
+        self.assertEqual(["卫生间", "母婴室"], match_facilities("有厕所和母婴室的景点"))
+
+class TestFacilityIndex(unittest.TestCase):
+    """测试服务设施位图索引"""
+
+    def setUp(self):
+        snapshot = KGSnapshot(
+            {
+                "武侯祠": {"name": "武侯祠", "rating": 4.7, "facilityTags": "停车场;卫生间;无障碍设施"},
+                "杜甫草堂": {"name": "杜甫草堂", "rating": 4.5, "facilityTags": "停车场;卫生间"},
+                "熊猫基地": {"name": "熊猫基地", "rating": 4.8, "facilityTags": "卫生间;母婴室"},
+                "乐山大佛": {"name": "乐山大佛", "rating": 4.9, "facilityTags": "停车场;无障碍设施"},
+                "锦里": {"name": "锦里"},
+            },
+            {"属于城市": {"武侯祠": "成都", "杜甫草堂": "成都", "熊猫基地": "成都", "锦里": "成都", "乐山大佛": "乐山"}}
+        )
+        self.index = FacilityIndex.from_snapshot(snapshot)
+
+    def test_all_and_any(self):
+        """测试同时具备（交集）和具备其一（并集）"""
+        self.assertEqual(["武侯祠", "乐山大佛"], self.index.query(all_of=["停车场", "无障碍设施"]))
+        self.assertEqual(["武侯祠", "熊猫基地", "乐山大佛"], self.index.query(any_of=["母婴室", "无障碍设施"]))
+        self.assertEqual(4, len(self.index))
+        self.assertEqual([], self.index.query(all_of=["淋浴设施"]))
+
+    def test_city_and_rating_filters(self):
+        """测试与城市、最低评分条件组合"""
+        self.assertEqual(["武侯祠"], self.index.query(all_of=["停车场", "无障碍设施"], city="成都"))
+        self.assertEqual(["武侯祠", "熊猫基地"], self.index.query(all_of=["卫生间"], min_rating=4.6))
+        self.assertEqual(["熊猫基地"], self.index.query(any_of=["停车场", "母婴室"], city="成都", min_rating=4.75))
+        self.assertEqual([], self.index.query(all_of=["停车场"], min_rating=5.0))
+        self.assertEqual([], self.index.query(all_of=["停车场"], city="绵阳"))
+
+if __name__ == '__main__':
+    unittest.main()
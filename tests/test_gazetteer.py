@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_gazetteer.py
+
+import unittest
+import sys
+import os
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.data.gazetteer import Gazetteer, get_gazetteer, prefecture_short_name
+
+class TestGazetteer(unittest.TestCase):
+    """测试地名库字典树"""
+    
+    def setUp(self):
+        self.gazetteer = get_gazetteer()
+    
+    def test_province_city_district(self):
+        """测试 省 → 市 → 区 的完整地址"""
+        self.assertEqual(("成都", "武侯区"), self.gazetteer.extract("四川省成都市武侯区武侯祠大街231号"))
+    
+    def test_county_level_city_belongs_to_prefecture(self):
+        """测试县级市归入所属地级市，而不是作为城市"""
+        self.assertEqual(("成都", "都江堰市"), self.gazetteer.extract("四川省成都市都江堰市公园路"))
+        self.assertEqual(("成都", "都江堰市"), self.gazetteer.extract("都江堰市公园路"))
+    
+    def test_duplicate_district_name(self):
+        """测试同名区县使用地级行政区前缀区分，且不从同名区县反推城市"""
+        self.assertEqual(("乐山", "乐山市市中区"), self.gazetteer.extract("乐山市市中区凌云路2435号"))
+        self.assertEqual(("内江", "内江市市中区"), self.gazetteer.extract("内江市市中区"))
+        self.assertEqual(("", ""), self.gazetteer.extract("市中区凌云路"))
+    
+    def test_autonomous_prefecture_aliases(self):
+        """测试自治州的全称、简称和"X州"写法"""
+        self.assertEqual("阿坝", self.gazetteer.extract("阿坝藏族羌族自治州九寨沟县")[0])
+        self.assertEqual(("阿坝", "九寨沟县"), self.gazetteer.extract("阿坝州九寨沟县漳扎镇"))
+        self.assertEqual("甘孜", prefecture_short_name("甘孜藏族自治州"))
+    
+    def test_unknown_address(self):
+        """测试无法识别的地址返回空字符串"""
+        self.assertEqual(("", ""), self.gazetteer.extract("福锦路一段"))
+        self.assertEqual(("", ""), self.gazetteer.extract(""))
+    
+    def test_longest_match(self):
+        """测试前缀重叠的地名取最长匹配"""
+        gazetteer = Gazetteer([("成都市", "成华区"), ("成都市", "成都高新区")])
+        self.assertEqual(("成都", "成华区"), gazetteer.extract("成都成华区"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_graph_pool.py
+
+import unittest
+import sys
+import os
+import threading
+import time
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from answer_search import AnswerSearcher
+from src.models.snapshot import KGSnapshot
+from src.utils.database import (CircuitBreaker, CircuitOpen, GraphConnectionError, GraphPool, GraphUnavailable,
+                                Neo4jManager, PoolTimeout, QueryTimeout, get_graph_pool)
+
+class StubGraph:
+    """模拟py2neo的连接复用：有空闲连接时复用，否则新建连接，记录新建的连接数"""
+
+    def __init__(self, latency=0.005):
+        self.latency = latency
+        self.opened = 0
+        self.calls = 0
+        self._free = []
+        self._lock = threading.Lock()
+
+    def run(self, query, parameters=None, **kwparameters):
+        self.calls += 1
+        with self._lock:
+            if self._free:
+                connection = self._free.pop()
+            else:
+                self.opened += 1
+                connection = self.opened
+        time.sleep(self.latency)
+        with self._lock:
+            self._free.append(connection)
+        return query
+
+class RefusingGraph:
+    """模拟Neo4j没有启动：每次查询都被拒绝连接"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def run(self, query, parameters=None, **kwparameters):
+        self.calls += 1
+        raise ConnectionRefusedError(111, "Connection refused")
+
+class TestGraphPool(unittest.TestCase):
+    """测试共享的Neo4j连接池"""
+
+    def test_concurrent_requests_reuse_connections(self):
+        """测试200个并发请求只使用连接池大小以内的连接，没有等待超时"""
+        graph = StubGraph()
+        pool = GraphPool(max_size=8, acquire_timeout=10, graph_factory=lambda: graph)
+        start = threading.Barrier(200)
+        errors = []
+
+        def request():
+            start.wait()
+            try:
+                pool.run("MATCH (a:景点) RETURN a.name")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=request) for _ in range(200)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = pool.stats()
+        self.assertEqual([], errors)
+        self.assertLessEqual(graph.opened, 8)
+        self.assertEqual(200, stats["acquired"])
+        self.assertEqual(0, stats["timeouts"])
+        self.assertEqual(8, stats["peak_in_use"])
+        self.assertEqual(0, stats["in_use"])
+        self.assertGreater(stats["wait_ms_max"], 0)
+
+    def test_acquire_timeout(self):
+        """测试名额用完时等待超时抛出PoolTimeout并计数"""
+        pool = GraphPool(max_size=1, acquire_timeout=0.05, graph_factory=StubGraph)
+        with pool.acquire():
+            self.assertEqual(1.0, pool.stats()["utilization"])
+            with self.assertRaises(PoolTimeout):
+                pool.run("RETURN 1")
+        self.assertEqual(1, pool.stats()["timeouts"])
+        self.assertEqual("RETURN 1", pool.run("RETURN 1"))
+
+    def test_breaker_on_latency_spike(self):
+        """测试查询延迟突增时查询超时，连续失败后熔断器打开、不再访问数据库，恢复后经试探查询关闭"""
+        graph = StubGraph(latency=0.2)
+        pool = GraphPool(max_size=4, query_timeout=0.02, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=0.1),
+                         graph_factory=lambda: graph)
+        for _ in range(3):
+            with self.assertRaises(QueryTimeout):
+                pool.run("RETURN 1")
+        self.assertFalse(pool.available)
+
+        started = time.monotonic()
+        with self.assertRaises(CircuitOpen):
+            pool.run("RETURN 1")
+        self.assertLess(time.monotonic() - started, 0.02)
+        self.assertEqual(3, graph.calls)
+
+        graph.latency = 0.0
+        time.sleep(0.25)  # 超时的查询在后台结束，熔断器到达试探时间
+        self.assertTrue(pool.available)
+        self.assertEqual("RETURN 1", pool.run("RETURN 1"))
+        stats = pool.stats()
+        self.assertEqual("closed", stats["breaker"]["state"])
+        self.assertEqual({"closed->open": 1, "open->half_open": 1, "half_open->closed": 1}, stats["breaker"]["transitions"])
+        self.assertEqual(1, stats["breaker"]["rejected"])
+        self.assertEqual(3, stats["query_timeouts"])
+        self.assertEqual(0, stats["in_use"])
+
+    def test_failed_trial_reopens(self):
+        """测试半开状态只放行一次试探查询，试探失败时重新打开"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual("open", breaker.state)
+        self.assertEqual({"closed->open": 1, "open->half_open": 1, "half_open->open": 1}, breaker.stats()["transitions"])
+
+    def test_connection_refused(self):
+        """测试连接被拒绝时包装为GraphUnavailable并计为失败，第一个问题就改用内存快照回答"""
+        graph = RefusingGraph()
+        pool = GraphPool(max_size=2, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60), graph_factory=lambda: graph)
+        with self.assertRaises(GraphConnectionError) as context:
+            pool.run("RETURN 1")
+        self.assertIsInstance(context.exception, GraphUnavailable)
+        self.assertIsInstance(context.exception.__cause__, ConnectionRefusedError)
+        self.assertEqual(1, pool.stats()["connection_errors"])
+        self.assertEqual(1, pool.stats()["breaker"]["failures"])
+
+        searcher = AnswerSearcher(snapshot=KGSnapshot({'武侯祠': {'name': '武侯祠', 'address': '武侯祠大街231号'}}))
+        searcher.g = pool
+        result = searcher.search_results([
+            {'question_type': '地址', 'sql': ["MATCH (a:景点) WHERE a.name = '武侯祠' RETURN a.name AS name, a.address AS 地址"],
+             'entities': ['武侯祠']},
+        ])
+        self.assertEqual([("武侯祠的地址是：武侯祠大街231号。", True)], result)
+        self.assertEqual(2, graph.calls)
+
+        def refuse():
+            raise ConnectionRefusedError(111, "Connection refused")
+        pool = GraphPool(max_size=2, query_timeout=0, graph_factory=refuse)
+        with self.assertRaises(GraphConnectionError):
+            pool.run("RETURN 1")
+        self.assertEqual(1, pool.stats()["connection_errors"])
+
+    def test_components_share_pool(self):
+        """测试答案搜索器和数据库管理器共用同一个连接池，且创建时不连接数据库"""
+        pool = get_graph_pool()
+        self.assertIs(pool, AnswerSearcher().g)
+        self.assertIs(pool, Neo4jManager().pool)
+        self.assertIsNot(pool, Neo4jManager(uri="bolt://other:7687").pool)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_nearby_index.py
+
+import unittest
+import sys
+import os
+import tempfile
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.data.gazetteer import load_district_adjacency
+from src.models.nearby_index import NearbyIndex
+from src.models.snapshot import KGSnapshot
+
+class TestNearbyIndex(unittest.TestCase):
+    """测试区县级附近景点索引"""
+
+    def setUp(self):
+        snapshot = KGSnapshot(
+            {
+                "武侯祠": {"name": "武侯祠", "popularity": 8.9},
+                "锦里": {"name": "锦里", "popularity": 7.9},
+                "玉林路": {"name": "玉林路"},
+                "杜甫草堂": {"name": "杜甫草堂", "popularity": 9.0},
+                "春熙路": {"name": "春熙路", "popularity": 9.2, "address": "成都市锦江区春熙路"},
+                "熊猫基地": {"name": "熊猫基地", "popularity": 9.5},
+                "乐山大佛": {"name": "乐山大佛", "popularity": 8.7},
+                "峨眉山": {"name": "峨眉山", "popularity": 9.1},
+                "无地址": {"name": "无地址"},
+            },
+            {
+                "属于城市": {"武侯祠": "成都", "锦里": "成都", "玉林路": "成都", "杜甫草堂": "成都", "熊猫基地": "成都",
+                          "乐山大佛": "乐山", "峨眉山": "乐山"},
+                "属于区县": {"武侯祠": "武侯区", "锦里": "武侯区", "玉林路": "武侯区", "杜甫草堂": "青羊区",
+                          "熊猫基地": "成华区", "乐山大佛": "乐山市市中区", "峨眉山": "峨眉山市"},
+            }
+        )
+        adjacency = {"武侯区": ["锦江区", "青羊区"], "锦江区": ["武侯区"], "青羊区": ["武侯区"]}
+        self.index = NearbyIndex.from_snapshot(snapshot, adjacency)
+
+    def test_same_then_adjacent_districts(self):
+        """测试先返回同一区县的景点，再返回相邻区县的景点，均按热度排序；区县缺失时从地址中提取"""
+        groups = self.index.nearby("武侯祠", 4)
+        self.assertEqual(("same", ["武侯区"], ["锦里", "玉林路"]), groups[0])
+        self.assertEqual(("adjacent", ["锦江区", "青羊区"], ["春熙路", "杜甫草堂"]), groups[1])
+        self.assertEqual([("same", ["武侯区"], ["锦里"])], self.index.nearby("武侯祠", 1))
+
+    def test_city_fallback_and_missing(self):
+        """测试相邻关系中没有的区县退回到同一城市，没有区县信息的景点返回空列表"""
+        self.assertEqual([("city", ["峨眉山市"], ["峨眉山"])], self.index.nearby("乐山大佛", 5))
+        self.assertEqual([], self.index.nearby("无地址", 5))
+        self.assertEqual(8, len(self.index))
+
+    def test_load_adjacency(self):
+        """测试相邻关系文件中每对区县只需列出一次"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "adjacency.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("district,neighbor\n武侯区,青羊区\n武侯区,锦江区\n青羊区,武侯区\n")
+            self.assertEqual({"武侯区": ["青羊区", "锦江区"], "青羊区": ["武侯区"], "锦江区": ["武侯区"]},
+                             load_district_adjacency(path))
+            self.assertEqual({}, load_district_adjacency(os.path.join(directory, "missing.csv")))
+        self.assertIn("青羊区", load_district_adjacency()["武侯区"])
+
+if __name__ == '__main__':
+    unittest.main()
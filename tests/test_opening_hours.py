@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_opening_hours.py
+
+import unittest
+import sys
+import os
+import random
+import datetime
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.data.opening_hours import format_rules, parse_opening_hours, parse_rules
+from src.models.opening_index import OpeningHoursIndex
+from src.models.snapshot import KGSnapshot
+
+class TestOpeningHoursParser(unittest.TestCase):
+    """测试开放时间文本解析"""
+    
+    def test_seasonal_ranges(self):
+        """测试季节时段，跨年的日期范围拆成两段"""
+        rules = parse_opening_hours("03/01-10/31 07:30-18:00开放;11/01-02/28 08:00-17:30开放")
+        self.assertEqual(
+            "0301-1031|1234567|0730-1800;1101-1231|1234567|0800-1730;0101-0229|1234567|0800-1730",
+            format_rules(rules)
+        )
+    
+    def test_weekdays_and_closed_days(self):
+        """测试星期限定，闭馆子句和节假日子句不生成规则"""
+        text = "全年 周二-周四, 周日 09:00-17:00开放;全年 周五-周六 09:00-20:30开放;全年 周一 全天不开放;劳动节 09:00-18:30开放"
+        self.assertEqual("0101-1231|2347|0900-1700;0101-1231|56|0900-2030", format_rules(parse_opening_hours(text)))
+    
+    def test_all_day_and_remarks(self):
+        """测试全天开放，逗号后的补充说明不参与解析"""
+        self.assertEqual("0101-1231|1234567|0000-2400", format_rules(parse_opening_hours("全年 全天开放，具体营业状态以当天开放情况为准")))
+        self.assertEqual("0523-0523|5|2030-2230", format_rules(parse_opening_hours("05/23 周五 20:30-22:30开放，演出开始时间 20:30")))
+    
+    def test_unknown_hours(self):
+        """测试无法确定时段的文本"""
+        for text in ["具体营业状态以当天开放情况为准", "待定，演出开始时间 19:30 ,具体演出时长以现场为准", "", None]:
+            self.assertEqual([], parse_opening_hours(text))
+    
+    def test_round_trip(self):
+        """测试序列化后可以无损解析，包括跨越零点的时段"""
+        rules = parse_opening_hours("全年 20:00-02:00开放;12/01-12/31 周六 10:00-12:00开放")
+        self.assertEqual("0101-1231|1234567|2000-0200;1201-1231|6|1000-1200", format_rules(rules))
+        self.assertEqual(rules, parse_rules(format_rules(rules)))
+
+class TestOpeningHoursIndex(unittest.TestCase):
+    """测试开放时间区间索引"""
+    
+    def setUp(self):
+        texts = {
+            "武侯祠": "全年 09:00-18:00开放",
+            "熊猫基地": "03/01-10/31 07:30-18:00开放;11/01-02/28 08:00-17:30开放",
+            "博物馆": "全年 周二-周日 09:00-17:00开放;全年 周一 全天不开放",
+            "夜市": "全年 20:00-02:00开放",
+            "广场": "全年 全天开放",
+            "剧场": "待定",
+        }
+        snapshot = KGSnapshot({
+            name: {"name": name, "openingIntervals": format_rules(parse_opening_hours(text))}
+            for name, text in texts.items()
+        })
+        self.index = OpeningHoursIndex.from_snapshot(snapshot)
+    
+    def test_is_open(self):
+        """测试单个景点是否开放，包括季节、星期和前一天跨越零点的时段"""
+        monday_morning = datetime.datetime(2026, 3, 2, 7, 45)
+        self.assertTrue(self.index.is_open("熊猫基地", monday_morning))
+        self.assertFalse(self.index.is_open("熊猫基地", monday_morning.replace(month=11)))
+        self.assertFalse(self.index.is_open("博物馆", monday_morning.replace(hour=10)))
+        self.assertTrue(self.index.is_open("博物馆", datetime.datetime(2026, 3, 3, 10, 0)))
+        self.assertTrue(self.index.is_open("夜市", datetime.datetime(2026, 1, 1, 1, 30)))
+        self.assertFalse(self.index.is_open("夜市", datetime.datetime(2026, 1, 1, 2, 0)))
+        self.assertIsNone(self.index.is_open("剧场", monday_morning))
+    
+    def test_open_at(self):
+        """测试某一时刻开放的全部景点"""
+        self.assertEqual(["夜市", "广场"], self.index.open_at(datetime.datetime(2026, 3, 2, 1, 0)))
+        self.assertEqual(["广场", "武侯祠", "熊猫基地"], self.index.open_at(datetime.datetime(2026, 3, 2, 17, 45)))
+        self.assertEqual("全天", self.index.hours_on("广场", datetime.date(2026, 3, 2)))
+        self.assertEqual("", self.index.hours_on("博物馆", datetime.date(2026, 3, 2)))
+    
+    def test_leap_day(self):
+        """测试结束于02/28的跨年规则包含闰年的2月29日，之前预处理保存的规则同样包含"""
+        leap_day = datetime.datetime(2028, 2, 29, 12, 0)
+        self.assertTrue(self.index.is_open("熊猫基地", leap_day))
+        self.assertEqual("08:00-17:30", self.index.hours_on("熊猫基地", leap_day.date()))
+        self.assertIn("熊猫基地", self.index.open_at(leap_day))
+        
+        stored = parse_rules("0301-1031|1234567|0730-1800;1101-1231|1234567|0800-1730;0101-0228|1234567|0800-1730")
+        self.assertEqual(parse_opening_hours("03/01-10/31 07:30-18:00开放;11/01-02/28 08:00-17:30开放"), stored)
+        self.assertEqual("0228-0228|1234567|0900-1700", format_rules(parse_opening_hours("02/28 09:00-17:00开放")))
+    
+    def test_open_at_matches_brute_force(self):
+        """测试时间槽查询与逐个景点判断的结果一致"""
+        rng = random.Random(0)
+        start = datetime.datetime(2026, 1, 1)
+        for _ in range(300):
+            when = start + datetime.timedelta(minutes=rng.randrange(366 * 24 * 60))
+            expected = sorted(name for name in self.index.names if self.index.is_open(name, when))
+            self.assertEqual(expected, self.index.open_at(when), when)
+
+if __name__ == '__main__':
+    unittest.main()
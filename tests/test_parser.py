@@ -44,6 +44,8 @@ class TestQuestionParser(unittest.TestCase):
         self.assertIn("MATCH (a:景点)", sql)
         self.assertIn("a.name = '武侯祠'", sql)
         self.assertIn("RETURN a.name AS name, a.address AS 地址", sql)
+        # 查询附带景点名称，供Neo4j不可用时从快照回答
+        self.assertEqual(['武侯祠'], result[0]['entities'])
     
     def test_multiple_entities(self):
         """测试多个实体的情况"""
@@ -69,6 +71,46 @@ class TestQuestionParser(unittest.TestCase):
                     found = True
                     break
             self.assertTrue(found, f"没有为实体 '{entity}' 生成SQL")
+    
+    def test_paired_entities(self):
+        """测试有配对时只为配对的景点生成查询"""
+        result = self.parser.parser_main({
+            'args': {'武侯祠': ['attraction'], '锦里古街': ['attraction']},
+            'question_types': ['地址', '门票价格'],
+            'pairs': {'地址': ['武侯祠'], '门票价格': ['锦里古街']}
+        })
+        queries = {entry['question_type']: entry['sql'] for entry in result}
+        self.assertEqual(2, sum(len(sql) for sql in queries.values()))
+        self.assertIn("'武侯祠'", queries['地址'][0])
+        self.assertIn("'锦里古街'", queries['门票价格'][0])
+    
+    def test_comparison_query(self):
+        """测试景点比较只生成一条批量查询，并附上比较参数"""
+        result = self.parser.parser_main({
+            'args': {'武侯祠': ['attraction'], '杜甫草堂': ['attraction']},
+            'question_types': ['景点比较'],
+            'params': {'metric': 'rating', 'order': 'max'}
+        })
+        self.assertEqual(1, len(result))
+        self.assertEqual(1, len(result[0]['sql']))
+        self.assertIn("a.name IN ['武侯祠', '杜甫草堂']", result[0]['sql'][0])
+        self.assertEqual({'metric': 'rating', 'order': 'max', 'entities': ['武侯祠', '杜甫草堂']}, result[0]['params'])
+    
+    def test_local_question_types(self):
+        """测试由内存索引回答的问题类型不生成Cypher，而是携带参数和实体"""
+        test_classification = {
+            'args': {'武侯祠': ['attraction']},
+            'question_types': ['是否开放', '开放景点'],
+            'params': {'minute': 600, 'day_offset': 0}
+        }
+        
+        result = self.parser.parser_main(test_classification)
+        
+        self.assertEqual(2, len(result))
+        self.assertEqual('是否开放', result[0]['question_type'])
+        self.assertEqual([], result[0]['sql'])
+        self.assertEqual({'minute': 600, 'day_offset': 0, 'entities': ['武侯祠']}, result[0]['params'])
+        self.assertEqual('开放景点', result[1]['question_type'])
 
 if __name__ == '__main__':
     unittest.main()
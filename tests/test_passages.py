@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_passages.py
+
+import unittest
+import sys
+import os
+import tempfile
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.data.passages import build_bm25_index, load_bm25_index, save_bm25_index, split_passages
+from src.models.passage_index import MIN_CONFIDENCE, PassageIndex, number_pattern, question_terms, short_name
+from src.models.snapshot import KGSnapshot
+
+class TestPassageIndex(unittest.TestCase):
+    """测试景点介绍段落的BM25检索"""
+
+    def setUp(self):
+        self.snapshot = KGSnapshot({
+            "都江堰景区": {"introduction": "都江堰位于成都市都江堰市城西。由秦国蜀郡太守李冰及其子率众修建，是世界文化遗产。"
+                                           "景区内有鱼嘴、飞沙堰、宝瓶口等水利工程。"},
+            "雅安碧峰峡熊猫基地": {"introduction": "目前基地圈养大熊猫80余只，吸引了众多游客。基地位于碧峰峡风景区内，环境优美。"},
+            "武侯祠": {"introduction": "祠内供奉刘备、诸葛亮等蜀汉英雄塑像50尊。武侯祠是纪念诸葛亮的祠堂，三国圣地。"},
+            "锦里": {"name": "锦里"},
+        })
+        self.index = PassageIndex(build_bm25_index(self.snapshot))
+
+    def test_split_passages(self):
+        """测试按句切分，过短的句子与后一句合并"""
+        self.assertEqual(["第一句话比较长一些，超过了最少字数。", "短句。第二句也比较长，超过最少字数。"],
+                         split_passages("第一句话比较长一些，超过了最少字数。短句。第二句也比较长，超过最少字数。", 10))
+        self.assertEqual(["很长的一句话没有标点但是足够长", "结尾很短的一句已经足够长了。尾巴"],
+                         split_passages("很长的一句话没有标点但是足够长\n结尾很短的一句已经足够长了。尾巴", 10))
+        self.assertEqual([], split_passages(None))
+
+    def test_question_terms(self):
+        """测试检索前去掉疑问词和虚词"""
+        self.assertEqual(["供奉"], question_terms("供奉的是谁"))
+        self.assertEqual(["大熊", "熊猫"], question_terms("有多少只大熊猫"))
+        self.assertEqual("都江堰", short_name("都江堰景区"))
+        self.assertEqual("青城山", short_name("青城山(前山)"))
+
+    def test_search_within_topic(self):
+        """测试只在问题提到的景点（及名称包含它的景点）中检索，并给出置信度"""
+        hit = self.index.search("碧峰峡有多少只大熊猫")[0]
+        self.assertEqual("雅安碧峰峡熊猫基地", hit.name)
+        self.assertIn("80余只", hit.text)
+        self.assertEqual(1.0, hit.confidence)
+
+        hit = self.index.search("都江堰是谁修建的")[0]
+        self.assertEqual("都江堰景区", hit.name)
+        self.assertIn("李冰", hit.text)
+
+        hit = self.index.search("供奉的是谁", names=["武侯祠"])[0]
+        self.assertIn("刘备", hit.text)
+        self.assertEqual([], self.index.search("武侯祠有多少只大熊猫"))
+
+    def test_low_confidence_and_no_match(self):
+        """测试问题的关键信息不在介绍中时置信度低，没有匹配时返回空列表"""
+        hits = self.index.search("成都有哪些好吃的火锅店")
+        self.assertTrue(all(hit.confidence < 0.75 for hit in hits))
+        self.assertEqual([], self.index.search("今天天气怎么样"))
+        self.assertEqual([], self.index.search("锦里有什么"))
+
+    def test_quantity_questions_need_numbers(self):
+        """测试问数量的问题，段落中没有相应的数字和单位时置信度减半"""
+        self.assertTrue(number_pattern("碧峰峡有多少只大熊猫").search("圈养大熊猫80余只"))
+        self.assertFalse(number_pattern("峨眉山金顶海拔多少米").search("分为低中高三个区"))
+        self.assertTrue(number_pattern("乐山大佛有多高").search("通高71米"))
+        self.assertIsNone(number_pattern("武侯祠供奉的是谁"))
+
+        hit = self.index.search("碧峰峡有多少只大熊猫")[0]
+        self.assertEqual(1.0, hit.confidence)
+        snapshot = KGSnapshot({"熊猫基地": {"introduction": "熊猫基地新区也可以看熊猫，还有其他好玩的。"}})
+        self.assertEqual(0.5, PassageIndex(build_bm25_index(snapshot)).search("熊猫基地有几只熊猫")[0].confidence)
+
+    def test_save_and_load(self):
+        """测试保存与读取，文件与当前数据不一致时重新构建"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "passages.npz")
+            save_bm25_index(self.index.index, path)
+            loaded = load_bm25_index(path)
+            self.assertEqual(self.index.index.passages, loaded.passages)
+            self.assertEqual(self.index.index.signature, loaded.signature)
+            self.assertEqual(self.index.search("都江堰是谁修建的"), PassageIndex(loaded).search("都江堰是谁修建的"))
+
+            changed = KGSnapshot({"武侯祠": {"introduction": "纪念诸葛亮的祠堂，三国圣地，有刘备墓。"}})
+            rebuilt = PassageIndex.from_snapshot(changed, path)
+            self.assertEqual(1, len(rebuilt))
+            self.assertIsNone(load_bm25_index(os.path.join(directory, "missing.npz")))
+
+class TestPassageReplay(unittest.TestCase):
+    """用回放集测量真实数据上段落检索的分流结果"""
+
+    def test_replay_diversions(self):
+        """
+        测试默认置信度下分流的问题及其正确率（tests/fixtures/replay_questions.txt，32个原本调用API的问题）：
+        分流7个，6个段落包含答案；"杜甫草堂是纪念谁的"只匹配到"杜甫草堂纪念建筑群"，置信度为1.0，
+        任何阈值都无法排除，因此段落答案不写入答案缓存。数量问题要求段落中有数字之前分流11个，只有7个答对
+        """
+        import Backend_code
+        path = os.path.join(os.path.dirname(__file__), 'fixtures', 'replay_questions.txt')
+        with open(path, encoding='utf-8') as f:
+            rows = [line.rstrip('\n').split('\t') for line in f if line.strip() and not line.startswith('#')]
+        self.assertEqual(32, len(rows))
+        self.assertEqual(0.75, MIN_CONFIDENCE)
+        diverted, wrong = [], []
+        for row in rows:
+            question, keywords = row[0], row[1].split('|') if len(row) > 1 and row[1] else []
+            context = {'question': question, 'classify': Backend_code.classifier.classify(question)}
+            result = Backend_code.tier_passages(context)
+            if result is None:
+                continue
+            diverted.append(question)
+            if not any(keyword in result.answer for keyword in keywords):
+                wrong.append(question)
+        self.assertEqual(7, len(diverted))
+        self.assertEqual(["杜甫草堂是纪念谁的"], wrong)
+        self.assertNotIn('passages', Backend_code.CACHED_TIERS)
+
+if __name__ == '__main__':
+    unittest.main()
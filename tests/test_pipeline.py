@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_pipeline.py
+
+import unittest
+import sys
+import os
+import time
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.api.pipeline import AnswerCache, AnswerPipeline, Tier, TierAnswer
+
+def slow(seconds, answer=None):
+    """返回一个耗时 seconds 秒的处理函数"""
+    def handler(context):
+        time.sleep(seconds)
+        return answer
+    return handler
+
+class TestAnswerPipeline(unittest.TestCase):
+    """测试分级问答流水线"""
+
+    def test_first_final_answer_wins(self):
+        """测试按顺序执行，得到最终答案后不再执行后面的级别"""
+        calls = []
+        pipeline = AnswerPipeline([
+            Tier("cache", lambda context: calls.append("cache"), 0.1, inline=True),
+            Tier("snapshot", lambda context: TierAnswer("内存答案"), 0.1),
+            Tier("neo4j", lambda context: calls.append("neo4j") or TierAnswer("数据库答案"), 0.1),
+        ], deadline=1.0)
+        result = pipeline.run({})
+        self.assertEqual(("内存答案", "snapshot", True), result[:3])
+        self.assertEqual(["cache"], calls)
+        self.assertEqual(["cache", "snapshot"], [name for name, _, _ in result.trace])
+
+    def test_tier_budget_and_candidate(self):
+        """测试超出预算的级别被跳过，候选答案在没有最终答案时返回"""
+        pipeline = AnswerPipeline([
+            Tier("snapshot", lambda context: TierAnswer("抱歉，没有找到", final=False), 0.1, inline=True),
+            Tier("neo4j", slow(0.5, TierAnswer("太慢的答案")), 0.05),
+            Tier("passages", lambda context: None, 0.1),
+        ], deadline=1.0, fallback=Tier("llm", lambda context: TierAnswer("等待API"), 0.1, inline=True))
+        started = time.perf_counter()
+        result = pipeline.run({})
+        self.assertLess(time.perf_counter() - started, 0.4)
+        self.assertEqual(("抱歉，没有找到", "snapshot", False), result[:3])
+        self.assertEqual(["candidate", "timeout", "miss"], [outcome for _, outcome, _ in result.trace])
+
+        stats = pipeline.stats()
+        self.assertEqual(1, stats["neo4j"]["timeouts"])
+        self.assertEqual(1, stats["snapshot"]["candidates"])
+        self.assertEqual(0, stats["llm"]["calls"])
+
+    def test_deadline_skips_and_fallback(self):
+        """测试到达截止时间后跳过剩余级别，没有答案时调用兜底级别，出错的级别被记录"""
+        def broken(context):
+            raise RuntimeError("连接失败")
+        pipeline = AnswerPipeline([
+            Tier("snapshot", broken, 0.1, inline=True),
+            Tier("neo4j", slow(0.5), 0.3),
+            Tier("passages", lambda context: TierAnswer("段落答案"), 0.1),
+        ], deadline=0.1, fallback=Tier("llm", lambda context: TierAnswer(("等待API", "id")), 0.1, inline=True))
+        started = time.perf_counter()
+        result = pipeline.run({})
+        self.assertLess(time.perf_counter() - started, 0.3)
+        self.assertEqual((("等待API", "id"), "llm", True), result[:3])
+        self.assertEqual(["error", "timeout", "skipped", "hit"], [outcome for _, outcome, _ in result.trace])
+
+        stats = pipeline.stats()
+        self.assertEqual(1, stats["snapshot"]["errors"])
+        self.assertEqual(1, stats["passages"]["skipped"])
+        self.assertEqual(0, stats["passages"]["calls"])
+        self.assertEqual(1.0, stats["llm"]["hit_rate"])
+
+    def test_deadline_override(self):
+        """测试单次请求可以使用更短的截止时间，没有剩余时间时直接调用兜底级别"""
+        pipeline = AnswerPipeline([
+            Tier("snapshot", lambda context: TierAnswer("内存答案"), 0.1, inline=True),
+        ], deadline=1.0, fallback=Tier("llm", lambda context: None, 0.1, inline=True))
+        result = pipeline.run({}, deadline=0.0)
+        self.assertEqual((None, None, False), result[:3])
+        self.assertEqual(["skipped", "miss"], [outcome for _, outcome, _ in result.trace])
+        self.assertEqual("内存答案", pipeline.run({}).answer)
+
+class TestAnswerCache(unittest.TestCase):
+    """测试答案缓存"""
+
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未使用的答案"""
+        cache = AnswerCache(max_size=2)
+        cache.put((1, "a"), "A")
+        cache.put((1, "b"), "B")
+        self.assertEqual("A", cache.get((1, "a")))
+        cache.put((1, "c"), "C")
+        self.assertIsNone(cache.get((1, "b")))
+        self.assertEqual("A", cache.get((1, "a")))
+        self.assertIsNone(cache.get((2, "a")))
+        self.assertEqual(2, len(cache))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_preprocess.py
+
+import unittest
+import sys
+import os
+import csv
+import io
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import Dataset_preprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestDatasetPreprocess(unittest.TestCase):
+    """测试数据预处理"""
+    
+    def test_clean_rating(self):
+        """测试评分列的向量化清洗"""
+        ratings = pd.Series(["4.5分", "N/A", "", None, 3.0])
+        result = Dataset_preprocess.clean_rating(ratings)
+        
+        self.assertEqual(4.5, result[0])
+        self.assertTrue(result[1:4].isna().all())
+        self.assertEqual(3.0, result[4])
+    
+    def test_clean_popularity(self):
+        """测试热度列的向量化清洗，包括'w'/'万'单位"""
+        popularity = pd.Series(["12.3w热度", "5000热度", "1.5万", "N/A", np.nan])
+        result = Dataset_preprocess.clean_popularity(popularity)
+        
+        self.assertAlmostEqual(123000.0, result[0])
+        self.assertEqual(5000.0, result[1])
+        self.assertEqual(15000.0, result[2])
+        self.assertTrue(result[3:].isna().all())
+    
+    def test_triplet_order_and_missing_values(self):
+        """测试三元组按景点、谓语顺序输出，并跳过缺失值和无名称的行"""
+        df = pd.DataFrame({
+            "景点名称": ["武侯祠", " ", "锦里古街"],
+            "评分": ["4.7", "4.0", None],
+            "热度": ["8.6", "1.0", "7.9"],
+            "地址": ["成都市武侯区武侯祠大街231号", "", "N/A"],
+            "介绍": ["三国圣地", "", ""],
+        })
+        triplets_df, names = Dataset_preprocess.generate_triplets(Dataset_preprocess.preprocess_frame(df))
+        
+        self.assertEqual({"武侯祠", "锦里古街"}, names)
+        self.assertEqual(
+            [("武侯祠", "位于"), ("武侯祠", "属于城市"), ("武侯祠", "属于区县"), ("武侯祠", "的评分是"),
+             ("武侯祠", "的热度为"), ("武侯祠", "的介绍是"), ("锦里古街", "的热度为")],
+            list(zip(triplets_df["subject"], triplets_df["predicate"]))
+        )
+    
+    def test_output_matches_committed_triplets(self):
+        """测试由爬取数据生成的三元组文件与仓库中的三元组文件逐字节一致"""
+        df = pd.read_csv(os.path.join(PROJECT_ROOT, "完整数据爬取.csv"), encoding='utf-8-sig')
+        triplets_df, _ = Dataset_preprocess.generate_triplets(Dataset_preprocess.preprocess_frame(df))
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "triplets.csv")
+            triplets_df.to_csv(output_path, index=False, encoding='utf-8-sig', lineterminator='\n')
+            with open(output_path, 'rb') as f:
+                actual = f.read()
+        with open(os.path.join(PROJECT_ROOT, "景点知识图谱_三元组.csv"), 'rb') as f:
+            expected = f.read()
+        
+        self.assertEqual(expected, actual)
+    
+    def test_stream_matches_committed_triplets(self):
+        """测试流式模式（多个分块）输出与仓库中的三元组文件逐字节一致"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "triplets.csv")
+            with redirect_stdout(io.StringIO()):
+                total, names = Dataset_preprocess.stream_triplets(
+                    os.path.join(PROJECT_ROOT, "完整数据爬取.csv"), output_path, chunksize=300)
+            with open(output_path, 'rb') as f:
+                actual = f.read()
+        with open(os.path.join(PROJECT_ROOT, "景点知识图谱_三元组.csv"), 'rb') as f:
+            expected = f.read()
+        
+        self.assertEqual(expected, actual)
+        self.assertEqual(len(pd.read_csv(io.BytesIO(expected), encoding='utf-8-sig')), total)
+        with open(os.path.join(PROJECT_ROOT, "dict", "attraction_name.txt"), 'r', encoding='utf-8') as f:
+            self.assertEqual(set(f.read().split('\n')) - {""}, names)
+    
+    def test_incremental_cache_reuses_unchanged_rows(self):
+        """测试增量缓存只重新处理新增或变化的记录，且输出与全量处理一致"""
+        raw = pd.DataFrame({
+            "景点名称": ["武侯祠", "锦里古街", "乐山大佛"],
+            "评分": ["4.7", None, "4.8分"],
+            "热度": ["8.6", "7.9", "1.2w"],
+            "地址": ["成都市武侯区武侯祠大街231号", "N/A", "乐山市市中区凌云路2435号"],
+        })
+        
+        def full_run(df):
+            triplets_df, names = Dataset_preprocess.generate_triplets(Dataset_preprocess.preprocess_frame(df.copy()))
+            return triplets_df.reset_index(drop=True).astype(str), names
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "cache.pkl")
+            _, _, stats = Dataset_preprocess.incremental_triplets(raw.copy(), cache_path)
+            self.assertEqual({"rows": 3, "hits": 0, "misses": 3, "processed": 3}, stats)
+            
+            triplets_df, names, stats = Dataset_preprocess.incremental_triplets(raw.copy(), cache_path)
+            self.assertEqual(3, stats["hits"])
+            expected_df, expected_names = full_run(raw)
+            pd.testing.assert_frame_equal(expected_df, triplets_df.astype(str))
+            self.assertEqual(expected_names, names)
+            
+            changed = raw.copy()
+            changed.loc[1, "评分"] = "4.2"
+            changed = changed.drop(index=0)
+            triplets_df, names, stats = Dataset_preprocess.incremental_triplets(changed, cache_path)
+            self.assertEqual({"rows": 2, "hits": 1, "misses": 1, "processed": 1}, stats)
+            expected_df, expected_names = full_run(changed)
+            pd.testing.assert_frame_equal(expected_df, triplets_df.astype(str))
+            self.assertEqual({"锦里古街", "乐山大佛"}, names)
+            self.assertNotIn("武侯祠", set(Dataset_preprocess.load_triplet_cache(cache_path)["subject"]))
+    
+    def test_incremental_cache_tracks_parser_source(self):
+        """测试生成派生字段的解析模块源码变化时，增量缓存全部失效"""
+        raw = pd.DataFrame({"景点名称": ["武侯祠"], "开放时间": ["08:00-18:00"]})
+        self.assertIn(os.path.join(PROJECT_ROOT, "src", "data", "opening_hours.py"),
+                      [os.path.abspath(path) for path in Dataset_preprocess.DERIVED_FIELD_SOURCES])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "cache.pkl")
+            parser_path = os.path.join(tmp_dir, "parser.py")
+            with open(parser_path, "w", encoding="utf-8") as f:
+                f.write("VERSION = 1\n")
+            with patch.object(Dataset_preprocess, "DERIVED_FIELD_SOURCES", [parser_path]):
+                Dataset_preprocess.incremental_triplets(raw.copy(), cache_path)
+                self.assertEqual(1, Dataset_preprocess.incremental_triplets(raw.copy(), cache_path)[2]["hits"])
+                with open(parser_path, "w", encoding="utf-8") as f:
+                    f.write("VERSION = 2\n")
+                self.assertEqual(0, Dataset_preprocess.incremental_triplets(raw.copy(), cache_path)[2]["hits"])
+    
+    def test_stream_peak_memory_is_bounded(self):
+        """测试流式模式的峰值内存不随输入行数增长"""
+        def peak_for(rows, tmp_dir):
+            input_path = os.path.join(tmp_dir, f"crawl_{rows}.csv")
+            with open(input_path, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["景点名称", "评分", "热度", "地址", "介绍"])
+                for i in range(rows):
+                    writer.writerow([f"景点{i % 100}", "4.5分", "1.2w热度", f"四川省成都市武侯区某路{i}号", "介绍" * 200])
+            tracemalloc.start()
+            try:
+                with redirect_stdout(io.StringIO()):
+                    Dataset_preprocess.stream_triplets(input_path, os.path.join(tmp_dir, "out.csv"), chunksize=500)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            small = peak_for(2000, tmp_dir)
+            large = peak_for(10000, tmp_dir)
+        
+        self.assertLess(large, small * 1.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_query_cache.py
+
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.utils.database import GraphPool, Neo4jManager, QueryCache, is_read_only
+
+QUERY = "MATCH (a:景点) WHERE a.name = $name RETURN a.name AS name, a.rating AS rating"
+
+class TestQueryCache(unittest.TestCase):
+    """测试 Neo4jManager.execute_query 的结果缓存"""
+
+    def setUp(self):
+        self.graph = MagicMock()
+        self.graph.run.return_value.data.return_value = [{'name': '武侯祠', 'rating': 4.6}]
+        self.pool = GraphPool(max_size=2, graph_factory=lambda: self.graph)
+        self.manager = Neo4jManager(pool=self.pool, query_cache=QueryCache(max_entries=2, max_bytes=4096))
+
+    def test_repeated_read_is_cached(self):
+        """测试相同的只读查询和参数只查询一次数据库，参数顺序不影响缓存，修改返回结果不影响缓存"""
+        rows = self.manager.execute_query(QUERY, {'name': '武侯祠', 'limit': 1})
+        rows[0]['rating'] = 0
+        self.assertEqual([{'name': '武侯祠', 'rating': 4.6}], self.manager.execute_query(QUERY, {'limit': 1, 'name': '武侯祠'}))
+        self.assertEqual(1, self.graph.run.call_count)
+
+        self.manager.execute_query(QUERY, {'name': '杜甫草堂'})
+        self.manager.execute_query(QUERY, {'name': '武侯祠', 'limit': 1}, use_cache=False)
+        self.assertEqual(3, self.graph.run.call_count)
+        stats = self.manager.query_cache.stats()
+        self.assertEqual((1, 2, 1), (stats['hits'], stats['misses'], stats['bypassed']))
+
+    def test_data_version_invalidates(self):
+        """测试数据导入提交后版本号增加，写入查询不使用缓存并使缓存失效"""
+        self.manager.execute_query(QUERY, {'name': '武侯祠'})
+        self.pool.bump_data_version()
+        self.manager.execute_query(QUERY, {'name': '武侯祠'})
+        self.assertEqual(2, self.graph.run.call_count)
+
+        self.manager.execute_query("MATCH (a:景点 {name: $name}) SET a.rating = 4.7", {'name': '武侯祠'})
+        self.manager.execute_query(QUERY, {'name': '武侯祠'})
+        self.assertEqual(4, self.graph.run.call_count)
+        self.assertEqual(2, self.pool.data_version)
+        self.assertEqual(2, self.manager.query_cache.stats()['invalidated'])
+
+    def test_lru_and_byte_limits(self):
+        """测试超出条目数时淘汰最久未使用的结果，超过字节上限的结果不缓存"""
+        cache = QueryCache(max_entries=2, max_bytes=200)
+        for name in ['a', 'b', 'a', 'c']:
+            key = cache.make_key(QUERY, {'name': name})
+            if cache.get(key, 0) is None:
+                cache.put(key, 0, [{'name': name}])
+        self.assertIsNone(cache.get(cache.make_key(QUERY, {'name': 'b'}), 0))
+        self.assertIsNotNone(cache.get(cache.make_key(QUERY, {'name': 'a'}), 0))
+        cache.put(cache.make_key(QUERY, {'name': 'd'}), 0, [{'name': 'x' * 300}])
+        self.assertEqual(2, len(cache))
+        self.assertLessEqual(cache.stats()['bytes'], 200)
+        self.assertEqual(1, cache.stats()['evicted'])
+
+    def test_is_read_only(self):
+        """测试识别写入查询，字符串中的关键字不影响判断"""
+        self.assertTrue(is_read_only("MATCH (a:景点) WHERE a.name = 'SET' RETURN a.offset"))
+        self.assertFalse(is_read_only("MERGE (c:城市 {name: $name})"))
+        self.assertFalse(is_read_only("MATCH (n) DETACH DELETE n"))
+        self.assertFalse(is_read_only("CALL db.createLabel('景点')"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_ranking_index.py
+
+import unittest
+import sys
+import os
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.models.ranking_index import CityRankings
+from src.models.snapshot import KGSnapshot
+
+class TestCityRankings(unittest.TestCase):
+    """测试城市景点排行索引"""
+    
+    def setUp(self):
+        snapshot = KGSnapshot(
+            {
+                "武侯祠": {"name": "武侯祠", "rating": 4.7, "popularity": 8.9},
+                "杜甫草堂": {"name": "杜甫草堂", "rating": 4.7, "popularity": 9.0},
+                "熊猫基地": {"name": "熊猫基地", "rating": 4.6, "popularity": 9.5},
+                "锦里": {"name": "锦里", "popularity": 7.9},
+                "乐山大佛": {"name": "乐山大佛", "rating": 4.8, "popularity": 8.7},
+            },
+            {"属于城市": {"武侯祠": "成都", "杜甫草堂": "成都", "熊猫基地": "成都", "锦里": "成都", "乐山大佛": "乐山"}}
+        )
+        self.rankings = CityRankings.from_snapshot(snapshot)
+    
+    def test_city_ranking_by_rating(self):
+        """测试按评分排行，评分相同时按热度排序，没有评分的景点不参与"""
+        self.assertEqual(
+            [("杜甫草堂", 4.7), ("武侯祠", 4.7), ("熊猫基地", 4.6)],
+            self.rankings.top("rating", "成都", 10)
+        )
+        self.assertEqual(3, self.rankings.count("rating", "成都"))
+    
+    def test_top_k_and_province(self):
+        """测试前K个切片和全省排行"""
+        self.assertEqual([("熊猫基地", 9.5), ("杜甫草堂", 9.0)], self.rankings.top("popularity", "成都", 2))
+        self.assertEqual("乐山大佛", self.rankings.top("rating", None, 1)[0][0])
+        self.assertEqual([], self.rankings.top("rating", "绵阳", 5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,15 +10,19 @@ from unittest.mock import patch, MagicMock
 # 添加上级目录到路径中，使测试可以导入项目模块
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+import datetime
+
 from answer_search import AnswerSearcher
+from src.models.snapshot import KGSnapshot
+from src.utils.database import CircuitOpen
 
 class TestAnswerSearcher(unittest.TestCase):
     """测试答案搜索器"""
     
-    @patch('answer_search.Graph')
+    @patch('answer_search.get_graph_pool')
     def setUp(self, mock_graph):
         """每个测试用例开始前执行，初始化搜索器（使用模拟的Neo4j连接）"""
-        # 创建Graph实例的模拟
+        # 创建连接池的模拟
         self.mock_graph_instance = MagicMock()
         mock_graph.return_value = self.mock_graph_instance
         
@@ -66,5 +70,249 @@ class TestAnswerSearcher(unittest.TestCase):
         # 期望返回适当的错误信息
         self.assertIn("抱歉，没有找到", result[0])
 
+    def test_search_results_marks_missing(self):
+        """测试 search_results 区分真正找到的答案和未找到信息的提示"""
+        found, missing = MagicMock(), MagicMock()
+        found.data.return_value = [{'name': '武侯祠', '地址': '武侯祠大街231号'}]
+        missing.data.return_value = []
+        self.mock_graph_instance.run.side_effect = [found, missing]
+        
+        sqls = [
+            {'question_type': '地址', 'sql': ["MATCH (a:景点) WHERE a.name = '武侯祠' RETURN a.name AS name, a.address AS 地址"]},
+            {'question_type': '电话', 'sql': ["MATCH (a:景点) WHERE a.name = '武侯祠' RETURN a.name AS name, a.phone AS 电话"]},
+        ]
+        result = self.searcher.search_results(sqls)
+        
+        self.assertEqual([("武侯祠的地址是：武侯祠大街231号。", True), ("抱歉，没有找到关于“武侯祠”的“电话”信息。", False)], result)
+    
+    @patch('answer_search.get_graph_pool')
+    def test_search_open_questions(self, mock_graph):
+        """测试使用快照中的开放时段回答是否开放和开放景点问题，不查询数据库"""
+        snapshot = KGSnapshot({
+            '武侯祠': {'name': '武侯祠', 'popularity': 4.5, 'openingIntervals': '0101-1231|1234567|0900-1800'},
+            '锦里': {'name': '锦里', 'popularity': 4.8, 'openingIntervals': '0101-1231|1234567|0000-2400'},
+            '杜甫草堂': {'name': '杜甫草堂', 'openingTime': '具体营业状态以当天开放情况为准'},
+        })
+        searcher = AnswerSearcher(snapshot=snapshot)
+        searcher.clock = lambda: datetime.datetime(2026, 10, 19, 20, 30)
+        
+        sqls = [
+            {'question_type': '是否开放', 'sql': [], 'params': {'minute': None, 'day_offset': 0, 'entities': ['武侯祠', '杜甫草堂']}},
+            {'question_type': '开放景点', 'sql': [], 'params': {'minute': 600, 'day_offset': 1, 'entities': []}},
+        ]
+        result = searcher.search_main(sqls)
+        
+        self.assertEqual(
+            "现在（20:30）武侯祠不在开放时间内，当天开放时间为09:00-18:00。\n"
+            "杜甫草堂暂无明确的开放时段，开放时间信息为：具体营业状态以当天开放情况为准。",
+            result[0]
+        )
+        self.assertEqual("明天10:00仍在开放的景点共有2个，热门的有：锦里、武侯祠。", result[1])
+        mock_graph.return_value.run.assert_not_called()
+    
+    @patch('answer_search.get_graph_pool')
+    def test_search_price_questions(self, mock_graph):
+        """测试使用门票价格索引回答价格区间和免费景点问题"""
+        snapshot = KGSnapshot({
+            '武侯祠': {'name': '武侯祠', 'adultPrice': 50.0, 'popularity': 4.5},
+            '青城山': {'name': '青城山', 'adultPrice': 80.0},
+            '宽窄巷子': {'name': '宽窄巷子', 'adultPrice': 0.0, 'freeEntry': True, 'popularity': 4.8},
+            '映秀震中纪念馆': {'name': '映秀震中纪念馆', 'adultPrice': 0.0, 'freeEntry': True, 'popularity': 4.0},
+        }, {'属于城市': {'武侯祠': '成都', '青城山': '成都', '宽窄巷子': '成都', '映秀震中纪念馆': '阿坝'}})
+        searcher = AnswerSearcher(snapshot=snapshot)
+        
+        sqls = [
+            {'question_type': '价格区间', 'sql': [], 'params': {'min_price': None, 'max_price': 60.0, 'entities': []}},
+            {'question_type': '价格区间', 'sql': [], 'params': {'min_price': 100.0, 'max_price': None, 'entities': []}},
+            {'question_type': '免费景点', 'sql': [], 'params': {'entities': []}},
+            {'question_type': '价格区间', 'sql': [], 'params': {'min_price': None, 'max_price': 100.0, 'city': '成都', 'entities': []}},
+            {'question_type': '免费景点', 'sql': [], 'params': {'city': '成都', 'entities': []}},
+            {'question_type': '免费景点', 'sql': [], 'params': {'city': '绵阳', 'entities': []}},
+        ]
+        result = searcher.search_main(sqls)
+        
+        self.assertEqual("在有明确票价信息的4个景点中，门票在60元以下的有3个：宽窄巷子（0元）、映秀震中纪念馆（0元）、武侯祠（50元）。", result[0])
+        self.assertEqual("抱歉，在有明确票价信息的4个景点中，没有查询到门票在100元以上的景点。", result[1])
+        self.assertEqual("在有明确票价信息的4个景点中，免费开放的有2个：宽窄巷子、映秀震中纪念馆。", result[2])
+        self.assertEqual("在有明确票价信息的4个景点中，成都门票在100元以下的有3个：宽窄巷子（0元）、武侯祠（50元）、青城山（80元）。", result[3])
+        self.assertEqual("在有明确票价信息的4个景点中，成都免费开放的有1个：宽窄巷子。", result[4])
+        self.assertEqual("抱歉，在有明确票价信息的4个景点中，没有查询到绵阳明确免费开放的景点。", result[5])
+        self.assertEqual([True, False, True, True, True, False], [found for _, found in searcher.search_results(sqls)])
+        mock_graph.return_value.run.assert_not_called()
+    
+    @patch('answer_search.get_graph_pool')
+    def test_price_answers_with_low_coverage(self, mock_graph):
+        """测试大部分景点没有票价信息时，价格答案说明统计范围且只作为候选"""
+        attractions = {f'景点{i}': {'name': f'景点{i}'} for i in range(10)}
+        attractions['宽窄巷子'] = {'name': '宽窄巷子', 'adultPrice': 0.0, 'freeEntry': True}
+        searcher = AnswerSearcher(snapshot=KGSnapshot(attractions))
+        
+        results = searcher.search_results([{'question_type': '免费景点', 'sql': [], 'params': {'entities': []}}], local_only=True)
+        self.assertEqual([("在有明确票价信息的1个景点中，免费开放的有1个：宽窄巷子。", False)], results)
+    
+    @patch('answer_search.get_graph_pool')
+    def test_search_ranking(self, mock_graph):
+        """测试使用城市排行索引回答前K个景点"""
+        snapshot = KGSnapshot(
+            {
+                '武侯祠': {'name': '武侯祠', 'rating': 4.7},
+                '熊猫基地': {'name': '熊猫基地', 'rating': 4.6},
+                '乐山大佛': {'name': '乐山大佛', 'rating': 4.8},
+            },
+            {'属于城市': {'武侯祠': '成都', '熊猫基地': '成都', '乐山大佛': '乐山'}}
+        )
+        searcher = AnswerSearcher(snapshot=snapshot)
+        
+        sqls = [
+            {'question_type': '景点排行', 'sql': [], 'params': {'city': '成都', 'metric': 'rating', 'k': 2, 'entities': []}},
+            {'question_type': '景点排行', 'sql': [], 'params': {'city': '绵阳', 'metric': 'popularity', 'k': None, 'entities': []}},
+        ]
+        result = searcher.search_main(sqls)
+        
+        self.assertEqual("成都评分最高的2个景点：\n1. 武侯祠（评分4.7分）\n2. 熊猫基地（评分4.6分）", result[0])
+        self.assertEqual("抱歉，没有查询到绵阳有热度信息的景点。", result[1])
+    
+    @patch('answer_search.get_graph_pool')
+    def test_search_city_listing(self, mock_graph):
+        """测试使用城市景点列表按游标翻页，每页不超过 num_limit 个"""
+        snapshot = KGSnapshot(
+            {
+                '武侯祠': {'name': '武侯祠', 'popularity': 8.9},
+                '熊猫基地': {'name': '熊猫基地', 'popularity': 9.5},
+                '锦里': {'name': '锦里', 'popularity': 7.9},
+            },
+            {'属于城市': {'武侯祠': '成都', '熊猫基地': '成都', '锦里': '成都'}}
+        )
+        searcher = AnswerSearcher(snapshot=snapshot)
+        searcher.num_limit = 2
+        
+        params = {'city': '成都', 'limit': 50, 'entities': []}
+        self.assertEqual("成都共收录3个景点，按热度排序第1-2个：熊猫基地、武侯祠。回复“更多”查看后面的景点。",
+                         searcher.search_city_listing(params))
+        params = {'city': '成都', 'more': True, 'cursor': params['next_cursor'], 'entities': []}
+        self.assertEqual("成都共收录3个景点，按热度排序第3-3个：锦里。以上是全部景点。", searcher.search_city_listing(params))
+        self.assertIsNone(params['next_cursor'])
+        params = {'city': '成都', 'more': True, 'cursor': None, 'entities': []}
+        self.assertEqual("成都的3个景点已经全部列出了。", searcher.search_city_listing(params))
+        mock_graph.return_value.run.assert_not_called()
+    
+    @patch('answer_search.get_graph_pool')
+    def test_search_city_statistics(self, mock_graph):
+        """测试使用城市统计回答景点数量和平均评分问题"""
+        snapshot = KGSnapshot(
+            {
+                '武侯祠': {'name': '武侯祠', 'rating': 4.7},
+                '熊猫基地': {'name': '熊猫基地', 'rating': 4.5},
+                '锦里': {'name': '锦里'},
+            },
+            {'属于城市': {'武侯祠': '成都', '熊猫基地': '成都', '锦里': '成都'}}
+        )
+        searcher = AnswerSearcher(snapshot=snapshot)
+        
+        sqls = [
+            {'question_type': '城市统计', 'sql': [], 'params': {'city': '成都', 'metric': None, 'compare': False, 'entities': []}},
+            {'question_type': '城市统计', 'sql': [], 'params': {'city': '成都', 'metric': 'rating', 'compare': False, 'entities': []}},
+            {'question_type': '城市统计', 'sql': [], 'params': {'city': '乐山', 'metric': None, 'compare': False, 'entities': []}},
+        ]
+        result = searcher.search_main(sqls)
+        
+        self.assertEqual("成都共收录3个景点，其中2个有评分，平均评分4.60分。", result[0])
+        self.assertEqual("成都有评分的景点共2个，平均评分4.60分，中位数4.6分，90%分位数4.68分。", result[1])
+        self.assertEqual("抱歉，知识库中暂时没有乐山的景点。", result[2])
+    
+    @patch('answer_search.get_graph_pool')
+    def test_search_similar(self, mock_graph):
+        """测试使用相似景点表回答相似景点问题"""
+        snapshot = KGSnapshot({
+            '武侯祠': {'name': '武侯祠', 'introduction': '纪念诸葛亮的祠堂，三国圣地'},
+            '汉昭烈庙': {'name': '汉昭烈庙', 'introduction': '刘备的祠庙，三国圣地'},
+            '熊猫基地': {'name': '熊猫基地', 'introduction': '大熊猫繁育研究基地'},
+            '锦里': {'name': '锦里'},
+        })
+        searcher = AnswerSearcher(snapshot=snapshot)
+        
+        result = searcher.search_main([
+            {'question_type': '相似景点', 'sql': [], 'params': {'entities': ['武侯祠', '锦里']}},
+        ])
+        
+        self.assertEqual(1, len(result))
+        lines = result[0].split("\n")
+        self.assertEqual("与武侯祠相似的景点：", lines[0])
+        self.assertTrue(lines[1].startswith("1. 汉昭烈庙（相似度"))
+        self.assertEqual("抱歉，暂时没有找到与锦里相似的景点。", lines[-1])
+    
+    @patch('answer_search.get_graph_pool')
+    def test_search_facilities(self, mock_graph):
+        """测试使用服务设施位图索引回答设施筛选问题"""
+        snapshot = KGSnapshot(
+            {
+                '武侯祠': {'name': '武侯祠', 'rating': 4.7, 'popularity': 8.6, 'facilityTags': '停车场;无障碍设施'},
+                '熊猫基地': {'name': '熊猫基地', 'rating': 4.8, 'popularity': 9.5, 'facilityTags': '停车场;母婴室'},
+                '乐山大佛': {'name': '乐山大佛', 'rating': 4.9, 'facilityTags': '停车场'},
+            },
+            {'属于城市': {'武侯祠': '成都', '熊猫基地': '成都', '乐山大佛': '乐山'}}
+        )
+        searcher = AnswerSearcher(snapshot=snapshot)
+        
+        sqls = [
+            {'question_type': '设施筛选', 'sql': [], 'params': {'facilities': ['停车场'], 'mode': 'all', 'city': '成都', 'min_rating': None, 'entities': []}},
+            {'question_type': '设施筛选', 'sql': [], 'params': {'facilities': ['母婴室', '无障碍设施'], 'mode': 'any', 'city': None, 'min_rating': 4.75, 'entities': []}},
+            {'question_type': '设施筛选', 'sql': [], 'params': {'facilities': ['淋浴设施'], 'mode': 'all', 'city': None, 'min_rating': None, 'entities': []}},
+        ]
+        result = searcher.search_main(sqls)
+        
+        self.assertEqual("成都有停车场的景点共有2个：熊猫基地、武侯祠。", result[0])
+        self.assertEqual("评分4.75分以上、有母婴室或无障碍设施的景点共有1个：熊猫基地。", result[1])
+        self.assertEqual("抱歉，没有查询到有淋浴设施的景点（目前有3个景点收录了服务设施信息）。", result[2])
+
+    @patch('answer_search.get_graph_pool')
+    def test_search_comparison(self, mock_graph):
+        """测试景点比较：快照中有全部景点时在内存中比较，否则用一次批量Cypher查询后比较"""
+        graph = MagicMock()
+        mock_graph.return_value = graph
+        snapshot = KGSnapshot({
+            '武侯祠': {'name': '武侯祠', 'rating': 4.6, 'adultPrice': 50.0},
+            '杜甫草堂': {'name': '杜甫草堂', 'rating': 4.5, 'adultPrice': 50.0},
+            '锦里古街': {'name': '锦里古街'},
+        })
+        searcher = AnswerSearcher(snapshot=snapshot)
+        query = "MATCH (a:景点) WHERE a.name IN ['武侯祠', '宽窄巷子'] RETURN a.name AS name, a.rating AS rating"
+
+        result = searcher.search_main([
+            {'question_type': '景点比较', 'sql': [query], 'params': {'metric': 'rating', 'order': 'max', 'entities': ['武侯祠', '杜甫草堂']}},
+            {'question_type': '景点比较', 'sql': [query], 'params': {'metric': 'adultPrice', 'order': 'min', 'entities': ['武侯祠', '杜甫草堂']}},
+            {'question_type': '景点比较', 'sql': [query], 'params': {'metric': 'rating', 'order': 'max', 'entities': ['武侯祠', '锦里古街']}},
+        ])
+        self.assertEqual("武侯祠的评分更高（武侯祠4.6分，杜甫草堂4.5分）。", result[0])
+        self.assertEqual("武侯祠和杜甫草堂的门票价格相同（武侯祠50元，杜甫草堂50元）。", result[1])
+        self.assertEqual("抱歉，没有查询到锦里古街的评分信息，无法比较。", result[2])
+        graph.run.assert_not_called()
+
+        graph.run.return_value.data.return_value = [{'name': '武侯祠', 'rating': 4.6}, {'name': '宽窄巷子', 'rating': 4.7}]
+        sqls = [{'question_type': '景点比较', 'sql': [query], 'params': {'metric': 'rating', 'order': 'min', 'entities': ['武侯祠', '宽窄巷子']}}]
+        self.assertEqual([], searcher.search_results(sqls, local_only=True))
+        self.assertEqual(["武侯祠的评分更低（武侯祠4.6分，宽窄巷子4.7分）。"], searcher.search_main(sqls))
+        graph.run.assert_called_once_with(query)
+
+    @patch('answer_search.get_graph_pool')
+    def test_search_degraded(self, mock_graph):
+        """测试Neo4j不可用（熔断器打开）时改用内存快照回答，快照中没有的景点按未找到处理"""
+        graph = MagicMock()
+        graph.run.side_effect = CircuitOpen("Neo4j熔断器已打开")
+        mock_graph.return_value = graph
+        snapshot = KGSnapshot({
+            '武侯祠': {'name': '武侯祠', 'address': '武侯祠大街231号', 'rating': 4.6},
+        })
+        searcher = AnswerSearcher(snapshot=snapshot)
+
+        result = searcher.search_results([
+            {'question_type': '地址', 'sql': ["MATCH (a:景点) WHERE a.name = '武侯祠' RETURN a.name AS name, a.address AS 地址"],
+             'entities': ['武侯祠']},
+            {'question_type': '评分', 'sql': ["MATCH (a:景点) WHERE a.name = '宽窄巷子' RETURN a.name AS name, a.rating AS 评分"],
+             'entities': ['宽窄巷子']},
+        ])
+        self.assertEqual([("武侯祠的地址是：武侯祠大街231号。", True), ("抱歉，没有找到关于“宽窄巷子”的“评分”信息。", False)], result)
+        self.assertEqual(2, graph.run.call_count)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_speculation.py
+
+import unittest
+import sys
+import os
+import threading
+import json
+import time
+from unittest.mock import patch
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.api.speculation import SpeculationBudget, SpeculationStore, SpeculativeCall, answer_coverage
+
+class TestSpeculation(unittest.TestCase):
+    """测试大模型投机预取"""
+
+    def test_answer_coverage(self):
+        """测试答案对问题内容的覆盖比例，实体和疑问词不计入"""
+        answer = "武侯祠是纪念诸葛亮的祠堂，祠内供奉刘备、诸葛亮等塑像。"
+        self.assertEqual(1.0, answer_coverage("武侯祠供奉的是谁", answer, ["武侯祠"]))
+        self.assertEqual(0.0, answer_coverage("武侯祠门口有什么小吃", answer, ["武侯祠"]))
+        self.assertIsNone(answer_coverage("武侯祠", answer, ["武侯祠"]))
+
+    def test_budget_caps_fraction(self):
+        """测试投机调用占请求的比例不超过上限，同时进行的调用个数受限"""
+        budget = SpeculationBudget(max_fraction=0.25, max_in_flight=10)
+        started = 0
+        for _ in range(100):
+            budget.note_request()
+            if budget.try_acquire():
+                started += 1
+                budget.release()
+        self.assertEqual(25, started)
+        self.assertEqual(0.25, budget.stats()["fraction"])
+
+        budget = SpeculationBudget(max_fraction=1.0, max_in_flight=1)
+        budget.note_request()
+        budget.note_request()
+        self.assertTrue(budget.try_acquire())
+        self.assertFalse(budget.try_acquire())
+        budget.release()
+        self.assertTrue(budget.try_acquire())
+
+    def test_cancel_and_adopt(self):
+        """测试取消的调用不产生结果，未完成时被采用的调用在结束后回调"""
+        gate = threading.Event()
+        finished = []
+
+        def worker(cancel):
+            gate.wait(1.0)
+            return None if cancel.is_set() else "大模型答案"
+
+        cancelled = SpeculativeCall("q1", worker, finished.append).start()
+        cancelled.cancel()
+        adopted = SpeculativeCall("q2", worker, finished.append).start()
+        self.assertEqual((False, None), adopted.adopt())
+        gate.set()
+        for call in (cancelled, adopted):
+            call._done.wait(1.0)
+        self.assertIsNone(cancelled.result)
+        self.assertTrue(adopted.adopted)
+        self.assertEqual("大模型答案", adopted.result)
+        self.assertEqual((True, "大模型答案"), adopted.adopt())
+        self.assertEqual(2, len(finished))
+
+    def test_store(self):
+        """测试按用户和问题保存投机调用，取出后删除，过期后丢弃"""
+        store = SpeculationStore(ttl=60)
+        call = SpeculativeCall("q1", lambda cancel: "答案")
+        store.put("u1", "武侯祠供奉的是谁 ", call)
+        self.assertIsNone(store.pop("u2", "武侯祠供奉的是谁"))
+        self.assertIs(call, store.pop("u1", "武侯祠供奉的是谁"))
+        self.assertIsNone(store.pop("u1", "武侯祠供奉的是谁"))
+
+        store.put("u1", "武侯祠供奉的是谁", call)
+        call.started -= 120
+        self.assertIsNone(store.pop("u1", "武侯祠供奉的是谁"))
+
+class FakeSparkSocket:
+    """模拟星火WebSocket：连接打开后逐帧推送 tokens，每帧之间稍作等待，使同时进行的调用交错"""
+
+    def __init__(self, url, header=None, on_message=None, on_error=None, on_close=None, on_open=None):
+        self.on_message, self.on_close, self.on_open = on_message, on_close, on_open
+        self.closed = False
+
+    def send(self, payload):
+        self.question = json.loads(payload)["payload"]["message"]["text"][-1]["content"]
+
+    def close(self):
+        self.closed = True
+
+    def run_forever(self):
+        self.on_open(self)
+        tokens = list(self.question)
+        for i, token in enumerate(tokens):
+            if self.closed:
+                break
+            time.sleep(0.005)
+            frame = {"header": {"code": 0}, "payload": {"choices": {"status": 2 if i == len(tokens) - 1 else 1, "text": [{"content": token}]}}}
+            self.on_message(self, json.dumps(frame))
+        self.on_close(self, None, None)
+
+class TestConcurrentApiCalls(unittest.TestCase):
+    """测试同时进行的星火API调用各自保存响应"""
+
+    @patch('Backend_code.generate_auth_params', return_value=("wss://test", "date"))
+    @patch('Backend_code.websocket.WebSocketApp', FakeSparkSocket)
+    def test_overlapping_calls_do_not_mix(self, _):
+        """测试投机调用、普通调用和中途取消的调用同时进行时，答案不会混杂、被清空或被提前截断"""
+        import Backend_code
+        cancel = threading.Event()
+        results = {}
+
+        def call(name, question, cancel_event=None):
+            results[name] = Backend_code.get_answer_from_api(question, history=[], cancel_event=cancel_event)
+
+        threads = [threading.Thread(target=call, args=("speculative", "甲" * 20)),
+                   threading.Thread(target=call, args=("cancelled", "丙" * 20, cancel))]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.03)
+        cancel.set()  # 被取消的调用提前关闭连接
+        call("normal", "乙" * 10)  # 投机调用仍在接收时开始的新调用
+        for thread in threads:
+            thread.join()
+        self.assertEqual({"speculative": "甲" * 20, "normal": "乙" * 10, "cancelled": None}, results)
+
+if __name__ == '__main__':
+    unittest.main()
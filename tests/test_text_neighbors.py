@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_text_neighbors.py
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.data.text_neighbors import (build_neighbor_table, build_tfidf, char_ngrams, load_neighbor_table,
+                                     save_neighbor_table, top_k_neighbors)
+from src.models.similar_index import SimilarAttractions
+from src.models.snapshot import KGSnapshot
+
+class TestTextNeighbors(unittest.TestCase):
+    """测试相似景点表的离线计算与查询"""
+
+    def setUp(self):
+        self.snapshot = KGSnapshot({
+            "武侯祠": {"introduction": "纪念诸葛亮的祠堂，三国圣地，有刘备墓", "facilities": "停车场 ： 收费"},
+            "汉昭烈庙": {"introduction": "刘备的祠庙，三国圣地，与诸葛亮祠堂相连", "facilities": "停车场 ： 收费"},
+            "杜甫草堂": {"introduction": "杜甫流寓成都时的故居，诗圣的草堂", "facilities": "停车场 ： 免费"},
+            "浣花溪公园": {"introduction": "紧邻杜甫草堂的城市公园，诗歌大道", "facilities": "卫生间 ： 有"},
+            "熊猫基地": {"introduction": "大熊猫繁育研究基地，可以看熊猫", "facilities": "停车场 ： 收费"},
+            "锦里": {"name": "锦里"},
+        })
+
+    def test_char_ngrams(self):
+        """测试字符n-gram不跨越标点"""
+        self.assertEqual(["三国", "国圣", "圣地", "三国圣", "国圣地"], char_ngrams("三国圣地"))
+        self.assertEqual(["ab", "cd"], char_ngrams("AB，cd"))
+        self.assertNotIn("国，", char_ngrams("三国，圣地"))
+
+    def test_blocked_matches_full_product(self):
+        """测试分块计算的近邻与一次性稠密矩阵乘法的结果一致"""
+        texts = [f"景点{i % 7}号 有{'山水' if i % 2 else '寺庙'}和{'古镇' if i % 3 else '博物馆'}" for i in range(23)]
+        matrix = build_tfidf(texts)
+        dense = matrix.dense_rows(0, matrix.n_rows)
+        np.testing.assert_allclose(np.linalg.norm(dense, axis=1), 1.0, rtol=1e-5)
+        full = dense @ dense.T
+        np.fill_diagonal(full, -np.inf)
+        neighbors, scores = top_k_neighbors(matrix, k=4, block_size=5)
+        # 相似度相同的近邻在不同分块下的顺序可能因浮点误差不同，因此比较相似度，并验证下标与相似度对应
+        np.testing.assert_allclose(np.sort(full, axis=1)[:, ::-1][:, :4], scores, rtol=1e-5)
+        np.testing.assert_allclose(np.take_along_axis(full, neighbors.astype(np.int64), axis=1), scores, rtol=1e-5)
+        self.assertFalse((neighbors == np.arange(len(texts))[:, None]).any())
+
+    def test_neighbor_table(self):
+        """测试相似景点表：相似的景点排在前面，没有文本的景点没有近邻"""
+        similar = SimilarAttractions(build_neighbor_table(self.snapshot, k=3))
+        self.assertEqual("汉昭烈庙", similar.similar("武侯祠")[0][0])
+        self.assertEqual("浣花溪公园", similar.similar("杜甫草堂", 1)[0][0])
+        self.assertEqual([], similar.similar("锦里"))
+        self.assertEqual([], similar.similar("不存在的景点"))
+
+    def test_save_and_load(self):
+        """测试保存后读取；文件与数据不一致时重新计算"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "similar.npz")
+            table = build_neighbor_table(self.snapshot, k=3)
+            save_neighbor_table(table, path)
+            loaded = load_neighbor_table(path)
+            self.assertEqual(table.names, loaded.names)
+            np.testing.assert_array_equal(table.neighbors, loaded.neighbors)
+            self.assertEqual(table.signature, loaded.signature)
+            self.assertIs(np.int32, loaded.neighbors.dtype.type)
+
+            # 文件签名一致时直接使用文件中的表
+            self.assertEqual(3, SimilarAttractions.from_snapshot(self.snapshot, path).table.neighbors.shape[1])
+            # 景点文本变化后签名不一致，重新计算
+            self.snapshot.attractions["熊猫基地"]["introduction"] = "熊猫"
+            self.assertEqual(10, SimilarAttractions.from_snapshot(self.snapshot, path).table.neighbors.shape[1])
+
+            self.assertIsNone(load_neighbor_table(os.path.join(tmp, "missing.npz")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# coding: utf-8
+# File: test_ticket_prices.py
+
+import unittest
+import sys
+import os
+
+# 添加上级目录到路径中，使测试可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.data.ticket_prices import TicketPrices, extract_ticket_prices
+from src.models.price_index import PriceIndex
+from src.models.snapshot import KGSnapshot
+
+class TestTicketPriceExtraction(unittest.TestCase):
+    """测试从文本中提取门票价格"""
+    
+    def test_adult_and_child_prices(self):
+        """测试成人票价和优待政策中儿童行的票价"""
+        policy = "儿童 ： 1.2米（含）-1.49米（含）儿童，30元\n老人 ： 70周岁（含）以上，免费"
+        introduction = "景区准备了嘉年华门票（成人票128元/张，学生票80元/张）"
+        self.assertEqual(TicketPrices(128.0, 30.0, False), extract_ticket_prices(policy, introduction))
+    
+    def test_group_discounts_are_not_free_entry(self):
+        """测试优待政策中特定人群免费不视为免费开放"""
+        policy = "儿童 ： 身高1.2米（含）以下，免费\n老人 ： 免收景区大门票，免费"
+        self.assertEqual(TicketPrices(None, None, None), extract_ticket_prices(policy, "门票价格以景区公示为准"))
+    
+    def test_free_entry(self):
+        """测试开放时间中的免费开放"""
+        self.assertEqual(TicketPrices(0.0, 0.0, True), extract_ticket_prices(None, None, "全年 全天免费开放"))
+
+class TestPriceIndex(unittest.TestCase):
+    """测试门票价格索引"""
+    
+    def setUp(self):
+        snapshot = KGSnapshot({
+            "武侯祠": {"name": "武侯祠", "adultPrice": 50.0},
+            "熊猫基地": {"name": "熊猫基地", "adultPrice": 55.0},
+            "青城山": {"name": "青城山", "adultPrice": 80.0},
+            "宽窄巷子": {"name": "宽窄巷子", "adultPrice": 0.0, "freeEntry": True},
+            "人民公园": {"name": "人民公园", "freeEntry": True},
+            "锦里": {"name": "锦里"},
+        })
+        self.index = PriceIndex.from_snapshot(snapshot)
+    
+    def test_in_range(self):
+        """测试价格区间查询包含两端，并按票价排序"""
+        self.assertEqual(["宽窄巷子", "武侯祠", "熊猫基地"], self.index.in_range(max_price=55))
+        self.assertEqual(["武侯祠", "熊猫基地", "青城山"], self.index.in_range(50, 80))
+        self.assertEqual(["青城山"], self.index.in_range(min_price=60))
+        self.assertEqual([], self.index.in_range(90, 100))
+    
+    def test_free(self):
+        """测试免费景点包括票价为0和明确免费开放的景点"""
+        self.assertEqual(["人民公园", "宽窄巷子"], self.index.free())
+
+if __name__ == '__main__':
+    unittest.main()